@@ -55,9 +55,12 @@ set(PXVIEW_CORE_SOURCES
     PXView/pv/api/rpc_dispatcher.cpp
     PXView/pv/api/ws_transport.cpp
     PXView/pv/api/mcp_transport.cpp
+    PXView/pv/api/http_compression.cpp
+    PXView/pv/api/export_stream.cpp
     PXView/pv/api/binary_codec.cpp
     # MCP SDK (tool registration, schema generation, exception-driven dispatch)
     PXView/pv/mcp/mcp_server.cpp
+    PXView/pv/mcp/mcp_blob_store.cpp
     PXView/pv/mcp/mcp_serializers.cpp
     PXView/pv/mcp/mcp_tool_registry.cpp
     # NOTE: utility/*.cpp live in PXView/pv/utility/CMakeLists.txt (pxview-utility STATIC lib)
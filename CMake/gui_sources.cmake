@@ -316,6 +316,8 @@ PXView/pv/view/component/decoderaudioplayer.h
     PXView/pv/api/rpc_dispatcher.h
     PXView/pv/api/ws_transport.h
     PXView/pv/api/mcp_transport.h
+    PXView/pv/api/http_compression.h
+    PXView/pv/api/export_stream.h
     ${UI_HEADERS}
 )
  
@@ -48,6 +48,8 @@
 #include <QFontDatabase>
 #include <QFont>
 #include <QTimer>
+#include <QElapsedTimer>
+#include <QSaveFile>
 
 #ifdef _WIN32
 #include <windows.h>
@@ -85,6 +87,25 @@ void myMessageHandler(QtMsgType type, const QMessageLogContext &context, const Q
 #endif
 
 
+// Readiness handshake for launchers (--ready-file). QSaveFile renames into
+// place on commit, so a poller never sees a half-written file.
+static void writeReadyFile(const QString &path, int mcpPort, int wsPort,
+                           qint64 initMs, qint64 startMs)
+{
+	QSaveFile f(path);
+	if (!f.open(QIODevice::WriteOnly | QIODevice::Text)) {
+		pxv_err("Failed to open ready file: %s", path.toUtf8().data());
+		return;
+	}
+	QString body = QString("mcp_port=%1\nws_port=%2\npid=%3\ninit_ms=%4\nstart_ms=%5\n")
+		.arg(mcpPort).arg(wsPort).arg(QCoreApplication::applicationPid())
+		.arg(initMs).arg(startMs);
+	f.write(body.toUtf8());
+	if (!f.commit()) {
+		pxv_err("Failed to write ready file: %s", path.toUtf8().data());
+	}
+}
+
 void usage()
 {
 	printf(
@@ -101,6 +122,9 @@ void usage()
 		"      --headless                  Run in headless mode (no GUI, MCP/WS API only)\n"
 		"      --port PORT                 MCP server port (default: 10110)\n"
 		"      --ws-port PORT              WebSocket server port (default: 10430)\n"
+		"      --config-dir DIR            Store settings and profiles in DIR\n"
+		"      --ready-file FILE           Write ports and startup timings to FILE once ready\n"
+		"      --compress-min-bytes N      Compress MCP responses of at least N bytes (0 = off, default: 1024)\n"
 		"\n", DS_BIN_NAME, DS_DESCRIPTION);
 }
 
@@ -125,6 +149,9 @@ int main(int argc, char *argv[])
 	bool bHeadless = false;
 	int mcpPort = 10110;
 	int wsPort = 10430;
+	long compressMinBytes = 1024;
+	const char *configDir = nullptr;
+	const char *readyFile = nullptr;
 
 	//----------------------rebuild command param
 #ifdef _WIN32
@@ -167,6 +194,9 @@ int main(int argc, char *argv[])
 		{"headless", no_argument, 0, 1000},
 		{"port", required_argument, 0, 1001},
 		{"ws-port", required_argument, 0, 1002},
+		{"config-dir", required_argument, 0, 1003},
+		{"ready-file", required_argument, 0, 1004},
+		{"compress-min-bytes", required_argument, 0, 1005},
 		{0, 0, 0, 0}
 		};
 
@@ -205,6 +235,22 @@ int main(int argc, char *argv[])
 			}
 			break;
 
+		case 1003: // settings / profile directory
+			configDir = optarg;
+			break;
+
+		case 1004: // readiness handshake file (headless)
+			readyFile = optarg;
+			break;
+
+		case 1005: // MCP response compression threshold
+			compressMinBytes = strtol(optarg, nullptr, 10);
+			if (compressMinBytes < 0) {
+				printf("Invalid compression threshold: %s\n", optarg);
+				return 1;
+			}
+			break;
+
 		case 'V': // version
 		case 'v':
 			printf("%s %s\n", DS_TITLE, DS_VERSION_STRING);
@@ -225,6 +271,10 @@ int main(int argc, char *argv[])
         open_file = argvFinal[argcFinal - 1];		
 	}
 
+	if (configDir != nullptr) {
+		SetConfigDirOverride(QString::fromUtf8(configDir));
+	}
+
 	//----------------------init app
 	//
 	// In headless mode we create a plain QCoreApplication (no GUI) so that
@@ -276,19 +326,28 @@ int main(int argc, char *argv[])
 		}
 
 		// init core
+		QElapsedTimer phase;
+		phase.start();
 		if (!control->Init()) {
 			pxv_err("init error!");
 			return 1;
 		}
+		qint64 initMs = phase.restart();
 
 		// Set custom API ports before starting services
 		control->set_api_ports(mcpPort, wsPort);
+		control->set_mcp_compress_min_bytes(static_cast<size_t>(compressMinBytes));
 
 		// Start API services
 		control->Start();
+		qint64 startMs = phase.elapsed();
 
 		pxv_info("Headless mode started. MCP port %d, WS port %d.", mcpPort, wsPort);
 
+		if (readyFile != nullptr) {
+			writeReadyFile(QString::fromUtf8(readyFile), mcpPort, wsPort, initMs, startMs);
+		}
+
 		ret = a.exec();
 
 		control->Stop();
@@ -406,6 +465,7 @@ int main(int argc, char *argv[])
 		pv::MainFrame w;
 		pxv_info("DBG: MainFrame constructed");
 		control->set_api_ports(mcpPort, wsPort);
+		control->set_mcp_compress_min_bytes(static_cast<size_t>(compressMinBytes));
 		control->Start();
 		pxv_info("DBG: control->Start() done");
 
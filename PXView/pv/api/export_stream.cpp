@@ -0,0 +1,88 @@
+// export_stream.cpp — Raw exports streamed back to the client
+//
+// Licensed under GPL v2 or (at your option) any later version.
+
+#include "pv/api/export_stream.h"
+
+#include <algorithm>
+
+namespace pv::api {
+
+ExportPipe::ExportPipe(size_t capacity)
+    : _capacity(capacity > 0 ? capacity : kExportPipeCapacity) {}
+
+void ExportPipe::finish(const std::string& error) {
+    std::lock_guard<std::mutex> lk(_mutex);
+    _finished = true;
+    _error = error;
+    _cv.notify_all();
+}
+
+void ExportPipe::set_abort_handler(std::function<void()> handler) {
+    std::lock_guard<std::mutex> lk(_mutex);
+    _abort_handler = std::move(handler);
+}
+
+std::vector<uint8_t> ExportPipe::take(size_t max_bytes,
+                                      std::chrono::milliseconds wait) {
+    std::unique_lock<std::mutex> lk(_mutex);
+    _cv.wait_for(lk, wait,
+                 [this] { return !_buf.empty() || _finished || _aborted; });
+    size_t n = std::min(max_bytes, _buf.size());
+    std::vector<uint8_t> out(_buf.begin(), _buf.begin() + n);
+    _buf.erase(_buf.begin(), _buf.begin() + n);
+    if (n > 0)
+        _cv.notify_all();  // room for a blocked writer
+    return out;
+}
+
+bool ExportPipe::drained() const {
+    std::lock_guard<std::mutex> lk(_mutex);
+    return _finished && _buf.empty();
+}
+
+std::string ExportPipe::error() const {
+    std::lock_guard<std::mutex> lk(_mutex);
+    return _error;
+}
+
+void ExportPipe::abort() {
+    std::lock_guard<std::mutex> lk(_mutex);
+    _aborted = true;
+    _buf.clear();
+    _buf.shrink_to_fit();
+    if (_abort_handler)
+        _abort_handler();
+    _cv.notify_all();
+}
+
+qint64 ExportPipe::readData(char* data, qint64 max_len) {
+    (void)data;
+    (void)max_len;
+    return -1;  // write-only device; the reader uses take()
+}
+
+qint64 ExportPipe::writeData(const char* data, qint64 len) {
+    const char* p = data;
+    size_t left = static_cast<size_t>(len);
+    std::unique_lock<std::mutex> lk(_mutex);
+    while (left > 0) {
+        _cv.wait(lk, [this] { return _aborted || _buf.size() < _capacity; });
+        if (_aborted)
+            return -1;
+        size_t n = std::min(left, _capacity - _buf.size());
+        _buf.insert(_buf.end(), p, p + n);
+        p += n;
+        left -= n;
+        _cv.notify_all();
+    }
+    return len;
+}
+
+void ExportStream::shutdown() {
+    pipe.abort();
+    if (worker.joinable())
+        worker.join();
+}
+
+} // namespace pv::api
@@ -0,0 +1,107 @@
+// export_stream.h — Raw exports streamed back to the client
+//
+// export_raw_data writes channel_N.<ext> files into a directory on the
+// instrument host.  A streamed export runs the same writer (the libsigrok
+// output module via StoreSession, or the binary writer) on a worker thread
+// but points it at an ExportPipe instead of a QFile; read_raw_export_stream
+// drains the pipe in chunks.  The client therefore receives exactly the
+// bytes the file would have held, without anything touching the host's
+// disk.
+//
+// The pipe is bounded: a client that reads slower than the export renders
+// blocks the worker instead of growing server memory.
+//
+// Licensed under GPL v2 or (at your option) any later version.
+
+#pragma once
+
+#include <QIODevice>
+
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <functional>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace pv::api {
+
+// Bytes buffered between the export worker and the reader.
+constexpr size_t kExportPipeCapacity = size_t(8) << 20;
+
+// Byte pipe between one writer thread (through the QIODevice interface,
+// so QTextStream / write() code written for QFile works unchanged) and one
+// reader.  Opened write-only by the writer; the reader uses take().
+class ExportPipe : public QIODevice {
+public:
+    explicit ExportPipe(size_t capacity = kExportPipeCapacity);
+
+    bool isSequential() const override { return true; }
+
+    // ---- writer side ----
+
+    // No more data: the reader sees end of stream once the buffer is
+    // drained, with `error` (empty on success) as the outcome.
+    void finish(const std::string& error = {});
+
+    // Called (under the pipe lock) when the reader aborts, so the writer
+    // can stop producing; cleared with nullptr before the target dies.
+    void set_abort_handler(std::function<void()> handler);
+
+    // ---- reader side ----
+
+    // Wait up to `wait` for data, then remove and return at most
+    // max_bytes.  Returns an empty vector on timeout or at the end.
+    std::vector<uint8_t> take(size_t max_bytes, std::chrono::milliseconds wait);
+
+    // True once finish() was called and every byte has been taken.
+    bool drained() const;
+
+    // Outcome passed to finish().
+    std::string error() const;
+
+    // The reader is gone: pending and future writes fail immediately.
+    void abort();
+
+protected:
+    qint64 readData(char* data, qint64 max_len) override;
+    qint64 writeData(const char* data, qint64 len) override;
+
+private:
+    const size_t _capacity;
+    mutable std::mutex _mutex;
+    std::condition_variable _cv;
+    std::vector<uint8_t> _buf;
+    bool _finished = false;
+    bool _aborted = false;
+    std::string _error;
+    std::function<void()> _abort_handler;
+};
+
+// One open stream in SessionService.  `offset` counts the bytes handed to
+// the client; the previous chunk is kept so a read retried at its offset
+// (e.g. after a lost response or an expired blob) gets the same bytes.
+struct ExportStream {
+    std::string id;
+    std::string file_name;
+    ExportPipe pipe;
+    std::thread worker;
+
+    std::mutex read_mutex;              // serializes reads of this stream
+    uint64_t offset = 0;
+    uint64_t last_offset = 0;
+    std::vector<uint8_t> last;
+    bool last_eof = false;
+
+    // Guarded by SessionService::_export_streams_mutex.
+    std::chrono::steady_clock::time_point last_used =
+        std::chrono::steady_clock::now();
+
+    // Abort the pipe and wait for the worker to exit.
+    void shutdown();
+};
+
+} // namespace pv::api
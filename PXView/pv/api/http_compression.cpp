@@ -0,0 +1,118 @@
+// http_compression.cpp — Content-Encoding negotiation for MCP HTTP responses
+//
+// Licensed under GPL v2 or (at your option) any later version.
+
+#include "pv/api/http_compression.h"
+
+#include <cctype>
+#include <cstdlib>
+#include <zlib.h>
+
+namespace pv::api {
+
+namespace {
+
+std::string_view trim(std::string_view s) {
+    while (!s.empty() && std::isspace(static_cast<unsigned char>(s.front())))
+        s.remove_prefix(1);
+    while (!s.empty() && std::isspace(static_cast<unsigned char>(s.back())))
+        s.remove_suffix(1);
+    return s;
+}
+
+bool iequals(std::string_view a, std::string_view b) {
+    if (a.size() != b.size())
+        return false;
+    for (size_t i = 0; i < a.size(); ++i) {
+        if (std::tolower(static_cast<unsigned char>(a[i])) !=
+            std::tolower(static_cast<unsigned char>(b[i])))
+            return false;
+    }
+    return true;
+}
+
+// q-value of one "coding;q=0.5" entry (1.0 when absent).
+double entry_quality(std::string_view params) {
+    while (!params.empty()) {
+        auto semi = params.find(';');
+        auto param = trim(params.substr(0, semi));
+        params = semi == std::string_view::npos ? std::string_view{}
+                                                : params.substr(semi + 1);
+        if (param.size() > 2 && (param[0] == 'q' || param[0] == 'Q') &&
+            param[1] == '=')
+            return std::strtod(std::string(param.substr(2)).c_str(), nullptr);
+    }
+    return 1.0;
+}
+
+} // anonymous namespace
+
+ContentEncoding negotiate_content_encoding(std::string_view accept_encoding) {
+    double gzip_q = 0.0, deflate_q = 0.0, any_q = -1.0;
+    bool gzip_seen = false, deflate_seen = false;
+    while (!accept_encoding.empty()) {
+        auto comma = accept_encoding.find(',');
+        auto entry = accept_encoding.substr(0, comma);
+        accept_encoding = comma == std::string_view::npos
+                              ? std::string_view{}
+                              : accept_encoding.substr(comma + 1);
+        auto semi = entry.find(';');
+        auto coding = trim(entry.substr(0, semi));
+        double q = semi == std::string_view::npos
+                       ? 1.0 : entry_quality(entry.substr(semi + 1));
+        if (iequals(coding, "gzip") || iequals(coding, "x-gzip")) {
+            gzip_q = q;
+            gzip_seen = true;
+        } else if (iequals(coding, "deflate")) {
+            deflate_q = q;
+            deflate_seen = true;
+        } else if (coding == "*") {
+            any_q = q;
+        }
+    }
+    if (!gzip_seen && any_q >= 0)
+        gzip_q = any_q;
+    if (!deflate_seen && any_q >= 0)
+        deflate_q = any_q;
+    if (gzip_q > 0 && gzip_q >= deflate_q)
+        return ContentEncoding::Gzip;
+    if (deflate_q > 0)
+        return ContentEncoding::Deflate;
+    return ContentEncoding::Identity;
+}
+
+const char* content_encoding_name(ContentEncoding enc) {
+    switch (enc) {
+    case ContentEncoding::Gzip:    return "gzip";
+    case ContentEncoding::Deflate: return "deflate";
+    default:                       return nullptr;
+    }
+}
+
+bool compress_body(std::string_view in, ContentEncoding enc,
+                   std::string& out, int level) {
+    if (enc == ContentEncoding::Identity)
+        return false;
+    z_stream zs{};
+    // windowBits 15 = zlib wrapper (HTTP "deflate"); +16 = gzip wrapper.
+    int window_bits = enc == ContentEncoding::Gzip ? 15 + 16 : 15;
+    if (deflateInit2(&zs, level, Z_DEFLATED, window_bits, 8,
+                     Z_DEFAULT_STRATEGY) != Z_OK)
+        return false;
+
+    std::string buf(deflateBound(&zs, static_cast<uLong>(in.size())) + 32, '\0');
+    zs.next_in = reinterpret_cast<Bytef*>(const_cast<char*>(in.data()));
+    zs.avail_in = static_cast<uInt>(in.size());
+    zs.next_out = reinterpret_cast<Bytef*>(buf.data());
+    zs.avail_out = static_cast<uInt>(buf.size());
+    int rc = deflate(&zs, Z_FINISH);
+    size_t produced = zs.total_out;
+    deflateEnd(&zs);
+    if (rc != Z_STREAM_END)
+        return false;
+    buf.resize(produced);
+    out = std::move(buf);
+    return true;
+}
+
+} // namespace pv::api
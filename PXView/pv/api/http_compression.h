@@ -0,0 +1,39 @@
+// http_compression.h — Content-Encoding negotiation for MCP HTTP responses
+//
+// Large JSON tool results (analog sample arrays, annotation lists, device
+// lists) compress 5-20x, which matters when PXView is reached over a VPN.
+// McpTransport compresses a response body when the request's
+// Accept-Encoding allows gzip or deflate and the body is at least the
+// configured threshold (--compress-min-bytes, 0 = never).
+//
+// "deflate" is the zlib-wrapped stream (RFC 9110), not raw deflate.
+//
+// Licensed under GPL v2 or (at your option) any later version.
+
+#pragma once
+
+#include <cstddef>
+#include <string>
+#include <string_view>
+
+namespace pv::api {
+
+enum class ContentEncoding { Identity, Gzip, Deflate };
+
+// Bodies smaller than this are sent as-is by default; below ~1 KiB the
+// gzip header and the compression time outweigh the saved bytes.
+constexpr size_t kDefaultCompressMinBytes = 1024;
+
+// Pick the encoding for an Accept-Encoding header value: gzip preferred
+// over deflate, entries with q=0 refused, anything else → Identity.
+ContentEncoding negotiate_content_encoding(std::string_view accept_encoding);
+
+// Header token for enc ("gzip" / "deflate"), or nullptr for Identity.
+const char* content_encoding_name(ContentEncoding enc);
+
+// Compress in with zlib. Returns false (out untouched) on Identity or a
+// zlib failure.
+bool compress_body(std::string_view in, ContentEncoding enc,
+                   std::string& out, int level = 6);
+
+} // namespace pv::api
@@ -127,6 +127,9 @@ public:
     virtual std::vector<ChannelInfo> get_channels() const = 0;
     virtual Result<void> set_channel_enabled(int16_t index, bool enabled) = 0;
     virtual Result<void> set_channel_name(int16_t index, const std::string& name) = 0;
+    // Apply all updates or none, with one ChannelConfigChanged event and
+    // one device config-changed notification for the whole batch.
+    virtual Result<void> configure_channels(const std::vector<ChannelUpdate>& updates) = 0;
     virtual uint16_t get_channel_count(ChannelType type) const = 0;
 
     // 5. Sample config
@@ -225,12 +228,24 @@ public:
         const std::string& decoder_id) = 0;
 
     // 13. Decoder results
+    // ann_classes: only annotations of these ann_class values (empty = all).
     virtual Result<std::vector<DecoderAnnotation>> get_decoder_annotations(
         const std::string& instance_id,
         uint64_t start_sample = 0,
         uint64_t end_sample = UINT64_MAX,
         int max_count = 1000,
-        std::optional<int> ann_class = std::nullopt) = 0;
+        const std::vector<int>& ann_classes = {}) = 0;
+    // Annotations appended since since_version (0 = from the beginning), for
+    // clients following a stream / repeat capture. The returned version is
+    // monotonically increasing per instance; an unknown or stale version
+    // (e.g. the capture restarted) yields everything with reset = true.
+    virtual Result<DecoderAnnotationDelta> get_decoder_annotations_since(
+        const std::string& instance_id,
+        uint64_t since_version,
+        uint64_t start_sample = 0,
+        uint64_t end_sample = UINT64_MAX,
+        int max_count = 1000,
+        const std::vector<int>& ann_classes = {}) = 0;
     // Read a decoder's binary output stream. output_id selects which binary
     // output class to read (matches srd_decoder_binary::bin_class).
     virtual Result<std::vector<uint8_t>> get_decoder_binary_output(
@@ -291,6 +306,21 @@ public:
         int analog_downsample_ratio = 1,
         bool iso8601_timestamp = false) = 0;
 
+    // 18c. Streamed raw export: the bytes export_raw_data writes for one
+    // channel, read back in chunks instead of written to a directory.
+    virtual Result<RawExportStreamInfo> open_raw_export_stream(
+        const std::string& format,
+        int32_t channel,
+        bool analog = false,
+        int analog_downsample_ratio = 1,
+        bool iso8601_timestamp = false) = 0;
+    virtual Result<RawExportChunk> read_raw_export_stream(
+        const std::string& stream_id,
+        uint64_t offset,
+        size_t max_bytes,
+        int wait_ms) = 0;
+    virtual Result<void> close_raw_export_stream(const std::string& stream_id) = 0;
+
     // 19. View control
     virtual Result<void> show_region(uint64_t start_sample, uint64_t end_sample) = 0;
     virtual Result<void> zoom_fit() = 0;
@@ -4,12 +4,14 @@
 
 #include "pv/core/eventbus.h"
 #include "pv/core/qt_async_dispatcher.h"
+#include "pv/mcp/mcp_blob_store.h"
 #include <QCoreApplication>
 #include <QFile>
 #include <QFileInfo>
 #include <QThread>
 #include <atomic>
 #include <chrono>
+#include <cstring>
 #include <thread>
 
 using json = nlohmann::json;
@@ -391,6 +393,20 @@ void McpTransport::handle_http_request(QTcpSocket* socket, const QByteArray& dat
     if (http_method == "GET") {
         QByteArray path = parts[1].trimmed();
 
+        // Out-of-band tool results (get_samples blobMinBytes)
+        if (path.startsWith(mcp::kBlobPathPrefix)) {
+            QByteArray range;
+            for (int i = 1; i < request_lines.size(); ++i) {
+                QByteArray line = request_lines[i].trimmed();
+                if (line.toLower().startsWith("range:"))
+                    range = line.mid(6).trimmed();
+            }
+            send_blob_response(socket,
+                path.mid(int(std::strlen(mcp::kBlobPathPrefix))).toStdString(),
+                range.toStdString());
+            return;
+        }
+
         // Default to index.html for root path
         if (path == "/")
             path = "/index.html";
@@ -444,11 +460,14 @@ void McpTransport::handle_http_request(QTcpSocket* socket, const QByteArray& dat
 
     // Read Content-Length (already validated by try_handle_request, but parse for reference)
     int content_length = -1;
+    ContentEncoding encoding = ContentEncoding::Identity;
     for (int i = 1; i < request_lines.size(); ++i) {
         QByteArray line = request_lines[i].trimmed();
         if (line.startsWith("Content-Length:") || line.startsWith("content-length:")) {
             QByteArray value = line.mid(15).trimmed();
             content_length = value.toInt();
+        } else if (line.toLower().startsWith("accept-encoding:")) {
+            encoding = negotiate_content_encoding(line.mid(16).trimmed().toStdString());
         }
     }
     (void)content_length;
@@ -503,6 +522,8 @@ void McpTransport::handle_http_request(QTcpSocket* socket, const QByteArray& dat
                 req.mcp_tool_args = p["arguments"].dump();
             else
                 req.mcp_tool_args = "{}";
+            if (p.contains("_meta") && p["_meta"].is_object())
+                req.mcp_structured_only = p["_meta"].value("pxview/structuredOnly", false);
         }
         req.params_json = req.mcp_tool_args;
 
@@ -544,24 +565,29 @@ void McpTransport::handle_http_request(QTcpSocket* socket, const QByteArray& dat
         // while the worker is processing this request.
         disconnect(socket, &QTcpSocket::readyRead, this, &McpTransport::on_ready_read);
 
-        _worker_pool->submit([this, req, socket_guard]() {
-            // Phase 2: Business logic + response building (worker thread)
+        _worker_pool->submit([this, req, socket_guard, encoding]() {
+            // Phase 2: Business logic + response building (worker thread),
+            // including compression so the IO thread only writes bytes.
             JsonRpcResponse resp = _handler->handle_request(req);
             QByteArray resp_body = build_mcp_response_body(resp, req);
+            const char* content_encoding = compress_response(resp_body, encoding);
 
             // Phase 3: Post response back to IO thread for socket write
-            post_to_self([this, resp_body, socket_guard]() {
+            post_to_self([this, resp_body, socket_guard, content_encoding]() {
                 auto* s = socket_guard.data();
                 if (!s)
                     return; // socket was deleted while worker ran
-                send_http_response(s, 200, resp_body);
+                send_http_response(s, 200, resp_body, "application/json",
+                                   content_encoding);
             });
         });
     } else {
         // Fallback: synchronous on main thread (worker pool not initialized)
         JsonRpcResponse resp = _handler->handle_request(req);
         QByteArray resp_body = build_mcp_response_body(resp, req);
-        send_http_response(socket, 200, resp_body);
+        const char* content_encoding = compress_response(resp_body, encoding);
+        send_http_response(socket, 200, resp_body, "application/json",
+                           content_encoding);
     }
 }
 
@@ -734,10 +760,18 @@ QByteArray McpTransport::build_mcp_response_body(const JsonRpcResponse& resp,
     resp_json["id"] = req.id;
 
     if (resp.is_mcp_direct) {
-        if (!resp.result_json.empty()) {
-            resp_json["result"] = json::parse(resp.result_json);
-        } else {
+        if (resp.result_json.empty()) {
             resp_json["result"] = nullptr;
+        } else {
+            // result_json is already serialized (without its text copy when
+            // the request was structuredOnly): splice it into the envelope
+            // instead of parsing and re-dumping the whole payload.
+            QByteArray out = "{\"id\":";
+            out.append(QByteArray::fromStdString(json(req.id).dump()));
+            out.append(",\"jsonrpc\":\"2.0\",\"result\":");
+            out.append(QByteArray::fromStdString(resp.result_json));
+            out.append('}');
+            return out;
         }
     } else if (resp.is_mcp_error) {
         if (!resp.error_json.empty()) {
@@ -775,9 +809,26 @@ QByteArray McpTransport::build_mcp_response_body(const JsonRpcResponse& resp,
     return QByteArray::fromStdString(resp_json.dump());
 }
 
+const char* McpTransport::compress_response(QByteArray& body,
+                                            ContentEncoding enc) const
+{
+    size_t min_bytes = _compress_min_bytes;
+    if (enc == ContentEncoding::Identity || min_bytes == 0 ||
+        static_cast<size_t>(body.size()) < min_bytes)
+        return nullptr;
+    std::string packed;
+    if (!compress_body(std::string_view(body.constData(), size_t(body.size())),
+                       enc, packed) ||
+        packed.size() >= static_cast<size_t>(body.size()))
+        return nullptr;
+    body = QByteArray(packed.data(), qsizetype(packed.size()));
+    return content_encoding_name(enc);
+}
+
 void McpTransport::send_http_response(QTcpSocket* socket, int status,
                                        const QByteArray& body,
-                                       const char* content_type)
+                                       const char* content_type,
+                                       const char* content_encoding)
 {
     const char* status_text = "OK";
     switch (status) {
@@ -796,6 +847,10 @@ void McpTransport::send_http_response(QTcpSocket* socket, int status,
     response.append("Access-Control-Allow-Origin: *\r\n");
     response.append("Access-Control-Allow-Methods: POST, GET, OPTIONS\r\n");
     response.append("Access-Control-Allow-Headers: Content-Type\r\n");
+    if (content_encoding) {
+        response.append("Content-Encoding: " + QByteArray(content_encoding) + "\r\n");
+        response.append("Vary: Accept-Encoding\r\n");
+    }
     response.append("Content-Length: " + QByteArray::number(body.size()) + "\r\n");
     response.append("Connection: close\r\n");
     response.append("\r\n");
@@ -811,6 +866,64 @@ void McpTransport::send_http_response(QTcpSocket* socket, int status,
     socket->disconnectFromHost();
 }
 
+void McpTransport::send_blob_response(QTcpSocket* socket, const std::string& id,
+                                      const std::string& range)
+{
+    std::string content_type;
+    auto blob = mcp::BlobStore::instance().get(id, &content_type);
+    if (!blob) {
+        send_http_response(socket, 404, "Blob not found or expired", "text/plain");
+        return;
+    }
+
+    const size_t size = blob->size();
+    size_t first = 0;
+    size_t last = size ? size - 1 : 0;
+    bool partial = false;
+    if (!range.empty()) {
+        if (!mcp::parse_byte_range(range, size, first, last)) {
+            QByteArray response;
+            response.append("HTTP/1.1 416 Range Not Satisfiable\r\n");
+            response.append("Content-Range: bytes */" + QByteArray::number(qulonglong(size)) + "\r\n");
+            response.append("Content-Length: 0\r\n");
+            response.append("Connection: close\r\n");
+            response.append("\r\n");
+            socket->write(response);
+            socket->flush();
+            socket->disconnectFromHost();
+            return;
+        }
+        partial = true;
+    }
+    const size_t length = size ? last - first + 1 : 0;
+
+    QByteArray header;
+    header.append(partial ? "HTTP/1.1 206 Partial Content\r\n" : "HTTP/1.1 200 OK\r\n");
+    header.append("Content-Type: " + QByteArray::fromStdString(content_type) + "\r\n");
+    header.append("Access-Control-Allow-Origin: *\r\n");
+    header.append("Accept-Ranges: bytes\r\n");
+    header.append("Cache-Control: no-store\r\n");
+    if (partial) {
+        header.append("Content-Range: bytes " + QByteArray::number(qulonglong(first)) + "-"
+                      + QByteArray::number(qulonglong(last)) + "/"
+                      + QByteArray::number(qulonglong(size)) + "\r\n");
+    }
+    header.append("Content-Length: " + QByteArray::number(qulonglong(length)) + "\r\n");
+    header.append("Connection: close\r\n");
+    header.append("\r\n");
+    socket->write(header);
+    // Write the payload straight from the shared buffer: no base64, no
+    // JSON string and no intermediate copy of the whole blob.
+    if (length)
+        socket->write(reinterpret_cast<const char*>(blob->data()) + first, qint64(length));
+    socket->flush();
+
+    if (socket->state() == QAbstractSocket::ConnectedState) {
+        socket->waitForBytesWritten(30000);
+    }
+    socket->disconnectFromHost();
+}
+
 void McpTransport::send_http_204(QTcpSocket* socket)
 {
     QByteArray response;
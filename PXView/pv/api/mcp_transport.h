@@ -1,5 +1,6 @@
 #pragma once
 
+#include "pv/api/http_compression.h"
 #include "pv/api/transport.h"
 #include "pv/core/qt_async_dispatcher.h"
 #include "pv/core/thread_pool.h"
@@ -9,9 +10,11 @@
 #include <QTcpServer>
 #include <QTcpSocket>
 #include <QSet>
+#include <atomic>
 #include <map>
 #include <memory>
 #include <mutex>
+#include <string>
 
 namespace pv::api {
 
@@ -27,6 +30,11 @@ public:
 
     int get_port() const { return _port; }
 
+    // Compress POST responses of at least min_bytes when the client's
+    // Accept-Encoding allows gzip / deflate; 0 disables compression.
+    void set_compression_min_bytes(size_t min_bytes) { _compress_min_bytes = min_bytes; }
+    size_t compression_min_bytes() const { return _compress_min_bytes; }
+
     // IServiceEventListener - push service events to MCP clients (via the
     // active SSE streams opened by wait_capture, or as JSON-RPC notifications).
     void on_service_event(const ServiceEventData& data) override;
@@ -56,6 +64,7 @@ private:
     int _port;
     QTcpServer* _server = nullptr;
     QSet<QTcpSocket*> _pending_sockets;
+    std::atomic<size_t> _compress_min_bytes{kDefaultCompressMinBytes};
 
     // Sockets currently holding an open SSE stream (e.g. wait_capture in
     // progress). Service events are pushed to these so MCP clients receive
@@ -66,8 +75,16 @@ private:
     void try_handle_request(QTcpSocket* socket);
     void handle_http_request(QTcpSocket* socket, const QByteArray& data);
     void send_http_response(QTcpSocket* socket, int status, const QByteArray& body,
-                            const char* content_type = "application/json");
+                            const char* content_type = "application/json",
+                            const char* content_encoding = nullptr);
+    // Compress body in place if enc and the size threshold allow it and it
+    // actually shrinks; returns the Content-Encoding token or nullptr.
+    const char* compress_response(QByteArray& body, ContentEncoding enc) const;
     void send_http_204(QTcpSocket* socket);
+    // GET /mcp/blob/<id>: raw blob bytes with Content-Length, optional
+    // single "Range: bytes=..." (206 / 416) and 404 once expired.
+    void send_blob_response(QTcpSocket* socket, const std::string& id,
+                            const std::string& range);
     void handle_sse_wait_capture(QPointer<QTcpSocket> socket_guard, const JsonRpcRequest& req);
 
     // Build the MCP JSON-RPC response body from a JsonRpcResponse.
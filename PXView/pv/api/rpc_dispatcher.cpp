@@ -379,11 +379,12 @@ JsonRpcResponse RpcDispatcher::on_ping(int id) {
 // handle_tools_call().  Old tool names are NOT retained — callers must
 // use the new consolidated names.
 
-JsonRpcResponse RpcDispatcher::dispatch_mcp_tool(int id, const std::string& tool_name, const json& args) {
+JsonRpcResponse RpcDispatcher::dispatch_mcp_tool(int id, const std::string& tool_name, const json& args,
+                                                 bool structured_only) {
     // Check if the tool is registered in the SDK
     if (mcp_server_->find_tool(tool_name)) {
         // Delegate to MCP SDK — exception-driven dispatch
-        json result = mcp_server_->handle_tools_call(tool_name, args);
+        json result = mcp_server_->handle_tools_call(tool_name, args, structured_only);
 
         JsonRpcResponse resp;
         resp.id = id;
@@ -431,7 +432,7 @@ JsonRpcResponse RpcDispatcher::handle_request(const JsonRpcRequest& req) {
                     return resp;
                 }
             }
-            return dispatch_mcp_tool(req.id, req.mcp_tool_name, args);
+            return dispatch_mcp_tool(req.id, req.mcp_tool_name, args, req.mcp_structured_only);
         }
         if (req.method == "ping")          return on_ping(req.id);
         if (req.method.rfind("notifications/", 0) == 0) {
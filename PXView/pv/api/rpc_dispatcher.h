@@ -76,7 +76,8 @@ private:
 
     // ---- MCP tool call handlers (mapped from MCP tool names) ----
     // These dispatch to the internal on_* handlers below
-    JsonRpcResponse dispatch_mcp_tool(int id, const std::string& tool_name, const nlohmann::json& args);
+    JsonRpcResponse dispatch_mcp_tool(int id, const std::string& tool_name, const nlohmann::json& args,
+                                      bool structured_only = false);
 
 };
 
@@ -65,6 +65,7 @@
 #include <cstring>
 #include <condition_variable>
 #include <functional>
+#include <set>
 
 // Headless-mode ISessionDataGetter implementation.
 // In GUI mode, MainWindow provides genSessionData() which serializes the full
@@ -440,6 +441,64 @@ inline std::shared_ptr<pv::data::DecoderStack> find_stack_by_instance_id(
     return nullptr;
 }
 
+// Each decoder row is homogeneous in ann class: peek the first annotation's
+// type to decide whether the row holds one of ann_classes (empty = all).
+inline bool row_matches_classes(pv::data::DecoderStack &stack, int row,
+                                const std::vector<int> &ann_classes) {
+    if (ann_classes.empty())
+        return true;
+    pv::data::decode::Annotation probe;
+    if (!stack.list_annotation(&probe, static_cast<uint16_t>(row), 0))
+        return false;
+    return std::find(ann_classes.begin(), ann_classes.end(),
+                     static_cast<int>(probe.type())) != ann_classes.end();
+}
+
+// Indices of the logic channels in device channel order: the layout of
+// FilterProcessor's per-channel signal invert states.
+inline std::vector<int32_t> logic_channel_indices(const GSList *channels) {
+    std::vector<int32_t> out;
+    for (const GSList *l = channels; l; l = l->next) {
+        auto *ch = static_cast<const sr_channel *>(l->data);
+        if (ch && ch->type == SR_CHANNEL_LOGIC)
+            out.push_back(static_cast<int32_t>(ch->index));
+    }
+    return out;
+}
+
+// Append the annotations of one row, from column first_col up to ann_count,
+// that overlap [start_sample, end_sample] until out holds max_count entries.
+// Returns the first column not examined.
+inline uint64_t read_row_annotations(pv::data::DecoderStack &stack, int row,
+                                     uint64_t first_col, uint64_t ann_count,
+                                     uint64_t start_sample, uint64_t end_sample,
+                                     size_t max_count,
+                                     std::vector<DecoderAnnotation> &out) {
+    uint64_t col = first_col;
+    for (; col < ann_count && out.size() < max_count; col++) {
+        pv::data::decode::Annotation ann;
+        if (!stack.list_annotation(&ann, static_cast<uint16_t>(row), col))
+            continue;
+
+        if (ann.start_sample() > end_sample || ann.end_sample() < start_sample)
+            continue;
+
+        DecoderAnnotation da;
+        da.start_sample = ann.start_sample();
+        da.end_sample = ann.end_sample();
+        da.ann_class = ann.type();
+        da.numeric = ann.is_numberic();
+
+        const auto &texts = ann.annotations();
+        da.texts.reserve(texts.size());
+        for (const auto &text : texts)
+            da.texts.push_back(text.toStdString());
+
+        out.push_back(std::move(da));
+    }
+    return col;
+}
+
 // ---------------------------------------------------------------------------
 // PreparedDecoder — data prepared by phase 1 (worker-safe), consumed by
 // phase 2 (main thread).  Owns GVariant references.
@@ -533,12 +592,13 @@ _event_subscriptions.push_back(bus->subscribe<pv::interface::SignalInvertStarted
 _event_subscriptions.push_back(bus->subscribe<pv::interface::SignalInvertCompleted>([self](const auto &) { self->broadcast_event(ServiceEvent::SignalInvertCompleted); self->dispatch_notification("SignalInvertCompleted", "signal_invert", nlohmann::json(nullptr)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::SignalInvertCleared>([self](const auto &) { self->broadcast_event(ServiceEvent::SignalInvertCleared); self->dispatch_notification("SignalInvertCleared", "signal_invert", nlohmann::json(nullptr)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::CopyToDocDone>([self](const auto &) { self->broadcast_event(ServiceEvent::DataUpdated, {{"detail", "copy_to_doc_done"}}); self->dispatch_notification("DataUpdated", "data_updated", nlohmann::json(nullptr)); }));
-_event_subscriptions.push_back(bus->subscribe<pv::interface::SampleCountUpdated>([self](const auto &ev) { self->broadcast_event(ServiceEvent::DataUpdated, {{"detail", "sample_count_updated"}}); self->dispatch_notification("DataUpdated", "data_updated", nlohmann::json(ev)); }));
+_event_subscriptions.push_back(bus->subscribe<pv::interface::SampleCountUpdated>([self](const auto &ev) { self->broadcast_event(ServiceEvent::DataUpdated, {{"detail", "sample_count_updated"}, {"sample_count", std::to_string(ev.sample_count)}}); self->dispatch_notification("DataUpdated", "data_updated", nlohmann::json(ev)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::ActiveDocumentChanged>([self](const auto &) { self->broadcast_event(ServiceEvent::ChannelConfigChanged, {{"change", "active_document"}}); self->dispatch_notification("ChannelConfigChanged", "channel_config", nlohmann::json(nullptr)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::CopyInProgressChanged>([self](const auto &ev) { self->broadcast_event(ServiceEvent::CaptureStateChanged, {{"change", "copy_in_progress"}}); self->dispatch_notification("CaptureStateChanged", "capture_state", nlohmann::json(ev)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::CaptureOwnerChanged>([self](const auto &ev) { self->broadcast_event(ServiceEvent::CaptureStateChanged, {{"change", "capture_owner"}, {"is_working", ev.new_owner_index != SIZE_MAX ? "true" : "false"}}); self->dispatch_notification("CaptureStateChanged", "capture_state", nlohmann::json(nullptr)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::TrigNextCollect>([self](const auto &) { self->broadcast_event(ServiceEvent::TriggerReceived, {{"detail", "next_collect"}}); self->dispatch_notification("TriggerReceived", "trigger", nlohmann::json(nullptr)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::SaveComplete>([self](const auto &) { self->broadcast_event(ServiceEvent::SaveComplete); self->dispatch_notification("SaveComplete", "file_op", nlohmann::json(nullptr)); }));
+_event_subscriptions.push_back(bus->subscribe<pv::interface::DecoderStackDone>([self](const auto &ev) { self->broadcast_event(ServiceEvent::DecodeDone, {{"instance_id", std::to_string(ev.handle_id) + ":" + std::to_string(ev.version)}}); self->dispatch_notification("DecodeDone", "decode", nlohmann::json(ev)); }));
 _event_subscriptions.push_back(bus->subscribe<pv::interface::ClearDecodeData>([self](const auto &) { self->broadcast_event(ServiceEvent::DecodeDone, {{"detail", "clear_decode_data"}}); self->dispatch_notification("DecodeDone", "decode", nlohmann::json(nullptr)); }));
 }
 }
@@ -548,6 +608,8 @@ SessionService::~SessionService() {
     // tasks finish before we start destroying SessionService state.
     if (_api_worker_pool)
         _api_worker_pool->shutdown();
+    // Streamed exports run on their own threads and use _session.
+    shutdown_export_streams();
     // Subscriptions auto-unsubscribe via RAII.
     // phase 2: release the MCP-dedicated document slot. Ownership is held by
     // DocumentRegistry, so release_document() frees the document (marked
@@ -846,6 +908,8 @@ void SessionService::configure_capture_timing(
 // ===========================================================================
 
 Result<void> SessionService::start_capture(bool instant) {
+    // Streamed exports read the snapshot this capture replaces.
+    shutdown_export_streams();
     auto fn = [this, instant]() -> Result<void> {
         if (!_session)
             return Result<void>::Fail(ErrorCode::InternalError,
@@ -1181,6 +1245,7 @@ int SessionService::get_current_capture_id() const {
 }
 
 Result<void> SessionService::close_capture() {
+    shutdown_export_streams();
     auto fn = [this]() -> Result<void> {
         if (!_session)
             return Result<void>::Fail(ErrorCode::InternalError,
@@ -1411,6 +1476,59 @@ Result<void> SessionService::set_channel_name(int16_t index,
     return run_void_on_main_thread(fn);
 }
 
+Result<void> SessionService::configure_channels(
+    const std::vector<ChannelUpdate> &updates) {
+    auto fn = [this, updates]() -> Result<void> {
+        if (!_device || !_device->have_instance())
+            return Result<void>::Fail(ErrorCode::MissingDevice,
+                                      "No device connected");
+
+        // Validate every entry before touching the device, so a bad
+        // index leaves the configuration unchanged.
+        std::map<int, bool> was_enabled;
+        for (GSList *l = _device->get_channels(); l; l = l->next) {
+            auto *ch = static_cast<sr_channel *>(l->data);
+            if (ch)
+                was_enabled[ch->index] = ch->enabled;
+        }
+        std::set<int> seen;
+        std::vector<std::pair<int, bool>> enable;
+        std::vector<std::pair<int, bool>> restore;
+        for (const auto &u : updates) {
+            auto it = was_enabled.find(u.index);
+            if (it == was_enabled.end())
+                return Result<void>::Fail(ErrorCode::ChannelNotFound,
+                    "Channel " + std::to_string(u.index) + " not found");
+            if (!seen.insert(u.index).second)
+                return Result<void>::Fail(ErrorCode::ConfigInvalid,
+                    "Channel " + std::to_string(u.index) + " listed more than once");
+            if (u.enabled && *u.enabled != it->second) {
+                enable.emplace_back(u.index, *u.enabled);
+                restore.emplace_back(u.index, it->second);
+            }
+        }
+
+        if (!enable.empty() && !_device->enable_probes(enable)) {
+            _device->enable_probes(restore);
+            return Result<void>::Fail(ErrorCode::ChannelNotFound,
+                                      "Failed to enable/disable channels");
+        }
+        for (const auto &u : updates) {
+            if (u.name && !_device->set_channel_name(u.index, u.name->c_str())) {
+                if (!restore.empty())
+                    _device->enable_probes(restore);
+                return Result<void>::Fail(ErrorCode::ChannelNotFound,
+                                          "Failed to set channel name");
+            }
+        }
+        broadcast_event(ServiceEvent::ChannelConfigChanged,
+                        {{"field", "channels"},
+                         {"count", std::to_string(updates.size())}});
+        return Result<void>::Success();
+    };
+    return run_void_on_main_thread(fn);
+}
+
 uint16_t SessionService::get_channel_count(ChannelType type) const {
     auto fn = [this, type]() -> uint16_t {
         if (!_session)
@@ -3205,6 +3323,7 @@ Result<void> SessionService::remove_decoder(const std::string &instance_id) {
 
             if (make_instance_id(stack.get()) == instance_id) {
                 _session->remove_decoder(static_cast<int>(i), api_document());
+                _ann_journals.erase(instance_id);
                 // Mirror clear_all_decoders: refresh the ProtocolDock so no
                 // layer outlives its DecoderStack (belt-and-suspenders with
                 // the QPointer in ProtocolItemLayer).
@@ -3256,6 +3375,7 @@ Result<void> SessionService::clear_all_decoders() {
         size_t count = stacks.size();
         for (size_t i = count; i-- > 0;)
             _session->remove_decoder(static_cast<int>(i), api_document());
+        _ann_journals.clear();
         // Rebuild the protocol dock UI to remove stale layer items
         _session->rebuild_decoder_pannel();
 
@@ -3277,8 +3397,8 @@ Result<void> SessionService::clear_all_decoders() {
 
 Result<std::vector<DecoderAnnotation>> SessionService::get_decoder_annotations(
     const std::string &instance_id, uint64_t start_sample,
-    uint64_t end_sample, int max_count, std::optional<int> ann_class) {
-    auto fn = [this, instance_id, start_sample, end_sample, max_count, ann_class]() -> Result<std::vector<DecoderAnnotation>> {
+    uint64_t end_sample, int max_count, const std::vector<int> &ann_classes) {
+    auto fn = [this, instance_id, start_sample, end_sample, max_count, ann_classes]() -> Result<std::vector<DecoderAnnotation>> {
     if (!_session)
         return Result<std::vector<DecoderAnnotation>>::Fail(
             ErrorCode::InternalError, "Session is nullptr");
@@ -3341,41 +3461,18 @@ Result<std::vector<DecoderAnnotation>> SessionService::get_decoder_annotations(
                  row, (unsigned long long)ann_count);
 
         // Row/class filter: each decoder row is homogeneous in ann class, so
-        // peek the first annotation's type and skip the whole row when it does
-        // not match the requested ann_class. This lets callers read a later
+        // peek the first annotation's type and skip the whole row when it is
+        // not one of the requested ann_classes. This lets callers read a later
         // row (e.g. increment/count/interval) whose annotations would otherwise
         // be starved by the row-major max_count cutoff when an early row (e.g.
         // millions of 'phase' annotations) overflows max_count first.
-        if (ann_class.has_value() && ann_count > 0) {
-            decode::Annotation probe;
-            if (!decoder_stack->list_annotation(&probe,
-                    static_cast<uint16_t>(row), 0))
-                continue;
-            if (static_cast<int>(probe.type()) != ann_class.value())
-                continue;
-        }
-
-        for (uint64_t col = 0; col < ann_count && result.size() < static_cast<size_t>(max_count); col++) {
-            decode::Annotation ann;
-            if (!decoder_stack->list_annotation(&ann,
-                    static_cast<uint16_t>(row), col))
-                continue;
-
-            if (ann.start_sample() > end_sample || ann.end_sample() < start_sample)
-                continue;
-
-            DecoderAnnotation da;
-            da.start_sample = ann.start_sample();
-            da.end_sample = ann.end_sample();
-            da.ann_class = ann.type();
-
-            const auto &texts = ann.annotations();
-            da.texts.reserve(texts.size());
-            for (const auto &text : texts)
-                da.texts.push_back(text.toStdString());
+        if (ann_count > 0 &&
+            !row_matches_classes(*decoder_stack, row, ann_classes))
+            continue;
 
-            result.push_back(da);
-        }
+        read_row_annotations(*decoder_stack, row, 0, ann_count, start_sample,
+                             end_sample, static_cast<size_t>(max_count),
+                             result);
     }
 
     pxv_info("[PWMDBG] get_decoder_annotations: returning %zu annotations",
@@ -3386,6 +3483,91 @@ Result<std::vector<DecoderAnnotation>> SessionService::get_decoder_annotations(
     return run_result_on_main_thread<std::vector<DecoderAnnotation>>(fn);
 }
 
+Result<DecoderAnnotationDelta> SessionService::get_decoder_annotations_since(
+    const std::string &instance_id, uint64_t since_version,
+    uint64_t start_sample, uint64_t end_sample, int max_count,
+    const std::vector<int> &ann_classes) {
+    auto fn = [this, instance_id, since_version, start_sample, end_sample,
+               max_count, ann_classes]() -> Result<DecoderAnnotationDelta> {
+    if (!_session)
+        return Result<DecoderAnnotationDelta>::Fail(
+            ErrorCode::InternalError, "Session is nullptr");
+
+    auto &stacks = _session->get_decoder_stacks(api_document());
+    auto decoder_stack = find_stack_by_instance_id(stacks, instance_id);
+    if (!decoder_stack)
+        return Result<DecoderAnnotationDelta>::Fail(
+            ErrorCode::DecoderNotFound, "Decoder instance not found");
+
+    // Rows only ever grow between init() calls (RowData is append-only), so
+    // the per-row counts delivered so far are a complete cursor.
+    auto &journal = _ann_journals[instance_id];
+    if (journal.epoch != decoder_stack->result_epoch()) {
+        journal.epoch = decoder_stack->result_epoch();
+        journal.checkpoints.clear();
+    }
+
+    int row_count = decoder_stack->list_rows_size();
+    DecoderAnnotationDelta delta;
+    std::vector<uint64_t> from(static_cast<size_t>(row_count), 0);
+    if (since_version != 0) {
+        auto it = std::find_if(journal.checkpoints.begin(),
+                               journal.checkpoints.end(),
+                               [&](const auto &c) { return c.first == since_version; });
+        if (it != journal.checkpoints.end() &&
+            it->second.size() == from.size())
+            from = it->second;
+        else
+            delta.reset = true;
+    }
+
+    std::vector<uint64_t> to = from;
+    for (int row = 0; row < row_count; row++) {
+        uint64_t ann_count = decoder_stack->list_annotation_size(
+            static_cast<uint16_t>(row));
+        auto &next = to[static_cast<size_t>(row)];
+        if (ann_count <= next)
+            continue;
+        if (delta.annotations.size() >= static_cast<size_t>(max_count)) {
+            delta.more = true;
+            break;
+        }
+        // Rows of other classes and annotations outside the sample range
+        // are consumed too: the caller asked not to see them.
+        if (!row_matches_classes(*decoder_stack, row, ann_classes)) {
+            next = ann_count;
+            continue;
+        }
+        next = read_row_annotations(*decoder_stack, row, next, ann_count,
+                                    start_sample, end_sample,
+                                    static_cast<size_t>(max_count),
+                                    delta.annotations);
+        if (next < ann_count)
+            delta.more = true;
+    }
+
+    if (to == from && !delta.reset && since_version != 0) {
+        delta.version = since_version;
+    } else {
+        auto it = std::find_if(journal.checkpoints.begin(),
+                               journal.checkpoints.end(),
+                               [&](const auto &c) { return c.second == to; });
+        if (it != journal.checkpoints.end()) {
+            delta.version = it->first;
+        } else {
+            delta.version = ++_ann_version_counter;
+            journal.checkpoints.emplace_back(delta.version, to);
+            // Enough for a handful of followers; an evicted version just
+            // costs its owner one reset.
+            if (journal.checkpoints.size() > 64)
+                journal.checkpoints.pop_front();
+        }
+    }
+    return Result<DecoderAnnotationDelta>::Success(std::move(delta));
+    };
+    return run_result_on_main_thread<DecoderAnnotationDelta>(fn);
+}
+
 // ===========================================================================
 // 14. Measurements
 // ===========================================================================
@@ -3573,13 +3755,31 @@ Result<void> SessionService::set_signal_invert(const SignalInvertConfig &config)
         return Result<void>::Fail(ErrorCode::InternalError,
                                   "Session is nullptr");
 
-    std::vector<bool> channels;
-    channels.reserve(config.channels.size());
+    if (!_device)
+        return Result<void>::Fail(ErrorCode::MissingDevice,
+                                  "No device connected");
+
+    // FilterProcessor takes one state per logic channel in device order;
+    // config.channels holds channel indices.
+    auto logic = logic_channel_indices(_device->get_channels());
+    std::vector<bool> states(logic.size(), false);
+    bool any = false;
     for (size_t i = 0; i < config.channels.size() && i < config.invert_states.size(); i++) {
-        channels.push_back(config.invert_states[i]);
+        auto it = std::find(logic.begin(), logic.end(), config.channels[i]);
+        if (it == logic.end())
+            return Result<void>::Fail(ErrorCode::ChannelNotFound,
+                                      "Not a logic channel: " +
+                                          std::to_string(config.channels[i]));
+        states[static_cast<size_t>(it - logic.begin())] = config.invert_states[i];
+        any = any || config.invert_states[i];
     }
 
-    _session->set_signal_invert(channels);
+    // FilterProcessor ignores a set with nothing inverted, which would
+    // leave an earlier invert in place.
+    if (any)
+        _session->set_signal_invert(states);
+    else
+        _session->clear_signal_invert();
     return Result<void>::Success();
 }
 
@@ -3594,14 +3794,18 @@ Result<void> SessionService::clear_signal_invert() {
 
 SignalInvertConfig SessionService::get_signal_invert_config() const {
     SignalInvertConfig config;
-    if (!_session)
+    if (!_session || !_device)
         return config;
 
-    // SigSession does not expose the invert channel list through a
-    // public getter. Return the active state only; detailed config
-    // requires extending SigSession's public API.
-    if (_session->is_signal_invert_active()) {
-        config.invert_states.push_back(true);
+    // Report the inverted channels by channel index, like set_signal_invert
+    // takes them.
+    auto states = _session->signal_invert_channels();
+    auto logic = logic_channel_indices(_device->get_channels());
+    for (size_t i = 0; i < states.size() && i < logic.size(); i++) {
+        if (states[i]) {
+            config.channels.push_back(logic[i]);
+            config.invert_states.push_back(true);
+        }
     }
 
     return config;
@@ -3633,6 +3837,7 @@ Result<void> SessionService::load_file(const std::string &path) {
     if (!_session)
         return Result<void>::Fail(ErrorCode::InternalError,
                                   "Session is nullptr");
+    shutdown_export_streams();
 
     bool ok = _session->set_file(QString::fromStdString(path));
     if (!ok)
@@ -3735,6 +3940,17 @@ Result<void> SessionService::export_data(const ExportConfig &config) {
         return Result<void>::Fail(ErrorCode::InternalError,
                                   "Session is nullptr");
 
+    auto r = run_export(config);
+    if (!r)
+        return r;
+    broadcast_event(ServiceEvent::ExportComplete,
+                    {{"format", config.is_logic ? "csv_logic" : "csv_analog"},
+                     {"path", config.output_path}});
+    return Result<void>::Success();
+}
+
+Result<void> SessionService::run_export(const ExportConfig &config,
+                                        ExportPipe *pipe) {
     StoreSession store(_session);
     // Provide a headless ISessionDataGetter for export operations.
     HeadlessSessionDataGetter getter(_session, _device);
@@ -3763,8 +3979,17 @@ Result<void> SessionService::export_data(const ExportConfig &config) {
         store.set_iso8601_timestamp(true);
     }
 
-    bool ok = store.export_start();
-    if (!ok) {
+    bool ok;
+    if (pipe) {
+        pipe->set_abort_handler([&store] { store.cancel(); });
+        ok = store.export_to(pipe);
+        pipe->set_abort_handler(nullptr);
+    } else {
+        ok = store.export_start();
+        if (ok)
+            store.wait();
+    }
+    if (!ok || store.error() != "") {
         // Propagate StoreSession's specific error message (e.g. "Invalid
         // export format", "No data to save") instead of a generic string,
         // so MCP/API callers can diagnose the failure.
@@ -3774,14 +3999,6 @@ Result<void> SessionService::export_data(const ExportConfig &config) {
             : ("Failed to export data: " + err.toStdString());
         return Result<void>::Fail(ErrorCode::ExportFailed, msg);
     }
-
-    store.wait();
-    if (store.error() != "")
-        return Result<void>::Fail(ErrorCode::ExportFailed,
-                                  store.error().toStdString());
-    broadcast_event(ServiceEvent::ExportComplete,
-                    {{"format", config.is_logic ? "csv_logic" : "csv_analog"},
-                     {"path", config.output_path}});
     return Result<void>::Success();
 }
 
@@ -3799,18 +4016,7 @@ Result<void> SessionService::export_binary(const ExportConfig &config) {
     }
 
     uint64_t start = config.start_sample;
-    uint64_t end = config.end_sample;
-    if (end == 0) {
-        // Default to all data
-        if (_session->get_logic_snapshot() && _session->get_logic_snapshot()->have_data())
-            end = _session->get_logic_snapshot()->get_sample_count() - 1;
-        else if (_session->get_analog_snapshot() && _session->get_analog_snapshot()->have_data())
-            end = _session->cur_samplelimits() - 1;
-        else if (_session->get_dso_snapshot() && _session->get_dso_snapshot()->have_data())
-            end = _session->cur_samplelimits() - 1;
-        if (end == 0)
-            end = _session->cur_samplelimits() > 0 ? _session->cur_samplelimits() - 1 : 0;
-    }
+    uint64_t end = resolve_binary_end(config.end_sample);
 
     // If no channels specified, export all enabled channels
     std::vector<int32_t> channels = config.channels;
@@ -3823,135 +4029,162 @@ Result<void> SessionService::export_binary(const ExportConfig &config) {
     }
 
     for (auto ch_idx : channels) {
-        // Determine channel type from SignalModel
-        auto sig_list = _session->get_signal_models_snapshot();
-        ChannelType ch_type = ChannelType::Logic;
-        for (auto m : sig_list) {
-            if (m && m->index() == ch_idx) {
-                ch_type = sr_channel_type_to_api(m->type());
-                break;
-            }
-        }
-
         QString filename = output_dir + QString("/channel_%1.bin").arg(ch_idx);
         QFile file(filename);
         if (!file.open(QIODevice::WriteOnly))
             return Result<void>::Fail(ErrorCode::ExportFailed,
                                       "Failed to open file: " + filename.toStdString());
 
-        if (ch_type == ChannelType::Logic) {
-            auto *snapshot = _session->get_logic_snapshot();
-            if (!snapshot || !snapshot->have_data())
-                continue;
+        bool ok = write_binary_channel(file, ch_idx, start, end,
+                                       config.analog_downsample_ratio);
+        file.close();
+        if (!ok)
+            return Result<void>::Fail(ErrorCode::ExportFailed,
+                                      "Failed to write file: " + filename.toStdString());
+    }
 
-            uint64_t actual_end = end;
-            const uint8_t *data = snapshot->get_samples(start, actual_end,
-                                                         static_cast<int>(ch_idx));
-            if (!data)
-                continue;
+    broadcast_event(ServiceEvent::ExportComplete,
+                    {{"format", "binary"},
+                     {"path", config.output_path}});
+    return Result<void>::Success();
+}
 
-            uint64_t count = actual_end - start + 1;
-            // CRITICAL FIX: get_samples() extends actual_end up to the enclosing
-            // leaf-block boundary (8 samples = 1 byte), so for captures that do
-            // not end exactly on a leaf boundary `count` can exceed the real
-            // valid range (get_ring_sample_count) by up to 1 byte of stale /
-            // zero-padded data. Trim `count` to the actual captured sample range
-            // so the exported binary matches the saved .pxc L-<ch> length exactly.
-            uint64_t valid = snapshot->get_ring_sample_count();
-            uint64_t max_count = (valid > start) ? (valid - start) : 0;
-            if (count > max_count)
-                count = max_count;
-            // Additionally cap `count` to the REQUESTED export range [start, end].
-            // Without this, a bounded range (end < total) gets inflated to the
-            // whole capture because get_samples() rounds actual_end up to the
-            // enclosing leaf block (millions of samples) and the trim above only
-            // bounds by the total sample count, not the requested end.
-            uint64_t req_count = (end > start) ? (end - start + 1) : 0;
-            if (count > req_count)
-                count = req_count;
-            // Logic: 1 bit per channel per sample, packed into bytes
-            size_t byte_count = static_cast<size_t>((count + 7) / 8);
-            file.write(reinterpret_cast<const char*>(data), byte_count);
-        } else if (ch_type == ChannelType::Analog) {
-            auto *snapshot = _session->get_analog_snapshot();
-            if (!snapshot || !snapshot->have_data())
-                continue;
+uint64_t SessionService::resolve_binary_end(uint64_t end) const {
+    if (end == 0) {
+        // Default to all data
+        if (_session->get_logic_snapshot() && _session->get_logic_snapshot()->have_data())
+            end = _session->get_logic_snapshot()->get_sample_count() - 1;
+        else if (_session->get_analog_snapshot() && _session->get_analog_snapshot()->have_data())
+            end = _session->cur_samplelimits() - 1;
+        else if (_session->get_dso_snapshot() && _session->get_dso_snapshot()->have_data())
+            end = _session->cur_samplelimits() - 1;
+        if (end == 0)
+            end = _session->cur_samplelimits() > 0 ? _session->cur_samplelimits() - 1 : 0;
+    }
+    return end;
+}
 
-            const uint8_t *raw = snapshot->get_samples(static_cast<int64_t>(start));
-            if (!raw)
-                continue;
+bool SessionService::write_binary_channel(QIODevice &out, int32_t ch_idx,
+                                          uint64_t start, uint64_t end,
+                                          uint64_t downsample_ratio) {
+    // Determine channel type from SignalModel
+    auto sig_list = _session->get_signal_models_snapshot();
+    ChannelType ch_type = ChannelType::Logic;
+    for (auto m : sig_list) {
+        if (m && m->index() == ch_idx) {
+            ch_type = sr_channel_type_to_api(m->type());
+            break;
+        }
+    }
 
-            // CRITICAL FIX: 上游 libsigrok analog 数据布局是 interleaved：
-            //   [s0_ch0][s0_ch1]...[s0_chN][s1_ch0][s1_ch1]...
-            // 每个样本占 unit_bytes 字节（float=4, uint16=2, uint8=1）。
-            // 旧代码用 pitch=EnvelopeScaleFactor=16 + ch_idx（如 8）+ /255.0f
-            // 是 fork 时代码为 ADC 整数（0-255）写的，对上游 float 电压数据完全错误。
-            // 现在按正确的 interleaved 布局读取，并用 get_ch_order 把通道索引
-            // 映射到 snapshot 内部的 order（如 ch=8 在 5 通道 analog 中是 order=0）。
-            int order = snapshot->get_ch_order(ch_idx);
-            if (order < 0) {
-                pxv_warn("export_binary: channel %d not in analog snapshot, skipping", ch_idx);
-                continue;
-            }
+    if (ch_type == ChannelType::Logic) {
+        auto *snapshot = _session->get_logic_snapshot();
+        if (!snapshot || !snapshot->have_data())
+            return true;
+
+        uint64_t actual_end = end;
+        const uint8_t *data = snapshot->get_samples(start, actual_end,
+                                                     static_cast<int>(ch_idx));
+        if (!data)
+            return true;
+
+        uint64_t count = actual_end - start + 1;
+        // CRITICAL FIX: get_samples() extends actual_end up to the enclosing
+        // leaf-block boundary (8 samples = 1 byte), so for captures that do
+        // not end exactly on a leaf boundary `count` can exceed the real
+        // valid range (get_ring_sample_count) by up to 1 byte of stale /
+        // zero-padded data. Trim `count` to the actual captured sample range
+        // so the exported binary matches the saved .pxc L-<ch> length exactly.
+        uint64_t valid = snapshot->get_ring_sample_count();
+        uint64_t max_count = (valid > start) ? (valid - start) : 0;
+        if (count > max_count)
+            count = max_count;
+        // Additionally cap `count` to the REQUESTED export range [start, end].
+        // Without this, a bounded range (end < total) gets inflated to the
+        // whole capture because get_samples() rounds actual_end up to the
+        // enclosing leaf block (millions of samples) and the trim above only
+        // bounds by the total sample count, not the requested end.
+        uint64_t req_count = (end > start) ? (end - start + 1) : 0;
+        if (count > req_count)
+            count = req_count;
+        // Logic: 1 bit per channel per sample, packed into bytes
+        size_t byte_count = static_cast<size_t>((count + 7) / 8);
+        if (out.write(reinterpret_cast<const char*>(data), byte_count) < 0)
+            return false;
+    } else if (ch_type == ChannelType::Analog) {
+        auto *snapshot = _session->get_analog_snapshot();
+        if (!snapshot || !snapshot->have_data())
+            return true;
 
-            uint32_t channel_num = snapshot->get_channel_num();
-            uint8_t unit_bytes = snapshot->get_unit_bytes();
-            bool is_float = snapshot->is_float();
+        const uint8_t *raw = snapshot->get_samples(static_cast<int64_t>(start));
+        if (!raw)
+            return true;
+
+        // CRITICAL FIX: 上游 libsigrok analog 数据布局是 interleaved：
+        //   [s0_ch0][s0_ch1]...[s0_chN][s1_ch0][s1_ch1]...
+        // 每个样本占 unit_bytes 字节（float=4, uint16=2, uint8=1）。
+        // 旧代码用 pitch=EnvelopeScaleFactor=16 + ch_idx（如 8）+ /255.0f
+        // 是 fork 时代码为 ADC 整数（0-255）写的，对上游 float 电压数据完全错误。
+        // 现在按正确的 interleaved 布局读取，并用 get_ch_order 把通道索引
+        // 映射到 snapshot 内部的 order（如 ch=8 在 5 通道 analog 中是 order=0）。
+        int order = snapshot->get_ch_order(ch_idx);
+        if (order < 0) {
+            pxv_warn("export_binary: channel %d not in analog snapshot, skipping", ch_idx);
+            return true;
+        }
 
-            // interleaved 步长：每个样本占 channel_num * unit_bytes 字节
-            uint64_t stride = (uint64_t)channel_num * unit_bytes;
-            uint64_t ch_offset = (uint64_t)order * unit_bytes;
+        uint32_t channel_num = snapshot->get_channel_num();
+        uint8_t unit_bytes = snapshot->get_unit_bytes();
+        bool is_float = snapshot->is_float();
 
-            uint64_t count = end - start + 1;
+        // interleaved 步长：每个样本占 channel_num * unit_bytes 字节
+        uint64_t stride = (uint64_t)channel_num * unit_bytes;
+        uint64_t ch_offset = (uint64_t)order * unit_bytes;
 
-            // Apply downsample ratio
-            uint64_t step = config.analog_downsample_ratio > 1
-                                ? config.analog_downsample_ratio : 1;
+        uint64_t count = end - start + 1;
 
-            for (uint64_t i = 0; i < count; i += step) {
-                const uint8_t *p = raw + i * stride + ch_offset;
-                float val;
-                if (is_float && unit_bytes == sizeof(float)) {
-                    // float 电压数据：直接 memcpy 4 字节
-                    memcpy(&val, p, sizeof(float));
-                } else {
-                    // 整数数据：按 unit_bytes 拼接（little-endian）后转 float
-                    uint64_t iv = 0;
-                    for (uint8_t b = 0; b < unit_bytes; b++) {
-                        iv |= ((uint64_t)p[b]) << (b * 8);
-                    }
-                    val = static_cast<float>(iv);
+        // Apply downsample ratio
+        uint64_t step = downsample_ratio > 1 ? downsample_ratio : 1;
+
+        for (uint64_t i = 0; i < count; i += step) {
+            const uint8_t *p = raw + i * stride + ch_offset;
+            float val;
+            if (is_float && unit_bytes == sizeof(float)) {
+                // float 电压数据：直接 memcpy 4 字节
+                memcpy(&val, p, sizeof(float));
+            } else {
+                // 整数数据：按 unit_bytes 拼接（little-endian）后转 float
+                uint64_t iv = 0;
+                for (uint8_t b = 0; b < unit_bytes; b++) {
+                    iv |= ((uint64_t)p[b]) << (b * 8);
                 }
-                file.write(reinterpret_cast<const char*>(&val), sizeof(float));
+                val = static_cast<float>(iv);
             }
-        } else if (ch_type == ChannelType::Dso) {
-            auto *snapshot = _session->get_dso_snapshot();
-            if (!snapshot || !snapshot->have_data())
-                continue;
+            if (out.write(reinterpret_cast<const char*>(&val), sizeof(float)) < 0)
+                return false;
+        }
+    } else if (ch_type == ChannelType::Dso) {
+        auto *snapshot = _session->get_dso_snapshot();
+        if (!snapshot || !snapshot->have_data())
+            return true;
 
-            const uint8_t *raw = snapshot->get_samples(
-                static_cast<int64_t>(start),
-                static_cast<int64_t>(end),
-                static_cast<uint16_t>(ch_idx));
-            if (!raw)
-                continue;
+        const uint8_t *raw = snapshot->get_samples(
+            static_cast<int64_t>(start),
+            static_cast<int64_t>(end),
+            static_cast<uint16_t>(ch_idx));
+        if (!raw)
+            return true;
 
-            uint64_t count = end - start + 1;
-            float data_scale = snapshot->get_data_scale(ch_idx);
+        uint64_t count = end - start + 1;
+        float data_scale = snapshot->get_data_scale(ch_idx);
 
-            for (uint64_t i = 0; i < count; i++) {
-                float val = static_cast<float>(raw[i]) * data_scale;
-                file.write(reinterpret_cast<const char*>(&val), sizeof(float));
-            }
+        for (uint64_t i = 0; i < count; i++) {
+            float val = static_cast<float>(raw[i]) * data_scale;
+            if (out.write(reinterpret_cast<const char*>(&val), sizeof(float)) < 0)
+                return false;
         }
-
-        file.close();
     }
-
-    broadcast_event(ServiceEvent::ExportComplete,
-                    {{"format", "binary"},
-                     {"path", config.output_path}});
-    return Result<void>::Success();
+    return true;
 }
 
 Result<void> SessionService::export_decoder_table(
@@ -4204,6 +4437,22 @@ Result<void> SessionService::export_data_table_csv(
     return export_decoder_table(filepath, analyzers, iso8601_timestamp);
 }
 
+namespace {
+
+// Normalize format -> sr_output module id + file suffix ("" if unknown).
+// binary has no sr_output exts, but id "binary" still resolves via
+// sr_output_find(), so we keep the suffix consistent with the module id.
+std::string raw_export_suffix(const std::string &fmt) {
+    if (fmt == "csv")    return "csv";
+    if (fmt == "binary") return "bin";
+    if (fmt == "vcd")    return "vcd";
+    if (fmt == "hex")    return "hex";
+    if (fmt == "bits")   return "bits"; // module id (matched against sr_output_id, not file ext)
+    return "";
+}
+
+} // namespace
+
 Result<void> SessionService::export_raw_data(
     const std::string &format,
     const std::string &directory,
@@ -4215,17 +4464,9 @@ Result<void> SessionService::export_raw_data(
         return Result<void>::Fail(ErrorCode::InternalError,
                                   "Session is nullptr");
 
-    // Normalize format -> sr_output module id + file suffix.
-    // binary has no sr_output exts, but id "binary" still resolves via
-    // sr_output_find(), so we keep the suffix consistent with the module id.
     std::string fmt = format;
-    std::string suffix;
-    if (fmt == "csv")              suffix = "csv";
-    else if (fmt == "binary")      suffix = "bin";
-    else if (fmt == "vcd")         suffix = "vcd";
-    else if (fmt == "hex")         suffix = "hex";
-    else if (fmt == "bits")        suffix = "bits"; // module id (matched against sr_output_id, not file ext)
-    else
+    std::string suffix = raw_export_suffix(fmt);
+    if (suffix.empty())
         return Result<void>::Fail(ErrorCode::ExportFailed,
                                   "Unsupported export format: " + fmt +
                                   " (supported: csv, binary, vcd, hex, bits)");
@@ -4286,6 +4527,165 @@ Result<void> SessionService::export_raw_data(
     return Result<void>::Success();
 }
 
+// ===========================================================================
+// 18c. Streamed raw export
+// ===========================================================================
+
+Result<RawExportStreamInfo> SessionService::open_raw_export_stream(
+    const std::string &format,
+    int32_t channel,
+    bool analog,
+    int analog_downsample_ratio,
+    bool iso8601_timestamp) {
+    if (!_session)
+        return Result<RawExportStreamInfo>::Fail(ErrorCode::InternalError,
+                                                 "Session is nullptr");
+
+    std::string suffix = raw_export_suffix(format);
+    if (suffix.empty())
+        return Result<RawExportStreamInfo>::Fail(
+            ErrorCode::ExportFailed,
+            "Unsupported export format: " + format +
+            " (supported: csv, binary, vcd, hex, bits)");
+
+    // Same names and range as export_raw_data (binary names every channel
+    // channel_N.bin, like export_binary).
+    ExportConfig config;
+    std::string prefix = analog && format != "binary" ? "analog_" : "channel_";
+    config.output_path = prefix + std::to_string(channel) + "." + suffix;
+    config.channels = {channel};
+    config.is_logic = !analog;
+    config.analog_downsample_ratio = static_cast<uint64_t>(analog_downsample_ratio);
+    config.iso8601_timestamp = iso8601_timestamp;
+    config.start_sample = _session->get_save_start();
+    config.end_sample = _session->get_save_end();
+
+    std::vector<std::shared_ptr<ExportStream>> expired;
+    std::shared_ptr<ExportStream> stream;
+    {
+        std::lock_guard<std::mutex> lk(_export_streams_mutex);
+        auto now = std::chrono::steady_clock::now();
+        for (auto it = _export_streams.begin(); it != _export_streams.end();) {
+            if (now - it->second->last_used > kExportStreamIdle) {
+                expired.push_back(it->second);
+                it = _export_streams.erase(it);
+            } else {
+                ++it;
+            }
+        }
+        if (_export_streams.size() >= kMaxExportStreams)
+            return Result<RawExportStreamInfo>::Fail(
+                ErrorCode::ExportFailed,
+                "Too many open export streams (close_export_stream unused ones)");
+
+        stream = std::make_shared<ExportStream>();
+        stream->id = "xs-" + std::to_string(++_export_stream_counter);
+        stream->file_name = config.output_path;
+        ExportStream *s = stream.get();
+        stream->worker = std::thread([this, s, config, format] {
+            std::string error;
+            if (format == "binary") {
+                uint64_t end = resolve_binary_end(config.end_sample);
+                s->pipe.open(QIODevice::WriteOnly);
+                if (!write_binary_channel(s->pipe, config.channels.front(),
+                                          config.start_sample, end,
+                                          config.analog_downsample_ratio))
+                    error = "Export stream closed";
+            } else {
+                auto r = run_export(config, &s->pipe);
+                if (!r)
+                    error = r.error().message;
+            }
+            s->pipe.finish(error);
+        });
+        _export_streams[stream->id] = stream;
+    }
+    for (auto &old : expired)
+        old->shutdown();
+
+    RawExportStreamInfo info;
+    info.stream_id = stream->id;
+    info.file_name = stream->file_name;
+    return Result<RawExportStreamInfo>::Success(info);
+}
+
+Result<RawExportChunk> SessionService::read_raw_export_stream(
+    const std::string &stream_id,
+    uint64_t offset,
+    size_t max_bytes,
+    int wait_ms) {
+    std::shared_ptr<ExportStream> stream;
+    {
+        std::lock_guard<std::mutex> lk(_export_streams_mutex);
+        auto it = _export_streams.find(stream_id);
+        if (it == _export_streams.end())
+            return Result<RawExportChunk>::Fail(
+                ErrorCode::ExportFailed,
+                "Unknown export stream: " + stream_id);
+        stream = it->second;
+        stream->last_used = std::chrono::steady_clock::now();
+    }
+
+    std::lock_guard<std::mutex> lk(stream->read_mutex);
+    RawExportChunk chunk;
+    if (offset != stream->offset) {
+        // A retried read gets the previous chunk again.
+        if (offset != stream->last_offset)
+            return Result<RawExportChunk>::Fail(
+                ErrorCode::ExportFailed,
+                "Export stream " + stream_id + " is at offset " +
+                std::to_string(stream->offset) + ", not " +
+                std::to_string(offset));
+        chunk.data = stream->last;
+        chunk.offset = stream->last_offset;
+        chunk.eof = stream->last_eof;
+        return Result<RawExportChunk>::Success(chunk);
+    }
+
+    chunk.offset = offset;
+    chunk.data = stream->pipe.take(max_bytes > 0 ? max_bytes : 1,
+                                   std::chrono::milliseconds(std::max(wait_ms, 0)));
+    chunk.eof = stream->pipe.drained();
+    if (chunk.eof && !stream->pipe.error().empty()) {
+        // Hand over what was written, then fail the next read.
+        if (chunk.data.empty())
+            return Result<RawExportChunk>::Fail(ErrorCode::ExportFailed,
+                                                stream->pipe.error());
+        chunk.eof = false;
+    }
+    stream->last_offset = offset;
+    stream->last = chunk.data;
+    stream->last_eof = chunk.eof;
+    stream->offset = offset + chunk.data.size();
+    return Result<RawExportChunk>::Success(chunk);
+}
+
+void SessionService::shutdown_export_streams() {
+    std::map<std::string, std::shared_ptr<ExportStream>> streams;
+    {
+        std::lock_guard<std::mutex> lk(_export_streams_mutex);
+        streams.swap(_export_streams);
+    }
+    for (auto &entry : streams)
+        entry.second->shutdown();
+}
+
+Result<void> SessionService::close_raw_export_stream(
+    const std::string &stream_id) {
+    std::shared_ptr<ExportStream> stream;
+    {
+        std::lock_guard<std::mutex> lk(_export_streams_mutex);
+        auto it = _export_streams.find(stream_id);
+        if (it == _export_streams.end())
+            return Result<void>::Fail(ErrorCode::ExportFailed,
+                                      "Unknown export stream: " + stream_id);
+        stream = it->second;
+        _export_streams.erase(it);
+    }
+    stream->shutdown();
+    return Result<void>::Success();
+}
+
 // ===========================================================================
 // 19. View control
 // ===========================================================================
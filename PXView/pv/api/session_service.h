@@ -20,6 +20,7 @@
 #pragma once
 
 #include "pv/api/isession_service.h"
+#include "pv/api/export_stream.h"
 #include <QtGlobal>
 #include <QString>
 #include <cstddef>
@@ -32,8 +33,14 @@
 #include "pv/core/eventbus.h"
 #include "pv/core/thread_pool.h"
 
+#include <chrono>
 #include <condition_variable>
+#include <deque>
+#include <map>
 #include <mutex>
+#include <string>
+#include <unordered_map>
+#include <utility>
 #include <vector>
 
 namespace pv {
@@ -126,6 +133,7 @@ explicit SessionService(SigSession *session, DeviceAgent *device);
     std::vector<ChannelInfo> get_channels() const override;
     Result<void> set_channel_enabled(int16_t index, bool enabled) override;
     Result<void> set_channel_name(int16_t index, const std::string &name) override;
+    Result<void> configure_channels(const std::vector<ChannelUpdate> &updates) override;
     uint16_t get_channel_count(ChannelType type) const override;
 
     // ---- ISessionService: 5. Sample config ----
@@ -219,7 +227,14 @@ explicit SessionService(SigSession *session, DeviceAgent *device);
         uint64_t start_sample = 0,
         uint64_t end_sample = UINT64_MAX,
         int max_count = 1000,
-        std::optional<int> ann_class = std::nullopt) override;
+        const std::vector<int> &ann_classes = {}) override;
+    Result<DecoderAnnotationDelta> get_decoder_annotations_since(
+        const std::string &instance_id,
+        uint64_t since_version,
+        uint64_t start_sample = 0,
+        uint64_t end_sample = UINT64_MAX,
+        int max_count = 1000,
+        const std::vector<int> &ann_classes = {}) override;
     Result<std::vector<uint8_t>> get_decoder_binary_output(
         const std::string &instance_id, int output_id) override;
 
@@ -282,6 +297,27 @@ explicit SessionService(SigSession *session, DeviceAgent *device);
         int analog_downsample_ratio = 1,
         bool iso8601_timestamp = false) override;
 
+    // ---- ISessionService: 18c. Streamed raw export ----
+    // Runs the export_raw_data writer for one channel on a worker thread
+    // into a bounded ExportPipe (see export_stream.h).  Streams idle for
+    // kExportStreamIdle are closed when another stream is opened; all are
+    // closed by start_capture, load_file and close_capture.
+    Result<RawExportStreamInfo> open_raw_export_stream(
+        const std::string &format,
+        int32_t channel,
+        bool analog = false,
+        int analog_downsample_ratio = 1,
+        bool iso8601_timestamp = false) override;
+    Result<RawExportChunk> read_raw_export_stream(
+        const std::string &stream_id,
+        uint64_t offset,
+        size_t max_bytes,
+        int wait_ms) override;
+    Result<void> close_raw_export_stream(const std::string &stream_id) override;
+
+    static constexpr size_t kMaxExportStreams = 8;
+    static constexpr std::chrono::seconds kExportStreamIdle{120};
+
     // ---- ISessionService: 19. View control ----
     Result<void> show_region(uint64_t start_sample, uint64_t end_sample) override;
     Result<void> zoom_fit() override;
@@ -346,6 +382,20 @@ void broadcast_event(ServiceEvent event,
                                nlohmann::json payload);
     ChannelType sr_channel_type_to_api(int sr_type) const;
 
+    // ---- export helpers shared by the file and streamed exports ----
+    // Run StoreSession for `config` into its output_path, or into `pipe`
+    // (a streamed export; closing the stream cancels the export).
+    Result<void> run_export(const ExportConfig &config, ExportPipe *pipe = nullptr);
+    // Resolve export_binary's end sample (0 = whole capture).
+    uint64_t resolve_binary_end(uint64_t end) const;
+    // Write one channel in export_binary's layout. False on a write error.
+    bool write_binary_channel(QIODevice &out, int32_t ch_idx, uint64_t start,
+                              uint64_t end, uint64_t downsample_ratio);
+    // Abort and join every open streamed export.  Their workers read the
+    // current snapshot, so this runs before anything replaces or drops it
+    // (start_capture, load_file, close_capture, destruction).
+    void shutdown_export_streams();
+
     // ---- configure_and_start helper methods (split from 470-line function) ----
     // Step 0: Ensure device is in LOGIC mode when digital channels are requested.
     void ensure_logic_mode_for_digital(const std::vector<int16_t>& digital_channels);
@@ -404,6 +454,22 @@ std::vector<pv::core::Subscription> _event_subscriptions;
 // P0-2: Global state version counter for versioned notifications
     mutable uint64_t _state_version_counter = 0;
 
+    // get_decoder_annotations_since() cursors per decoder instance: each
+    // handed-out version maps to the per-row annotation counts already
+    // delivered. Only touched on the main thread.
+    struct AnnotationJournal {
+        uint64_t epoch = 0;
+        std::deque<std::pair<uint64_t, std::vector<uint64_t>>> checkpoints;
+    };
+    std::unordered_map<std::string, AnnotationJournal> _ann_journals;
+    uint64_t _ann_version_counter = 0;
+
+    // Open streamed raw exports by id. Each stream's worker thread is
+    // joined (ExportStream::shutdown) before it leaves the map.
+    std::mutex _export_streams_mutex;
+    std::map<std::string, std::shared_ptr<ExportStream>> _export_streams;
+    uint64_t _export_stream_counter = 0;
+
     // MCP-dedicated document. phase 2: ownership is held by DocumentRegistry;
     // SessionService stores only the owning index (SIZE_MAX == none). Created
     // via DocumentRegistry::create_api_document() (called from AppService) and
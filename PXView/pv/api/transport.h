@@ -18,6 +18,8 @@ struct JsonRpcRequest {
     bool is_mcp = false;      // True when routed through MCP transport
     std::string mcp_tool_name;      // For MCP tools/call: the tool name from params.name
     std::string mcp_tool_args;      // For MCP tools/call: the arguments from params.arguments
+    bool mcp_structured_only = false; // tools/call _meta "pxview/structuredOnly": drop the
+                                      // text copy of results that carry structuredContent
 };
 
 struct JsonRpcResponse {
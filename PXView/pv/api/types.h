@@ -3,6 +3,7 @@
 #include <cstdint>
 #include <expected>
 #include <map>
+#include <optional>
 #include <string>
 #include <utility>
 #include <variant>
@@ -263,6 +264,14 @@ struct ChannelInfo {
     bool        enabled_default = false;
 };
 
+// One entry of ISessionService::configure_channels(); unset fields are
+// left unchanged.
+struct ChannelUpdate {
+    int16_t                    index   = 0;
+    std::optional<bool>        enabled;
+    std::optional<std::string> name;
+};
+
 struct SampleConfig {
     uint64_t    sample_rate         = 0;
     uint64_t    sample_limit        = 0;
@@ -366,6 +375,18 @@ struct DecoderAnnotation {
     uint64_t                   end_sample   = 0;
     int32_t                    ann_class    = 0;
     std::vector<std::string>   texts;
+    bool                       numeric      = false;  // texts carry a decoder value
+                                                      // (radixType applies)
+};
+
+// Annotations appended since a version returned by an earlier
+// get_decoder_annotations_since() call.
+struct DecoderAnnotationDelta {
+    std::vector<DecoderAnnotation> annotations;
+    uint64_t version = 0;   // pass back as since_version for the next delta
+    bool     reset   = false;  // since_version unknown or results cleared:
+                               // annotations start from the beginning
+    bool     more    = false;  // max_count reached, more are available now
 };
 
 struct MeasurementValue {
@@ -403,6 +424,18 @@ struct ExportConfig {
     bool                 iso8601_timestamp = false;
 };
 
+// Streamed raw export (open/read_raw_export_stream).
+struct RawExportStreamInfo {
+    std::string stream_id;
+    std::string file_name;   // name export_raw_data would give the file
+};
+
+struct RawExportChunk {
+    std::vector<uint8_t> data;
+    uint64_t offset = 0;     // position of data in the stream
+    bool     eof    = false; // nothing follows data
+};
+
 struct AnalyzerExportConfig {
     std::string analyzer_id;
     int radix_type = 4;  // 1=Binary, 2=Decimal, 3=Hex, 4=Ascii
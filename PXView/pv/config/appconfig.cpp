@@ -74,6 +74,15 @@ static void StringToFormatArray(const QString &str, std::vector<StringPair> &pro
 }
 
 //----------------read write field
+static QString g_config_dir_override;
+
+// Native store by default; INI under the --config-dir override if set.
+static QSettings::Format settingsFormat()
+{
+    return g_config_dir_override.isEmpty() ? QSettings::NativeFormat
+                                           : QSettings::IniFormat;
+}
+
 static void getFiled(const char *key, QSettings &st, QString &f, const char *dv)
 {
     f = st.value(key, dv).toString();
@@ -496,7 +505,8 @@ AppConfig& AppConfig::Instance()
 
 void AppConfig::LoadAll()
 {   
-    QSettings st(QApplication::organizationName(), QApplication::applicationName());
+    QSettings st(settingsFormat(), QSettings::UserScope,
+                 QApplication::organizationName(), QApplication::applicationName());
     _loadApp(appOptions, st);
     _loadHistory(userHistory, st);
     _loadFrame(frameOptions, st);
@@ -531,7 +541,8 @@ void AppConfig::SaveApp()
 
 void AppConfig::doSaveApp()
 {
-    QSettings st(QApplication::organizationName(), QApplication::applicationName());
+    QSettings st(settingsFormat(), QSettings::UserScope,
+                 QApplication::organizationName(), QApplication::applicationName());
     _saveApp(appOptions, st);
 
     st.beginGroup(keys::Group::Device.toUtf8().constData());
@@ -551,7 +562,8 @@ void AppConfig::SaveDevice()
 
 void AppConfig::doSaveDevice()
 {
-    QSettings st(QApplication::organizationName(), QApplication::applicationName());
+    QSettings st(settingsFormat(), QSettings::UserScope,
+                 QApplication::organizationName(), QApplication::applicationName());
     st.beginGroup(keys::Group::Device.toUtf8().constData());
     st.setValue(keys::Device::streamMemBuff.toUtf8().constData(), deviceOptions.streamMemBuff);
     st.setValue(keys::Device::streamBuff.toUtf8().constData(), deviceOptions.streamBuff);
@@ -577,7 +589,8 @@ void AppConfig::SaveHistory()
 
 void AppConfig::doSaveHistory()
 {
-    QSettings st(QApplication::organizationName(), QApplication::applicationName());
+    QSettings st(settingsFormat(), QSettings::UserScope,
+                 QApplication::organizationName(), QApplication::applicationName());
     _saveHistory(userHistory, st);
 }
 
@@ -593,7 +606,8 @@ void AppConfig::SaveFrame()
 
 void AppConfig::doSaveFrame()
 {
-    QSettings st(QApplication::organizationName(), QApplication::applicationName());
+    QSettings st(settingsFormat(), QSettings::UserScope,
+                 QApplication::organizationName(), QApplication::applicationName());
     _saveFrame(frameOptions, st);
 }
 
@@ -609,7 +623,8 @@ void AppConfig::SaveShortcuts()
 
 void AppConfig::doSaveShortcuts()
 {
-    QSettings st(QApplication::organizationName(), QApplication::applicationName());
+    QSettings st(settingsFormat(), QSettings::UserScope,
+                 QApplication::organizationName(), QApplication::applicationName());
     _saveShortcuts(shortcutOptions, st);
 }
 
@@ -625,7 +640,8 @@ void AppConfig::SaveStyle()
 
 void AppConfig::doSaveStyle()
 {
-    QSettings st(QApplication::organizationName(), QApplication::applicationName());
+    QSettings st(settingsFormat(), QSettings::UserScope,
+                 QApplication::organizationName(), QApplication::applicationName());
     _saveStyle(styleOptions, st);
 
     // P2-A: Notify listeners that settings were reloaded from disk.
@@ -899,6 +915,8 @@ QString GetFirmwareDir()
 
 QString GetUserDataDir()
 {
+    if (!g_config_dir_override.isEmpty())
+        return g_config_dir_override;
     return QStandardPaths::writableLocation(QStandardPaths::AppDataLocation);
 }
 
@@ -950,5 +968,20 @@ QString GetDecodeScriptDir()
 
 QString GetProfileDir()
 {
+    if (!g_config_dir_override.isEmpty())
+        return g_config_dir_override;
     return QStandardPaths::writableLocation(QStandardPaths::AppDataLocation);
+}
+
+void SetConfigDirOverride(const QString &dir)
+{
+    QDir().mkpath(dir);
+    g_config_dir_override = QDir(dir).absolutePath();
+    QSettings::setPath(QSettings::IniFormat, QSettings::UserScope,
+                       g_config_dir_override);
+}
+
+QString GetConfigDirOverride()
+{
+    return g_config_dir_override;
 }
\ No newline at end of file
@@ -52,6 +52,13 @@ QString GetUserDataDir();
 QString GetDecodeScriptDir();
 QString GetProfileDir();
 
+// Redirect user settings and profile data to DIR (--config-dir).
+// Settings are stored as DIR/<org>/<app>.ini instead of the native
+// store (registry on Windows), so several instances can run side by
+// side without sharing state. Must be called before LoadAll().
+void SetConfigDirOverride(const QString &dir);
+QString GetConfigDirOverride();
+
 //------------------class
   
 class StringPair
@@ -385,5 +385,12 @@ bool FilterProcessor::is_signal_invert_active() {
   return _state->view_data()->_signal_invert_active;
 }
 
+std::vector<bool> FilterProcessor::signal_invert_channels() {
+  std::lock_guard<std::mutex> lk(_state->view_data()->_filter_state_mutex);
+  if (!_state->view_data()->_signal_invert_active)
+    return {};
+  return _state->view_data()->_signal_invert_channels;
+}
+
 } // namespace core
 } // namespace pv
@@ -49,6 +49,9 @@ public:
   void set_signal_invert(const std::vector<bool> &channels);
   void clear_signal_invert();
   bool is_signal_invert_active();
+  /// Invert state per logic channel, in device channel order (empty when
+  /// signal invert is not active).
+  std::vector<bool> signal_invert_channels();
 
   /// Stop both background tasks. Called from SigSession::Close().
   void stop();
@@ -21,6 +21,7 @@
 #ifndef PXVIEW_PV_DATA_ISESSION_HOST_H
 #define PXVIEW_PV_DATA_ISESSION_HOST_H
 
+#include <cstdint>
 #include <functional>
 #include <memory>
 #include <shared_mutex>
@@ -68,6 +69,14 @@ public:
     /// `self` is a weak_ptr so a stack destroyed before the batch drains is
     /// dropped safely. Implemented by SigSession (main-thread QTimer).
     virtual void request_decode_notify(std::weak_ptr<DecoderStack> self) = 0;
+
+    /// Called on the main thread when the stack identified by handle_id /
+    /// version has finished a decode run. SigSession publishes it as
+    /// interface::DecoderStackDone; the default does nothing.
+    virtual void stack_decode_done(uint64_t handle_id, uint64_t version) {
+        (void)handle_id;
+        (void)version;
+    }
 };
 
 } // namespace data
@@ -674,6 +674,7 @@ set_error_message(QString());
 _no_memory = false;
   _snapshot.reset();
   _result_count.store(0);
+  _result_epoch.fetch_add(1, std::memory_order_relaxed);
   _ann_dropped_stop.store(0);
   _ann_dropped_mem.store(0);
   _ann_dropped_row.store(0);
@@ -1132,7 +1133,10 @@ return;
     _host->event_bus_post([self]() { self->new_decode_data(); });
 
   if (!_host->is_closed()) {
-    _host->event_bus_post([self]() { self->decode_done(); });
+    _host->event_bus_post([self]() {
+      self->decode_done();
+      self->_host->stack_decode_done(self->handle_id(), self->version());
+    });
   }
 }
 
@@ -262,6 +262,12 @@ public:
         return _result_count.load(std::memory_order_relaxed);
     }
 
+    // Incremented by init() whenever the rows are cleared, so readers that
+    // remember per-row positions can tell a fresh decode from appended rows.
+    inline uint64_t result_epoch() const {
+        return _result_epoch.load(std::memory_order_relaxed);
+    }
+
     void set_owner_document(data::SessionDocument *doc) { _owner_document = doc; }
     data::SessionDocument* get_owner_document() { return _owner_document; }
 
@@ -376,6 +382,7 @@ private:
     std::atomic<int> _progress{0};
     std::atomic<bool> _is_decoding{false};
     std::atomic<uint64_t> _result_count{0};
+    std::atomic<uint64_t> _result_epoch{0};
 
     // decoder-generated analog samples (TDM/PWM).
     std::vector<std::shared_ptr<DecoderAnalogData>> _analog_data;
@@ -160,6 +160,13 @@ struct CopyToDocDone {
 // Decode task finished.
 struct DecodeDone {};
 
+// One decoder stack finished decoding. Identifies the stack by the same
+// handle_id / version pair the API layer formats as "<handle_id>:<version>".
+struct DecoderStackDone {
+    uint64_t handle_id;
+    uint64_t version;
+};
+
 // Signal list changed.
 struct SignalsChanged {
     enum class RebuildKind {
@@ -57,6 +57,7 @@ NLOHMANN_DEFINE_TYPE_NON_INTRUSIVE(ShowRegion, start, end, keep)
 NLOHMANN_DEFINE_TYPE_NON_INTRUSIVE(RepeatHold, percent)
 NLOHMANN_DEFINE_TYPE_NON_INTRUSIVE(DelayedPropMsg, message)
 NLOHMANN_DEFINE_TYPE_NON_INTRUSIVE(DeviceOpenFailed, driver_name, error_message)
+NLOHMANN_DEFINE_TYPE_NON_INTRUSIVE(DecoderStackDone, handle_id, version)
 
 // ---- Empty events: serialize as JSON null ----
 // These are not strictly needed (HasPayload=false skips serialization),
@@ -370,6 +370,7 @@ bool AppControl::Start()
 
     _ws_transport = new pv::api::WsTransport(_rpc_dispatcher, _ws_port);
     _mcp_transport = new pv::api::McpTransport(_rpc_dispatcher, _mcp_port);
+    _mcp_transport->set_compression_min_bytes(_mcp_compress_min_bytes);
 
     _ws_transport->moveToThread(_io_thread);
     _mcp_transport->moveToThread(_io_thread);
@@ -84,6 +84,12 @@ public:
         _ws_port = ws_port;
     }
 
+    /// Minimum MCP response size (bytes) to gzip/deflate; 0 disables.
+    /// Must be called before Start().
+    inline void set_mcp_compress_min_bytes(size_t min_bytes) {
+        _mcp_compress_min_bytes = min_bytes;
+    }
+
     inline int get_mcp_port() const { return _mcp_port; }
     inline int get_ws_port() const { return _ws_port; }
 
@@ -120,4 +126,5 @@ private:
     // API port numbers (defaults: MCP=10110, WS=10430)
     int _mcp_port = 10110;
     int _ws_port = 10430;
+    size_t _mcp_compress_min_bytes = 1024;
 };
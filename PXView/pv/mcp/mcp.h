@@ -49,3 +49,4 @@
 
 // Server
 #include "mcp_server.h"       // McpServer — tool registration + dispatch
+#include "mcp_blob_store.h"   // BlobStore — out-of-band binary results
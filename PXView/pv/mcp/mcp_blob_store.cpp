@@ -0,0 +1,186 @@
+// mcp_blob_store.cpp — Out-of-band binary blobs for large tool results
+//
+// Part of the PXView MCP SDK.
+//
+// Licensed under GPL v2 or (at your option) any later version.
+
+#include "mcp_blob_store.h"
+
+#include <cctype>
+#include <cstdio>
+#include <random>
+
+namespace mcp {
+
+namespace {
+
+uint64_t splitmix64(uint64_t x) {
+    x += 0x9E3779B97F4A7C15ull;
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ull;
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EBull;
+    return x ^ (x >> 31);
+}
+
+bool parse_size(const std::string& s, size_t& out) {
+    if (s.empty() || s.size() > 19)
+        return false;
+    uint64_t v = 0;
+    for (char c : s) {
+        if (!std::isdigit(static_cast<unsigned char>(c)))
+            return false;
+        v = v * 10 + static_cast<uint64_t>(c - '0');
+    }
+    out = static_cast<size_t>(v);
+    return true;
+}
+
+} // anonymous namespace
+
+// ──────────────────────────────────────────────────────────────────
+//  BlobStore
+// ──────────────────────────────────────────────────────────────────
+
+BlobStore& BlobStore::instance() {
+    static BlobStore store;
+    return store;
+}
+
+BlobStore::BlobStore(size_t capacity, std::chrono::milliseconds ttl)
+    : capacity_(capacity), ttl_(ttl) {
+    std::random_device rd;
+    salt_ = (static_cast<uint64_t>(rd()) << 32) ^ rd();
+}
+
+std::string BlobStore::make_id_locked() {
+    // Unguessable enough that one client cannot read another's results
+    // by enumerating ids; the endpoint is only bound to localhost anyway.
+    uint64_t a = splitmix64(salt_ ^ ++seq_);
+    uint64_t b = splitmix64(a ^ static_cast<uint64_t>(
+        Clock::now().time_since_epoch().count()));
+    char buf[33];
+    std::snprintf(buf, sizeof(buf), "%016llx%016llx",
+                  static_cast<unsigned long long>(a),
+                  static_cast<unsigned long long>(b));
+    return buf;
+}
+
+void BlobStore::evict_locked(Clock::time_point now, size_t incoming) {
+    for (auto it = entries_.begin(); it != entries_.end();) {
+        if (it->second.expires <= now) {
+            total_ -= it->second.data->size();
+            it = entries_.erase(it);
+        } else {
+            ++it;
+        }
+    }
+    while (!entries_.empty() && total_ + incoming > capacity_) {
+        auto oldest = entries_.begin();
+        for (auto it = entries_.begin(); it != entries_.end(); ++it) {
+            if (it->second.seq < oldest->second.seq)
+                oldest = it;
+        }
+        total_ -= oldest->second.data->size();
+        entries_.erase(oldest);
+    }
+}
+
+BlobStore::Handle BlobStore::put(std::vector<uint8_t> data,
+                                 std::string content_type) {
+    auto bytes = std::make_shared<const std::vector<uint8_t>>(std::move(data));
+    auto now = Clock::now();
+
+    std::lock_guard<std::mutex> lock(mutex_);
+    evict_locked(now, bytes->size());
+    Handle h;
+    h.id = make_id_locked();
+    h.size = bytes->size();
+    h.content_type = content_type;
+    h.expires_in_ms = ttl_.count();
+    total_ += bytes->size();
+    entries_[h.id] = Entry{std::move(bytes), std::move(content_type),
+                           now + ttl_, seq_};
+    return h;
+}
+
+BlobStore::Bytes BlobStore::get(const std::string& id,
+                                std::string* content_type) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = entries_.find(id);
+    if (it == entries_.end())
+        return nullptr;
+    if (it->second.expires <= Clock::now()) {
+        total_ -= it->second.data->size();
+        entries_.erase(it);
+        return nullptr;
+    }
+    if (content_type)
+        *content_type = it->second.content_type;
+    return it->second.data;
+}
+
+void BlobStore::erase(const std::string& id) {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = entries_.find(id);
+    if (it == entries_.end())
+        return;
+    total_ -= it->second.data->size();
+    entries_.erase(it);
+}
+
+void BlobStore::clear() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    entries_.clear();
+    total_ = 0;
+}
+
+size_t BlobStore::count() const {
+    std::lock_guard<std::mutex> lock(mutex_);
+    return entries_.size();
+}
+
+size_t BlobStore::total_bytes() const {
+    std::lock_guard<std::mutex> lock(mutex_);
+    return total_;
+}
+
+// ──────────────────────────────────────────────────────────────────
+//  Range header parsing
+// ──────────────────────────────────────────────────────────────────
+
+bool parse_byte_range(const std::string& header, size_t size,
+                      size_t& first, size_t& last) {
+    const std::string unit = "bytes=";
+    if (header.compare(0, unit.size(), unit) != 0 || size == 0)
+        return false;
+    std::string spec = header.substr(unit.size());
+    if (spec.find(',') != std::string::npos)
+        return false;  // multi-range responses are not supported
+    auto dash = spec.find('-');
+    if (dash == std::string::npos)
+        return false;
+    std::string a = spec.substr(0, dash);
+    std::string b = spec.substr(dash + 1);
+
+    if (a.empty()) {
+        // Suffix range: the last n bytes
+        size_t n = 0;
+        if (!parse_size(b, n) || n == 0)
+            return false;
+        first = n >= size ? 0 : size - n;
+        last = size - 1;
+        return true;
+    }
+    if (!parse_size(a, first) || first >= size)
+        return false;
+    if (b.empty()) {
+        last = size - 1;
+        return true;
+    }
+    if (!parse_size(b, last) || last < first)
+        return false;
+    if (last >= size)
+        last = size - 1;
+    return true;
+}
+
+} // namespace mcp
@@ -0,0 +1,99 @@
+// mcp_blob_store.h — Out-of-band binary blobs for large tool results
+//
+// Part of the PXView MCP SDK.
+//
+// Large tool results (e.g. get_samples over millions of samples) are
+// expensive to ship inline: raw bytes → base64 → JSON string inside
+// content[0].text → JSON-RPC envelope, and the client undoes all three
+// layers.  Instead a tool can park the raw bytes here and return a small
+// handle; the client then fetches the bytes with a plain HTTP GET on
+// kBlobPathPrefix + id (served by McpTransport, Range supported).
+//
+// Blobs are immutable, expire kDefaultTtl after creation and are evicted
+// oldest-first once the store holds more than its byte capacity, so a
+// client that never fetches a handle cannot pin server memory.
+//
+// Thread safety: all methods may be called concurrently (tool handlers
+// run on the worker pool, blob downloads on the transport IO thread).
+//
+// Licensed under GPL v2 or (at your option) any later version.
+
+#pragma once
+
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+namespace mcp {
+
+// URL path under which McpTransport serves blobs: GET /mcp/blob/<id>
+inline constexpr const char* kBlobPathPrefix = "/mcp/blob/";
+
+class BlobStore {
+public:
+    using Clock = std::chrono::steady_clock;
+    using Bytes = std::shared_ptr<const std::vector<uint8_t>>;
+
+    static constexpr std::chrono::milliseconds kDefaultTtl{30000};
+    static constexpr size_t kDefaultCapacity = size_t(512) << 20;
+
+    struct Handle {
+        std::string id;
+        size_t      size = 0;
+        std::string content_type;
+        int64_t     expires_in_ms = 0;
+    };
+
+    // Process-wide store shared by the tool registry and the transport.
+    static BlobStore& instance();
+
+    explicit BlobStore(size_t capacity = kDefaultCapacity,
+                       std::chrono::milliseconds ttl = kDefaultTtl);
+
+    // Store `data` and return its handle.  Expired blobs and, if needed,
+    // the oldest live ones are evicted first to stay within capacity.
+    Handle put(std::vector<uint8_t> data,
+               std::string content_type = "application/octet-stream");
+
+    // Look up a live blob.  Returns nullptr for unknown or expired ids.
+    Bytes get(const std::string& id, std::string* content_type = nullptr);
+
+    void erase(const std::string& id);
+    void clear();
+
+    size_t count() const;
+    size_t total_bytes() const;
+    std::chrono::milliseconds ttl() const { return ttl_; }
+
+private:
+    struct Entry {
+        Bytes          data;
+        std::string    content_type;
+        Clock::time_point expires;
+        uint64_t       seq = 0;
+    };
+
+    void evict_locked(Clock::time_point now, size_t incoming);
+    std::string make_id_locked();
+
+    mutable std::mutex mutex_;
+    std::map<std::string, Entry> entries_;
+    size_t capacity_;
+    std::chrono::milliseconds ttl_;
+    size_t total_ = 0;
+    uint64_t seq_ = 0;
+    uint64_t salt_ = 0;
+};
+
+// Parse a single-range "Range: bytes=a-b" / "bytes=a-" / "bytes=-n" header
+// value against a blob of `size` bytes into [first, last] (inclusive).
+// Returns false if the header is malformed or unsatisfiable.
+bool parse_byte_range(const std::string& header, size_t size,
+                      size_t& first, size_t& last);
+
+} // namespace mcp
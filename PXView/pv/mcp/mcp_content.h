@@ -3,6 +3,8 @@
 // Part of the PXView MCP SDK.
 // Implements the MCP specification's CallToolResult structure:
 //   - content: array of ContentBlock (text, image, or resource)
+//   - structuredContent: the same JSON result as an object, so clients
+//     need not parse content[0].text a second time
 //   - isError: boolean flag
 //
 // Licensed under GPL v2 or (at your option) any later version.
@@ -91,9 +93,17 @@ public:
     static ToolResult json_result(json j) {
         ToolResult r;
         r.is_error_ = false;
-        r.content_.push_back(
-            ContentBlock::text_content(j.is_string() ? j.get<std::string>()
-                                                     : j.dump(2)));
+        if (j.is_string()) {
+            r.content_.push_back(ContentBlock::text_content(j.get<std::string>()));
+            return r;
+        }
+        // The text copy is rendered by to_json(), and only when the caller
+        // did not ask for structuredContent alone.
+        // structuredContent must be an object: wrap arrays and scalars as
+        // {"value": ...} and say so in _meta (kStructuredUnwrapKey).
+        r.structured_wrapped_ = !j.is_object();
+        r.structured_ = r.structured_wrapped_ ? json{{"value", std::move(j)}}
+                                              : std::move(j);
         return r;
     }
 
@@ -115,21 +125,47 @@ public:
 
     // ── Serialise to MCP tools/call result ──
 
-    json to_json() const {
+    // structured_only (tools/call _meta "pxview/structuredOnly") leaves the
+    // text copy of a JSON result empty instead of pretty-printing it.
+    json to_json(bool structured_only = false) const& {
+        return build(json(structured_), structured_only);
+    }
+
+    json to_json(bool structured_only = false) && {
+        return build(std::move(structured_), structured_only);
+    }
+
+    bool is_error() const { return is_error_; }
+    const std::vector<ContentBlock>& content() const { return content_; }
+    const json& structured_content() const { return structured_; }
+
+    // _meta key naming the wrapper member of a non-object structuredContent.
+    static constexpr const char* kStructuredUnwrapKey = "pxview/unwrap";
+
+private:
+    json build(json structured, bool structured_only) const {
         json result;
         json arr = json::array();
         for (const auto& b : content_)
             arr.push_back(b.to_json());
+        if (!structured.is_null()) {
+            const json& value = structured_wrapped_ ? structured["value"] : structured;
+            arr.push_back(ContentBlock::text_content(
+                structured_only ? std::string() : value.dump(2)).to_json());
+        }
         result["content"] = std::move(arr);
+        if (!structured.is_null()) {
+            result["structuredContent"] = std::move(structured);
+            if (structured_wrapped_)
+                result["_meta"] = {{kStructuredUnwrapKey, "value"}};
+        }
         result["isError"] = is_error_;
         return result;
     }
 
-    bool is_error() const { return is_error_; }
-    const std::vector<ContentBlock>& content() const { return content_; }
-
-private:
     std::vector<ContentBlock> content_;
+    json structured_;                 // null = text-only result
+    bool structured_wrapped_ = false;
     bool is_error_ = false;
 };
 
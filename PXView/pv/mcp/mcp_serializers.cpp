@@ -12,6 +12,8 @@
 
 #include "pv/api/iapp_service.h"
 
+#include <unordered_map>
+
 namespace mcp {
 
 // ──────────────────────────────────────────────────────────────────
@@ -162,13 +164,100 @@ json decoder_inst_to_json(const DecoderInstance& d) {
     };
 }
 
-json decoder_ann_to_json(const DecoderAnnotation& a) {
-    return json{
-        {"start_sample", a.start_sample},
-        {"end_sample",   a.end_sample},
-        {"ann_class",    a.ann_class},
-        {"texts",        a.texts}
+bool AnnotationFields::parse(const std::vector<std::string>& names,
+                             std::string* bad) {
+    start_sample = end_sample = ann_class = texts = numeric = false;
+    for (const auto& n : names) {
+        if (n == "start_sample")    start_sample = true;
+        else if (n == "end_sample") end_sample = true;
+        else if (n == "ann_class")  ann_class = true;
+        else if (n == "texts")      texts = true;
+        else if (n == "numeric")    numeric = true;
+        else {
+            if (bad) *bad = n;
+            return false;
+        }
+    }
+    return true;
+}
+
+json decoder_ann_to_json(const DecoderAnnotation& a,
+                         const AnnotationFields& fields) {
+    json j = json::object();
+    if (fields.start_sample) j["start_sample"] = a.start_sample;
+    if (fields.end_sample)   j["end_sample"]   = a.end_sample;
+    if (fields.ann_class)    j["ann_class"]    = a.ann_class;
+    if (fields.texts)        j["texts"]        = a.texts;
+    if (fields.numeric && a.numeric) j["numeric"] = true;
+    return j;
+}
+
+json decoder_anns_to_columnar(const std::vector<DecoderAnnotation>& anns,
+                              const AnnotationFields& fields) {
+    std::vector<int64_t> starts, ends;
+    std::vector<int32_t> classes;
+    std::vector<bool> numeric;
+    json texts = json::array();
+    json table = json::array();
+    std::unordered_map<std::string, size_t> text_ids;
+    uint64_t prev_start = 0, prev_end = 0;
+
+    if (fields.start_sample) starts.reserve(anns.size());
+    if (fields.end_sample)   ends.reserve(anns.size());
+    if (fields.ann_class)    classes.reserve(anns.size());
+    if (fields.numeric)      numeric.reserve(anns.size());
+    for (const auto& a : anns) {
+        if (fields.start_sample) {
+            starts.push_back(static_cast<int64_t>(a.start_sample - prev_start));
+            prev_start = a.start_sample;
+        }
+        if (fields.end_sample) {
+            ends.push_back(static_cast<int64_t>(a.end_sample - prev_end));
+            prev_end = a.end_sample;
+        }
+        if (fields.ann_class)
+            classes.push_back(a.ann_class);
+        if (fields.numeric)
+            numeric.push_back(a.numeric);
+        if (fields.texts) {
+            json ids = json::array();
+            for (const auto& t : a.texts) {
+                auto [it, added] = text_ids.try_emplace(t, text_ids.size());
+                if (added)
+                    table.push_back(t);
+                ids.push_back(it->second);
+            }
+            texts.push_back(std::move(ids));
+        }
+    }
+
+    json columns = json::object();
+    json encoding = json::object();
+    if (fields.start_sample) {
+        columns["start_sample"] = std::move(starts);
+        encoding["start_sample"] = "delta";
+    }
+    if (fields.end_sample) {
+        columns["end_sample"] = std::move(ends);
+        encoding["end_sample"] = "delta";
+    }
+    if (fields.ann_class)
+        columns["ann_class"] = std::move(classes);
+    if (fields.numeric)
+        columns["numeric"] = std::move(numeric);
+    if (fields.texts) {
+        columns["texts"] = std::move(texts);
+        encoding["texts"] = "text_table";
+    }
+    json result = {
+        {"format",   "columnar"},
+        {"count",    anns.size()},
+        {"columns",  std::move(columns)},
+        {"encoding", std::move(encoding)}
     };
+    if (fields.texts)
+        result["text_table"] = std::move(table);
+    return result;
 }
 
 json error_state_to_json(const ErrorState& e) {
@@ -42,7 +42,6 @@ json probe_to_json(const ProbeConfig& p);
 json disk_cache_to_json(const DiskCacheInfo& d);
 json decoder_desc_to_json(const DecoderDescriptor& d);
 json decoder_inst_to_json(const DecoderInstance& d);
-json decoder_ann_to_json(const DecoderAnnotation& a);
 json error_state_to_json(const ErrorState& e);
 json math_result_to_json(const MathResult& m);
 json spectrum_result_to_json(const SpectrumResult& s);
@@ -53,6 +52,35 @@ json decoder_class_to_json(const DecoderClassInfo& d);
 // Helper: get devices list with active flag
 json get_devices_json(IAppService* app_svc);
 
+// ──────────────────────────────────────────────────────────────────
+//  get_analyzer_results encodings
+// ──────────────────────────────────────────────────────────────────
+
+// Projection for get_analyzer_results fields=[...]
+struct AnnotationFields {
+    bool start_sample = true;
+    bool end_sample   = true;
+    bool ann_class    = true;
+    bool texts        = true;
+    bool numeric      = true;
+
+    // Returns false (and the offending name in *bad) for an unknown field.
+    bool parse(const std::vector<std::string>& names, std::string* bad);
+};
+
+// "numeric": true marks annotations whose text the decoder built from a
+// value, i.e. the ones export_data_table_csv reformats with radixType; the
+// key is left out for the rest.
+json decoder_ann_to_json(const DecoderAnnotation& a,
+                         const AnnotationFields& fields = {});
+
+// format="columnar": parallel arrays under "columns" instead of one object
+// per annotation.  start_sample / end_sample are delta-encoded against the
+// previous row (the first value is absolute); texts are lists of indices
+// into a deduplicated "text_table".
+json decoder_anns_to_columnar(const std::vector<DecoderAnnotation>& anns,
+                              const AnnotationFields& fields);
+
 // ──────────────────────────────────────────────────────────────────
 //  Struct API parameter types
 // ──────────────────────────────────────────────────────────────────
@@ -14,6 +14,7 @@
 // Licensed under GPL v2 or (at your option) any later version.
 
 #include "mcp_server.h"
+#include "mcp_blob_store.h"
 #include "pv/api/iapp_service.h"
 #include "pv/api/isession_service.h"
 #include "pv/api/types.h"
@@ -86,7 +87,19 @@ json McpServer::handle_initialize() const {
     return {
         {"protocolVersion", "2025-03-26"},
         {"capabilities", {
-            {"tools", {{"listChanged", false}}}
+            {"tools", {{"listChanged", false}}},
+            // Large get_samples results can be fetched out of band with
+            // GET <path><id> (see mcp_blob_store.h).
+            {"experimental", {
+                // Every JSON tool result carries structuredContent; a
+                // tools/call with _meta {"pxview/structuredOnly": true}
+                // gets it without the duplicate content[0].text.
+                {"structuredContent", {{"structuredOnly", true}}},
+                {"blobTransfer", {
+                    {"path", kBlobPathPrefix},
+                    {"ttlMs", BlobStore::instance().ttl().count()}
+                }}
+            }}
         }},
         {"serverInfo", {
             {"name", name_},
@@ -118,7 +131,8 @@ json McpServer::handle_tools_list() const {
 //    std::exception → user-invisible (InternalError)
 //
 json McpServer::handle_tools_call(std::string_view tool_name,
-                                   const json& args) const {
+                                   const json& args,
+                                   bool structured_only) const {
     auto it = tool_index_.find(std::string(tool_name));
     if (it == tool_index_.end()) {
         return {
@@ -158,7 +172,7 @@ json McpServer::handle_tools_call(std::string_view tool_name,
         }
         }
 
-        return result.to_json();
+        return std::move(result).to_json(structured_only);
 
     } catch (const ToolError& e) {
         // Tool-level error — user-visible
@@ -201,7 +215,9 @@ json McpServer::handle_request(std::string_view method,
         if (method == "tools/call") {
             std::string name = params.value("name", "");
             json args = params.value("arguments", json::object());
-            json result = handle_tools_call(name, args);
+            bool structured_only = params.contains("_meta") && params["_meta"].is_object() &&
+                                   params["_meta"].value("pxview/structuredOnly", false);
+            json result = handle_tools_call(name, args, structured_only);
             // tools/call result is the CallToolResult (content + isError),
             // wrapped in a JSON-RPC success response.
             return make_success(result, id);
@@ -127,9 +127,12 @@ public:
     // tools/list — returns all tool schemas
     json handle_tools_list() const;
 
-    // tools/call — dispatches to handler, catches exceptions
+    // tools/call — dispatches to handler, catches exceptions.
+    // structured_only: _meta "pxview/structuredOnly" was set, so JSON
+    // results leave their text copy empty.
     json handle_tools_call(std::string_view tool_name,
-                            const json& args) const;
+                            const json& args,
+                            bool structured_only = false) const;
 
     // ping — returns empty result
     json handle_ping() const;
@@ -5,9 +5,9 @@
 //
 // 49 consolidated tools (down from 65 originals):
 //   Tier 0: Mode management (3)     — switch/get_work_mode, get_supported_work_modes
-//   Tier 1: Core workflow (18)      — devices, capture, analyzers, channels, export
-//   Tier 2: Configuration (12)      — sample config, channel, trigger, probe, glitch, invert, config
-//   Tier 3: Advanced features (16)  — samples, edges, decoders, sessions, math/spectrum, cursors
+//   Tier 1: Core workflow (20)      — devices, capture, analyzers, channels, export
+//   Tier 2: Configuration (13)      — sample config, channel, trigger, probe, glitch, invert, config
+//   Tier 3: Advanced features (13)  — samples, edges, decoders, sessions, math/spectrum, cursors
 //
 // Refactored from a single 1645-line function into:
 //   - 4 tier-based register functions (Improvement 1)
@@ -27,6 +27,7 @@
 
 #include <algorithm>
 #include <cstring>
+#include <optional>
 
 namespace mcp {
 
@@ -204,16 +205,50 @@ ToolResult handle_get_analyzer_results(ISessionService* session,
     auto start = p.get_or<uint64_t>("startSample", 0);
     auto end = p.get_or<uint64_t>("endSample", UINT64_MAX);
     auto max_count = p.get_or<int>("maxCount", 1000);
-    std::optional<int> ann_class = std::nullopt;
+    auto classes = p.get_array_or<int>("annClasses", {});
     if (p.has("annClass"))
-        ann_class = p.get<int>("annClass");
-    auto r = session->get_decoder_annotations(id, start, end, max_count, ann_class);
-    if (!r)
-        throw ToolError(r.error().message);
-    json arr = json::array();
-    for (const auto& a : r.value())
-        arr.push_back(decoder_ann_to_json(a));
-    json result = {{"annotations", arr}};
+        classes.push_back(p.get<int>("annClass"));
+    auto format = p.get_or<std::string>("format", "rows");
+    if (format != "rows" && format != "columnar")
+        throw ToolError("Invalid format '" + format + "'. Use 'rows' or 'columnar'.");
+    AnnotationFields fields;
+    if (p.has("fields")) {
+        std::string bad;
+        if (!fields.parse(p.get_array_or<std::string>("fields", {}), &bad))
+            throw ToolError("Unknown field '" + bad + "'. Use start_sample, "
+                            "end_sample, ann_class, texts or numeric.");
+    }
+    // sinceVersion switches to the delta read: only annotations appended
+    // since that version, plus the version to pass next time.
+    std::vector<DecoderAnnotation> anns;
+    std::optional<DecoderAnnotationDelta> delta;
+    if (p.has("sinceVersion")) {
+        auto r = session->get_decoder_annotations_since(
+            id, p.get<uint64_t>("sinceVersion"), start, end, max_count, classes);
+        if (!r)
+            throw ToolError(r.error().message);
+        delta = std::move(r.value());
+        anns = std::move(delta->annotations);
+    } else {
+        auto r = session->get_decoder_annotations(id, start, end, max_count, classes);
+        if (!r)
+            throw ToolError(r.error().message);
+        anns = std::move(r.value());
+    }
+    json result;
+    if (format == "columnar") {
+        result = decoder_anns_to_columnar(anns, fields);
+    } else {
+        json arr = json::array();
+        for (const auto& a : anns)
+            arr.push_back(decoder_ann_to_json(a, fields));
+        result = {{"annotations", arr}};
+    }
+    if (delta) {
+        result["version"] = delta->version;
+        result["reset"]   = delta->reset;
+        result["more"]    = delta->more;
+    }
     // Include static metadata (class names) at top level,
     // not affected by maxCount pagination.
     if (p.get_or<bool>("includeMetadata", false)) {
@@ -285,12 +320,38 @@ ToolResult handle_export_data_table_csv(ISessionService* session,
 
 // ── get_samples handler (logic / analog / dso) ──
 
+// Park a large sample payload in the BlobStore and return its handle
+// instead of inlining it (see mcp_blob_store.h).  Logic blobs hold one
+// byte per sample; analog/DSO blobs hold little-endian float32 values.
+json blob_handle(std::vector<uint8_t> bytes) {
+    auto h = BlobStore::instance().put(std::move(bytes));
+    return {
+        {"id", h.id},
+        {"path", std::string(kBlobPathPrefix) + h.id},
+        {"size", h.size},
+        {"content_type", h.content_type},
+        {"expires_in_ms", h.expires_in_ms}
+    };
+}
+
+json blob_result(uint64_t sample_count, std::vector<uint8_t> bytes,
+                 const char* format) {
+    return {
+        {"sample_count", sample_count},
+        {"encoding", "blob"},
+        {"format", format},
+        {"blob", blob_handle(std::move(bytes))}
+    };
+}
+
 ToolResult handle_get_samples(ISessionService* session,
                                const Params& p) {
     auto ch = p.get<int16_t>("channelIndex");
     auto type = p.get<std::string>("channelType");
     auto start = p.get_or<uint64_t>("startSample", 0);
     auto end = p.get_or<uint64_t>("endSample", UINT64_MAX);
+    // 0 = always inline (clients that do not know about blobs)
+    auto blob_min = p.get_or<uint64_t>("blobMinBytes", 0);
 
     if (type == "logic") {
         std::vector<uint8_t> out_data;
@@ -299,6 +360,8 @@ ToolResult handle_get_samples(ISessionService* session,
             start, end, channels, out_data);
         if (!r)
             throw ToolError(r.error().message);
+        if (blob_min > 0 && out_data.size() >= blob_min)
+            return json_result(blob_result(r.value(), std::move(out_data), "u8"));
         return json_result({
             {"sample_count", r.value()},
             {"data", base64_encode(out_data)},
@@ -306,25 +369,20 @@ ToolResult handle_get_samples(ISessionService* session,
         });
     }
 
-    if (type == "analog") {
-        std::vector<float> out_data;
-        auto r = session->get_analog_samples(
-            start, end, ch, out_data);
-        if (!r)
-            throw ToolError(r.error().message);
-        return json_result({
-            {"sample_count", r.value()},
-            {"data", out_data},
-            {"encoding", "float32"}
-        });
-    }
-
-    if (type == "dso") {
+    if (type == "analog" || type == "dso") {
         std::vector<float> out_data;
-        auto r = session->get_dso_samples(
-            start, end, ch, out_data);
+        auto r = type == "analog"
+            ? session->get_analog_samples(start, end, ch, out_data)
+            : session->get_dso_samples(start, end, ch, out_data);
         if (!r)
             throw ToolError(r.error().message);
+        size_t nbytes = out_data.size() * sizeof(float);
+        if (blob_min > 0 && nbytes >= blob_min) {
+            // All supported hosts (x86-64, ARM64) are little-endian.
+            std::vector<uint8_t> bytes(nbytes);
+            std::memcpy(bytes.data(), out_data.data(), nbytes);
+            return json_result(blob_result(r.value(), std::move(bytes), "float32le"));
+        }
         return json_result({
             {"sample_count", r.value()},
             {"data", out_data},
@@ -336,6 +394,37 @@ ToolResult handle_get_samples(ISessionService* session,
                     "or 'dso'.");
 }
 
+// ── read_export_stream handler ──
+
+ToolResult handle_read_export_stream(ISessionService* session,
+                                      const Params& p) {
+    auto id = p.get<std::string>("streamId");
+    auto offset = p.get<uint64_t>("offset");
+    auto max_bytes = p.get_or<uint64_t>("maxBytes", uint64_t(4) << 20);
+    auto wait_ms = p.get_or<int>("waitMs", 1000);
+    auto blob_min = p.get_or<uint64_t>("blobMinBytes", 0);
+
+    max_bytes = std::clamp<uint64_t>(max_bytes, 1, uint64_t(64) << 20);
+    auto r = session->read_raw_export_stream(
+        id, offset, static_cast<size_t>(max_bytes), std::clamp(wait_ms, 0, 30000));
+    if (!r)
+        throw ToolError(r.error().message);
+    auto& chunk = r.value();
+    json out = {
+        {"offset", chunk.offset},
+        {"size", chunk.data.size()},
+        {"eof", chunk.eof}
+    };
+    if (blob_min > 0 && !chunk.data.empty() && chunk.data.size() >= blob_min) {
+        out["encoding"] = "blob";
+        out["blob"] = blob_handle(std::move(chunk.data));
+    } else {
+        out["encoding"] = "base64";
+        out["data"] = base64_encode(chunk.data);
+    }
+    return json_result(out);
+}
+
 // ── find_pattern handler (single + multi channel) ──
 
 ToolResult handle_find_pattern(ISessionService* session,
@@ -384,6 +473,32 @@ ToolResult handle_find_pattern(ISessionService* session,
     return json_result({{"sample", r.value()}});
 }
 
+// ── configure_channels handler (atomic bulk update) ──
+
+ToolResult handle_configure_channels(ISessionService* session,
+                                     const Params& p) {
+    const auto& channels = p.raw().at("channels");
+    if (!channels.is_array() || channels.empty())
+        throw ToolError("'channels' must be a non-empty array.");
+
+    std::vector<ChannelUpdate> updates;
+    updates.reserve(channels.size());
+    for (const auto& ch : channels) {
+        if (!ch.is_object() || !ch.contains("channelIndex"))
+            throw ToolError("Each 'channels' entry needs a channelIndex.");
+        ChannelUpdate u;
+        u.index = ch.at("channelIndex").get<int16_t>();
+        if (ch.contains("enabled"))
+            u.enabled = ch.at("enabled").get<bool>();
+        if (ch.contains("name"))
+            u.name = ch.at("name").get<std::string>();
+        updates.push_back(std::move(u));
+    }
+    check_void(session->configure_channels(updates));
+    return json_result({{"success", true},
+                        {"count", static_cast<int>(updates.size())}});
+}
+
 // ── configure_trigger handler (mode-aware get/set) ──
 
 ToolResult handle_configure_trigger(ISessionService* session,
@@ -530,7 +645,9 @@ ToolResult handle_configure_signal_invert(ISessionService* session,
     // SET
     SignalInvertConfig cfg;
     cfg.channels = channels;
-    cfg.invert_states = p.get_array_or<bool>("invertStates", {});
+    cfg.invert_states = p.has("invertStates")
+        ? p.get_array_or<bool>("invertStates", {})
+        : std::vector<bool>(channels.size(), true);
     check_void(session->set_signal_invert(cfg));
     return json_result({{"success", true}});
 }
@@ -825,7 +942,7 @@ static void register_mode_management_tools(McpServer& server,
 }
 
 // ═══════════════════════════════════════════════════════════════════════
-//  Tier 1: Core Workflow (18 tools)
+//  Tier 1: Core Workflow (20 tools)
 // ═══════════════════════════════════════════════════════════════════════
 
 static void register_core_workflow_tools(McpServer& server,
@@ -1019,6 +1136,24 @@ static void register_core_workflow_tools(McpServer& server,
         .param<int>("annClass",
             "Optional: only return annotations of this ann_class. "
             "Use includeMetadata to discover class names. Default = all classes")
+        .array_param<int>("annClasses",
+            "Optional: only return annotations of these ann_class values "
+            "(combined with annClass). Default = all classes")
+        .enum_param<std::string>("format", {"rows", "columnar"},
+            "'rows' (default): one object per annotation. 'columnar': "
+            "parallel arrays under 'columns' with delta-encoded "
+            "start_sample/end_sample and texts as indices into 'text_table'")
+        .array_param<std::string>("fields",
+            "Optional projection: any of start_sample, end_sample, "
+            "ann_class, texts, numeric (default = all). 'numeric' is true "
+            "on annotations holding a decoder value (the ones radixType "
+            "reformats); rows omit it when false")
+        .param<uint64_t>("sinceVersion",
+            "Optional: only return annotations appended since this 'version' "
+            "of an earlier delta read (0 = from the start). The result adds "
+            "'version' (pass it next time), 'reset' (true when sinceVersion "
+            "was unknown or the decode restarted: results start over) and "
+            "'more' (maxCount reached)")
         .param<bool>("includeMetadata",
             "If true, include annotation class names in 'metadata' field")
         .read_only()
@@ -1055,6 +1190,62 @@ static void register_core_workflow_tools(McpServer& server,
             return text("exported");
         });
 
+    // open_export_stream
+    server.tool("open_export_stream",
+        "Stream one channel's raw export back over MCP instead of writing "
+        "it to a server directory. The bytes are exactly those "
+        "export_raw_data writes to fileName (same output modules, same "
+        "set_export_config range). Read them with read_export_stream until "
+        "'eof', then call close_export_stream. start_capture, load_capture "
+        "and close_capture close every open stream.")
+        .enum_param<std::string>("format", {"csv", "binary", "vcd", "hex", "bits"},
+            "Output format (default: csv)")
+        .param<int32_t>("channel", "Channel index", Required)
+        .param<bool>("analog", "true for an analog channel (analog_N.<ext>)")
+        .param<int>("analogDownsampleRatio", "Analog downsample ratio (default 1)")
+        .param<bool>("iso8601Timestamp", "Use ISO8601 timestamps")
+        .on_call([app_svc](const Params& p) -> ToolResult {
+            auto* session = require_session(app_svc);
+            auto r = session->open_raw_export_stream(
+                p.get_or<std::string>("format", "csv"),
+                p.get<int32_t>("channel"),
+                p.get_or<bool>("analog", false),
+                p.get_or<int>("analogDownsampleRatio", 1),
+                p.get_or<bool>("iso8601Timestamp", false));
+            if (!r)
+                throw ToolError(r.error().message);
+            return json_result({{"streamId", r.value().stream_id},
+                                {"fileName", r.value().file_name}});
+        });
+
+    // read_export_stream
+    server.tool("read_export_stream",
+        "Read the next chunk of an export stream. Pass the offset of the "
+        "first byte you have not received (the previous offset + size); "
+        "repeating the previous offset returns that chunk again. An empty "
+        "chunk without 'eof' means no data arrived within waitMs.")
+        .param<std::string>("streamId", "Stream ID from open_export_stream", Required)
+        .param<uint64_t>("offset", "Byte offset to read from", Required)
+        .param<uint64_t>("maxBytes", "Maximum chunk size (default 4 MiB, max 64 MiB)")
+        .param<int>("waitMs", "Wait up to this long for data (default 1000)")
+        .param<uint64_t>("blobMinBytes",
+            "Return chunks of at least this many bytes as a blob handle "
+            "(default 0 = always inline base64)")
+        .on_call([app_svc](const Params& p) -> ToolResult {
+            auto* session = require_session(app_svc);
+            return handle_read_export_stream(session, p);
+        });
+
+    // close_export_stream
+    server.tool("close_export_stream",
+        "Release an export stream, stopping its export if it is still running.")
+        .param<std::string>("streamId", "Stream ID from open_export_stream", Required)
+        .on_call([app_svc](const Params& p) -> ToolResult {
+            auto* session = require_session(app_svc);
+            check_void(session->close_raw_export_stream(p.get<std::string>("streamId")));
+            return json_result({{"closed", true}});
+        });
+
     // export_data_table_csv
     server.tool("export_data_table_csv",
         "Export decoded analyzer data as a CSV table. "
@@ -1104,7 +1295,7 @@ static void register_core_workflow_tools(McpServer& server,
 }
 
 // ═══════════════════════════════════════════════════════════════════════
-//  Tier 2: Configuration (10 tools)
+//  Tier 2: Configuration (13 tools)
 // ═══════════════════════════════════════════════════════════════════════
 
 static void register_configuration_tools(McpServer& server,
@@ -1163,6 +1354,22 @@ static void register_configuration_tools(McpServer& server,
             return json_result({{"success", true}});
         });
 
+    // configure_channels
+    server.tool("configure_channels",
+        "Configure several channels in one call. 'channels' is an array "
+        "of {channelIndex, enabled?, name?} objects; omitted fields are "
+        "left unchanged. Applied atomically (an unknown or repeated "
+        "channelIndex changes nothing) with a single config-changed "
+        "event, instead of one per configure_channel call.")
+        .any_param("channels",
+            "Array of {channelIndex, enabled, name} objects.",
+            Required, "array", "object")
+        .destructive()
+        .on_call([app_svc](const Params& p) -> ToolResult {
+            auto* session = require_session(app_svc);
+            return handle_configure_channels(session, p);
+        });
+
     // configure_trigger
     server.tool("configure_trigger",
         "Get or set trigger configuration. Automatically uses LogicTrigger "
@@ -1216,10 +1423,11 @@ static void register_configuration_tools(McpServer& server,
     // configure_signal_invert
     server.tool("configure_signal_invert",
         "Get, set, or clear signal invert. Call with no args to get "
-        "current config. Set channels+invertStates to enable. "
+        "current config (the inverted channels). Set channels+invertStates "
+        "to enable; channels not listed are not inverted. "
         "Set channels to [] to clear.")
-        .array_param<int32_t>("channels", "Channel indices. Empty array = clear.")
-        .array_param<bool>("invertStates", "Invert state per channel")
+        .array_param<int32_t>("channels", "Logic channel indices. Empty array = clear.")
+        .array_param<bool>("invertStates", "Invert state per channel (default: all true)")
         .on_call([app_svc](const Params& p) -> ToolResult {
             auto* session = require_session(app_svc);
             return handle_configure_signal_invert(session, p);
@@ -1321,7 +1529,7 @@ static void register_configuration_tools(McpServer& server,
 }
 
 // ═══════════════════════════════════════════════════════════════════════
-//  Tier 3: Advanced Features (15 tools)
+//  Tier 3: Advanced Features (13 tools)
 // ═══════════════════════════════════════════════════════════════════════
 
 static void register_advanced_feature_tools(McpServer& server,
@@ -1339,6 +1547,10 @@ static void register_advanced_feature_tools(McpServer& server,
             "Channel type — must match current work mode", Required)
         .param<uint64_t>("startSample", "Start sample index (default 0)")
         .param<uint64_t>("endSample", "End sample index (default = all)")
+        .param<uint64_t>("blobMinBytes",
+            "Return payloads of at least this many bytes as a blob handle "
+            "to fetch with GET /mcp/blob/<id> instead of inline data "
+            "(default 0 = always inline)")
         .read_only()
         .on_call([app_svc](const Params& p) -> ToolResult {
             auto* session = require_session(app_svc);
@@ -1536,9 +1748,9 @@ create_mcp_server(IAppService* app_svc) {
 
     // Register tools by tier (Improvement 1: split for readability)
     register_mode_management_tools(*server, app_svc);     // Tier 0: 3 tools
-    register_core_workflow_tools(*server, app_svc);       // Tier 1: 18 tools
-    register_configuration_tools(*server, app_svc);       // Tier 2: 12 tools
-    register_advanced_feature_tools(*server, app_svc);    // Tier 3: 15 tools
+    register_core_workflow_tools(*server, app_svc);       // Tier 1: 20 tools
+    register_configuration_tools(*server, app_svc);       // Tier 2: 13 tools
+    register_advanced_feature_tools(*server, app_svc);    // Tier 3: 13 tools
 
     return server;
 }
@@ -642,6 +642,36 @@ bool DeviceAgent::enable_probe(int probe_index, bool enable)
     return false;
 }
 
+bool DeviceAgent::enable_probes(const std::vector<std::pair<int, bool>> &states)
+{
+    if (!_dev_handle) {
+        pxv_warn("%s", "DeviceAgent::enable_probes: _dev_handle is nullptr");
+        return false;
+    }
+
+    bool ok = true;
+    bool changed = false;
+    for (const auto &[probe_index, enable] : states) {
+        sr_channel *probe = nullptr;
+        for (const GSList *l = get_channels(); l; l = l->next) {
+            auto *ch = (sr_channel *)l->data;
+            if (ch && ch->index == probe_index) {
+                probe = ch;
+                break;
+            }
+        }
+        if (!probe || sr_dev_channel_enable(probe, enable) != SR_OK) {
+            ok = false;
+            break;
+        }
+        changed = true;
+    }
+    // One DeviceConfigChanged (and view re-layout) for the whole batch.
+    if (changed)
+        config_changed();
+    return ok;
+}
+
 bool DeviceAgent::set_channel_name(int ch_index, const char *name)
 {
     if (!_dev_handle || !name) {
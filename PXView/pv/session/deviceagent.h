@@ -33,6 +33,7 @@
 #include <thread>
 #include <mutex>
 #include <condition_variable>
+#include <utility>
 #include <vector>
 
 #include "pv/base/pxvdef.h"
@@ -177,6 +178,7 @@ public:
     // --- Channel operations ---
     bool enable_probe(const sr_channel *probe, bool enable) override;
     bool enable_probe(int probe_index, bool enable);
+    bool enable_probes(const std::vector<std::pair<int, bool>> &states);
     bool set_channel_name(int ch_index, const char *name);
     bool channel_is_enable(int index);
     GSList* get_channels() override;
@@ -3453,6 +3453,9 @@ void SigSession::clear_signal_invert() {
 bool SigSession::is_signal_invert_active() {
   return _filter_processor->is_signal_invert_active();
 }
+std::vector<bool> SigSession::signal_invert_channels() {
+  return _filter_processor->signal_invert_channels();
+}
 
 void SigSession::restart_decoders() {
   if (decode_traces().empty())
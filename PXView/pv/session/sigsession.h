@@ -278,6 +278,9 @@ public:
   void session_save() override { broadcast_async<interface::SaveRequested>({}); }
   void show_region(uint64_t start, uint64_t end, bool keep) { broadcast_async<interface::ShowRegion>({start, end, keep}); }
   void decode_done() override { broadcast_async<interface::DecodeDone>({}); }
+  void stack_decode_done(uint64_t handle_id, uint64_t version) override {
+    broadcast_async<interface::DecoderStackDone>({handle_id, version});
+  }
   bool is_saving() { return _state->is_saving(); }
   void set_saving(bool flag) { _state->set_saving(flag); }
   DeviceEventObject *device_event_object() { return &_device_event; }
@@ -395,6 +398,9 @@ void on_load_config_end();
   void set_signal_invert(const std::vector<bool> &channels);
   void clear_signal_invert();
   bool is_signal_invert_active();
+  // Invert state per logic channel, in device channel order (empty when
+  // signal invert is not active).
+  std::vector<bool> signal_invert_channels();
   void restart_decoders();
   void start_all_decode_tasks() override;
   size_t get_disk_write_queue_depth();
@@ -923,6 +923,35 @@ bool StoreSession::meta_gen(data::Snapshot *snapshot, std::string &str)
 
 //export as csv file
 bool StoreSession::export_start()
+{
+    data::Snapshot *snapshot = export_prepare();
+    if (!snapshot)
+        return false;
+
+    // Gap 2: join previous export if still running
+    if (_save_future.valid())
+        _save_future.wait();
+    _is_busy.store(true);
+    _save_future = std::async(std::launch::async,
+        &StoreSession::export_proc, this, snapshot);
+    return !_has_error.load();
+}
+
+bool StoreSession::export_to(QIODevice *device)
+{
+    data::Snapshot *snapshot = export_prepare();
+    if (!snapshot)
+        return false;
+
+    _is_busy.store(true);
+    _export_device = device;
+    export_exec(snapshot);
+    _export_device = nullptr;
+    _is_busy = false;
+    return !_has_error.load();
+}
+
+data::Snapshot *StoreSession::export_prepare()
 {
     std::set<int> type_set;
     std::vector<std::shared_ptr<data::SignalModel>> _sm_models = _session->get_signal_models_snapshot(); for(auto m : _sm_models) {
@@ -940,10 +969,10 @@ bool StoreSession::export_start()
     if (type_set.size() > 1) {
 set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR1),
                 "PXView does not currently support\nfile export for multiple data types."));
-        return false;
+        return nullptr;
     } else if (type_set.size() == 0) {
         set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR2), "No data to save."));
-        return false;
+        return nullptr;
     }
 
     const auto snapshot = _session->get_snapshot(*type_set.begin());
@@ -951,17 +980,17 @@ set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR1),
         // Don't dereference a nullptr snapshot (the original `assert(snapshot)`
         // is a no-op in Release builds and would crash on the next line).
         set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR2), "No data to save."));
-        return false;
+        return nullptr;
     }
     // Check we have data
     if (snapshot->empty()) {
         set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR2), "No data to save."));
-        return false;
+        return nullptr;
     }
 
     if (_file_name == ""){
         set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR3), "No set file name."));
-        return false;
+        return nullptr;
     }
 
     const struct sr_output_module **supportedModules = sr_output_list();
@@ -987,16 +1016,10 @@ set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR1),
         // export format" message set just above and left callers with an
         // empty error string. Return immediately so the message survives.
         set_error(L_S(STR_PAGE_DLG, S_ID(IDS_MSG_STORESESS_EXPORTSTART_ERROR4), "Invalid export format."));
-        return false;
+        return nullptr;
     }
 
-    // Gap 2: join previous export if still running
-    if (_save_future.valid())
-        _save_future.wait();
-    _is_busy.store(true);
-    _save_future = std::async(std::launch::async,
-        &StoreSession::export_proc, this, snapshot);
-    return !_has_error.load();
+    return snapshot;
 }
 
 void StoreSession::export_proc(data::Snapshot *snapshot)
@@ -1113,7 +1136,10 @@ void StoreSession::export_exec(data::Snapshot *snapshot)
     // For binary format, open in raw mode and use file.write() directly.
     bool is_binary_output = (_suffix == "binary");
 
-    QFile file(_file_name);
+    // export_to() hands in its own device (a streamed export); the bytes
+    // and open mode are the same as for the file.
+    QFile output_file(_file_name);
+    QIODevice &file = _export_device ? *_export_device : output_file;
     if (!file.open(QIODevice::WriteOnly | (is_binary_output ? QIODevice::OpenModeFlag(0) : QIODevice::Text))) {
         pxv_err("Failed to open export file: %s", _file_name.toUtf8().data());
         _has_error.store(true);
@@ -29,6 +29,7 @@
 #include <atomic>
 #include <mutex>
 #include <QObject>
+#include <QIODevice>
 #include <libsigrok/libsigrok.h> 
 
 #include "pv/interface/icallbacks.h"
@@ -64,6 +65,9 @@ public:
 	QString error();
     bool save_start();
     bool export_start();
+    // Export synchronously into `device` (opened here) instead of the file
+    // named by SetFileName(), which still selects the output module.
+    bool export_to(QIODevice *device);
 	void wait();
 	void cancel();
 
@@ -73,6 +77,7 @@ private:
     void save_analog(pv::data::AnalogSnapshot *analog_snapshot);
     void save_dso(pv::data::DsoSnapshot *dso_snapshot);
     bool meta_gen(data::Snapshot *snapshot, std::string &str);
+    data::Snapshot *export_prepare();
     void export_proc(pv::data::Snapshot *snapshot);
     void export_exec(pv::data::Snapshot *snapshot);
     bool decoders_gen(std::string &str);
@@ -180,6 +185,7 @@ private:
     std::vector<int32_t> _export_channels;
     int             _export_channel_type = -1;
     data::SessionDocument *_decoder_doc = nullptr;
+    QIODevice       *_export_device = nullptr;
 };
 
 } // pv
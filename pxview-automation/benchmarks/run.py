@@ -0,0 +1,362 @@
+"""Client benchmark suite against :class:`~pxview_automation.testing.FakePXViewServer`.
+
+Usage::
+
+    python benchmarks/run.py                         # full run, prints a table
+    python benchmarks/run.py --quick --out new.json  # smaller capture, JSON results
+    python benchmarks/run.py --compare base.json     # flag regressions vs. a baseline
+
+Each benchmark reports one headline number (``value`` / ``unit``) and
+whether higher is better, plus supporting detail.  ``--compare`` exits
+with status 1 when any headline regresses by more than ``--threshold``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+_HERE = Path(__file__).resolve().parent
+_SRC = _HERE.parent / "src"
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+import pxview_automation  # noqa: E402
+from pxview_automation import McpClient, _json  # noqa: E402
+from pxview_automation.testing import FakePXViewServer  # noqa: E402
+
+Result = Dict[str, object]
+
+
+def _result(value: float, unit: str, higher_is_better: bool, **detail: object) -> Result:
+    return {"value": round(value, 3), "unit": unit,
+            "higher_is_better": higher_is_better, **detail}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# ======================================================================
+# Benchmarks
+# ======================================================================
+
+def bench_handshake(server: FakePXViewServer, runs: int) -> Result:
+    """initialize + tools/list on a fresh client."""
+    latencies = []
+    for _ in range(runs):
+        client = McpClient(server.url)
+        t0 = time.perf_counter()
+        client.connect()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return _result(statistics.median(latencies), "ms", False,
+                   p95_ms=round(_percentile(latencies, 0.95), 3), runs=runs)
+
+
+def bench_calls(server: FakePXViewServer, seconds: float, threads: int) -> Result:
+    """Small tool calls (get_capture_status) per second on one shared client."""
+    client = McpClient(server.url)
+    client.connect()
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+
+    def worker(n: int) -> None:
+        while time.perf_counter() < deadline:
+            client.get_capture_status()
+            counts[n] += 1
+
+    t0 = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    ttfb = client.stats().tools["get_capture_status"].phases["ttfb"]
+    return _result(sum(counts) / elapsed, "calls/s", True, threads=threads,
+                   calls=sum(counts), ttfb_p50_s=ttfb.quantile(0.5))
+
+
+def bench_get_samples(server: FakePXViewServer, chunk: int) -> Result:
+    """Read one full logic channel in *chunk*-sample requests."""
+    client = McpClient(server.url, timeout=120)
+    client.connect()
+    total = 0
+    t0 = time.perf_counter()
+    samples = client.get_sample_config()["sample_limit"]
+    for start in range(0, samples, chunk):
+        end = min(start + chunk, samples)
+        total += len(client.get_samples(0, "logic", start, end))
+    elapsed = time.perf_counter() - t0
+    wire = client.stats().tools["get_samples"].response_bytes
+    return _result(total / elapsed / 1e6, "MB/s", True, samples=total, chunk=chunk,
+                   wire_mb=round(wire / 1e6, 3), seconds=round(elapsed, 3))
+
+
+def bench_annotations(server: FakePXViewServer, page: int) -> Result:
+    """Page through every annotation with get_analyzer_results."""
+    client = McpClient(server.url, timeout=120)
+    client.connect()
+    analyzer_id = client.add_analyzer("uart", {"channelMap": {"rxtx": 0}})["analyzerId"]
+    fetched = pages = 0
+    start = 0
+    t0 = time.perf_counter()
+    while True:
+        batch = client.get_analyzer_results(analyzer_id, start_sample=start, max_count=page)
+        anns = batch["annotations"] if isinstance(batch, dict) else batch
+        if not anns:
+            break
+        fetched += len(anns)
+        pages += 1
+        start = anns[-1]["end_sample"] + 1
+    elapsed = time.perf_counter() - t0
+    return _result(fetched / elapsed, "annotations/s", True, annotations=fetched,
+                   pages=pages, page_size=page)
+
+
+def bench_compression(server: FakePXViewServer, bandwidth: Optional[float],
+                      count: int) -> Result:
+    """One *count*-annotation page with and without response compression.
+
+    *bandwidth* (bytes/s) throttles the server's writes to model a slow
+    link; None measures plain loopback, where compression mostly costs CPU.
+    """
+    analyzer_id = McpClient(server.url).add_analyzer(
+        "uart", {"channelMap": {"rxtx": 0}})["analyzerId"]
+    times: Dict[bool, float] = {}
+    wire: Dict[bool, int] = {}
+    server.link_bandwidth = bandwidth
+    try:
+        for compression in (False, True):
+            client = McpClient(server.url, timeout=600, compression=compression)
+            client.connect()
+            t0 = time.perf_counter()
+            client.get_analyzer_results(analyzer_id, max_count=count)
+            times[compression] = (time.perf_counter() - t0) * 1000
+            wire[compression] = client.stats().tools["get_analyzer_results"].response_wire_bytes
+    finally:
+        server.link_bandwidth = None
+    return _result(times[False] / times[True], "x", True,
+                   plain_ms=round(times[False], 3), compressed_ms=round(times[True], 3),
+                   plain_kb=round(wire[False] / 1e3, 1),
+                   compressed_kb=round(wire[True] / 1e3, 1),
+                   link_mbps=bandwidth and round(bandwidth * 8 / 1e6, 3))
+
+
+def bench_structured_content(server: FakePXViewServer, count: int, runs: int) -> Result:
+    """One *count*-annotation page, text result vs. ``structuredContent`` only.
+
+    End to end over HTTP: the server builds (or skips) the pretty-printed
+    text copy, sends it, and the client decodes the result.
+    """
+    analyzer_id = McpClient(server.url).add_analyzer(
+        "uart", {"channelMap": {"rxtx": 0}})["analyzerId"]
+    times: Dict[bool, float] = {}
+    wire: Dict[bool, int] = {}
+    for structured in (False, True):
+        client = McpClient(server.url, timeout=600, structured_content=structured)
+        client.connect()
+        samples = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            client.get_analyzer_results(analyzer_id, max_count=count)
+            samples.append((time.perf_counter() - t0) * 1000)
+        times[structured] = statistics.median(samples)
+        stats = client.stats().tools["get_analyzer_results"]
+        wire[structured] = stats.response_bytes // stats.calls
+    return _result(times[False] / times[True], "x", True,
+                   text_ms=round(times[False], 3), structured_ms=round(times[True], 3),
+                   text_kb=round(wire[False] / 1e3, 1),
+                   structured_kb=round(wire[True] / 1e3, 1), annotations=count)
+
+
+def bench_json_backend(count: int, repeat: int) -> Result:
+    """Encode + decode large responses with each installed JSON backend.
+
+    The headline is the stdlib time divided by the active backend's
+    (1.0 when only the stdlib is installed).
+    """
+    anns = [{"start_sample": 1000 * i, "end_sample": 1000 * i + 900, "ann_class": i % 8,
+             "ann_type": 1, "texts": [f"Data write: {i & 0xFF:02X}", f"{i & 0xFF:02X}"]}
+            for i in range(count)]
+    samples = base64.b64encode(bytes(range(256)) * (count * 4)).decode("ascii")
+    bodies = {
+        "annotations": {"jsonrpc": "2.0", "id": 1, "result": {
+            "content": [{"type": "text", "text": ""}],
+            "structuredContent": {"annotations": anns, "total_count": count}}},
+        # Text-only result: the SSE / legacy path parses JSON twice.
+        "annotations_text": {"jsonrpc": "2.0", "id": 1, "result": {
+            "content": [{"type": "text", "text": json.dumps({"annotations": anns})}]}},
+        "samples": {"jsonrpc": "2.0", "id": 1, "result": {"structuredContent": {
+            "sample_count": len(samples) * 3 // 4, "encoding": "base64", "data": samples}}},
+    }
+    active = pxview_automation.json_backend()
+    client = McpClient(blob_threshold=None)
+    per_backend: Dict[str, float] = {}
+    try:
+        for backend in _json.available_backends():
+            pxview_automation.set_json_backend(backend)
+            encoded = {name: _json.dumps(body) for name, body in bodies.items()}
+            times = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                for name, body in bodies.items():
+                    _json.dumps(body)
+                    client._parse_tool_result(_json.loads(encoded[name]))
+                times.append((time.perf_counter() - t0) * 1000)
+            per_backend[backend] = statistics.median(times)
+    finally:
+        pxview_automation.set_json_backend(active)
+    return _result(per_backend["json"] / per_backend[active], "x", True, backend=active,
+                   **{f"{name}_ms": round(ms, 3) for name, ms in per_backend.items()})
+
+
+def bench_configure_channels(server: FakePXViewServer, runs: int) -> Result:
+    """Set every channel's enable + name: one configure_channels vs. per-channel calls."""
+    client = McpClient(server.url)
+    client.connect()
+    count = len(client.get_channels())
+    per_channel, bulk = [], []
+    for run in range(runs):
+        enabled = {i: (i + run) % 2 == 0 for i in range(count)}
+        names = {i: f"CH{i}-{run}" for i in range(count)}
+        t0 = time.perf_counter()
+        for i in range(count):
+            client.configure_channel(i, enabled[i], names[i])
+        per_channel.append((time.perf_counter() - t0) * 1000)
+        enabled = {i: not v for i, v in enabled.items()}
+        t0 = time.perf_counter()
+        client.configure_channels(enabled, names)
+        bulk.append((time.perf_counter() - t0) * 1000)
+    per_ms, bulk_ms = statistics.median(per_channel), statistics.median(bulk)
+    return _result(per_ms / bulk_ms, "x", True, channels=count, runs=runs,
+                   per_channel_ms=round(per_ms, 3), bulk_ms=round(bulk_ms, 3))
+
+
+def bench_cli_startup(server: FakePXViewServer, runs: int) -> Result:
+    """Wall time of ``pxview-cli status`` (interpreter start to exit)."""
+    cmd = [sys.executable, "-m", "pxview_automation.cli", "--port", str(server.port), "status"]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        p for p in (str(_SRC), os.environ.get("PYTHONPATH", "")) if p))
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - t0) * 1000)
+    return _result(statistics.median(times), "ms", False, runs=runs,
+                   min_ms=round(min(times), 3))
+
+
+# ======================================================================
+# Driver
+# ======================================================================
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    samples = 200_000 if args.quick else args.samples
+    annotations = 20_000 if args.quick else args.annotations
+    seconds = 0.5 if args.quick else args.seconds
+    runs = 3 if args.quick else 10
+
+    benches: Dict[str, Callable[[FakePXViewServer], Result]] = {
+        "handshake": lambda s: bench_handshake(s, runs * 5),
+        "calls_1_thread": lambda s: bench_calls(s, seconds, 1),
+        "calls_8_threads": lambda s: bench_calls(s, seconds, 8),
+        "get_samples_logic": lambda s: bench_get_samples(s, args.chunk),
+        "annotation_paging": lambda s: bench_annotations(s, args.page),
+        "cli_startup": lambda s: bench_cli_startup(s, runs),
+        "configure_channels": lambda s: bench_configure_channels(s, runs),
+        "structured_content": lambda s: bench_structured_content(s, args.page * 10, runs),
+        "json_backend": lambda s: bench_json_backend(20_000, runs),
+        "compression_loopback": lambda s: bench_compression(s, None, args.page * 10),
+        "compression_slow_link": lambda s: bench_compression(
+            s, args.link_mbps * 1e6 / 8, args.page * 10),
+    }
+    selected = args.only or list(benches)
+
+    results: Dict[str, Result] = {}
+    with FakePXViewServer(sample_limit=samples, annotations=annotations,
+                          latency=args.latency_ms / 1000.0) as server:
+        server.capture()
+        for name in selected:
+            results[name] = benches[name](server)
+            r = results[name]
+            print(f"{name:<24} {r['value']:>12} {r['unit']}")
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "package_version": pxview_automation.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "samples": samples,
+            "annotations": annotations,
+            "latency_ms": args.latency_ms,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return a message for every headline that regressed beyond *threshold*."""
+    regressions = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["value"]:
+            continue
+        ratio = cur["value"] / base["value"]
+        change = ratio - 1 if cur["higher_is_better"] else 1 / ratio - 1 if ratio else 0
+        print(f"{name:<24} {base['value']:>12} -> {cur['value']:<12} {change:+.1%}")
+        if change < -threshold:
+            regressions.append(f"{name}: {change:+.1%}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="small capture, short runs")
+    parser.add_argument("--samples", type=int, default=2_000_000, help="samples per channel")
+    parser.add_argument("--annotations", type=int, default=200_000)
+    parser.add_argument("--seconds", type=float, default=2.0, help="duration of call-rate runs")
+    parser.add_argument("--chunk", type=int, default=500_000, help="get_samples request size")
+    parser.add_argument("--page", type=int, default=1000, help="annotations per page")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="artificial server latency per tool call")
+    parser.add_argument("--link-mbps", type=float, default=20.0,
+                        help="simulated link speed for compression_slow_link")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="run only these benchmarks")
+    parser.add_argument("--out", help="write results JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed regression before --compare fails (default 0.10)")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        print()
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("Regressions: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -34,9 +34,17 @@ from .exceptions import (
     ProcessError,
     PxvError,
 )
+from ._json import json_backend, set_json_backend
 from .client import McpClient
-from .highlevel import PXView
+from .events import Event, EventStream
+from .highlevel import CaptureLoop, PXView
+from .pool import PXViewPool
 from .process import PXViewProcess
+from .sample_cache import SampleCache
+from .stats import CallRecord, ClientStats
+from .streaming import SampleRing
+from .tool_cache import ToolCache
+from .viewport import ViewportFrame, ViewportStream, ViewportTick
 from .types import (
     # Enums
     CaptureState,
@@ -48,11 +56,13 @@ from .types import (
     DigitalTriggerType,
     ExportFormat,
     RadixType,
+    ServiceEvent,
     StreamMode,
     # Dataclasses — configuration
     CaptureConfiguration,
     DigitalTriggerCaptureMode,
     DigitalTriggerLinkedChannel,
+    DeviceProfile,
     GlitchFilterEntry,
     LogicDeviceConfiguration,
     ManualCaptureMode,
@@ -60,6 +70,13 @@ from .types import (
     SampleConfig,
     TimedCaptureMode,
     # Dataclasses — results
+    SampleBatch,
+    AnnotationRow,
+    AnnotationTable,
+    AnnotationDelta,
+    CaptureSnapshot,
+    ProfileResult,
+    StreamStats,
     AnalyzerHandle,
     AnalyzerSettingValue,
     AppInfo,
@@ -76,8 +93,25 @@ __all__ = [
     "McpClient",
     # High-level API
     "PXView",
+    "CaptureLoop",
+    "SampleCache",
+    "ToolCache",
+    "SampleRing",
     # Process management
     "PXViewProcess",
+    "PXViewPool",
+    # Streaming
+    "ViewportStream",
+    "ViewportFrame",
+    "ViewportTick",
+    "EventStream",
+    "Event",
+    # Instrumentation
+    "ClientStats",
+    "CallRecord",
+    # JSON backend
+    "json_backend",
+    "set_json_backend",
     # Exceptions
     "PxvError",
     "McpError",
@@ -94,11 +128,13 @@ __all__ = [
     "DigitalTriggerType",
     "ExportFormat",
     "RadixType",
+    "ServiceEvent",
     "StreamMode",
     # Dataclasses — configuration
     "CaptureConfiguration",
     "DigitalTriggerCaptureMode",
     "DigitalTriggerLinkedChannel",
+    "DeviceProfile",
     "GlitchFilterEntry",
     "LogicDeviceConfiguration",
     "ManualCaptureMode",
@@ -106,6 +142,13 @@ __all__ = [
     "SampleConfig",
     "TimedCaptureMode",
     # Dataclasses — results
+    "SampleBatch",
+    "AnnotationRow",
+    "AnnotationTable",
+    "AnnotationDelta",
+    "CaptureSnapshot",
+    "ProfileResult",
+    "StreamStats",
     "AnalyzerHandle",
     "AnalyzerSettingValue",
     "AppInfo",
@@ -0,0 +1,132 @@
+"""JSON codec used on the client's hot paths.
+
+Every MCP call encodes one request and decodes one response (plus the
+``content[0].text`` of text-only tool results), so the JSON library is a
+measurable share of per-call overhead for large results.  When
+``orjson`` or ``ujson`` is installed it is used; otherwise the standard
+library ``json`` module is.  Neither is a dependency.
+
+The ``PXVIEW_JSON`` environment variable (``orjson`` / ``ujson`` /
+``json``) forces a backend at import time; :func:`set_json_backend`
+switches it at runtime.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, List, Optional, Union
+
+from .exceptions import ConfigError
+
+BACKENDS = ("orjson", "ujson", "json")
+
+
+class JsonCodec:
+    """``dumps`` to UTF-8 bytes and ``loads`` from bytes or str."""
+
+    __slots__ = ("name", "_dumps", "_loads")
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes],
+                 loads: Callable[[Union[bytes, str]], Any]):
+        self.name = name
+        self._dumps = dumps
+        self._loads = loads
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._dumps(obj)
+        except (TypeError, OverflowError):
+            # Types or integers a fast backend refuses (e.g. > 64-bit
+            # ints for orjson): the stdlib result, or its error message.
+            return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._loads(data)
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+
+def _make(name: str) -> JsonCodec:
+    if name == "orjson":
+        import orjson
+
+        return JsonCodec(name, orjson.dumps, orjson.loads)
+    if name == "ujson":
+        import ujson
+
+        def dumps(obj: Any) -> bytes:
+            return ujson.dumps(obj, escape_forward_slashes=False).encode("utf-8")
+
+        return JsonCodec(name, dumps, ujson.loads)
+    if name == "json":
+        return JsonCodec(name, lambda obj: json.dumps(obj).encode("utf-8"), json.loads)
+    raise ConfigError(f"Unknown JSON backend {name!r}; use one of {', '.join(BACKENDS)}")
+
+
+def available_backends() -> List[str]:
+    """Names of the backends importable in this interpreter, fastest first."""
+    names = []
+    for name in BACKENDS:
+        try:
+            _make(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def _default() -> JsonCodec:
+    # An unknown or uninstalled PXVIEW_JSON falls back to auto-selection
+    # rather than making the package unimportable.
+    forced = os.environ.get("PXVIEW_JSON", "")
+    names = ([forced] if forced in BACKENDS else []) + list(BACKENDS)
+    for name in names:
+        try:
+            return _make(name)
+        except ImportError:
+            continue
+    raise AssertionError("stdlib json is always available")
+
+
+codec: JsonCodec = _default()
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode *obj* with the active backend."""
+    return codec.dumps(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode *data* with the active backend; raises ``ValueError`` on bad input."""
+    return codec.loads(data)
+
+
+def json_backend() -> str:
+    """Name of the active JSON backend (``'orjson'``, ``'ujson'`` or ``'json'``)."""
+    return codec.name
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """Select the JSON backend for all clients in this process.
+
+    Args:
+        name: ``'orjson'``, ``'ujson'`` or ``'json'``; None picks the
+              fastest installed one.
+
+    Returns:
+        The name of the backend now in use.
+
+    Raises:
+        ConfigError: if *name* is unknown or not installed.
+    """
+    global codec
+    if name is None:
+        codec = _make(available_backends()[0])
+    else:
+        try:
+            codec = _make(name)
+        except ImportError:
+            raise ConfigError(f"JSON backend {name!r} is not installed") from None
+    return codec.name
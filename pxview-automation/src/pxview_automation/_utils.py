@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import re
+import socket
 import sys
 
 
@@ -123,3 +124,14 @@ def parse_int_list(s: str) -> list[int]:
         else:
             result.append(int(part))
     return result
+
+
+def find_free_port(host: str = "127.0.0.1") -> int:
+    """Return a TCP port that is currently free on *host*.
+
+    The port is only reserved while probing, so a caller racing other
+    processes should be prepared to retry on bind failure.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,312 @@
+"""Minimal RFC 6455 WebSocket implementation (standard library only).
+
+PXView pushes viewport frames and service events over its WebSocket
+transport (default port 10430).  The package has no runtime
+dependencies, so this module implements just enough of the protocol
+for that: the opening handshake, masked client frames, fragmented
+messages, ping/pong and the closing handshake.
+
+Both ends are supported so the same code can back a local test
+server.  This is an implementation detail and not part of the public
+API.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import struct
+import threading
+import urllib.parse
+from typing import Optional, Tuple, Union
+
+from .exceptions import McpConnectionError
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_MAX_HEADER_BYTES = 16384
+
+
+def accept_key(key: str) -> str:
+    """Compute the ``Sec-WebSocket-Accept`` value for a handshake key."""
+    digest = hashlib.sha1((key + _GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    """XOR *payload* with the 4-byte masking *key*."""
+    n = len(payload)
+    if n == 0:
+        return b""
+    stream = (key * (n // 4 + 1))[:n]
+    masked = int.from_bytes(payload, "little") ^ int.from_bytes(stream, "little")
+    return masked.to_bytes(n, "little")
+
+
+def encode_frame(opcode: int, payload: bytes, *, mask: bool, fin: bool = True) -> bytes:
+    """Encode a single WebSocket frame.
+
+    Args:
+        opcode:  Frame opcode (``OPCODE_*``).
+        payload: Frame payload.
+        mask:    Mask the payload (required for client-to-server frames).
+        fin:     Set the FIN bit (last fragment of a message).
+    """
+    head = bytearray()
+    head.append((0x80 if fin else 0x00) | opcode)
+    n = len(payload)
+    mask_bit = 0x80 if mask else 0x00
+    if n < 126:
+        head.append(mask_bit | n)
+    elif n < 0x10000:
+        head.append(mask_bit | 126)
+        head += struct.pack("!H", n)
+    else:
+        head.append(mask_bit | 127)
+        head += struct.pack("!Q", n)
+    if mask:
+        key = os.urandom(4)
+        head += key
+        return bytes(head) + _apply_mask(payload, key)
+    return bytes(head) + payload
+
+
+class WebSocket:
+    """A connected WebSocket endpoint.
+
+    Use :meth:`connect` for the client side or :meth:`accept` for the
+    server side.  :meth:`recv` returns complete (reassembled) text and
+    binary messages and answers pings transparently.
+
+    Sending is serialized with a lock so a reader thread and a caller
+    thread can share one connection.
+    """
+
+    def __init__(self, sock: socket.socket, *, client: bool, buffered: bytes = b""):
+        self._sock = sock
+        self._client = client
+        self._buf = bytearray(buffered)
+        self._send_lock = threading.Lock()
+        self._closed = False
+
+    # ---- Opening handshake ----
+
+    @classmethod
+    def connect(cls, url: str, timeout: Optional[float] = 10.0) -> "WebSocket":
+        """Open a client connection to a ``ws://`` URL.
+
+        Raises:
+            McpConnectionError: if the server is unreachable or rejects
+                the handshake.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "ws":
+            raise McpConnectionError(f"Unsupported WebSocket URL: {url!r}")
+        host = parts.hostname or "127.0.0.1"
+        port = parts.port or 80
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        try:
+            sock = socket.create_connection((host, port), timeout=timeout)
+        except OSError as exc:
+            raise McpConnectionError(
+                f"Cannot connect to WebSocket server at {url}: {exc}"
+            ) from exc
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "\r\n"
+        )
+        try:
+            sock.sendall(request.encode("ascii"))
+            status, headers, rest = _read_http_head(sock)
+        except (OSError, McpConnectionError) as exc:
+            sock.close()
+            raise McpConnectionError(f"WebSocket handshake with {url} failed: {exc}") from exc
+
+        if not status.startswith("HTTP/1.1 101"):
+            sock.close()
+            raise McpConnectionError(f"WebSocket handshake with {url} rejected: {status}")
+        if headers.get("sec-websocket-accept") != accept_key(key):
+            sock.close()
+            raise McpConnectionError(f"WebSocket handshake with {url}: bad accept key")
+        return cls(sock, client=True, buffered=rest)
+
+    @classmethod
+    def accept(cls, sock: socket.socket) -> "WebSocket":
+        """Complete the server side of the handshake on an accepted socket."""
+        _, headers, rest = _read_http_head(sock)
+        key = headers.get("sec-websocket-key")
+        if not key:
+            sock.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            sock.close()
+            raise McpConnectionError("WebSocket handshake without Sec-WebSocket-Key")
+        response = (
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept_key(key)}\r\n"
+            "\r\n"
+        )
+        sock.sendall(response.encode("ascii"))
+        return cls(sock, client=False, buffered=rest)
+
+    # ---- Sending ----
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        frame = encode_frame(opcode, payload, mask=self._client)
+        with self._send_lock:
+            if self._closed:
+                raise McpConnectionError("WebSocket is closed")
+            try:
+                self._sock.sendall(frame)
+            except OSError as exc:
+                raise McpConnectionError(f"WebSocket send failed: {exc}") from exc
+
+    def send_text(self, text: Union[str, bytes]) -> None:
+        """Send a text message (*text* may already be UTF-8 encoded)."""
+        self._send_frame(OPCODE_TEXT, text.encode("utf-8") if isinstance(text, str) else text)
+
+    def send_binary(self, data: bytes) -> None:
+        """Send a binary message."""
+        self._send_frame(OPCODE_BINARY, bytes(data))
+
+    # ---- Receiving ----
+
+    def _read_exact(self, n: int) -> bytes:
+        buf = self._buf
+        while len(buf) < n:
+            try:
+                chunk = self._sock.recv(max(65536, n - len(buf)))
+            except socket.timeout:
+                raise
+            except OSError as exc:
+                raise McpConnectionError(f"WebSocket receive failed: {exc}") from exc
+            if not chunk:
+                raise McpConnectionError("WebSocket connection closed by peer")
+            buf += chunk
+        data = bytes(buf[:n])
+        del buf[:n]
+        return data
+
+    def _read_frame(self) -> Tuple[bool, int, bytes]:
+        b0, b1 = self._read_exact(2)
+        fin = bool(b0 & 0x80)
+        opcode = b0 & 0x0F
+        n = b1 & 0x7F
+        if n == 126:
+            (n,) = struct.unpack("!H", self._read_exact(2))
+        elif n == 127:
+            (n,) = struct.unpack("!Q", self._read_exact(8))
+        key = self._read_exact(4) if b1 & 0x80 else None
+        payload = self._read_exact(n) if n else b""
+        if key is not None:
+            payload = _apply_mask(payload, key)
+        return fin, opcode, payload
+
+    def recv(self) -> Tuple[int, bytes]:
+        """Receive the next complete message.
+
+        Returns:
+            ``(opcode, payload)`` where opcode is :data:`OPCODE_TEXT` or
+            :data:`OPCODE_BINARY`, or :data:`OPCODE_CLOSE` with an empty
+            payload once the peer closed the connection.
+
+        Raises:
+            socket.timeout: if a socket timeout is set and expires.
+            McpConnectionError: on a broken connection.
+        """
+        message_opcode: Optional[int] = None
+        fragments = []
+        while True:
+            fin, opcode, payload = self._read_frame()
+            if opcode == OPCODE_PING:
+                self._send_frame(OPCODE_PONG, payload)
+                continue
+            if opcode == OPCODE_PONG:
+                continue
+            if opcode == OPCODE_CLOSE:
+                if not self._closed:
+                    try:
+                        self._send_frame(OPCODE_CLOSE, payload[:2])
+                    except McpConnectionError:
+                        pass
+                self._shutdown()
+                return OPCODE_CLOSE, b""
+            if opcode != OPCODE_CONTINUATION:
+                message_opcode = opcode
+            fragments.append(payload)
+            if fin:
+                data = fragments[0] if len(fragments) == 1 else b"".join(fragments)
+                return message_opcode if message_opcode is not None else OPCODE_BINARY, data
+
+    # ---- Lifecycle ----
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        """Set the socket timeout used by :meth:`recv`."""
+        self._sock.settimeout(timeout)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self, code: int = 1000) -> None:
+        """Send a close frame (best effort) and release the socket."""
+        if self._closed:
+            return
+        try:
+            self._send_frame(OPCODE_CLOSE, struct.pack("!H", code))
+        except McpConnectionError:
+            pass
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        with self._send_lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+def _read_http_head(sock: socket.socket) -> Tuple[str, dict, bytes]:
+    """Read an HTTP request/response head.
+
+    Returns the start line, a lower-cased header dict and any bytes
+    received past the blank line (the start of the frame stream).
+    """
+    data = b""
+    while b"\r\n\r\n" not in data:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise McpConnectionError("Connection closed during WebSocket handshake")
+        data += chunk
+        if len(data) > _MAX_HEADER_BYTES:
+            raise McpConnectionError("WebSocket handshake header too large")
+    head, rest = data.split(b"\r\n\r\n", 1)
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return lines[0], headers, rest
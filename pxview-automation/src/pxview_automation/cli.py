@@ -9,6 +9,8 @@ Usage::
     pxview-cli export --format csv --dir ./output
     pxview-cli run --device demo --channels 0,1 --rate 1M --time 1s \\
         --protocol i2c --scl 0 --sda 1 --export csv:./output
+    pxview-cli loop --device demo --channels 0,1 --rate 1M --time 100ms \\
+        --count 100 --export-dir ./runs --format vcd
 
 Global options::
 
@@ -29,7 +31,7 @@ from typing import Any, List, Optional
 
 from .client import McpClient
 from .exceptions import McpConnectionError, McpError, PxvError
-from .highlevel import PXView
+from .highlevel import CaptureLoop, PXView
 from ._utils import parse_duration, parse_int_list
 
 
@@ -127,15 +129,39 @@ Examples:
     p_exp.add_argument("--dir", required=True, help="Output directory")
     p_exp.add_argument("--digital-channels", default=None, help="Digital channels to export")
     p_exp.add_argument("--analog-channels", default=None, help="Analog channels to export")
+    p_exp.add_argument(
+        "--stream", action="store_true",
+        help="Stream the export back and write --dir locally instead of on the server",
+    )
+    p_exp.add_argument(
+        "--compress", default=None, choices=["gzip", "zstd"], help="Compress --stream output"
+    )
 
     # ---- export-table ----
     p_et = subparsers.add_parser("export-table", help="Export decoder results as CSV table")
     p_et.add_argument("--analyzer-id", default=None, help="Specific analyzer (default: all)")
     p_et.add_argument("--out", required=True, help="Output CSV file path")
+    p_et.add_argument(
+        "--stream", action="store_true",
+        help="Page results and write --out locally instead of on the server",
+    )
+    p_et.add_argument(
+        "--format", default="csv", choices=["csv", "ndjson", "columnar"],
+        help="Table format with --stream",
+    )
+    p_et.add_argument(
+        "--radix", type=int, default=0, choices=[0, 1, 2, 3, 4],
+        help="1=Binary, 2=Decimal, 3=Hex, 4=Ascii",
+    )
 
     # ---- samples ----
     p_smp = subparsers.add_parser("samples", help="Read raw samples")
-    p_smp.add_argument("--channel", type=int, required=True, help="Channel index")
+    p_smp.add_argument(
+        "--channel", required=True, help="Channel index or list (e.g. 0 or 0,1,2-4)"
+    )
+    p_smp.add_argument(
+        "--workers", type=int, default=4, help="Concurrent requests for several channels"
+    )
     p_smp.add_argument("--start", type=int, default=0, help="Start sample index")
     p_smp.add_argument("--count", type=int, default=None, help="Number of samples")
     p_smp.add_argument(
@@ -180,6 +206,29 @@ Examples:
         help="Export spec: format:path (e.g. csv:./output)",
     )
 
+    # ---- loop (pipelined repeat capture) ----
+    p_loop = subparsers.add_parser(
+        "loop", help="Repeat captures, processing each while the next one runs")
+    p_loop.add_argument("--device", required=True, help="Device ID")
+    p_loop.add_argument("--channels", default=None, help="Digital channels")
+    p_loop.add_argument("--rate", default=None, help="Sample rate")
+    p_loop.add_argument("--time", default=None, help="Capture duration per iteration")
+    p_loop.add_argument("--samples", type=int, default=None, help="Sample count per iteration")
+    p_loop.add_argument("--count", type=int, default=None, help="Number of captures")
+    p_loop.add_argument(
+        "--duration", default=None, help="Stop starting captures after this long (e.g. 10m)")
+    p_loop.add_argument(
+        "--export-dir", default=None, help="Local directory for per-capture exports")
+    p_loop.add_argument(
+        "--format", default="csv", choices=["csv", "binary", "vcd", "hex", "bits"],
+        help="Raw format for --export-dir (default: csv)")
+    p_loop.add_argument(
+        "--save-dir", default=None, help="Server-side directory for one .pxc per capture")
+    p_loop.add_argument("--no-samples", action="store_true", help="Don't read samples")
+    p_loop.add_argument("--workers", type=int, default=2, help="Worker threads (default: 2)")
+    p_loop.add_argument(
+        "--max-pending", type=int, default=2, help="Snapshots queued for workers (default: 2)")
+
     # ---- list-decoders ----
     subparsers.add_parser("list-decoders", help="List available protocol decoders")
 
@@ -313,6 +362,7 @@ def cmd_channels(client: McpClient, args: argparse.Namespace) -> None:
 def cmd_capture(client: McpClient, args: argparse.Namespace) -> None:
     pxv = PXView.__new__(PXView)
     pxv._client = client
+    pxv._sample_cache = None
 
     channels = parse_int_list(args.channels) if args.channels else None
     analog_channels = parse_int_list(args.analog_channels) if args.analog_channels else None
@@ -383,6 +433,14 @@ def cmd_results(client: McpClient, args: argparse.Namespace) -> None:
 def cmd_export(client: McpClient, args: argparse.Namespace) -> None:
     digital = parse_int_list(args.digital_channels) if args.digital_channels else None
     analog = parse_int_list(args.analog_channels) if args.analog_channels else None
+    if args.stream:
+        written = client.export_raw_data_stream(
+            args.format, args.dir, digital, analog, compression=args.compress,
+        )
+        _print(written if args.json else
+               f"Exported {len(written)} file(s), {sum(written.values())} bytes to {args.dir}",
+               args.json)
+        return
     result = client.export_raw_data(
         format=args.format,
         directory=args.dir,
@@ -393,7 +451,19 @@ def cmd_export(client: McpClient, args: argparse.Namespace) -> None:
 
 
 def cmd_export_table(client: McpClient, args: argparse.Namespace) -> None:
-    analyzers = [{"analyzerId": args.analyzer_id}] if args.analyzer_id else None
+    if args.stream:
+        ids = [args.analyzer_id] if args.analyzer_id else [
+            d["instance_id"] for d in client.get_active_decoders()]
+        rows = client.export_data_table_stream(
+            args.out,
+            analyzers=[{"analyzerId": i, "radixType": args.radix} for i in ids],
+            format=args.format,
+        )
+        _print({"rows": rows, "path": args.out} if args.json
+               else f"Wrote {rows} rows to {args.out}", args.json)
+        return
+    analyzers = ([{"analyzerId": args.analyzer_id, "radixType": args.radix}]
+                 if args.analyzer_id else None)
     result = client.export_data_table_csv(
         filepath=args.out,
         analyzers=analyzers,
@@ -404,6 +474,11 @@ def cmd_export_table(client: McpClient, args: argparse.Namespace) -> None:
 def cmd_samples(client: McpClient, args: argparse.Namespace) -> None:
     count = args.count
     end = args.start + count if count else None
+    channels = parse_int_list(str(args.channel))
+    if len(channels) > 1:
+        _print_samples_many(client, args, channels, end)
+        return
+    args.channel = channels[0]
 
     if args.type == "logic":
         data = client.get_samples(channel_type="logic", 
@@ -448,6 +523,39 @@ def cmd_samples(client: McpClient, args: argparse.Namespace) -> None:
                 print(f"[{args.start + i}] {v}")
 
 
+def _print_samples_many(
+    client: McpClient, args: argparse.Namespace, channels: List[int], end: Optional[int]
+) -> None:
+    batch = client.get_samples_many(
+        channels, args.type, args.start, end, max_workers=args.workers
+    )
+    if args.json:
+        data = {
+            str(ch): v.hex() if isinstance(v, bytes) else v for ch, v in batch.data.items()
+        }
+        print(json.dumps({
+            "channels": data,
+            "count": len(next(iter(batch.data.values()))),
+            "elapsed_seconds": round(batch.elapsed_seconds, 6),
+            "throughput_mbps": round(batch.throughput_mbps, 3),
+        }))
+        return
+    columns = list(batch.data.values())
+    fmt = {"hex": "0x{:02X}", "bin": "{:08b}", "dec": "{}"}[args.format]
+    print("sample  " + "  ".join(f"ch{ch}" for ch in channels))
+    for i in range(min(len(c) for c in columns)):
+        if args.type == "logic":
+            row = "  ".join(fmt.format(c[i]) for c in columns)
+        else:
+            row = "  ".join(str(c[i]) for c in columns)
+        print(f"[{args.start + i}] {row}")
+    print(
+        f"{batch.sample_count} samples in {batch.elapsed_seconds:.3f}s "
+        f"({batch.throughput_mbps:.1f} MB/s, {batch.requests} requests)",
+        file=sys.stderr,
+    )
+
+
 def cmd_status(client: McpClient, args: argparse.Namespace) -> None:
     status = client.get_capture_status()
     _print(status, args.json)
@@ -502,6 +610,7 @@ def cmd_run(client: McpClient, args: argparse.Namespace) -> None:
     """All-in-one: capture + decode + export."""
     pxv = PXView.__new__(PXView)
     pxv._client = client
+    pxv._sample_cache = None
 
     channels = parse_int_list(args.channels) if args.channels else None
     rate = _parse_rate(args.rate) if args.rate else None
@@ -562,6 +671,42 @@ def cmd_run(client: McpClient, args: argparse.Namespace) -> None:
             print(f"  ... and {len(results) - 20} more")
 
 
+def cmd_loop(client: McpClient, args: argparse.Namespace) -> None:
+    """Pipelined repeat capture; Ctrl-C stops after the current capture."""
+    pxv = PXView.__new__(PXView)
+    pxv._client = client
+    pxv._sample_cache = None
+
+    def report(snap: Any) -> None:
+        timings = " ".join(f"{k}={v * 1000:.0f}ms" for k, v in snap.timings.items())
+        print(f"#{snap.index}: {snap.sample_count} samples, "
+              f"{sum(len(a) for a in snap.annotations.values())} annotations  {timings}")
+
+    loop = CaptureLoop(
+        pxv,
+        args.device,
+        channels=parse_int_list(args.channels) if args.channels else None,
+        sample_rate=_parse_rate(args.rate) if args.rate else None,
+        duration_s=parse_duration(args.time) if args.time else None,
+        sample_count=args.samples,
+        read_samples=not args.no_samples,
+        save_dir=args.save_dir,
+        export_dir=args.export_dir,
+        export_format=args.format,
+        handlers=[] if args.json else [report],
+        workers=args.workers,
+        max_pending=args.max_pending,
+    )
+    try:
+        stats = loop.run(
+            count=args.count,
+            duration_s=parse_duration(args.duration) if args.duration else None,
+        )
+    except KeyboardInterrupt:
+        stats = loop.stats()
+    _print(stats, args.json)
+
+
 # ======================================================================
 # Command dispatch
 # ======================================================================
@@ -580,6 +725,7 @@ _COMMAND_MAP = {
     "save": cmd_save,
     "load": cmd_load,
     "run": cmd_run,
+    "loop": cmd_loop,
     "list-decoders": cmd_list_decoders,
     "dump-schema": cmd_dump_schema,
 }
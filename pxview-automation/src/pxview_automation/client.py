@@ -20,20 +20,50 @@ Or as a context manager::
     with McpClient() as client:
         client.connect()
         devices = client.get_devices()
+
+A single client may be shared between threads; see :class:`McpClient`.
 """
 
 from __future__ import annotations
 
+import array
 import base64
+import gzip
+import http.client
 import json
+import os
+import sys
+import threading
 import time
 import urllib.error
+import urllib.parse
 import urllib.request
-from typing import Any, Dict, List, Optional
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
+from . import _json
 from ._utils import to_windows_path
-from .exceptions import McpConnectionError, McpError
+from .events import Event, EventKey, EventStream
+from .exceptions import ConfigError, McpConnectionError, McpError
+from .stats import CallRecord, ClientStats, Hook, TimedHTTPHandler, begin_phases, end_phases
+from .tool_cache import INVALIDATING_EVENTS, ToolCache
 from .types import (
+    AnnotationDelta,
+    AnnotationTable,
     AppInfo,
     CaptureStatus,
     ChannelInfo,
@@ -41,7 +71,9 @@ from .types import (
     DataTableFilter,
     DeviceDesc,
     ProbeConfig,
+    SampleBatch,
     SampleConfig,
+    ServiceEvent,
 )
 
 # ------------------------------------------------------------------
@@ -57,12 +89,71 @@ from .types import (
 # Installing an opener with an empty ProxyHandler({}) at module import
 # time guarantees that urlopen() never uses a proxy, regardless of
 # registry or environment settings.
+#
+# The same opener carries TimedHTTPHandler, which reports connect /
+# send / time-to-first-byte phases for McpClient.stats().
 # ------------------------------------------------------------------
 _no_proxy_handler = urllib.request.ProxyHandler({})
-_urllib_opener = urllib.request.build_opener(_no_proxy_handler)
+_urllib_opener = urllib.request.build_opener(_no_proxy_handler, TimedHTTPHandler())
 urllib.request.install_opener(_urllib_opener)
 
 
+
+# Transient client memory per sample while a get_samples response is in
+# flight (JSON body + decoded copy): base64 text for logic, JSON float
+# text plus Python floats for analog / DSO.
+_INFLIGHT_BYTES_PER_SAMPLE = {"logic": 4, "analog": 48, "dso": 48}
+
+
+# tools/call ``_meta`` flag and result ``_meta`` key for structuredContent.
+_STRUCTURED_ONLY = "pxview/structuredOnly"
+_STRUCTURED_UNWRAP = "pxview/unwrap"
+
+
+# Tools annotated read-only whose side effects still make cached
+# results stale (device rescan, capture completion).
+_CACHE_INVALIDATING_READS = frozenset({"refresh_device_list", "wait_capture"})
+
+# Tools that may change which device the active session is bound to.
+# Any other tool given a ``deviceId`` argument may connect it as well.
+_DEVICE_SWITCHING_TOOLS = frozenset({
+    "connect_device", "disconnect_device", "create_session", "destroy_session",
+    "set_active_session", "load_capture", "close_capture",
+})
+
+# Service events after which the tracked active device is re-checked.
+_DEVICE_EVENTS = (ServiceEvent.DEVICE_LIST_UPDATED, ServiceEvent.DEVICE_DETACHED)
+
+
+def _invalidate_tools(cache: ToolCache, tools: Optional[Tuple[str, ...]], event: Event) -> None:
+    """Event handler: drop the cached results *event* may have changed."""
+    cache.invalidate(tools)
+
+
+class _BlobGone(Exception):
+    """A blob handle expired (or was evicted) before it was fetched."""
+
+
+class _ByteBudget:
+    """Counting semaphore over bytes; one oversized request may run alone."""
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> None:
+        with self._cond:
+            while self._used and self._used + n > self._limit:
+                self._cond.wait()
+            self._used += n
+
+    def release(self, n: int) -> None:
+        with self._cond:
+            self._used -= n
+            self._cond.notify_all()
+
+
 class McpClient:
     """MCP JSON-RPC 2.0 client for PXView.
 
@@ -76,12 +167,48 @@ class McpClient:
         max_retries: Number of retries on connection failure.
         retry_delay: Delay between retries in seconds.
         auto_connect: If True, call :meth:`connect` in ``__init__``.
+        ws_url:      WebSocket transport URL used by :meth:`events`.
+                     Defaults to port 10430 on the MCP host.
+        blob_threshold: ``get_samples`` payloads of at least this many
+                     bytes are fetched out of band from the server's
+                     ``/mcp/blob/<id>`` endpoint as raw bytes instead of
+                     base64 inside the JSON-RPC response.  Only used when
+                     the server advertises ``blobTransfer``; None disables.
+        structured_content: Read tool results from ``structuredContent``
+                     when the server provides it (and ask the server to
+                     leave out the duplicate ``content[0].text``) instead
+                     of parsing the JSON text a second time.
+        compression: Send ``Accept-Encoding: gzip, deflate`` so the server
+                     may compress responses above its size threshold
+                     (``--compress-min-bytes``, 1 KiB by default).
+        tool_cache:  Optional :class:`~pxview_automation.ToolCache` that
+                     serves repeated read-only calls (``get_devices``,
+                     ``get_channels``, ...) from memory for a per-tool
+                     TTL and coalesces identical concurrent calls.
+
+    Thread safety:
+        One client may be shared by any number of threads.  Request ids
+        are allocated atomically, every request uses its own HTTP
+        connection (the server answers with ``Connection: close``, so
+        there is no socket to share or pool), and the automatic
+        re-handshake after a connection failure is single-flight: when
+        many threads fail at once, one re-runs :meth:`connect` and the
+        others retry on the refreshed session.  Tool calls are not
+        serialized; concurrent calls that change server state (e.g. two
+        captures) still need coordination by the caller.
 
     Attributes:
         url:         MCP endpoint URL.
+        ws_url:      WebSocket transport URL.
         timeout:     Default HTTP timeout in seconds.
         max_retries: Number of retries on connection failure.
         retry_delay: Delay between retries in seconds.
+        blob_threshold: Minimum ``get_samples`` payload (bytes) fetched
+                     as a blob; None = always inline.
+        structured_content: Prefer ``structuredContent`` over the text
+                     content of tool results.
+        compression: Accept gzip / deflate encoded responses.
+        tool_cache:  The :class:`ToolCache` in use, or None.
     """
 
     # ---- Construction & context manager ----
@@ -94,14 +221,56 @@ class McpClient:
         retry_delay: float = 0.5,
         *,
         auto_connect: bool = False,
+        ws_url: Optional[str] = None,
+        blob_threshold: Optional[int] = 1 << 20,
+        structured_content: bool = True,
+        compression: bool = True,
+        tool_cache: Optional[ToolCache] = None,
     ):
+        if blob_threshold is not None and blob_threshold <= 0:
+            raise ConfigError("blob_threshold must be positive or None")
         self.url = url
+        if ws_url is None:
+            host = urllib.parse.urlsplit(url).hostname or "127.0.0.1"
+            ws_url = f"ws://{host}:10430"
+        self.ws_url = ws_url
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.blob_threshold = blob_threshold
+        self.structured_content = structured_content
+        self.compression = compression
+        self.tool_cache = tool_cache
+        # Tools annotated readOnlyHint by the server; any other tool
+        # call invalidates the tool cache.
+        self._read_only_tools: frozenset = frozenset()
+        # Event stream the tool cache's invalidation handlers are on.
+        self._tool_cache_stream: Optional[EventStream] = None
+        # Device this client last connected or saw active, None when
+        # unknown; see ensure_device().
+        self._active_device: Optional[str] = None
+        # Event stream the device tracking handlers are on.
+        self._device_stream: Optional[EventStream] = None
+        # True once the server advertised that it honours the
+        # "pxview/structuredOnly" request flag.
+        self._structured_only = False
+        # Blob endpoint path prefix from the initialize result, None if
+        # the server does not support out-of-band results.
+        self._blob_path: Optional[str] = None
         self._request_id = 0
+        self._id_lock = threading.Lock()
+        # Guards connect()/reconnect and the shared event stream.  It is
+        # re-entrant because connect() issues requests through _post.
+        self._connect_lock = threading.RLock()
+        # Bumped by every successful connect(); lets a failing request
+        # tell whether another thread already re-handshaked.
+        self._generation = 0
         self._connected = False
         self._tools: List[Dict[str, Any]] = []
+        self._event_stream: Optional[EventStream] = None
+        self._stats = ClientStats()
+        self._request_hooks: List[Hook] = []
+        self._response_hooks: List[Hook] = []
 
         # Proxy bypass is handled at module level via ProxyHandler({})
         # (see top of file).  The NO_PROXY env var approach was insufficient
@@ -125,8 +294,26 @@ class McpClient:
     # ==================================================================
 
     def _next_id(self) -> int:
-        self._request_id += 1
-        return self._request_id
+        with self._id_lock:
+            self._request_id += 1
+            return self._request_id
+
+    def _reconnect(self, generation: int) -> None:
+        """Re-run the handshake once per connection *generation*.
+
+        Threads whose request failed under the same generation queue on
+        the lock; the first one reconnects and the rest return as soon
+        as they see the generation has moved on (or that the client is
+        no longer connected, e.g. because the re-handshake failed).
+        """
+        with self._connect_lock:
+            if generation != self._generation or not self._connected:
+                return
+            self._connected = False
+            try:
+                self.connect()
+            except Exception:
+                pass
 
     @staticmethod
     def _parse_sse_response(text: str) -> dict:
@@ -146,37 +333,34 @@ class McpClient:
         detected.
         """
         if not text.startswith("event:"):
-            return json.loads(text)
+            return _json.loads(text)
 
         result_json: Optional[dict] = None
         current_event: Optional[str] = None
         current_data_lines: list[str] = []
 
+        # Only "result" events are decoded; progress events carry nothing
+        # the caller sees, so their JSON is never parsed.
         for line in text.split("\n"):
             if line.startswith("event:"):
                 current_event = line[6:].strip()
             elif line.startswith("data:"):
-                current_data_lines.append(line[5:].strip())
+                if current_event == "result":
+                    current_data_lines.append(line[5:].strip())
             elif line.strip() == "":
-                if current_event and current_data_lines:
-                    data_str = "\n".join(current_data_lines)
+                if current_event == "result" and current_data_lines:
                     try:
-                        parsed = json.loads(data_str)
-                        if current_event == "result":
-                            result_json = parsed
-                    except (json.JSONDecodeError, ValueError):
+                        result_json = _json.loads("\n".join(current_data_lines))
+                    except ValueError:
                         pass
                 current_event = None
                 current_data_lines = []
 
         # Handle last event (if no trailing empty line)
-        if current_event and current_data_lines:
-            data_str = "\n".join(current_data_lines)
+        if current_event == "result" and current_data_lines:
             try:
-                parsed = json.loads(data_str)
-                if current_event == "result":
-                    result_json = parsed
-            except (json.JSONDecodeError, ValueError):
+                result_json = _json.loads("\n".join(current_data_lines))
+            except ValueError:
                 pass
 
         if result_json is not None:
@@ -192,36 +376,67 @@ class McpClient:
         brief network glitch doesn't permanently break the client.
         """
         t = timeout if timeout is not None else min(self.timeout, 30.0)
-        raw = json.dumps(body).encode("utf-8")
+        raw = _json.dumps(body)
+        method = body.get("method", "")
+        tool = method
+        if method == "tools/call":
+            tool = (body.get("params") or {}).get("name", method)
+        rec = CallRecord(tool, method, body.get("id"), len(raw))
+        self._run_hooks(self._request_hooks, rec)
+
+        t0 = time.perf_counter()
+        try:
+            return self._send(raw, t, rec)
+        except BaseException as exc:
+            rec.error = exc
+            raise
+        finally:
+            end_phases()
+            rec.timings["total"] = time.perf_counter() - t0
+            self._stats.record(rec)
+            self._run_hooks(self._response_hooks, rec)
+
+    def _send(self, raw: bytes, t: float, rec: CallRecord) -> dict:
+        """Retry loop behind :meth:`_post`; fills in *rec* as it goes."""
         last_err: Optional[Exception] = None
         reconnected = False
 
         for attempt in range(self.max_retries):
+            generation = self._generation
+            rec.retries = attempt
+            timings = begin_phases()
+            rec.timings = timings
             try:
-                req = urllib.request.Request(
-                    self.url,
-                    data=raw,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json, text/event-stream",
-                        "Connection": "close",
-                    },
-                    method="POST",
-                )
+                headers = {
+                    "Content-Type": "application/json",
+                    "Accept": "application/json, text/event-stream",
+                    "Connection": "close",
+                }
+                if self.compression:
+                    headers["Accept-Encoding"] = "gzip, deflate"
+                req = urllib.request.Request(self.url, data=raw, headers=headers,
+                                             method="POST")
                 with urllib.request.urlopen(req, timeout=t) as resp:
-                    text = resp.read().decode("utf-8", errors="replace")
-                    if not text.strip():
+                    t_read = time.perf_counter()
+                    data = resp.read()
+                    t_parse = time.perf_counter()
+                    timings["read"] = t_parse - t_read
+                    data = self._decode_body(data, resp.headers, rec)
+                    if not data.strip():
                         raise McpConnectionError(
                             f"Empty response from {self.url}"
                         )
                     content_type = resp.headers.get("Content-Type", "")
                     if "text/event-stream" in content_type:
-                        return self._parse_sse_response(text)
-                    return json.loads(text)
+                        parsed = self._parse_sse_response(
+                            data.decode("utf-8", errors="replace"))
+                    else:
+                        parsed = _json.loads(data)
+                    timings["parse"] = time.perf_counter() - t_parse
+                    return parsed
             except urllib.error.HTTPError as exc:
                 try:
-                    text = exc.read().decode("utf-8", errors="replace")
-                    return json.loads(text)
+                    return _json.loads(self._decode_body(exc.read(), exc.headers, rec))
                 except Exception:
                     last_err = exc
             except McpConnectionError:
@@ -232,17 +447,28 @@ class McpClient:
                     # If the server might have restarted, try
                     # re-handshake once before retrying.
                     if not reconnected and self._connected:
-                        reconnected = True
-                        self._connected = False
-                        try:
-                            self.connect()
-                        except Exception:
-                            pass
+                        reconnected = rec.reconnected = True
+                        self._reconnect(generation)
                     time.sleep(self.retry_delay * (attempt + 1))
         raise McpConnectionError(
             f"Cannot connect to MCP server at {self.url}: {last_err}"
         )
 
+    @staticmethod
+    def _decode_body(data: bytes, headers: Any, rec: CallRecord) -> bytes:
+        """Undo the response's ``Content-Encoding`` and count both sizes."""
+        rec.response_wire_bytes = len(data)
+        encoding = (headers.get("Content-Encoding") or "").strip().lower() if headers else ""
+        try:
+            if encoding in ("gzip", "x-gzip"):
+                data = gzip.decompress(data)
+            elif encoding == "deflate":
+                data = zlib.decompress(data)
+        except (OSError, EOFError, zlib.error) as exc:
+            raise McpConnectionError(f"Corrupt {encoding} response body: {exc}") from exc
+        rec.response_bytes = len(data)
+        return data
+
     def _call_method(
         self,
         method: str,
@@ -267,17 +493,53 @@ class McpClient:
     ) -> Any:
         """Call an MCP tool and return the parsed result.
 
+        With a :attr:`tool_cache`, cached tools are answered through it
+        and every other tool that may change server state invalidates it.
+
         Raises:
             McpError: if the tool returns an error.
         """
+        if name in _DEVICE_SWITCHING_TOOLS or (arguments or {}).get("deviceId"):
+            self._active_device = None
+        cache = self.tool_cache
+        if cache is None:
+            return self._call_tool_uncached(name, arguments, timeout)
+        if cache.caches(name):
+            return cache.call(name, arguments,
+                              lambda: self._call_tool_uncached(name, arguments, timeout))
+        if name not in self._read_only_tools or name in _CACHE_INVALIDATING_READS:
+            try:
+                return self._call_tool_uncached(name, arguments, timeout)
+            finally:
+                cache.invalidate()
+        return self._call_tool_uncached(name, arguments, timeout)
+
+    def _call_tool_uncached(
+        self,
+        name: str,
+        arguments: Optional[dict],
+        timeout: Optional[float],
+    ) -> Any:
         params: Dict[str, Any] = {"name": name}
         if arguments is not None:
             params["arguments"] = arguments
+        if self.structured_content and self._structured_only:
+            params["_meta"] = {_STRUCTURED_ONLY: True}
         resp = self._call_method("tools/call", params, timeout=timeout)
-        return self._parse_tool_result(resp)
+        try:
+            return self._parse_tool_result(resp)
+        except McpError:
+            self._stats.add_error(name)
+            raise
 
     def _parse_tool_result(self, resp: dict) -> Any:
-        """Parse a tools/call response into Python objects."""
+        """Parse a tools/call response into Python objects.
+
+        ``structuredContent`` is used as-is when present (unwrapping the
+        ``{"value": ...}`` the server puts around non-object results);
+        otherwise ``content[0].text`` is parsed as JSON, or returned as a
+        string if it is not JSON.
+        """
         if "error" in resp:
             err = resp["error"]
             raise McpError(
@@ -290,15 +552,88 @@ class McpClient:
             content = result.get("content", [])
             text = content[0].get("text", "") if content else ""
             raise McpError(text)
+        if self.structured_content and isinstance(result, dict) and "structuredContent" in result:
+            structured = result["structuredContent"]
+            key = (result.get("_meta") or {}).get(_STRUCTURED_UNWRAP)
+            return structured[key] if key else structured
         content = result.get("content") if isinstance(result, dict) else None
         if content and isinstance(content, list) and len(content) > 0:
             text = content[0].get("text", "")
             try:
-                return json.loads(text)
-            except (json.JSONDecodeError, ValueError):
+                return _json.loads(text)
+            except ValueError:
                 return text
         return result
 
+    def _fetch_blob(
+        self,
+        blob: dict,
+        timeout: Optional[float] = None,
+        label: str = "get_samples/blob",
+    ) -> bytes:
+        """Download an out-of-band tool result (``GET /mcp/blob/<id>``).
+
+        The body is checked against the handle's size and the response's
+        ``Content-Length``; a short read resumes with a ``Range`` request
+        for the missing tail instead of starting over.
+
+        Raises:
+            _BlobGone: if the blob expired before it could be read.
+            McpConnectionError: if the endpoint cannot be reached.
+        """
+        parts = urllib.parse.urlsplit(self.url)
+        url = urllib.parse.urlunsplit((parts.scheme, parts.netloc, blob["path"], "", ""))
+        size = int(blob["size"])
+        t = timeout if timeout is not None else self.timeout
+        buf = bytearray()
+        rec = CallRecord(label, "GET", blob.get("id"))
+        self._run_hooks(self._request_hooks, rec)
+        t0 = time.perf_counter()
+        last_err: Optional[Exception] = None
+        try:
+            for attempt in range(self.max_retries):
+                rec.retries = attempt
+                headers = {"Connection": "close", "Accept-Encoding": "identity"}
+                if buf:
+                    headers["Range"] = f"bytes={len(buf)}-"
+                rec.timings = timings = begin_phases()
+                try:
+                    req = urllib.request.Request(url, headers=headers, method="GET")
+                    with urllib.request.urlopen(req, timeout=t) as resp:
+                        if buf and resp.status != 206:
+                            del buf[:]  # server ignored the Range: full body follows
+                        expected = int(resp.headers.get("Content-Length") or size - len(buf))
+                        t_read = time.perf_counter()
+                        try:
+                            chunk = resp.read()
+                        except http.client.IncompleteRead as exc:
+                            chunk = exc.partial
+                        timings["read"] = time.perf_counter() - t_read
+                        rec.response_bytes += len(chunk)
+                        rec.response_wire_bytes += len(chunk)
+                        buf += chunk
+                        if len(chunk) == expected and len(buf) == size:
+                            return bytes(buf)
+                        last_err = McpConnectionError(
+                            f"Short blob read: {len(buf)} of {size} bytes")
+                except urllib.error.HTTPError as exc:
+                    if exc.code in (404, 410, 416):
+                        raise _BlobGone(blob.get("id")) from exc
+                    last_err = exc
+                except (OSError, http.client.HTTPException) as exc:
+                    last_err = exc
+                if attempt < self.max_retries - 1:
+                    time.sleep(self.retry_delay * (attempt + 1))
+            raise McpConnectionError(f"Cannot fetch blob from {url}: {last_err}")
+        except BaseException as exc:
+            rec.error = exc
+            raise
+        finally:
+            end_phases()
+            rec.timings["total"] = time.perf_counter() - t0
+            self._stats.record(rec)
+            self._run_hooks(self._response_hooks, rec)
+
     # ==================================================================
     # Connection management
     # ==================================================================
@@ -310,6 +645,30 @@ class McpClient:
             McpError: if the initialize handshake fails.
             McpConnectionError: if the server cannot be reached.
         """
+        with self._connect_lock:
+            self._active_device = None
+            self._handshake()
+            self._generation += 1
+            if self.tool_cache is not None:
+                self.tool_cache.invalidate()
+                self._attach_tool_cache()
+
+    def _attach_tool_cache(self) -> None:
+        """Invalidate the tool cache on service events, if WS is reachable."""
+        stream = self._event_stream
+        if stream is not None and stream is self._tool_cache_stream and stream.is_open:
+            return
+        cache = self.tool_cache
+        if cache is None:
+            return
+        try:
+            for event, tools in INVALIDATING_EVENTS.items():
+                self.on(event, partial(_invalidate_tools, cache, tools))
+        except McpConnectionError:
+            return  # TTLs and mutating calls still bound staleness
+        self._tool_cache_stream = self._event_stream
+
+    def _handshake(self) -> None:
         resp = self._call_method(
             "initialize",
             {
@@ -321,6 +680,12 @@ class McpClient:
         result = resp.get("result", resp) if isinstance(resp, dict) else {}
         if not isinstance(result, dict) or "protocolVersion" not in result:
             raise McpError(f"Initialize failed: {resp}")
+        experimental = (result.get("capabilities") or {}).get("experimental") or {}
+        blob = experimental.get("blobTransfer")
+        self._blob_path = blob.get("path") if isinstance(blob, dict) else None
+        structured = experimental.get("structuredContent")
+        self._structured_only = isinstance(structured, dict) and bool(
+            structured.get("structuredOnly"))
         self._call_method("notifications/initialized", {})
         tools_resp = self._call_method("tools/list", {})
         tools_result = (
@@ -333,11 +698,22 @@ class McpClient:
             if isinstance(tools_result, dict)
             else []
         )
+        self._read_only_tools = frozenset(
+            t.get("name") for t in self._tools
+            if (t.get("annotations") or {}).get("readOnlyHint"))
         self._connected = True
 
     def disconnect(self) -> None:
-        """Disconnect from the MCP server."""
-        self._connected = False
+        """Disconnect from the MCP server.
+
+        Also closes the shared event stream opened by :meth:`on`.
+        """
+        with self._connect_lock:
+            self._connected = False
+            self._active_device = None
+            stream, self._event_stream = self._event_stream, None
+        if stream is not None:
+            stream.close()
 
     @property
     def connected(self) -> bool:
@@ -419,6 +795,122 @@ class McpClient:
         except McpError:
             return False
 
+    # ==================================================================
+    # Instrumentation
+    # ==================================================================
+
+    def stats(self) -> ClientStats:
+        """Snapshot of per-tool call counts, bytes and latency histograms.
+
+        Export with ``.to_dict()``, ``.to_json()`` or ``.to_prometheus()``;
+        see :mod:`pxview_automation.stats` for the recorded phases.
+        """
+        return self._stats.snapshot()
+
+    def reset_stats(self) -> None:
+        """Clear all recorded statistics."""
+        self._stats.reset()
+
+    def on_request(self, hook: Hook) -> Hook:
+        """Register ``hook(record)``, called before each request is sent.
+
+        Hooks run on the calling thread.  Exceptions raised by a hook are
+        counted in ``stats().hook_errors`` and otherwise ignored.
+
+        Returns:
+            *hook*, for later removal via :meth:`remove_hook`.
+        """
+        self._request_hooks.append(hook)
+        return hook
+
+    def on_response(self, hook: Hook) -> Hook:
+        """Register ``hook(record)``, called when a request finishes.
+
+        The :class:`~pxview_automation.stats.CallRecord` carries phase
+        timings, byte counts, retries and the error (if any).  It is the
+        same object the ``on_request`` hooks saw.
+
+        Returns:
+            *hook*, for later removal via :meth:`remove_hook`.
+        """
+        self._response_hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Unregister a hook added with :meth:`on_request` / :meth:`on_response`."""
+        for hooks in (self._request_hooks, self._response_hooks):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    def _run_hooks(self, hooks: List[Hook], rec: CallRecord) -> None:
+        for hook in list(hooks):
+            try:
+                hook(rec)
+            except Exception:
+                self._stats.add_hook_error()
+
+    # ==================================================================
+    # Service events (WebSocket transport)
+    # ==================================================================
+
+    def events(
+        self,
+        topics: Optional[List[str]] = None,
+        *,
+        max_queue: int = 1024,
+        drop_policy: str = "drop_oldest",
+    ) -> EventStream:
+        """Open a topic-filtered subscription to service events.
+
+        The returned :class:`~pxview_automation.events.EventStream` is
+        already connected and reading in the background; close it (or
+        use it as a context manager) when done.
+
+        Args:
+            topics:      Topics to subscribe to (e.g. ``['capture_state',
+                         'data_updated']``).  None subscribes to all.
+            max_queue:   Maximum number of unconsumed events to keep.
+            drop_policy: ``'drop_oldest'``, ``'drop_newest'`` or ``'block'``.
+
+        Raises:
+            McpConnectionError: if the WS transport is unreachable.
+        """
+        stream = EventStream(
+            self.ws_url,
+            topics,
+            max_queue=max_queue,
+            drop_policy=drop_policy,
+            timeout=min(self.timeout, 10.0),
+        )
+        stream.open()
+        return stream
+
+    def on(self, event: EventKey, handler: Callable[[Event], None]) -> Callable[[Event], None]:
+        """Register a handler for a service event on a shared stream.
+
+        The first call opens an all-topics :class:`EventStream` owned by
+        this client; it is closed by :meth:`disconnect`.  Handlers run
+        on the stream's reader thread.
+
+        Args:
+            event:   :class:`ServiceEvent`, its name (``'DataUpdated'``),
+                     or ``'*'`` for every event.
+            handler: Callable receiving an :class:`Event`.
+
+        Returns:
+            *handler*, for later removal via ``client.event_stream.off``.
+        """
+        with self._connect_lock:
+            if self._event_stream is None or not self._event_stream.is_open:
+                self._event_stream = self.events(max_queue=256)
+            stream = self._event_stream
+        return stream.on(event, handler)
+
+    @property
+    def event_stream(self) -> Optional[EventStream]:
+        """The shared stream opened by :meth:`on`, if any."""
+        return self._event_stream
+
     def wait_for_server(
         self, timeout: float = 60.0, interval: float = 1.0
     ) -> bool:
@@ -734,21 +1226,18 @@ class McpClient:
         Args:
             analyzer_name:         Decoder ID (e.g. ``'i2c'``).
             settings:              Channel map + options dict.
-            device_id:             Connect this device first (headless).
+            device_id:             Connect this device first unless it is
+                                   already active (see :meth:`ensure_device`).
             analyzer_label:        Custom display label.
             stack_on_analyzer_id:  Stack on an existing analyzer.
 
         Returns:
             Analyzer instance ID string (e.g. ``'1:1'``).
         """
-        # If device_id is provided, ensure the device is connected first.
         # The MCP add_analyzer tool does not have a deviceId parameter;
-        # device connection must be done via connect_device beforehand.
+        # the device is connected beforehand unless it already is active.
         if device_id is not None:
-            try:
-                self.connect_device(device_id)
-            except Exception:
-                pass  # Already connected
+            self.ensure_device(device_id)
 
         args: dict = {"decoderId": analyzer_name}
         # Flatten settings into top-level channelMap and options
@@ -777,6 +1266,57 @@ class McpClient:
             timeout=timeout,
         )
 
+    @overload
+    def get_analyzer_results(
+        self,
+        analyzer_id: str,
+        start_sample: Optional[int] = ...,
+        end_sample: Optional[int] = ...,
+        max_count: int = ...,
+        ann_class: Optional[int] = ...,
+        include_metadata: bool = ...,
+        timeout: Optional[float] = ...,
+        *,
+        ann_classes: Optional[Sequence[int]] = ...,
+        fields: Optional[Sequence[str]] = ...,
+        format: Literal["rows"] = ...,
+        since_version: Optional[int] = ...,
+    ) -> dict: ...
+
+    @overload
+    def get_analyzer_results(
+        self,
+        analyzer_id: str,
+        start_sample: Optional[int] = ...,
+        end_sample: Optional[int] = ...,
+        max_count: int = ...,
+        ann_class: Optional[int] = ...,
+        include_metadata: bool = ...,
+        timeout: Optional[float] = ...,
+        *,
+        ann_classes: Optional[Sequence[int]] = ...,
+        fields: Optional[Sequence[str]] = ...,
+        format: Literal["columnar"],
+        since_version: Optional[int] = ...,
+    ) -> AnnotationTable: ...
+
+    @overload
+    def get_analyzer_results(
+        self,
+        analyzer_id: str,
+        start_sample: Optional[int] = ...,
+        end_sample: Optional[int] = ...,
+        max_count: int = ...,
+        ann_class: Optional[int] = ...,
+        include_metadata: bool = ...,
+        timeout: Optional[float] = ...,
+        *,
+        ann_classes: Optional[Sequence[int]] = ...,
+        fields: Optional[Sequence[str]] = ...,
+        format: str = ...,
+        since_version: Optional[int] = ...,
+    ) -> Union[dict, AnnotationTable]: ...
+
     def get_analyzer_results(
         self,
         analyzer_id: str,
@@ -784,21 +1324,46 @@ class McpClient:
         end_sample: Optional[int] = None,
         max_count: int = 1000,
         ann_class: Optional[int] = None,
+        include_metadata: bool = False,
         timeout: Optional[float] = None,
-    ) -> List[dict]:
+        *,
+        ann_classes: Optional[Sequence[int]] = None,
+        fields: Optional[Sequence[str]] = None,
+        format: str = "rows",
+        since_version: Optional[int] = None,
+    ) -> Union[dict, AnnotationTable]:
         """Get protocol analyzer decoded annotations.
 
         Args:
-            analyzer_id:  Analyzer instance ID.
-            start_sample: Start sample index (0-based).
-            end_sample:   End sample index (exclusive).
-            max_count:    Maximum annotations to return.
-            ann_class:    If given, only return annotations of this class.
+            analyzer_id:      Analyzer instance ID.
+            start_sample:     Start sample index (0-based).
+            end_sample:       End sample index (exclusive).
+            max_count:        Maximum annotations to return.
+            ann_class:        If given, only return annotations of this class.
+            include_metadata: Add ``metadata.classNames`` (not paged).
+            ann_classes:      Only return annotations of these classes
+                              (combined with *ann_class*).
+            fields:           Subset of ``start_sample``, ``end_sample``,
+                              ``ann_class`` and ``texts`` to return.
+            format:           ``'rows'`` (one dict per annotation) or
+                              ``'columnar'`` (parallel arrays, decoded
+                              into an :class:`AnnotationTable`).
+            since_version:    Only annotations appended since this
+                              ``version`` of an earlier delta read (0 =
+                              from the start); the result adds
+                              ``version``, ``reset`` and ``more``.
 
         Returns:
-            List of annotation dicts: ``ann_class``, ``ann_class_id``,
-            ``data``, ``start_sample``, ``end_sample``, ``row_index``.
+            ``'rows'``: the tool result, with ``annotations`` as a list of
+            annotation dicts.  ``'columnar'``: an :class:`AnnotationTable`
+            (``metadata`` and the delta keys in
+            :attr:`AnnotationTable.metadata`).
+
+        Raises:
+            ConfigError: on an unknown *format*.
         """
+        if format not in ("rows", "columnar"):
+            raise ConfigError(f"format must be 'rows' or 'columnar', got {format!r}")
         args: dict = {"analyzerId": analyzer_id, "maxCount": max_count}
         if start_sample is not None:
             args["startSample"] = start_sample
@@ -806,9 +1371,96 @@ class McpClient:
             args["endSample"] = end_sample
         if ann_class is not None:
             args["annClass"] = ann_class
-        return self._call_tool(
+        if ann_classes:
+            args["annClasses"] = list(ann_classes)
+        if fields is not None:
+            args["fields"] = list(fields)
+        if format != "rows":
+            args["format"] = format
+        if since_version is not None:
+            args["sinceVersion"] = since_version
+        if include_metadata:
+            args["includeMetadata"] = True
+        result = self._call_tool(
             "get_analyzer_results", args, timeout=timeout
         )
+        if format == "columnar":
+            table = AnnotationTable.from_columnar(result)
+            for key in ("version", "reset", "more"):
+                if key in result:
+                    table.metadata[key] = result[key]
+            return table
+        return result
+
+    def follow_analyzer(
+        self,
+        analyzer_id: str,
+        *,
+        since_version: int = 0,
+        ann_classes: Optional[Sequence[int]] = None,
+        page_size: int = 1000,
+        poll_interval_s: float = 0.25,
+        use_events: bool = True,
+        stop_event: Optional[threading.Event] = None,
+        idle_timeout_s: Optional[float] = None,
+    ) -> Iterator[AnnotationDelta]:
+        """Yield annotations as a stream or repeat capture decodes them.
+
+        Each ``get_analyzer_results(since_version=...)`` call returns only
+        the annotations appended since the previous one, so following a
+        long capture costs the same per annotation however long it runs.
+        With *use_events* the generator waits for ``DataUpdated`` /
+        ``DecodeProgress`` notifications between reads and only falls back
+        to polling every *poll_interval_s* when the WS transport is
+        unreachable or quiet.
+
+        Args:
+            analyzer_id:     Analyzer instance ID.
+            since_version:   Resume after this version (0 = from the start).
+            ann_classes:     Only follow these annotation classes.
+            page_size:       Maximum annotations per request.
+            poll_interval_s: Longest wait between reads.
+            use_events:      Wake up on service events instead of polling.
+            stop_event:      Stop once this event is set.
+            idle_timeout_s:  Stop after this long without new annotations.
+
+        Yields:
+            :class:`AnnotationDelta` per non-empty read, and on every
+            ``reset`` (the decode started over).
+        """
+        events: Optional[EventStream] = None
+        if use_events:
+            try:
+                events = self.events(["data_updated", "decode", "capture_state"])
+            except McpConnectionError:
+                events = None
+        version = since_version
+        last_new = time.monotonic()
+        try:
+            while True:
+                result = self.get_analyzer_results(
+                    analyzer_id, max_count=page_size, ann_classes=ann_classes,
+                    since_version=version)
+                version = result.get("version", version)
+                anns = result.get("annotations", [])
+                if anns or result.get("reset"):
+                    last_new = time.monotonic()
+                    yield AnnotationDelta(anns, version, bool(result.get("reset")))
+                if result.get("more"):
+                    continue
+                if stop_event is not None and stop_event.is_set():
+                    return
+                if idle_timeout_s is not None and time.monotonic() - last_new >= idle_timeout_s:
+                    return
+                if events is not None and events.is_open:
+                    if events.get(timeout=poll_interval_s) is not None:
+                        while events.get(timeout=0) is not None:
+                            pass
+                else:
+                    time.sleep(poll_interval_s)
+        finally:
+            if events is not None:
+                events.close()
 
     def export_raw_data(
         self,
@@ -838,6 +1490,152 @@ class McpClient:
         args["iso8601Timestamp"] = iso8601_timestamp
         return self._call_tool("export_raw_data", args, timeout=timeout)
 
+    def export_raw_data_stream(
+        self,
+        format: str,
+        destination: Any,
+        digital_channels: Optional[List[int]] = None,
+        analog_channels: Optional[List[int]] = None,
+        *,
+        analog_downsample_ratio: int = 1,
+        iso8601_timestamp: bool = False,
+        compression: Optional[str] = None,
+        compresslevel: Optional[int] = None,
+        chunk_bytes: int = 4 << 20,
+        prefetch: int = 4,
+    ) -> Dict[str, int]:
+        """Export raw capture data to the local machine instead of the server.
+
+        PXView renders each channel exactly as :meth:`export_raw_data`
+        would (same output module, same :meth:`set_export_config` range)
+        but streams the bytes back over MCP, so nothing is written on the
+        instrument host.
+
+        Args:
+            format:           ``'csv'``, ``'binary'``, ``'vcd'``, ``'hex'``, ``'bits'``.
+            destination:      Local directory (one file per channel, named
+                              as :meth:`export_raw_data` names them, plus
+                              ``.gz`` / ``.zst``), or a binary file-like
+                              object for a single channel.
+            digital_channels: Logic channels (default: all enabled logic
+                              channels when no *analog_channels* are given).
+            analog_channels:  Analog channels.
+            analog_downsample_ratio: Analog downsample ratio.
+            iso8601_timestamp: Use ISO8601 timestamps.
+            compression:      None, ``'gzip'`` or ``'zstd'`` (needs ``zstandard``).
+            compresslevel:    Compressor level.
+            chunk_bytes:      Bytes per ``read_export_stream`` request.
+            prefetch:         Chunks read ahead of the writer (bounds memory
+                              when the sink is slower than the link).
+
+        Returns:
+            Dict of server file name (e.g. ``channel_0.csv``) → bytes
+            written before compression.
+
+        Raises:
+            McpError: if the server has no ``open_export_stream`` tool or
+                the export fails.
+        """
+        from .exports import _raw_format, stream_raw_data
+
+        fmt = _raw_format(format)
+        if self._tools and "open_export_stream" not in self.tool_names:
+            raise McpError("This PXView build cannot stream exports "
+                           "(no open_export_stream tool); use export_raw_data")
+        if digital_channels is None and analog_channels is None:
+            digital_channels = [
+                c["index"] for c in self.get_channels()
+                if isinstance(c, dict) and c.get("enabled") and c.get("type", 0) == 0
+            ]
+        targets = ([(ch, False) for ch in digital_channels or []]
+                   + [(ch, True) for ch in analog_channels or []])
+        to_dir = isinstance(destination, (str, os.PathLike))
+        if not to_dir and len(targets) != 1:
+            raise ConfigError("A file-like destination takes exactly one channel")
+        if to_dir:
+            os.makedirs(destination, exist_ok=True)
+        ext = {None: "", "gzip": ".gz", "zstd": ".zst"}.get(compression, "")
+        written: Dict[str, int] = {}
+        for ch, analog in targets:
+            info = self.open_export_stream(
+                fmt, ch, analog=analog, analog_downsample_ratio=analog_downsample_ratio,
+                iso8601_timestamp=iso8601_timestamp)
+            name = info["fileName"]
+            sink = os.path.join(destination, name + ext) if to_dir else destination
+            written[name] = stream_raw_data(
+                self, sink, info["streamId"], compression=compression,
+                compresslevel=compresslevel, chunk_bytes=chunk_bytes, prefetch=prefetch,
+            )
+        return written
+
+    def open_export_stream(
+        self,
+        format: str,
+        channel: int,
+        *,
+        analog: bool = False,
+        analog_downsample_ratio: int = 1,
+        iso8601_timestamp: bool = False,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """Start streaming one channel's raw export.
+
+        Returns:
+            ``{"streamId", "fileName"}``; read the bytes with
+            :meth:`read_export_stream` and release the stream with
+            :meth:`close_export_stream`.
+        """
+        return self._call_tool("open_export_stream", {
+            "format": format,
+            "channel": channel,
+            "analog": analog,
+            "analogDownsampleRatio": analog_downsample_ratio,
+            "iso8601Timestamp": iso8601_timestamp,
+        }, timeout=timeout)
+
+    def read_export_stream(
+        self,
+        stream_id: str,
+        offset: int,
+        max_bytes: int = 4 << 20,
+        wait_ms: int = 1000,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """Read the chunk of an export stream that starts at *offset*.
+
+        Chunks of at least :attr:`blob_threshold` bytes are downloaded from
+        the blob endpoint; if the handle expires first the same offset is
+        read again inline (the server keeps the last chunk for retries).
+
+        Returns:
+            ``{"offset", "eof", "data"}`` with *data* as ``bytes``; empty
+            without ``eof`` if nothing arrived within *wait_ms*.
+        """
+        args: Dict[str, Any] = {
+            "streamId": stream_id,
+            "offset": offset,
+            "maxBytes": max_bytes,
+            "waitMs": wait_ms,
+        }
+        if self._blob_path and self.blob_threshold:
+            args["blobMinBytes"] = self.blob_threshold
+        result = self._call_tool("read_export_stream", args, timeout=timeout)
+        if result.get("encoding") == "blob":
+            try:
+                data = self._fetch_blob(result["blob"], timeout=timeout,
+                                        label="read_export_stream/blob")
+            except _BlobGone:
+                args.pop("blobMinBytes")
+                result = self._call_tool("read_export_stream", args, timeout=timeout)
+                data = base64.b64decode(result["data"])
+        else:
+            data = base64.b64decode(result["data"])
+        return {"offset": int(result["offset"]), "eof": bool(result["eof"]), "data": data}
+
+    def close_export_stream(self, stream_id: str, timeout: Optional[float] = None) -> Any:
+        """Release an export stream, stopping its export if still running."""
+        return self._call_tool("close_export_stream", {"streamId": stream_id}, timeout=timeout)
+
     def export_data_table_csv(
         self,
         filepath: str,
@@ -880,6 +1678,44 @@ class McpClient:
             args["radixType"] = radix_type
         return self._call_tool("export_data_table_csv", args, timeout=timeout)
 
+    def export_data_table_stream(
+        self,
+        sink: Any,
+        analyzer_id: Optional[str] = None,
+        *,
+        analyzers: Optional[List[dict]] = None,
+        radix_type: int = 0,
+        format: str = "csv",
+        iso8601_timestamp: bool = False,
+        page_size: int = 1000,
+    ) -> int:
+        """Stream the decoder data table to a local file as it is read.
+
+        Unlike :meth:`export_data_table_csv` the file is written on the
+        client, page by page, so memory stays bounded and no shared
+        filesystem is needed.  Multi mode writes every analyzer to the
+        same *sink*.
+
+        Args:
+            sink:              File path, or text / binary file-like object.
+            analyzer_id:       Single mode: analyzer instance ID.
+            analyzers:         Multi mode: list of ``{analyzerId, radixType}`` dicts.
+            radix_type:        Radix: 1=Binary, 2=Decimal, 3=Hex, 4=Ascii.
+            format:            ``'csv'``, ``'ndjson'`` or ``'columnar'``
+                               (see :mod:`pxview_automation.exports`).
+            iso8601_timestamp: Use ISO8601 wall-clock timestamps.
+            page_size:         Annotations per request.
+
+        Returns:
+            Number of annotations written.
+        """
+        from .exports import stream_data_table
+
+        return stream_data_table(
+            self, sink, analyzer_id, analyzers=analyzers, radix_type=radix_type,
+            format=format, iso8601_timestamp=iso8601_timestamp, page_size=page_size,
+        )
+
     def get_sample_config(self, timeout: Optional[float] = None) -> dict:
         """Get the full sample configuration.
 
@@ -977,6 +1813,68 @@ class McpClient:
         """List all currently active decoder instances."""
         return self._call_tool("get_active_decoders", {}, timeout=timeout)
 
+    def wait_decoded(
+        self,
+        analyzer_ids: List[str],
+        timeout: float = 30.0,
+        events: Optional[EventStream] = None,
+    ) -> None:
+        """Block until every analyzer in *analyzer_ids* has finished decoding.
+
+        Completion is taken from ``DecodeDone`` events carrying the
+        analyzer's ``instance_id`` when *events* (a stream subscribed to
+        ``'decode'`` before the capture started) delivers them, and from
+        polling ``get_active_decoders`` until the analyzer is idle at
+        100 % progress otherwise.  The ``DecodeDone`` PXView sends when a
+        capture starts (``detail='clear_decode_data'``) resets decoding,
+        so completions queued before it are discarded.
+
+        Raises:
+            McpError: if an analyzer is not active or decoding does not
+                      finish within *timeout* seconds.
+        """
+        waiting = set(analyzer_ids)
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+
+        def seen(event: Event) -> None:
+            nonlocal waiting
+            if event.event is not ServiceEvent.DECODE_DONE:
+                return
+            if event.params.get("detail") == "clear_decode_data":
+                waiting = set(analyzer_ids)
+            else:
+                waiting.discard(event.params.get("instance_id"))
+
+        while True:
+            if events is not None:
+                for event in events.drain():
+                    seen(event)
+            if not waiting:
+                return
+            # Bypasses the tool cache: this is a freshness check.
+            decoders = self._call_tool_uncached("get_active_decoders", {}, None)
+            listed = {d.get("instance_id"): d for d in decoders or [] if isinstance(d, dict)}
+            for instance_id in list(waiting):
+                d = listed.get(instance_id)
+                if d is None:
+                    raise McpError(f"Analyzer {instance_id} is not active")
+                if not d.get("is_running") and float(d.get("progress") or 0) >= 1.0:
+                    waiting.discard(instance_id)
+            if not waiting:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise McpError(f"Decoding did not finish within {timeout:g}s "
+                               f"({', '.join(sorted(waiting))})")
+            if events is not None and events.is_open:
+                queued = events.get(timeout=min(delay, remaining))
+                if queued is not None:
+                    seen(queued)
+            else:
+                time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.2)
+
     def clear_all_decoders(self, timeout: Optional[float] = None) -> Any:
         """Remove all active decoder instances."""
         return self._call_tool("clear_all_decoders", {}, timeout=timeout)
@@ -1021,19 +1919,99 @@ class McpClient:
         )
 
     def connect_device(
-        self, device_id: str, timeout: Optional[float] = None
+        self,
+        device_id: str,
+        timeout: Optional[float] = None,
+        ready_timeout: float = 5.0,
     ) -> Any:
         """Connect to a device by ID.
 
-        Creates a new session bound to that device if no session exists.
-        Waits 1 second after connection for the server to settle.
+        Creates a new session bound to that device if no session exists,
+        then polls :meth:`get_devices` until the device is reported
+        active (usually at once) instead of sleeping a fixed second.
+
+        Args:
+            device_id:     Device ID from :meth:`get_devices`.
+            ready_timeout: Seconds to wait for the device to become active.
+
+        Raises:
+            McpError: if the connect fails or the device is not active
+                      within *ready_timeout*.
         """
         result = self._call_tool(
             "connect_device", {"deviceId": device_id}, timeout=timeout
         )
-        time.sleep(1)
+        self._wait_device_active(device_id, ready_timeout, timeout)
+        self._track_device(device_id)
         return result
 
+    def ensure_device(
+        self,
+        device_id: str,
+        timeout: Optional[float] = None,
+        ready_timeout: float = 5.0,
+    ) -> bool:
+        """Connect *device_id* unless it already is the active device.
+
+        The client remembers the device it last connected.  While the
+        shared event stream (:meth:`on`) is open that is trusted until a
+        device-switching tool call, ``DeviceListUpdated`` or
+        ``DeviceDetached``; without it one :meth:`get_devices` call
+        checks the device's ``is_active`` flag.
+
+        Returns:
+            True if :meth:`connect_device` was called, False if the
+            device was already active.
+        """
+        stream = self._event_stream
+        if (self._active_device == device_id and stream is not None
+                and stream is self._device_stream and stream.is_open):
+            return False
+        if self._device_state(device_id, timeout) is True:
+            self._track_device(device_id)
+            return False
+        self.connect_device(device_id, timeout=timeout, ready_timeout=ready_timeout)
+        return True
+
+    @property
+    def active_device(self) -> Optional[str]:
+        """ID of the device this client knows to be active, or None."""
+        return self._active_device
+
+    def _device_state(self, device_id: str, timeout: Optional[float]) -> Optional[bool]:
+        """``is_active`` of *device_id* per ``get_devices`` (None if unlisted)."""
+        # Bypasses the tool cache: this is a freshness check.
+        devices = self._call_tool_uncached("get_devices", {}, timeout)
+        for dev in devices if isinstance(devices, list) else ():
+            if isinstance(dev, dict) and str(dev.get("id")) == device_id:
+                return bool(dev.get("is_active", True))
+        return None
+
+    def _wait_device_active(self, device_id: str, ready_timeout: float,
+                            timeout: Optional[float]) -> None:
+        deadline = time.monotonic() + ready_timeout
+        delay = 0.01
+        # A device missing from the list (e.g. a loaded file) has
+        # nothing to wait for.
+        while self._device_state(device_id, timeout) is False:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise McpError(f"Device {device_id} not active after {ready_timeout:g} s")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.2)
+
+    def _track_device(self, device_id: str) -> None:
+        """Remember *device_id* as active; forget it on device events."""
+        stream = self._event_stream
+        if stream is not None and stream.is_open and stream is not self._device_stream:
+            for event in _DEVICE_EVENTS:
+                stream.on(event, self._forget_device)
+            self._device_stream = stream
+        self._active_device = device_id
+
+    def _forget_device(self, event: Event) -> None:
+        self._active_device = None
+
     def disconnect_device(
         self, device_id: Optional[str] = None, timeout: Optional[float] = None
     ) -> Any:
@@ -1358,6 +2336,47 @@ class McpClient:
             args["name"] = name
         return self._call_tool("configure_channel", args, timeout=timeout)
 
+    def configure_channels(
+        self,
+        enabled: Optional[Dict[int, bool]] = None,
+        names: Optional[Dict[int, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Enable/disable and rename several channels in one call.
+
+        The server applies all entries or none (an unknown channel index
+        changes nothing) and emits a single config-changed event, where
+        :meth:`configure_channel` costs a round trip and a re-layout per
+        channel.  Servers without the ``configure_channels`` tool get one
+        :meth:`configure_channel` call per channel instead, without the
+        atomicity guarantee.
+
+        Args:
+            enabled: Channel index → enabled state.
+            names:   Channel index → display name.
+            timeout: Request timeout override.
+
+        Raises:
+            ConfigError: if both *enabled* and *names* are empty.
+        """
+        enabled = enabled or {}
+        names = names or {}
+        if not enabled and not names:
+            raise ConfigError("configure_channels needs 'enabled' or 'names'")
+        entries = []
+        for idx in sorted(set(enabled) | set(names)):
+            entry: Dict[str, Any] = {"channelIndex": int(idx)}
+            if idx in enabled:
+                entry["enabled"] = bool(enabled[idx])
+            if idx in names:
+                entry["name"] = str(names[idx])
+            entries.append(entry)
+        if self._tools and "configure_channels" not in self.tool_names:
+            for entry in entries:
+                self._call_tool("configure_channel", entry, timeout=timeout)
+            return {"success": True, "count": len(entries)}
+        return self._call_tool("configure_channels", {"channels": entries}, timeout=timeout)
+
     def configure_trigger(
         self,
         stage_count: Optional[int] = None,
@@ -1479,6 +2498,10 @@ class McpClient:
 
         For logic channels, returns decoded bytes (one byte per sample).
         For analog/DSO channels, returns a list of float values.
+
+        Payloads of at least :attr:`blob_threshold` bytes come back as a
+        blob handle and are downloaded as raw bytes from the server's
+        blob endpoint (re-read inline if the handle expires first).
         """
         args: Dict[str, Any] = {
             "channelIndex": channel_index,
@@ -1487,7 +2510,23 @@ class McpClient:
         }
         if end_sample is not None:
             args["endSample"] = end_sample
+        if self._blob_path and self.blob_threshold:
+            args["blobMinBytes"] = self.blob_threshold
         result = self._call_tool("get_samples", args, timeout=timeout)
+        if isinstance(result, dict) and result.get("encoding") == "blob":
+            try:
+                raw = self._fetch_blob(result["blob"], timeout=timeout)
+            except _BlobGone:
+                args.pop("blobMinBytes")
+                result = self._call_tool("get_samples", args, timeout=timeout)
+            else:
+                if result.get("format") == "float32le":
+                    values = array.array("f")
+                    values.frombytes(raw)
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    return values.tolist()
+                return raw
         # Extract data from the {sample_count, data, encoding} response
         if isinstance(result, dict) and "data" in result:
             data = result["data"]
@@ -1496,6 +2535,83 @@ class McpClient:
             return data
         return result
 
+    def get_samples_many(
+        self,
+        channels: List[int],
+        channel_type: str = "logic",
+        start_sample: int = 0,
+        end_sample: Optional[int] = None,
+        max_workers: int = 4,
+        *,
+        chunk_samples: Optional[int] = None,
+        max_inflight_bytes: int = 256 << 20,
+        timeout: Optional[float] = None,
+    ) -> SampleBatch:
+        """Read several channels concurrently.
+
+        Requests run on a pool of *max_workers* threads, each on its own
+        HTTP connection, and are reassembled in the order of *channels*.
+        With *end_sample* None the first channel is read alone to learn
+        the capture length; the remaining channels then run in parallel.
+
+        Args:
+            channels:           Channel indices, in the order wanted.
+            channel_type:       ``'logic'``, ``'analog'`` or ``'dso'``.
+            start_sample:       First sample (inclusive).
+            end_sample:         Last sample (exclusive); None = to end.
+            max_workers:        Concurrent requests.
+            chunk_samples:      Split each channel into requests of at
+                                most this many samples.
+            max_inflight_bytes: Cap on the estimated client memory held
+                                by responses in flight.
+
+        Returns:
+            :class:`SampleBatch` with per-channel data and throughput.
+        """
+        t0 = time.perf_counter()
+        batch = SampleBatch(channel_type=channel_type, start_sample=start_sample)
+        if not channels:
+            return batch
+        parts: Dict[int, List[Any]] = {ch: [] for ch in channels}
+        pending = list(channels)
+        if end_sample is None:
+            first = pending.pop(0)
+            parts[first].append(self.get_samples(
+                first, channel_type, start_sample, None, timeout=timeout))
+            batch.requests += 1
+            end_sample = start_sample + len(parts[first][0])
+
+        step = chunk_samples if chunk_samples else max(1, end_sample - start_sample)
+        jobs = [(ch, pos, min(pos + step, end_sample))
+                for ch in pending for pos in range(start_sample, end_sample, step)]
+        per_sample = _INFLIGHT_BYTES_PER_SAMPLE.get(channel_type, 48)
+        budget = _ByteBudget(max_inflight_bytes)
+
+        def fetch(job: tuple) -> Any:
+            ch, s, e = job
+            cost = (e - s) * per_sample
+            budget.acquire(cost)
+            try:
+                return self.get_samples(ch, channel_type, s, e, timeout=timeout)
+            finally:
+                budget.release(cost)
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs))),
+                                    thread_name_prefix="pxview-samples") as pool:
+                for (ch, _, _), data in zip(jobs, pool.map(fetch, jobs)):
+                    parts[ch].append(data)
+            batch.requests += len(jobs)
+
+        for ch in channels:
+            chunks = parts[ch]
+            if channel_type == "logic":
+                batch.data[ch] = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+            else:
+                batch.data[ch] = [v for chunk in chunks for v in chunk]
+        batch.elapsed_seconds = time.perf_counter() - t0
+        return batch
+
     # ---- Generic Device Config (SR_CONF_* keys) ----
 
     def get_config(
@@ -0,0 +1,415 @@
+"""Topic-filtered service event subscriptions.
+
+PXView broadcasts service events (capture state changes, data updates,
+device hot-plug, glitch-filter progress, decode completion, ...) over
+its WebSocket transport.  Each notification carries a *topic*; a
+client can ``subscribe`` to a subset of topics so it only receives
+what it cares about.
+
+:class:`EventStream` owns one WebSocket connection and a background
+reader thread.  Events are delivered two ways:
+
+- to handlers registered with :meth:`EventStream.on` (called on the
+  reader thread), and
+- into a bounded queue consumed with :meth:`EventStream.get`,
+  :meth:`EventStream.wait_for` or iteration.
+
+When the queue is full the *drop_policy* decides what happens:
+``'drop_oldest'`` (default) discards the oldest queued event,
+``'drop_newest'`` discards the incoming one and ``'block'`` stops
+reading until the consumer catches up.
+
+Typical usage::
+
+    with client.events(["capture_state", "data_updated"]) as events:
+        events.on("DataUpdated", lambda e: print(e.params))
+        client.start_capture(device_id="demo")
+        events.wait_for("CaptureStateChanged",
+                        lambda e: e.params.get("state") == "stopped",
+                        timeout=60)
+
+Topics: ``capture_state``, ``capture_progress``, ``data_updated``,
+``trigger``, ``frame``, ``device_list``, ``device``, ``glitch_filter``,
+``signal_invert``, ``decode``, ``decoder``, ``decode_progress``,
+``sample_config``, ``channel_config``, ``trigger_config``, ``file_op``,
+``signals``, ``view``, ``error``, ``misc``.
+"""
+
+from __future__ import annotations
+
+import collections
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from . import _json
+from ._ws import OPCODE_CLOSE, OPCODE_TEXT, WebSocket
+from .exceptions import ConfigError, McpConnectionError, McpError
+from .types import ServiceEvent
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# Notification method → event.  Events without a dedicated method are
+# sent as "on_event" with the numeric event code in params.
+_METHOD_EVENTS: Dict[str, ServiceEvent] = {
+    "on_capture_state_changed": ServiceEvent.CAPTURE_STATE_CHANGED,
+    "on_capture_progress": ServiceEvent.CAPTURE_PROGRESS,
+    "on_data_updated": ServiceEvent.DATA_UPDATED,
+    "on_trigger_received": ServiceEvent.TRIGGER_RECEIVED,
+    "on_frame_began": ServiceEvent.FRAME_BEGAN,
+    "on_frame_ended": ServiceEvent.FRAME_ENDED,
+    "on_device_list_updated": ServiceEvent.DEVICE_LIST_UPDATED,
+    "on_device_detached": ServiceEvent.DEVICE_DETACHED,
+    "on_decode_done": ServiceEvent.DECODE_DONE,
+    "on_decode_progress": ServiceEvent.DECODE_PROGRESS,
+    "on_sample_config_changed": ServiceEvent.SAMPLE_CONFIG_CHANGED,
+    "on_channel_config_changed": ServiceEvent.CHANNEL_CONFIG_CHANGED,
+    "on_trigger_config_changed": ServiceEvent.TRIGGER_CONFIG_CHANGED,
+    "on_save_complete": ServiceEvent.SAVE_COMPLETE,
+    "on_load_complete": ServiceEvent.LOAD_COMPLETE,
+    "on_export_complete": ServiceEvent.EXPORT_COMPLETE,
+    "on_signals_changed": ServiceEvent.SIGNALS_CHANGED,
+}
+
+EventKey = Union[ServiceEvent, str, None]
+EventHandler = Callable[["Event"], None]
+
+
+@dataclass
+class Event:
+    """A service event notification.
+
+    Attributes:
+        event:        The :class:`ServiceEvent`, or None for an event
+                      code this client does not know.
+        topic:        Subscription topic (e.g. ``'capture_state'``).
+        method:       Notification method (e.g. ``'on_data_updated'``).
+        params:       Event parameters.
+        version:      Monotonic server-side version number.
+        timestamp_ms: Server wall-clock timestamp in milliseconds.
+    """
+
+    event: Optional[ServiceEvent]
+    topic: str
+    method: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0
+    timestamp_ms: int = 0
+
+    @property
+    def name(self) -> str:
+        """C++ event name (``'CaptureStateChanged'``), or the method name."""
+        return self.event.event_name if self.event is not None else self.method
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Event":
+        method = d.get("method", "")
+        params = d.get("params") or {}
+        event = _METHOD_EVENTS.get(method)
+        if event is None and method == "on_event":
+            try:
+                event = ServiceEvent(params.get("event"))
+            except ValueError:
+                event = None
+            params = params.get("params") or {}
+        return cls(
+            event=event,
+            topic=d.get("topic", "misc"),
+            method=method,
+            params=params,
+            version=d.get("version", 0),
+            timestamp_ms=d.get("timestamp", 0),
+        )
+
+
+def _event_key(event: EventKey) -> Optional[ServiceEvent]:
+    """Normalize an event argument; None / ``'*'`` means any event."""
+    if event is None or event == "*":
+        return None
+    if isinstance(event, ServiceEvent):
+        return event
+    try:
+        return ServiceEvent.from_name(event)
+    except ValueError as exc:
+        raise ConfigError(str(exc)) from exc
+
+
+class EventStream:
+    """Background subscription to PXView service events.
+
+    Args:
+        url:         WebSocket URL of PXView's WS transport.
+        topics:      Topics to subscribe to.  None subscribes to all.
+        max_queue:   Maximum number of queued, unconsumed events.
+        drop_policy: ``'drop_oldest'``, ``'drop_newest'`` or ``'block'``.
+        timeout:     Connect / subscribe timeout in seconds.
+
+    Attributes:
+        dropped:        Number of events discarded by the drop policy.
+        handler_errors: Number of exceptions raised by handlers.
+        last_error:     The most recent handler exception, if any.
+    """
+
+    def __init__(
+        self,
+        url: str = "ws://127.0.0.1:10430",
+        topics: Optional[List[str]] = None,
+        *,
+        max_queue: int = 1024,
+        drop_policy: str = "drop_oldest",
+        timeout: float = 10.0,
+    ):
+        if drop_policy not in DROP_POLICIES:
+            raise ConfigError(
+                f"Invalid drop_policy {drop_policy!r}; use one of {', '.join(DROP_POLICIES)}"
+            )
+        if max_queue < 1:
+            raise ConfigError("max_queue must be >= 1")
+        self.url = url
+        self.topics = list(topics) if topics is not None else None
+        self.max_queue = max_queue
+        self.drop_policy = drop_policy
+        self.timeout = timeout
+        self.dropped = 0
+        self.handler_errors = 0
+        self.last_error: Optional[BaseException] = None
+        self._ws: Optional[WebSocket] = None
+        self._queue: collections.deque = collections.deque()
+        self._cond = threading.Condition()
+        self._handlers: Dict[Optional[ServiceEvent], List[EventHandler]] = {}
+        self._handlers_lock = threading.Lock()
+        self._request_id = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def __enter__(self) -> "EventStream":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        status = "open" if self._running else "closed"
+        return f"EventStream(url={self.url!r}, topics={self.topics}, {status})"
+
+    # ---- Connection ----
+
+    def _send(self, method: str, params: dict) -> int:
+        if self._ws is None:
+            raise McpError("EventStream is not open")
+        self._request_id += 1
+        self._ws.send_text(_json.dumps({
+            "jsonrpc": "2.0", "id": self._request_id, "method": method, "params": params,
+        }))
+        return self._request_id
+
+    def open(self) -> None:
+        """Connect, subscribe and start the background reader.
+
+        Raises:
+            McpConnectionError: if the WS transport is unreachable.
+        """
+        if self._running:
+            return
+        ws = WebSocket.connect(self.url, timeout=self.timeout)
+        self._ws = ws
+        try:
+            if self.topics is not None:
+                request_id = self._send("subscribe", {"topics": self.topics})
+                self._await_ack(request_id)
+        except Exception:
+            ws.close()
+            self._ws = None
+            raise
+        ws.settimeout(None)
+        self._running = True
+        self._thread = threading.Thread(target=self._reader, name="pxview-events", daemon=True)
+        self._thread.start()
+
+    def _await_ack(self, request_id: int) -> None:
+        """Read until the reply to *request_id*, queueing any events seen."""
+        assert self._ws is not None
+        self._ws.settimeout(self.timeout)
+        try:
+            while True:
+                opcode, payload = self._ws.recv()
+                if opcode == OPCODE_CLOSE:
+                    raise McpConnectionError("WebSocket closed while subscribing")
+                if opcode != OPCODE_TEXT:
+                    continue
+                msg = _json.loads(payload)
+                if msg.get("type") == "notification":
+                    self._deliver(Event.from_dict(msg))
+                elif msg.get("id") == request_id:
+                    if "error" in msg:
+                        err = msg["error"]
+                        raise McpError(err.get("message", "subscribe failed"),
+                                       err.get("code", -1), err)
+                    return
+        except socket.timeout as exc:
+            raise McpConnectionError("Timed out waiting for subscribe reply") from exc
+
+    def subscribe(self, topics: List[str]) -> None:
+        """Add topics to the subscription (reply handled by the reader)."""
+        self.topics = sorted(set(self.topics or []) | set(topics))
+        self._send("subscribe", {"topics": list(topics)})
+
+    def unsubscribe(self, topics: List[str]) -> None:
+        """Remove topics from the subscription.
+
+        Note that an empty subscription set means *all* topics on the
+        server side.
+        """
+        self.topics = sorted(set(self.topics or []) - set(topics))
+        self._send("unsubscribe", {"topics": list(topics)})
+
+    def close(self) -> None:
+        """Close the connection and stop the reader thread."""
+        self._running = False
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            ws.close()
+        with self._cond:
+            self._cond.notify_all()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.timeout)
+
+    @property
+    def is_open(self) -> bool:
+        return self._running
+
+    # ---- Reader ----
+
+    def _reader(self) -> None:
+        ws = self._ws
+        while self._running and ws is not None:
+            try:
+                opcode, payload = ws.recv()
+            except McpError:
+                break
+            if opcode == OPCODE_CLOSE:
+                break
+            if opcode != OPCODE_TEXT:
+                continue
+            try:
+                msg = _json.loads(payload)
+            except ValueError:
+                continue
+            if msg.get("type") == "notification":
+                self._deliver(Event.from_dict(msg))
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+
+    def _deliver(self, event: Event) -> None:
+        with self._handlers_lock:
+            handlers = self._handlers.get(event.event, []) + self._handlers.get(None, [])
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as exc:
+                self.handler_errors += 1
+                self.last_error = exc
+
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                if self.drop_policy == "drop_newest":
+                    self.dropped += 1
+                    return
+                if self.drop_policy == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self.max_queue and self._running:
+                        self._cond.wait(0.1)
+            self._queue.append(event)
+            self._cond.notify_all()
+
+    # ---- Handlers ----
+
+    def on(self, event: EventKey, handler: EventHandler) -> EventHandler:
+        """Register *handler* for *event* (``None`` or ``'*'`` for all).
+
+        Handlers run on the reader thread and should return quickly.
+        Returns *handler* so it can be passed to :meth:`off` later.
+        """
+        key = _event_key(event)
+        with self._handlers_lock:
+            self._handlers.setdefault(key, []).append(handler)
+        return handler
+
+    def off(self, event: EventKey, handler: EventHandler) -> None:
+        """Unregister a handler previously added with :meth:`on`."""
+        key = _event_key(event)
+        with self._handlers_lock:
+            handlers = self._handlers.get(key, [])
+            if handler in handlers:
+                handlers.remove(handler)
+
+    # ---- Queue consumption ----
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Pop the next queued event.
+
+        Returns None on timeout or once the stream is closed and drained.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._queue:
+                if not self._running:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            event = self._queue.popleft()
+            self._cond.notify_all()
+            return event
+
+    def wait_for(
+        self,
+        event: EventKey = None,
+        predicate: Optional[Callable[[Event], bool]] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[Event]:
+        """Consume queued events until one matches.
+
+        Args:
+            event:     Event to match (``ServiceEvent`` or name); None = any.
+            predicate: Optional extra condition on the event.
+            timeout:   Maximum wait in seconds (None = forever).
+
+        Returns:
+            The matching event, or None on timeout / stream closed.
+        """
+        key = _event_key(event)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ev = self.get(remaining)
+            if ev is None:
+                return None
+            if key is not None and ev.event is not key:
+                continue
+            if predicate is None or predicate(ev):
+                return ev
+
+    def drain(self) -> List[Event]:
+        """Remove and return all currently queued events."""
+        with self._cond:
+            events = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+            return events
+
+    def __iter__(self) -> Iterator[Event]:
+        """Yield events until the stream is closed."""
+        while True:
+            ev = self.get()
+            if ev is None:
+                return
+            yield ev
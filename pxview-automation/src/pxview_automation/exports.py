@@ -0,0 +1,918 @@
+"""Client-side exports streamed straight to local files.
+
+``export_data_table_csv`` makes PXView write the file on the instrument
+host, which only works when client and server share a filesystem and
+costs a second read to get the data back.  The functions here page the
+same data over the MCP connection and write it incrementally to any
+file-like object (or path) on the client::
+
+    from pxview_automation import McpClient
+
+    client = McpClient()
+    client.connect()
+    with open("i2c.ndjson", "w") as fh:
+        client.export_data_table_stream(fh, "1:1", format="ndjson", radix_type=3)
+
+Decoder table formats (:func:`stream_data_table`):
+
+``csv``
+    Same columns as ``export_data_table_csv``
+    (``start_sample,end_sample,analyzer_name,annotation_class,text``).
+``ndjson``
+    One JSON object per annotation.
+``columnar``
+    One JSON object per page with a list per column, for loading into
+    dataframes without per-row overhead.
+
+Raw sample exports (:func:`stream_raw_data`) are rendered by PXView
+itself: the ``open_export_stream`` tool runs the same writer as
+``export_raw_data`` into a bounded server-side buffer and a prefetch
+thread drains it with ``read_export_stream``, so the local file holds
+exactly the bytes ``export_raw_data`` would have written on the
+instrument host.  Output can be gzip or zstd compressed on the fly
+(zstd needs the optional ``zstandard`` package).
+
+Exported files are read back in chunks by :func:`iter_export` and the
+per-format parsers (:func:`iter_csv`, :func:`iter_binary` over ``mmap``,
+:func:`iter_hex`, :func:`iter_bits`, :class:`VcdFile` with a value-change
+iterator), each yielding ``array('B')`` of one byte per sample;
+:func:`verify_export` cross-checks a file against ``get_samples``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import io
+import json
+import os
+import queue
+import threading
+from array import array
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .exceptions import ConfigError, McpError
+
+if TYPE_CHECKING:
+    from .client import McpClient
+
+__all__ = [
+    "TABLE_FORMATS",
+    "RAW_FORMATS",
+    "COMPRESSIONS",
+    "stream_data_table",
+    "iter_annotations",
+    "stream_raw_data",
+    "iter_export",
+    "iter_csv",
+    "iter_binary",
+    "iter_hex",
+    "iter_bits",
+    "iter_vcd",
+    "VcdFile",
+    "verify_export",
+]
+
+TABLE_FORMATS = ("csv", "ndjson", "columnar")
+RAW_FORMATS = ("csv", "binary", "vcd", "hex", "bits")
+COMPRESSIONS = ("gzip", "zstd")
+
+# File suffixes used by the server's export_raw_data.
+RAW_SUFFIXES = {"csv": "csv", "binary": "bin", "vcd": "vcd", "hex": "hex", "bits": "bits"}
+
+Sink = Union[str, "os.PathLike[str]", io.IOBase, Any]
+
+
+# ======================================================================
+# Sinks
+# ======================================================================
+
+class _Writer:
+    """Writes ``str`` to a text or binary file-like object, or to a path."""
+
+    def __init__(self, sink: Sink, binary: bool = False):
+        self._owned = isinstance(sink, (str, os.PathLike))
+        self._fh: Any = open(sink, "wb") if isinstance(sink, (str, os.PathLike)) else sink
+        sink = self._fh
+        self._text = isinstance(sink, io.TextIOBase) or (
+            not isinstance(sink, (io.RawIOBase, io.BufferedIOBase)) and hasattr(sink, "encoding")
+        )
+        if binary and self._text:
+            raise ConfigError("Binary output needs a binary sink (open the file with 'wb')")
+        self.bytes_written = 0
+
+    def write(self, data: Union[str, bytes]) -> int:
+        if isinstance(data, str) and not self._text:
+            data = data.encode("utf-8")
+        self._fh.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if hasattr(self._fh, "flush"):
+            self._fh.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self._fh.close()
+        elif hasattr(self._fh, "flush"):
+            self._fh.flush()
+
+
+# ======================================================================
+# Decoder data table
+# ======================================================================
+
+def iter_annotations(
+    client: "McpClient",
+    analyzer_id: str,
+    page_size: int = 1000,
+) -> Iterator[Tuple[List[dict], Dict[int, str]]]:
+    """Yield ``(page, class_names)`` until every annotation has been read.
+
+    Pages are ``get_analyzer_results`` delta reads: each one returns the
+    ``version`` the next page resumes from, so nothing is skipped or read
+    twice, and annotations arrive in the server's row order (that of
+    ``export_data_table_csv``).  If the server forgets a version
+    (``reset``), reading starts over and the annotations already yielded
+    are skipped.
+
+    Raises:
+        McpError: if the server does not support ``sinceVersion``.
+    """
+    version = 0
+    delivered = skip = 0
+    names: Dict[int, str] = {}
+    while True:
+        result = client.get_analyzer_results(
+            analyzer_id, max_count=page_size, since_version=version,
+            include_metadata=not version)
+        if "version" not in result:
+            raise McpError("This PXView build cannot page analyzer results "
+                           "(no sinceVersion support)")
+        if not version:
+            names = {c["class_id"]: c.get("class_name", "")
+                     for c in result.get("metadata", {}).get("classNames", [])}
+        if result.get("reset") and version:
+            skip = delivered
+        page = result.get("annotations", [])
+        if skip:
+            dropped = min(skip, len(page))
+            page, skip = page[dropped:], skip - dropped
+        if page:
+            delivered += len(page)
+            yield page, names
+        if not result.get("more"):
+            return
+        version = result["version"]
+
+
+def _csv_row(start: Any, end: Any, name: str, ann_class: int, text: str) -> str:
+    """One data-table row, quoted like ``export_data_table_csv``."""
+    return f'{start},{end},{name},{ann_class},"{text.replace(chr(34), chr(34) * 2)}"\n'
+
+
+def _parse_uint(text: str) -> Optional[int]:
+    """``QString::toULongLong(&ok, 0)``: ``0x`` hex, leading ``0`` octal."""
+    t = text.strip()
+    if not t or not all(c.isalnum() for c in t):
+        return None
+    try:
+        if t[:2].lower() == "0x":
+            return int(t[2:], 16)
+        if len(t) > 1 and t[0] == "0":
+            return int(t[1:], 8)
+        return int(t, 10)
+    except ValueError:
+        return None
+
+
+def _format_radix(ann: dict, radix: int) -> str:
+    """First text of *ann* with ``radixType`` applied like the server's CSV export.
+
+    Only annotations flagged ``numeric`` are reformatted, and only when
+    their text parses as an unsigned integer.
+    """
+    text = (ann.get("texts") or [""])[0]
+    if radix not in (1, 2, 3) or not ann.get("numeric"):
+        return text
+    value = _parse_uint(text)
+    if value is None:
+        return text
+    if radix == 1:
+        return "0b" + format(value, "b")
+    if radix == 2:
+        return str(value)
+    return "0x" + format(value, "x")
+
+
+def _iso8601(sample: int, rate: int) -> str:
+    """Sample position as the server's ISO8601 timestamp (epoch + offset, UTC)."""
+    ms = int(sample / rate * 1000)
+    dt = datetime.datetime(1970, 1, 1) + datetime.timedelta(milliseconds=ms)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+
+
+TABLE_HEADER = "start_sample,end_sample,analyzer_name,annotation_class,text\n"
+
+
+def stream_data_table(
+    client: "McpClient",
+    sink: Sink,
+    analyzer_id: Optional[str] = None,
+    *,
+    analyzers: Optional[List[dict]] = None,
+    radix_type: int = 0,
+    format: str = "csv",
+    iso8601_timestamp: bool = False,
+    page_size: int = 1000,
+) -> int:
+    """Write decoder annotations to *sink* as they are paged in.
+
+    Args:
+        client:            Connected :class:`McpClient`.
+        sink:              File path, or text / binary file-like object.
+        analyzer_id:       Single mode: analyzer instance ID.
+        analyzers:         Multi mode: list of ``{analyzerId, radixType}``
+                           dicts, written one after the other.
+        radix_type:        Single mode radix: 1=Binary, 2=Decimal, 3=Hex,
+                           4=Ascii.
+        format:            ``'csv'``, ``'ndjson'`` or ``'columnar'``.
+        iso8601_timestamp: Write start/end as ISO8601 timestamps.
+        page_size:         Annotations per ``get_analyzer_results`` call.
+
+    Returns:
+        Number of annotations written.
+
+    Raises:
+        ConfigError: on an unknown *format* or missing analyzer ID.
+    """
+    if format not in TABLE_FORMATS:
+        raise ConfigError(f"Unknown table format {format!r}; use one of {', '.join(TABLE_FORMATS)}")
+    if analyzers is None:
+        if analyzer_id is None:
+            raise ConfigError("Provide either 'analyzers' or 'analyzer_id'")
+        analyzers = [{"analyzerId": analyzer_id, "radixType": radix_type}]
+    elif not analyzers:
+        raise ConfigError("'analyzers' must be a non-empty list")
+
+    active = {d.get("instance_id"): d for d in client.get_active_decoders() or []}
+    rate = 0
+    if iso8601_timestamp:
+        rate = int(client.get_sample_config().get("sample_rate", 0))
+
+    out = _Writer(sink)
+    rows = 0
+    try:
+        if format == "csv":
+            out.write(TABLE_HEADER)
+        for entry in analyzers:
+            aid = entry["analyzerId"]
+            radix = int(entry.get("radixType", 0))
+            info = active.get(aid, {})
+            name = info.get("display_name") or info.get("decoder_id") or aid
+            for page, class_names in iter_annotations(client, aid, page_size):
+                if rate:
+                    starts: List[Any] = [_iso8601(a["start_sample"], rate) for a in page]
+                    ends: List[Any] = [_iso8601(a["end_sample"], rate) for a in page]
+                else:
+                    starts = [a["start_sample"] for a in page]
+                    ends = [a["end_sample"] for a in page]
+                texts = [_format_radix(a, radix) for a in page]
+                classes = [a["ann_class"] for a in page]
+                if format == "csv":
+                    out.write("".join(_csv_row(s, e, name, c, t)
+                                      for s, e, c, t in zip(starts, ends, classes, texts)))
+                elif format == "ndjson":
+                    out.write("".join(json.dumps({
+                        "analyzer_id": aid, "analyzer_name": name,
+                        "start_sample": s, "end_sample": e, "ann_class": c,
+                        "class_name": class_names.get(c, ""), "text": t,
+                    }) + "\n" for s, e, c, t in zip(starts, ends, classes, texts)))
+                else:
+                    out.write(json.dumps({
+                        "analyzer_id": aid, "analyzer_name": name,
+                        "start_sample": starts, "end_sample": ends,
+                        "ann_class": classes, "text": texts,
+                    }) + "\n")
+                rows += len(page)
+    finally:
+        out.close()
+    return rows
+
+
+# ======================================================================
+# Raw export streaming
+# ======================================================================
+
+def _raw_format(format: Any) -> str:
+    fmt = format.value if isinstance(format, Enum) else str(format)
+    if fmt not in RAW_FORMATS:
+        raise ConfigError(f"Unsupported export format: {fmt} "
+                          f"(supported: {', '.join(RAW_FORMATS)})")
+    return fmt
+
+
+_DONE = object()
+
+
+def _prefetch(chunks: Iterator[bytes], depth: int) -> Iterator[bytes]:
+    """Yield the items of *chunks*, read ahead by a worker thread.
+
+    At most *depth* chunks wait in the queue, so a slow sink stalls the
+    reader instead of growing memory.
+    """
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker() -> None:
+        try:
+            for data in chunks:
+                if not put(data):
+                    return
+            put(_DONE)
+        except BaseException as exc:  # handed to the consumer
+            put(exc)
+
+    thread = threading.Thread(target=worker, name="pxv-export-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _open_compressed(fh: Any, compression: Optional[str],
+                     level: Optional[int]) -> Tuple[Any, Callable[[], None]]:
+    """Wrap binary *fh* in a compressor; returns ``(writer, finish)``."""
+    if compression is None:
+        return fh, lambda: None
+    if compression == "gzip":
+        gz = gzip.GzipFile(fileobj=fh, mode="wb", compresslevel=9 if level is None else level)
+        return gz, gz.close
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ConfigError("zstd compression needs the 'zstandard' package "
+                              "(pip install pxview-automation[zstd])") from None
+        writer = zstandard.ZstdCompressor(level=3 if level is None else level).stream_writer(
+            fh, closefd=False)
+        return writer, writer.close
+    raise ConfigError(f"Unknown compression {compression!r}; use one of {', '.join(COMPRESSIONS)}")
+
+
+def _read_stream(client: "McpClient", stream_id: str, chunk_bytes: int) -> Iterator[bytes]:
+    """Chunks of an open export stream, in order, until its end."""
+    offset = 0
+    while True:
+        chunk = client.read_export_stream(stream_id, offset, max_bytes=chunk_bytes)
+        data = chunk["data"]
+        if data:
+            offset += len(data)
+            yield data
+        if chunk["eof"]:
+            return
+
+
+def stream_raw_data(
+    client: "McpClient",
+    sink: Sink,
+    stream_id: str,
+    *,
+    compression: Optional[str] = None,
+    compresslevel: Optional[int] = None,
+    chunk_bytes: int = 4 << 20,
+    prefetch: int = 4,
+) -> int:
+    """Copy an export stream to *sink*, then close it.
+
+    The bytes are PXView's own ``export_raw_data`` output for the channel
+    (the same libsigrok output module and ``set_export_config`` range),
+    read with ``read_export_stream`` by a prefetch thread.
+
+    Args:
+        client:        Connected :class:`McpClient`.
+        sink:          File path or binary file-like object.
+        stream_id:     Stream from :meth:`McpClient.open_export_stream`.
+        compression:   None, ``'gzip'`` or ``'zstd'``.
+        compresslevel: Compressor level (default: gzip 9, zstd 3).
+        chunk_bytes:   Bytes per ``read_export_stream`` request.
+        prefetch:      Chunks read ahead of the writer.
+
+    Returns:
+        Number of (uncompressed) bytes written.
+
+    Raises:
+        ConfigError: on an unknown compression or a text sink.
+        McpError:    if the export fails on the server.
+    """
+    try:
+        if chunk_bytes <= 0 or prefetch <= 0:
+            raise ConfigError("chunk_bytes and prefetch must be positive")
+        out = _Writer(sink, binary=True)
+        written = 0
+        try:
+            writer, finish = _open_compressed(out, compression, compresslevel)
+            for data in _prefetch(_read_stream(client, stream_id, chunk_bytes), prefetch):
+                writer.write(data)
+                written += len(data)
+            finish()
+        finally:
+            out.close()
+        return written
+    finally:
+        client.close_export_stream(stream_id)
+
+
+# ======================================================================
+# Parsers for exported files
+# ======================================================================
+
+_FROM_BITS = bytes(range(256)).translate(bytes.maketrans(b"01", b"\x00\x01"))
+_COMMENT_PREFIXES = (b";", b"#")
+_READ_BLOCK = 1 << 22
+
+
+def _open_export(path: Union[str, "os.PathLike[str]"]) -> Any:
+    """Open an export for binary reading, decompressing ``.gz`` / ``.zst``."""
+    path = os.fspath(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ConfigError("Reading .zst exports needs the 'zstandard' package") from None
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def _iter_lines(path: Union[str, "os.PathLike[str]"],
+                block: int = _READ_BLOCK) -> Iterator[List[bytes]]:
+    """Yield lists of complete lines (without ``\\n``) read in large blocks."""
+    rest = b""
+    with _open_export(path) as fh:
+        while True:
+            data = fh.read(block)
+            if not data:
+                break
+            lines = (rest + data).split(b"\n")
+            rest = lines.pop()
+            yield lines
+    if rest:
+        yield [rest]
+
+
+def _unpack(packed: bytes, msb_first: bool) -> bytes:
+    """Inverse of :func:`_pack`: one byte (0 / 1) per sample."""
+    if not packed:
+        return b""
+    n = len(packed) * 8
+    bits = format(int.from_bytes(packed, "big" if msb_first else "little"), f"0{n}b")
+    if not msb_first:
+        bits = bits[::-1]
+    return bits.encode().translate(_FROM_BITS)
+
+
+def _rechunk(
+    parts: Iterator[Union[bytes, array]], chunk_samples: int, limit: Optional[int]
+) -> Iterator[array]:
+    """Regroup byte runs into ``array('B')`` chunks of *chunk_samples*."""
+    buf = bytearray()
+    left = limit
+    for part in parts:
+        if left is not None:
+            part = part[:left]
+            left -= len(part)
+        buf += part
+        if len(buf) >= chunk_samples:
+            full = len(buf) - len(buf) % chunk_samples
+            view = memoryview(buf)
+            for off in range(0, full, chunk_samples):
+                chunk = array("B")
+                chunk.frombytes(view[off:off + chunk_samples])
+                yield chunk
+            view.release()
+            del buf[:full]
+        if left == 0:
+            break
+    if buf:
+        chunk = array("B")
+        chunk.frombytes(buf)
+        yield chunk
+
+
+def iter_csv(
+    path: Union[str, "os.PathLike[str]"],
+    column: Union[int, str, None] = None,
+    *,
+    typecode: str = "B",
+    chunk_samples: int = 1 << 20,
+) -> Iterator[array]:
+    """Yield one column of a CSV export as typed arrays.
+
+    ``;`` / ``#`` comment lines are skipped.  The first row is the header
+    when it is not numeric or follows comment lines (libsigrok writes a
+    label row after its comments, and channel names may be numbers).
+
+    Args:
+        path:          Export file (``.gz`` / ``.zst`` are decompressed).
+        column:        Column index or header name (default: last column,
+                       the channel value in both layouts PXView writes).
+        typecode:      ``'B'`` for logic values, ``'d'`` for analog.
+        chunk_samples: Rows per yielded array.
+    """
+    with _open_export(path) as fh:
+        head = b""
+        while True:
+            data = fh.read(_READ_BLOCK)
+            head += data
+            if not data or head.count(b"\n") > 64:
+                break
+        # ---- header ----
+        lines = head.split(b"\n", 64)  # the last item keeps the unsplit rest
+        i = 0
+        while i < len(lines) - 1 and (not lines[i].strip()
+                                      or lines[i].startswith(_COMMENT_PREFIXES)):
+            i += 1
+        first = lines[i].rstrip(b"\r").split(b",")
+        try:
+            [float(v) for v in first]
+            labelled = i > 0 and any(line.strip() for line in lines[:i])
+        except ValueError:
+            labelled = True
+        col = column if isinstance(column, int) else len(first) - 1
+        if labelled:
+            names = [n.strip().decode("utf-8", "replace") for n in first]
+            if isinstance(column, str):
+                if column not in names:
+                    raise ConfigError(f"Column {column!r} not in {names}")
+                col = names.index(column)
+            i += 1
+        body = b"\n".join(lines[i:])
+
+        def blocks() -> Iterator[bytes]:
+            yield body
+            while True:
+                data = fh.read(_READ_BLOCK)
+                if not data:
+                    return
+                yield data
+
+        if len(first) == 1 and typecode == "B":
+            # One logic value per line: drop the separators in C.
+            yield from _rechunk(
+                (b.translate(_FROM_BITS, b"\r\n\t ") for b in blocks()), chunk_samples, None)
+            return
+
+        def rows() -> Iterator[List[bytes]]:
+            rest = b""
+            for data in blocks():
+                part = (rest + data).split(b"\n")
+                rest = part.pop()
+                yield [line.rstrip(b"\r").split(b",")[col] for line in part if line.strip()]
+            if rest.strip():
+                yield [rest.rstrip(b"\r").split(b",")[col]]
+
+        if typecode == "B":
+            yield from _rechunk(
+                (b"".join(r).translate(_FROM_BITS, b" ") for r in rows()), chunk_samples, None)
+            return
+        convert: Callable[[bytes], Any] = float if typecode in "fd" else int
+        buf = array(typecode)
+        for r in rows():
+            buf.extend(map(convert, r))
+            while len(buf) >= chunk_samples:
+                yield buf[:chunk_samples]
+                del buf[:chunk_samples]
+        if buf:
+            yield buf
+
+
+def iter_binary(
+    path: Union[str, "os.PathLike[str]"],
+    *,
+    sample_count: Optional[int] = None,
+    chunk_samples: int = 1 << 20,
+) -> Iterator[array]:
+    """Yield a ``binary`` logic export (8 samples per byte, LSB first).
+
+    Uncompressed files are memory-mapped, so only the current chunk is
+    resident.  The file does not record the sample count; pass
+    *sample_count* to drop the padding bits of the last byte.
+    """
+    import mmap
+
+    chunk_bytes = max(1, chunk_samples // 8)
+    path = os.fspath(path)
+
+    def parts() -> Iterator[bytes]:
+        if path.endswith((".gz", ".zst")):
+            with _open_export(path) as fh:
+                while True:
+                    packed = fh.read(chunk_bytes)
+                    if not packed:
+                        return
+                    yield _unpack(packed, msb_first=False)
+        with open(path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for off in range(0, len(mm), chunk_bytes):
+                    yield _unpack(mm[off:off + chunk_bytes], msb_first=False)
+
+    yield from _rechunk(parts(), chunk_bytes * 8, sample_count)
+
+
+def _iter_text_lines(
+    path: Union[str, "os.PathLike[str]"],
+    channel: Optional[str],
+    msb_hex: bool,
+) -> Iterator[bytes]:
+    prefix: Optional[bytes] = None if channel is None else channel.encode() + b":"
+    for lines in _iter_lines(path):
+        out = []
+        for line in lines:
+            head, sep, body = line.partition(b":")
+            if not sep or head == b"T":
+                continue  # header, or a libsigrok trigger marker line
+            if prefix is None:
+                if b" " in head.strip():
+                    continue  # "Acquisition with ..." header text
+                prefix = head + b":"
+            if line.startswith(prefix):
+                out.append(body)
+        if not out:
+            continue
+        data = b"".join(out).translate(None, b" \r\t")
+        if msb_hex:
+            yield _unpack(bytes.fromhex(data.decode("ascii")), msb_first=True)
+        else:
+            yield data.translate(_FROM_BITS)
+
+
+def iter_bits(
+    path: Union[str, "os.PathLike[str]"],
+    channel: Optional[str] = None,
+    *,
+    chunk_samples: int = 1 << 20,
+) -> Iterator[array]:
+    """Yield a ``bits`` export (``name:01010101 ...`` lines) as ``array('B')``.
+
+    Args:
+        channel: Channel name before the ``:`` (default: the first one).
+    """
+    yield from _rechunk(_iter_text_lines(path, channel, False), chunk_samples, None)
+
+
+def iter_hex(
+    path: Union[str, "os.PathLike[str]"],
+    channel: Optional[str] = None,
+    *,
+    sample_count: Optional[int] = None,
+    chunk_samples: int = 1 << 20,
+) -> Iterator[array]:
+    """Yield a ``hex`` export (``name:a5 0f ...``, first sample in the MSB).
+
+    Pass *sample_count* to drop the padding bits of the last byte.
+    """
+    yield from _rechunk(_iter_text_lines(path, channel, True), chunk_samples, sample_count)
+
+
+class VcdFile:
+    """Streaming reader for a ``vcd`` export.
+
+    The header is parsed on construction; :meth:`changes` iterates value
+    changes and :meth:`samples` expands one signal back to samples.
+
+    Attributes:
+        timescale: Seconds per VCD time unit.
+        signals:   Identifier code → signal name.
+    """
+
+    _UNITS = {"s": 1, "ms": 10 ** 3, "us": 10 ** 6, "ns": 10 ** 9, "ps": 10 ** 12, "fs": 10 ** 15}
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        self.path = path
+        self.signals: Dict[str, str] = {}
+        self._scale = (1, 1)  # timescale = num / den seconds
+        tokens: List[str] = []
+        with _open_export(path) as fh:
+            for raw in io.TextIOWrapper(fh, encoding="utf-8", errors="replace"):
+                tokens.extend(raw.split())
+                if "$enddefinitions" in tokens:
+                    break
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok == "$timescale":
+                spec = "".join(tokens[i + 1:tokens.index("$end", i)])
+                digits = spec.rstrip("afmnpsu")
+                self._scale = (int(digits or 1), self._UNITS.get(spec[len(digits):], 1))
+            elif tok == "$var":
+                # $var <type> <size> <id> <name> $end
+                self.signals[tokens[i + 3]] = tokens[i + 4]
+            i += 1
+
+    @property
+    def timescale(self) -> float:
+        return self._scale[0] / self._scale[1]
+
+    def changes(self) -> Iterator[Tuple[int, str, str]]:
+        """Yield ``(time, identifier, value)``; a bare ``#t`` yields ``(t, '', '')``.
+
+        Scalar changes carry ``'0'``/``'1'``/``'x'``/``'z'``; vectors the
+        ``b...`` digits without the prefix.
+        """
+        in_body = False
+        now = 0
+        for lines in _iter_lines(self.path):
+            for line in lines:
+                if not in_body:
+                    in_body = b"$enddefinitions" in line
+                    continue
+                toks = line.split()
+                if not toks:
+                    continue
+                bare = True
+                j = 0
+                while j < len(toks):
+                    tok = toks[j]
+                    if tok[:1] == b"#":
+                        now = int(tok[1:])
+                    elif tok[:1] in (b"b", b"B", b"r", b"R"):
+                        yield now, toks[j + 1].decode(), tok[1:].decode()
+                        bare = False
+                        j += 1
+                    elif tok[:1] == b"$":
+                        pass  # $dumpvars / $end and similar
+                    else:
+                        yield now, tok[1:].decode(), tok[:1].decode()
+                        bare = False
+                    j += 1
+                if bare and toks[0][:1] == b"#":
+                    yield now, "", ""
+
+    def samples(
+        self,
+        sample_rate: int,
+        signal: Optional[str] = None,
+        *,
+        chunk_samples: int = 1 << 20,
+    ) -> Iterator[array]:
+        """Expand one 1-bit signal to samples at *sample_rate*.
+
+        Args:
+            sample_rate: Capture sample rate (Hz).
+            signal:      Identifier code or signal name (default: first).
+
+        The last timestamp in the file marks the end of the capture.
+        """
+        if signal is None:
+            if not self.signals:
+                return
+            ident = next(iter(self.signals))
+        elif signal in self.signals:
+            ident = signal
+        else:
+            names = {n: k for k, n in self.signals.items()}
+            if signal not in names:
+                raise ConfigError(f"Signal {signal!r} not in {sorted(names)}")
+            ident = names[signal]
+        num, den = self._scale
+
+        def to_sample(t: int) -> int:
+            return (t * num * sample_rate + den // 2) // den
+
+        def runs() -> Iterator[bytes]:
+            pos, value = 0, None
+            for t, code, v in self.changes():
+                if code and code != ident:
+                    continue
+                at = to_sample(t)
+                if value is None:
+                    pos = at
+                elif at > pos:
+                    yield value * (at - pos)
+                    pos = at
+                if code:
+                    value = b"\x01" if v == "1" else b"\x00"
+
+        yield from _rechunk(runs(), chunk_samples, None)
+
+
+def iter_vcd(
+    path: Union[str, "os.PathLike[str]"],
+    sample_rate: int,
+    signal: Optional[str] = None,
+    *,
+    chunk_samples: int = 1 << 20,
+) -> Iterator[array]:
+    """Shorthand for ``VcdFile(path).samples(sample_rate, signal)``."""
+    return VcdFile(path).samples(sample_rate, signal, chunk_samples=chunk_samples)
+
+
+def iter_export(
+    path: Union[str, "os.PathLike[str]"],
+    format: Any = None,
+    *,
+    sample_rate: Optional[int] = None,
+    sample_count: Optional[int] = None,
+    chunk_samples: int = 1 << 20,
+) -> Iterator[array]:
+    """Yield logic samples from any raw export, picking the parser by format.
+
+    Args:
+        path:         Export file; *format* defaults to its extension
+                      (``.bin`` = binary, compression suffixes ignored).
+        sample_rate:  Needed for ``vcd``.
+        sample_count: Trims byte padding for ``binary`` / ``hex``.
+    """
+    if format is None:
+        stem = os.fspath(path)
+        for ext in (".gz", ".zst"):
+            if stem.endswith(ext):
+                stem = stem[:-len(ext)]
+        suffix = os.path.splitext(stem)[1].lstrip(".").lower()
+        format = {v: k for k, v in RAW_SUFFIXES.items()}.get(suffix, suffix)
+    fmt = _raw_format(format)
+    if fmt == "csv":
+        return _rechunk(iter_csv(path, chunk_samples=chunk_samples), chunk_samples, sample_count)
+    if fmt == "binary":
+        return iter_binary(path, sample_count=sample_count, chunk_samples=chunk_samples)
+    if fmt == "hex":
+        return iter_hex(path, sample_count=sample_count, chunk_samples=chunk_samples)
+    if fmt == "bits":
+        return _rechunk(iter_bits(path, chunk_samples=chunk_samples), chunk_samples, sample_count)
+    if not sample_rate:
+        raise ConfigError("sample_rate is required to expand a VCD export")
+    return _rechunk(iter_vcd(path, sample_rate, chunk_samples=chunk_samples),
+                    chunk_samples, sample_count)
+
+
+def verify_export(
+    client: "McpClient",
+    path: Union[str, "os.PathLike[str]"],
+    channel: int,
+    format: Any = None,
+    *,
+    start_sample: int = 0,
+    end_sample: Optional[int] = None,
+    sample_rate: Optional[int] = None,
+    chunk_samples: int = 1 << 20,
+) -> dict:
+    """Cross-check an export file against ``get_samples``, chunk by chunk.
+
+    Args:
+        client:       Connected :class:`McpClient` holding the capture.
+        path:         Export file of *channel*.
+        channel:      Logic channel index.
+        format:       Export format (default: from the extension).
+        start_sample: First sample the export covers.
+        end_sample:   End of the exported range (exclusive; default: the
+                      end of the export).
+        sample_rate:  For ``vcd`` (default: from ``get_sample_config``).
+
+    Returns:
+        ``{"samples": compared, "first_mismatch": index or None,
+        "length_match": bool}``; indices are absolute sample numbers.
+    """
+    is_vcd = format == "vcd" or os.fspath(path).endswith((".vcd", ".vcd.gz", ".vcd.zst"))
+    if sample_rate is None and is_vcd:
+        sample_rate = int(client.get_sample_config().get("sample_rate", 0))
+    count = None if end_sample is None else end_sample - start_sample
+    pos = start_sample
+    for chunk in iter_export(path, format, sample_rate=sample_rate, sample_count=count,
+                             chunk_samples=chunk_samples):
+        expected = bytes(client.get_samples(channel, "logic", pos, pos + len(chunk)))
+        got = chunk.tobytes()
+        if got != expected:
+            n = min(len(got), len(expected))
+            diff = next((i for i in range(n) if got[i] != expected[i]), n)
+            return {"samples": pos + diff - start_sample, "first_mismatch": pos + diff,
+                    "length_match": False}
+        pos += len(chunk)
+    tail = bytes(client.get_samples(channel, "logic", pos, pos + 1)) if end_sample is None else b""
+    return {
+        "samples": pos - start_sample,
+        "first_mismatch": None,
+        "length_match": (end_sample is None and not tail) or pos == end_sample,
+    }
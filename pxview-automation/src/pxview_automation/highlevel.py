@@ -28,22 +28,57 @@ Typical usage::
 
 from __future__ import annotations
 
+import os
+import queue
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .client import McpClient
-from .exceptions import ConfigError, McpError
+from .events import Event, EventStream
+from .exceptions import ConfigError, McpConnectionError, McpError
+from .profile import INVALIDATING_EVENTS as _PROFILE_INVALIDATING_EVENTS
+from .profile import ProfileState, diff, read_sections, sections, written_value
+from .exports import TABLE_HEADER, _csv_row, _raw_format, iter_annotations
+from .sample_cache import SampleCache
+from .tool_cache import ToolCache
+from .streaming import stream_samples
 from ._utils import to_windows_path
 from .types import (
     CaptureConfiguration,
+    CaptureSnapshot,
     CaptureStatus,
     DataTableExportConfiguration,
     DataTableFilter,
     DeviceDesc,
+    DeviceProfile,
     LogicDeviceConfiguration,
+    ProfileResult,
     RadixType,
+    ServiceEvent,
+    StreamStats,
 )
 
+# Events after which cached samples may no longer match the server.
+_SAMPLE_INVALIDATING_EVENTS = (
+    ServiceEvent.CAPTURE_STATE_CHANGED,
+    ServiceEvent.DATA_UPDATED,
+    ServiceEvent.DEVICE_MODE_CHANGED,
+    ServiceEvent.GLITCH_FILTER_COMPLETED,
+    ServiceEvent.GLITCH_FILTER_CLEARED,
+    ServiceEvent.SIGNAL_INVERT_COMPLETED,
+    ServiceEvent.SIGNAL_INVERT_CLEARED,
+    ServiceEvent.LOAD_COMPLETE,
+    ServiceEvent.SIGNALS_CHANGED,
+)
+
+
+def _forget_profile(state: ProfileState, kinds: Optional[Tuple[str, ...]], event: Event) -> None:
+    """Event handler: drop the profile sections *event* may have changed."""
+    state.invalidate(kinds)
+
 
 class PXView:
     """High-level PXView automation API.
@@ -56,6 +91,12 @@ class PXView:
         port: MCP server port (default: ``10110``).
         timeout: Default HTTP timeout in seconds.
         auto_connect: If True, call :meth:`connect` in ``__init__``.
+        ws_port: WebSocket transport port used for service events
+                 (default: ``10430``).
+        sample_cache: Optional :class:`SampleCache` serving overlapping
+                 :meth:`get_logic_samples` reads from memory.
+        tool_cache: Optional :class:`ToolCache` for repeated read-only
+                 calls (device / channel lists, session status).
 
     Example::
 
@@ -72,13 +113,29 @@ class PXView:
         timeout: float = 60.0,
         *,
         auto_connect: bool = False,
+        ws_port: int = 10430,
+        sample_cache: Optional[SampleCache] = None,
+        tool_cache: Optional[ToolCache] = None,
     ):
         self._client = McpClient(
             url=f"http://{host}:{port}/mcp",
             timeout=timeout,
+            ws_url=f"ws://{host}:{ws_port}",
+            tool_cache=tool_cache,
         )
         self._host = host
         self._port = port
+        self._sample_cache = sample_cache
+        self._cache_session: Optional[int] = None
+        # Event stream the sample cache is subscribed to (None = not yet,
+        # or it closed and events may have been missed).
+        self._cache_stream: Optional[EventStream] = None
+        self._cache_ws_failed = False
+        # Device settings last read by apply_profile(), trusted while
+        # _profile_stream reports configuration changes.
+        self._profile_state = ProfileState()
+        self._profile_stream: Optional[EventStream] = None
+        self._profile_ws_failed = False
 
         if auto_connect:
             self.connect()
@@ -102,8 +159,16 @@ class PXView:
         return self._client.connected
 
     def connect(self) -> None:
-        """Connect to the MCP server and complete the handshake."""
+        """Connect to the MCP server and complete the handshake.
+
+        With a :class:`SampleCache`, also subscribes to the events that
+        invalidate it (if the WebSocket transport is reachable).
+        """
         self._client.connect()
+        self._profile_ws_failed = False
+        self._cache_ws_failed = False
+        if self._sample_cache is not None:
+            self._attach_sample_cache()
 
     def disconnect(self) -> None:
         """Disconnect from the MCP server."""
@@ -214,6 +279,11 @@ class PXView:
 
         Returns:
             Capture status dict (from :meth:`get_capture_status`).
+
+        When *wait* is True the method subscribes to the
+        ``capture_state`` / ``error`` event topics before starting and
+        blocks until the capture reports ``stopped``.  If the WebSocket
+        transport is unavailable it falls back to ``wait_capture``.
         """
         # Build logic device configuration
         logic_cfg: Dict[str, Any] = {}
@@ -240,21 +310,23 @@ class PXView:
                 "triggerType": trigger_type,
             }
 
-        # Start capture
-        self._client.start_capture(
-            device_id=device_id,
-            logic_device_configuration=logic_cfg if logic_cfg else None,
-            capture_configuration=cap_cfg if cap_cfg else None,
-        )
+        # Subscribe before starting so the end-of-capture event can't be missed
+        events = self._capture_events() if wait else None
+        try:
+            self._client.start_capture(
+                device_id=device_id,
+                logic_device_configuration=logic_cfg if logic_cfg else None,
+                capture_configuration=cap_cfg if cap_cfg else None,
+            )
 
-        if not wait:
-            return self._client.get_capture_status()
+            if not wait:
+                return self._client.get_capture_status()
 
-        # Wait for completion
-        self._client.wait_capture(
-            timeout_seconds=wait_timeout_s,
-            timeout=wait_timeout_s + 10,
-        )
+            self._wait_capture_done(events, wait_timeout_s)
+        finally:
+            self.invalidate_samples()
+            if events is not None:
+                events.close()
 
         status = self._client.get_capture_status()
         if status.get("state") == "error":
@@ -266,6 +338,35 @@ class PXView:
 
         return status
 
+    def _capture_events(self) -> Optional[EventStream]:
+        """Subscribe to capture-completion events, or None if WS is unavailable."""
+        try:
+            return self._client.events(["capture_state", "error"])
+        except McpConnectionError:
+            return None
+
+    def _wait_capture_done(self, events: Optional[EventStream], timeout_s: float) -> None:
+        """Block until the capture stops (or an error event arrives)."""
+        deadline = time.monotonic() + timeout_s
+        if events is not None:
+            done = events.wait_for(
+                predicate=lambda e: e.event is ServiceEvent.ERROR_OCCURRED or (
+                    e.event is ServiceEvent.CAPTURE_STATE_CHANGED
+                    and e.params.get("state") == "stopped"
+                ),
+                timeout=timeout_s,
+            )
+            if done is not None:
+                return
+            if events.is_open:
+                raise McpError(f"Capture did not complete within {timeout_s:g}s")
+        # No event channel (or it dropped mid-capture): block server-side
+        remaining = max(0.0, deadline - time.monotonic())
+        self._client.wait_capture(
+            timeout_seconds=remaining,
+            timeout=remaining + 10,
+        )
+
     def capture_and_wait(
         self,
         device_id: str,
@@ -337,21 +438,24 @@ class PXView:
                     ),
                 )
         """
-        self._client.start_capture(
-            device_id=device_id,
-            logic_device_configuration=device_config.to_dict(),
-            capture_configuration=capture_config.to_dict()
-            if capture_config is not None
-            else None,
-        )
+        events = self._capture_events() if wait else None
+        try:
+            self._client.start_capture(
+                device_id=device_id,
+                logic_device_configuration=device_config.to_dict(),
+                capture_configuration=capture_config.to_dict()
+                if capture_config is not None
+                else None,
+            )
 
-        if not wait:
-            return self._client.get_capture_status_typed()
+            if not wait:
+                return self._client.get_capture_status_typed()
 
-        self._client.wait_capture(
-            timeout_seconds=wait_timeout_s,
-            timeout=wait_timeout_s + 10,
-        )
+            self._wait_capture_done(events, wait_timeout_s)
+        finally:
+            self.invalidate_samples()
+            if events is not None:
+                events.close()
 
         status = self._client.get_capture_status_typed()
         if status.state.value == "error":
@@ -363,6 +467,93 @@ class PXView:
 
         return status
 
+    # ==================================================================
+    # Stream capture
+    # ==================================================================
+
+    def stream_capture(
+        self,
+        sink: Any,
+        channels: List[int],
+        rate: int,
+        *,
+        device_id: Optional[str] = None,
+        duration_s: Optional[float] = None,
+        max_samples: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+        chunk_samples: int = 1 << 18,
+        max_pending: int = 16,
+        poll_interval_s: float = 0.05,
+        status_interval_s: float = 1.0,
+        on_stats: Optional[Callable[[StreamStats], None]] = None,
+    ) -> StreamStats:
+        """Run a Stream-mode capture and process its samples while it runs.
+
+        Starts the capture with ``channelMode='Stream'`` and follows the
+        growing logic snapshot with chunked ``get_samples`` reads (see
+        :mod:`pxview_automation.streaming`).  Streaming ends after
+        *duration_s* / *max_samples*, when *stop_event* is set, when the
+        server's disk cache is full or when the capture is stopped
+        elsewhere; the capture is then stopped and its tail drained.
+
+        Args:
+            sink:              Path or binary file object (sigrok logic
+                               units), :class:`SampleRing`, or callable
+                               ``fn(start_sample, {channel: bytes})``.
+            channels:          Digital channels to enable and read.
+            rate:              Sample rate in Hz.
+            device_id:         Device to connect first (default: current).
+            duration_s:        Stop after this many seconds.
+            max_samples:       Stop after this many samples per channel.
+            stop_event:        Stop once this event is set.
+            chunk_samples:     Samples per ``get_samples`` request.
+            max_pending:       Chunks that may wait for a slow sink.
+            poll_interval_s:   Wait at the live edge before reading again.
+            status_interval_s: Interval for disk cache metrics / *on_stats*.
+            on_stats:          Called with :class:`StreamStats` every
+                               *status_interval_s* (backpressure, lag and
+                               ``disk_cache_info`` metrics).
+
+        Returns:
+            Final :class:`StreamStats`.
+        """
+        events = self._stream_events()
+        try:
+            self._client.start_capture(
+                device_id=device_id,
+                logic_device_configuration={
+                    "digitalChannels": channels,
+                    "digitalSampleRate": rate,
+                },
+                capture_configuration={"streamCaptureMode": {}},
+                channelMode="Stream",
+            )
+            return stream_samples(
+                self._client,
+                sink,
+                channels,
+                events=events,
+                duration_s=duration_s,
+                max_samples=max_samples,
+                stop_event=stop_event,
+                chunk_samples=chunk_samples,
+                max_pending=max_pending,
+                poll_interval_s=poll_interval_s,
+                status_interval_s=status_interval_s,
+                on_stats=on_stats,
+            )
+        finally:
+            self.invalidate_samples()
+            if events is not None:
+                events.close()
+
+    def _stream_events(self) -> Optional[EventStream]:
+        """Subscribe to the events :func:`stream_samples` follows, or None."""
+        try:
+            return self._client.events(["capture_state", "data_updated", "error"])
+        except McpConnectionError:
+            return None
+
     # ==================================================================
     # Decoding
     # ==================================================================
@@ -431,10 +622,11 @@ class PXView:
         Returns:
             List of annotation dicts.
         """
-        return self._client.get_analyzer_results(
+        result = self._client.get_analyzer_results(
             analyzer_id=analyzer_id,
             max_count=max_count,
         )
+        return list(result.get("annotations", []))
 
     def clear_decoders(self) -> Any:
         """Remove all active decoders."""
@@ -460,6 +652,7 @@ class PXView:
         sample_count: Optional[int] = None,
         decoder_options: Optional[Dict[str, str]] = None,
         wait_timeout_s: float = 300.0,
+        decode_timeout_s: float = 30.0,
     ) -> List[dict]:
         """Capture + decode in one call.
 
@@ -467,7 +660,9 @@ class PXView:
         1. Add the protocol decoder (before capture, for auto-decode).
         2. Start capture with given parameters.
         3. Wait for capture completion (auto-decode runs after).
-        4. Return decoded annotations.
+        4. Wait until the decoder has finished (see
+           :meth:`McpClient.wait_decoded`).
+        5. Return decoded annotations.
 
         Args:
             device_id:       Device ID.
@@ -479,6 +674,8 @@ class PXView:
             sample_count:    Number of samples (alternative to duration).
             decoder_options: Decoder-specific options.
             wait_timeout_s:  Wait timeout in seconds.
+            decode_timeout_s: Maximum time to wait for decoding to finish
+                             after the capture stops.
 
         Returns:
             List of decoded annotation dicts.
@@ -496,19 +693,25 @@ class PXView:
             device_id=device_id,
         )
 
-        # Capture and wait
-        self.capture(
-            device_id,
-            channels=channels,
-            sample_rate=sample_rate,
-            duration_s=duration_s,
-            sample_count=sample_count,
-            wait=True,
-            wait_timeout_s=wait_timeout_s,
-        )
-
-        # Give the decoder a moment to finish
-        time.sleep(0.5)
+        # Subscribe to decode completion before capturing
+        try:
+            decode_events: Optional[EventStream] = self._client.events(["decode"])
+        except McpConnectionError:
+            decode_events = None
+        try:
+            self.capture(
+                device_id,
+                channels=channels,
+                sample_rate=sample_rate,
+                duration_s=duration_s,
+                sample_count=sample_count,
+                wait=True,
+                wait_timeout_s=wait_timeout_s,
+            )
+            self._client.wait_decoded([analyzer_id], decode_timeout_s, decode_events)
+        finally:
+            if decode_events is not None:
+                decode_events.close()
 
         # Return decoded results
         return self.get_decoder_results(analyzer_id)
@@ -571,6 +774,67 @@ class PXView:
     # Sample reading
     # ==================================================================
 
+    @property
+    def sample_cache(self) -> Optional[SampleCache]:
+        """The :class:`SampleCache` passed to the constructor, if any."""
+        return self._sample_cache
+
+    def invalidate_samples(self) -> None:
+        """Drop cached samples (no-op without a :class:`SampleCache`)."""
+        if self._sample_cache is not None:
+            self._cache_session = None
+            self._sample_cache.invalidate()
+
+    def _attach_sample_cache(self) -> bool:
+        """Subscribe the sample cache to invalidating events; False without WS."""
+        stream = self._client.event_stream
+        if stream is not None and stream is self._cache_stream and stream.is_open:
+            return True
+        if self._cache_stream is not None:
+            # The subscribed stream closed: events may have been missed.
+            self._cache_stream = None
+            self.invalidate_samples()
+        if self._cache_ws_failed:
+            return False
+        try:
+            for event in _SAMPLE_INVALIDATING_EVENTS:
+                self._client.on(event, lambda e: self.invalidate_samples())
+        except McpConnectionError:
+            self._cache_ws_failed = True  # retried after the next connect()
+            return False
+        self._cache_stream = self._client.event_stream
+        return True
+
+    def _sample_cache_key(self, channel: int, channel_type: str) -> Optional[tuple]:
+        """Cache key for the current capture, or None if it must be bypassed."""
+        if not self._attach_sample_cache():
+            # No event stream: only trust the cache while a capture is at rest.
+            if self._client.get_capture_status().get("state") != "completed":
+                self.invalidate_samples()
+                return None
+        if self._cache_session is None:
+            sessions = self._client.list_sessions()
+            if isinstance(sessions, dict):
+                self._cache_session = sessions.get("active_session_id", 0)
+            else:
+                self._cache_session = 0
+        return (self._cache_session, channel, channel_type)
+
+    def _read_logic(self, channel: int, start: int, end: Optional[int]) -> bytes:
+        import base64
+        result = self._client.get_samples(
+            channel_index=channel,
+            channel_type="logic",
+            start_sample=start,
+            end_sample=end,
+        )
+        if isinstance(result, dict):
+            data = result.get("data", result)
+            if isinstance(data, str):
+                return base64.b64decode(data)
+            return data
+        return result
+
     def get_logic_samples(
         self,
         channel: int,
@@ -579,6 +843,9 @@ class PXView:
     ) -> bytes:
         """Read logic samples for a channel.
 
+        With a :class:`SampleCache`, the read is widened to block
+        boundaries and only blocks not already cached are requested.
+
         Args:
             channel: Digital channel index.
             start:   Start sample index (0-based).
@@ -587,20 +854,42 @@ class PXView:
         Returns:
             Raw bytes (one byte per sample, 0 or 1).
         """
-        import base64
         end = start + count if count is not None else None
-        result = self._client.get_samples(
-            channel_index=channel,
-            channel_type="logic",
-            start_sample=start,
-            end_sample=end,
-        )
-        if isinstance(result, dict):
-            data = result.get("data", result)
-            if isinstance(data, str):
-                return base64.b64decode(data)
+        cache = self._sample_cache
+        key = self._sample_cache_key(channel, "logic") if cache is not None else None
+        if cache is None or key is None:
+            return self._read_logic(channel, start, end)
+        if end is None:
+            data = self._read_logic(channel, start, None)
+            cache.store(key, start, data, to_end=True)
             return data
-        return result
+        return cache.read(key, start, end,
+                          lambda s, e: self._read_logic(channel, s, e))
+
+    def get_logic_samples_many(
+        self,
+        channels: List[int],
+        start: int = 0,
+        count: Optional[int] = None,
+        max_workers: int = 4,
+    ) -> Dict[int, bytes]:
+        """Read logic samples for several channels concurrently.
+
+        See :meth:`McpClient.get_samples_many`.  Results also populate
+        the :class:`SampleCache`, if one is configured.
+
+        Returns:
+            Channel index → raw bytes, in the order of *channels*.
+        """
+        end = start + count if count is not None else None
+        batch = self._client.get_samples_many(
+            channels, "logic", start, end, max_workers=max_workers)
+        cache = self._sample_cache
+        key = self._sample_cache_key(0, "logic") if cache is not None else None
+        if cache is not None and key is not None:
+            for ch, data in batch.data.items():
+                cache.store((key[0], ch, "logic"), start, data, to_end=end is None)
+        return batch.data
 
     def get_analog_samples(
         self,
@@ -629,7 +918,9 @@ class PXView:
 
     def load(self, filepath: str) -> Any:
         """Load a capture from a ``.pxc`` session file."""
-        return self._client.load_capture(filepath)
+        result = self._client.load_capture(filepath)
+        self.invalidate_samples()
+        return result
 
     def save(self, filepath: str) -> Any:
         """Save current capture to a ``.pxc`` session file."""
@@ -637,7 +928,9 @@ class PXView:
 
     def close(self) -> Any:
         """Close current capture and free resources."""
-        return self._client.close_capture()
+        result = self._client.close_capture()
+        self.invalidate_samples()
+        return result
 
     # ==================================================================
     # Config shortcuts
@@ -663,3 +956,501 @@ class PXView:
     def disable_channel(self, index: int) -> Any:
         """Disable a channel."""
         return self._client.configure_channel(index, False)
+
+    def configure_channels(self, enabled: Optional[Dict[int, bool]] = None,
+                           names: Optional[Dict[int, str]] = None) -> Any:
+        """Set several channels' enabled state and names in one atomic call.
+
+        Example::
+
+            pxv.configure_channels(enabled={i: i < 4 for i in range(16)},
+                                   names={0: "SCL", 1: "SDA"})
+        """
+        return self._client.configure_channels(enabled, names)
+
+    def apply_profile(self, profile: DeviceProfile, *, refresh: bool = False) -> ProfileResult:
+        """Bring the device to *profile*, writing only the settings that differ.
+
+        The settings the profile names are read (concurrently), compared
+        and only changed ones are written, one call per tool where the
+        tool takes several fields.  A work mode change is applied first
+        and the other settings are read again afterwards.
+
+        While the WebSocket transport is reachable, values read are
+        remembered until a configuration event reports a change, so
+        applying an unchanged profile again costs no tool calls.
+        Settings just written are read back on the next call, which
+        catches values the device rounded (e.g. sample rates).
+
+        Args:
+            profile: Settings to apply; fields left unset are not touched.
+            refresh: Forget remembered values and read everything.
+
+        Returns:
+            :class:`ProfileResult` with the changes made, call counts and
+            read / write timings.
+        """
+        t0 = time.perf_counter()
+        result = ProfileResult()
+        state = self._profile_state
+        if refresh or not self._attach_profile_state():
+            state.invalidate()
+        read_s = write_s = 0.0
+
+        def read(wanted: list) -> dict:
+            nonlocal read_s
+            t = time.perf_counter()
+            generation = state.generation
+            values, missing = {}, []
+            for section in wanted:
+                known, value = state.get(section)
+                if known:
+                    values[section] = value
+                else:
+                    missing.append(section)
+            if missing:
+                fresh = read_sections(self._client, missing)
+                result.reads += len(missing)
+                for section, value in fresh.items():
+                    if value is None:
+                        # Not reported by this server: assume our last write.
+                        fresh[section] = value = state.written(section)
+                    state.store(section, value, generation)
+                values.update(fresh)
+            read_s += time.perf_counter() - t
+            return values
+
+        if profile.work_mode is not None:
+            # Other settings may not be readable in the current mode
+            # (e.g. probes in Logic mode), so the mode goes first.
+            mode = read([("work_mode",)])[("work_mode",)]
+            if mode != profile.work_mode:
+                t = time.perf_counter()
+                state.invalidate()
+                self._client.switch_work_mode(profile.work_mode)
+                result.writes += 1
+                result.changes["work_mode"] = (mode, profile.work_mode)
+                write_s += time.perf_counter() - t
+        values = read(sections(profile))
+
+        t = time.perf_counter()
+        for section, changes, call in diff(self._client, profile, values):
+            # Read back next time rather than trusting what was written.
+            state.invalidate((section[0],))
+            call()
+            state.wrote(section, written_value(section, changes))
+            result.writes += 1
+            result.changes.update(changes)
+        write_s += time.perf_counter() - t
+        result.timings = {"read": read_s, "write": write_s,
+                          "total": time.perf_counter() - t0}
+        return result
+
+    def _attach_profile_state(self) -> bool:
+        """Subscribe the profile state to config events; False without WS."""
+        stream = self._client.event_stream
+        if stream is not None and stream is self._profile_stream and stream.is_open:
+            return True
+        if self._profile_ws_failed:
+            return False
+        state = self._profile_state
+        state.invalidate()
+        try:
+            for event, kinds in _PROFILE_INVALIDATING_EVENTS.items():
+                self._client.on(event, partial(_forget_profile, state, kinds))
+        except McpConnectionError:
+            self._profile_ws_failed = True  # retried after the next connect()
+            return False
+        self._profile_stream = self._client.event_stream
+        return True
+
+
+# ======================================================================
+# Pipelined capture loop
+# ======================================================================
+
+_LOOP_END = object()
+
+# Stages that keep the instrument (active session) busy.
+_INSTRUMENT_STAGES = ("capture", "decode", "snapshot", "save", "export")
+
+
+class CaptureLoop:
+    """Capture repeatedly while earlier captures are processed.
+
+    PXView tools act on the active session, so only one capture can run
+    at a time and its data must be read before the next capture replaces
+    it.  Each iteration is therefore split into stages:
+
+    1. ``capture``  - configure, start and wait (:meth:`PXView.capture`);
+    2. ``decode``   - wait until every analyzer has finished decoding;
+    3. ``snapshot`` - copy samples and annotations to the client;
+    4. ``save``     - optionally ``save_capture`` on the server;
+    5. ``export``   - optionally stream PXView's raw export of each channel
+       to a local directory (:meth:`McpClient.export_raw_data_stream`);
+    6. ``process``  - the decoded table and handlers, on worker threads.
+
+    Stages 1-5 run on the calling thread; as soon as a snapshot is taken
+    the next capture starts while workers process the previous one.
+    Snapshots wait in a queue of at most *max_pending* entries; when the
+    workers fall behind the capture thread blocks on it (recorded as the
+    ``backpressure`` stage) rather than buffering captures without limit.
+
+    Typical usage::
+
+        loop = CaptureLoop(pxv, device["id"], channels=[0, 1],
+                           sample_rate=1_000_000, duration_s=0.1,
+                           export_dir="./runs", export_format="vcd")
+        loop.add_handler(lambda snap: print(snap.index, snap.sample_count))
+        stats = loop.run(count=100)
+    """
+
+    def __init__(
+        self,
+        pxv: PXView,
+        device_id: str,
+        *,
+        channels: Optional[List[int]] = None,
+        sample_rate: Optional[int] = None,
+        duration_s: Optional[float] = None,
+        sample_count: Optional[int] = None,
+        trigger_channel: Optional[int] = None,
+        trigger_type: Optional[str] = None,
+        analyzers: Optional[List[str]] = None,
+        read_samples: bool = True,
+        save_dir: Optional[str] = None,
+        export_dir: Optional[str] = None,
+        export_format: str = "csv",
+        handlers: Optional[List[Callable[[CaptureSnapshot], Any]]] = None,
+        workers: int = 2,
+        max_pending: int = 2,
+        page_size: int = 1000,
+        stop_on_error: bool = True,
+        wait_timeout_s: float = 300.0,
+        decode_timeout_s: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            pxv:              Connected :class:`PXView`.
+            device_id:        Device to capture on.
+            channels:         Digital channels to enable and snapshot
+                              (default: the enabled channels).
+            sample_rate:      Sample rate in Hz.
+            duration_s:       Capture duration per iteration.
+            sample_count:     Samples per iteration (alternative to
+                              *duration_s*).
+            trigger_channel:  Trigger channel, see :meth:`PXView.capture`.
+            trigger_type:     Trigger type, see :meth:`PXView.capture`.
+            analyzers:        Analyzer instance IDs to wait for and
+                              snapshot (default: all active decoders;
+                              ``[]`` for none).
+            read_samples:     Copy logic samples into each snapshot.
+            save_dir:         Server-side directory for one ``.pxc`` per
+                              iteration (``capture_00000.pxc``, ...).
+            export_dir:       Local directory; each capture's raw export is
+                              streamed to ``capture_NNNNN/channel_N.<ext>``
+                              and its annotations are written to
+                              ``decoded.csv``.
+            export_format:    Raw format for *export_dir*: ``'csv'``,
+                              ``'binary'``, ``'vcd'``, ``'hex'`` or
+                              ``'bits'``.
+            handlers:         Callables run with each snapshot on a
+                              worker thread.
+            workers:          Number of worker threads.
+            max_pending:      Snapshots that may wait for a worker.
+            page_size:        Annotations per ``get_analyzer_results``.
+            stop_on_error:    Stop after the first failing worker and
+                              re-raise its exception from :meth:`run`.
+            wait_timeout_s:   Capture wait timeout per iteration.
+            decode_timeout_s: Decode wait timeout per iteration.
+
+        Raises:
+            ConfigError: on an unknown *export_format* or non-positive
+                         *workers* / *max_pending*.
+        """
+        if workers < 1 or max_pending < 1:
+            raise ConfigError("'workers' and 'max_pending' must be at least 1")
+        self._pxv = pxv
+        self._device_id = device_id
+        self._capture_kwargs: Dict[str, Any] = {
+            "channels": channels,
+            "sample_rate": sample_rate,
+            "duration_s": duration_s,
+            "sample_count": sample_count,
+            "trigger_channel": trigger_channel,
+            "trigger_type": trigger_type,
+        }
+        self._channels = channels
+        self._sample_rate = sample_rate
+        self._analyzer_ids = analyzers
+        self._read_samples = read_samples
+        self._save_dir = save_dir
+        self._export_dir = export_dir
+        self._export_format = _raw_format(export_format)
+        self._handlers: List[Callable[[CaptureSnapshot], Any]] = list(handlers or [])
+        self._workers = workers
+        self._max_pending = max_pending
+        self._page_size = page_size
+        self._stop_on_error = stop_on_error
+        self._wait_timeout_s = wait_timeout_s
+        self._decode_timeout_s = decode_timeout_s
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}
+        self._errors: List[BaseException] = []
+        self._captured = 0
+        self._processed = 0
+        self._elapsed = 0.0
+        self._analyzer_names: Dict[str, str] = {}
+
+    # ---- control ----
+
+    def add_handler(self, handler: Callable[[CaptureSnapshot], Any]) -> None:
+        """Run *handler* with every snapshot (on a worker thread)."""
+        self._handlers.append(handler)
+
+    def stop(self) -> None:
+        """Stop after the current capture; :meth:`run` then drains the workers."""
+        self._stop.set()
+
+    def run(
+        self,
+        count: Optional[int] = None,
+        duration_s: Optional[float] = None,
+    ) -> dict:
+        """Capture until *count* iterations, *duration_s* seconds or :meth:`stop`.
+
+        Returns once every snapshot has been processed.
+
+        Args:
+            count:      Number of captures.
+            duration_s: Wall-clock budget; no capture starts after it.
+
+        Returns:
+            :meth:`stats` of this run.
+
+        Raises:
+            ConfigError: on a non-positive *count* / *duration_s*.
+        """
+        if count is not None and count < 1:
+            raise ConfigError("'count' must be at least 1")
+        if duration_s is not None and duration_s <= 0:
+            raise ConfigError("'duration_s' must be positive")
+
+        self._stop.clear()
+        with self._lock:
+            self._stages = {}
+            self._errors = []
+            self._captured = self._processed = 0
+            self._elapsed = 0.0
+
+        client = self._pxv.client
+        active = client.get_active_decoders() or []
+        if self._analyzer_ids is None:
+            analyzer_ids = [d["instance_id"] for d in active if d.get("instance_id")]
+        else:
+            analyzer_ids = list(self._analyzer_ids)
+        self._analyzer_names = {
+            d["instance_id"]: d.get("display_name") or d.get("decoder_id") or ""
+            for d in active if d.get("instance_id")
+        }
+        sample_rate = self._sample_rate or self._pxv.get_sample_rate()
+
+        pending: "queue.Queue[Any]" = queue.Queue(maxsize=self._max_pending)
+        threads = [
+            threading.Thread(target=self._work, args=(pending,),
+                             name=f"pxview-capture-loop-{i}", daemon=True)
+            for i in range(self._workers)
+        ]
+        for t in threads:
+            t.start()
+
+        events: Optional[EventStream] = None
+        if analyzer_ids:
+            try:
+                events = client.events(["decode"])
+            except McpConnectionError:
+                events = None
+        fetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pxview-loop-fetch")
+        t_start = time.monotonic()
+        deadline = t_start + duration_s if duration_s is not None else None
+        try:
+            index = 0
+            while not self._stop.is_set():
+                if count is not None and index >= count:
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                snap = self._acquire(index, analyzer_ids, sample_rate, events, fetcher)
+                with self._lock:
+                    self._captured += 1
+                index += 1
+                t0 = time.monotonic()
+                pending.put(snap)
+                self._record("backpressure", time.monotonic() - t0)
+        finally:
+            if events is not None:
+                events.close()
+            fetcher.shutdown(wait=True)
+            for _ in threads:
+                pending.put(_LOOP_END)
+            for t in threads:
+                t.join()
+            with self._lock:
+                self._elapsed = time.monotonic() - t_start
+
+        if self._errors and self._stop_on_error:
+            raise self._errors[0]
+        return self.stats()
+
+    # ---- stages ----
+
+    def _acquire(
+        self,
+        index: int,
+        analyzer_ids: List[str],
+        sample_rate: int,
+        events: Optional[EventStream],
+        fetcher: ThreadPoolExecutor,
+    ) -> CaptureSnapshot:
+        """Run the instrument stages of one iteration."""
+        client = self._pxv.client
+        snap = CaptureSnapshot(index=index, sample_rate=sample_rate)
+        if events is not None:
+            events.drain()  # DecodeDone of earlier captures
+
+        t0 = time.monotonic()
+        snap.status = self._pxv.capture(
+            self._device_id, wait=True, wait_timeout_s=self._wait_timeout_s,
+            **self._capture_kwargs)
+        t1 = time.monotonic()
+        if analyzer_ids:
+            self._wait_decoded(events, analyzer_ids)
+        t2 = time.monotonic()
+
+        # Page annotations on the fetch thread while samples are read
+        annotations = None
+        if analyzer_ids:
+            annotations = fetcher.submit(self._fetch_annotations, analyzer_ids)
+        if self._read_samples:
+            channels = self._channels
+            if channels is None:
+                channels = [c["index"] for c in client.get_channels()
+                            if isinstance(c, dict) and c.get("enabled")]
+            snap.samples = self._pxv.get_logic_samples_many(channels)
+        if annotations is not None:
+            snap.annotations = annotations.result()
+        t3 = time.monotonic()
+
+        if self._save_dir is not None:
+            path = os.path.join(self._save_dir, f"capture_{index:05d}.pxc")
+            self._pxv.save(path)
+            snap.saved_path = path
+        t4 = time.monotonic()
+
+        # The server renders the export, so it must run before the next
+        # capture replaces the data.
+        if self._export_dir is not None:
+            client.export_raw_data_stream(
+                self._export_format, self._export_path(index), self._channels)
+        t5 = time.monotonic()
+
+        snap.timings = {"capture": t1 - t0, "decode": t2 - t1, "snapshot": t3 - t2}
+        if self._save_dir is not None:
+            snap.timings["save"] = t4 - t3
+        if self._export_dir is not None:
+            snap.timings["export"] = t5 - t4
+        for stage, seconds in snap.timings.items():
+            self._record(stage, seconds)
+        return snap
+
+    def _wait_decoded(self, events: Optional[EventStream], analyzer_ids: List[str]) -> None:
+        """Block until every analyzer in *analyzer_ids* has finished decoding."""
+        self._pxv.client.wait_decoded(analyzer_ids, self._decode_timeout_s, events)
+
+    def _fetch_annotations(self, analyzer_ids: List[str]) -> Dict[str, List[dict]]:
+        client = self._pxv.client
+        return {
+            aid: [a for page, _ in iter_annotations(client, aid, self._page_size) for a in page]
+            for aid in analyzer_ids
+        }
+
+    def _work(self, pending: "queue.Queue[Any]") -> None:
+        """Worker thread: process snapshots until the end marker."""
+        while True:
+            snap = pending.get()
+            if snap is _LOOP_END:
+                return
+            t0 = time.monotonic()
+            try:
+                if self._export_dir is not None:
+                    self._export(snap)
+                for handler in self._handlers:
+                    handler(snap)
+            except Exception as exc:  # noqa: BLE001 - reported by run()
+                with self._lock:
+                    self._errors.append(exc)
+                if self._stop_on_error:
+                    self._stop.set()
+                continue
+            seconds = time.monotonic() - t0
+            snap.timings["process"] = seconds
+            self._record("process", seconds)
+            with self._lock:
+                self._processed += 1
+
+    def _export_path(self, index: int) -> str:
+        assert self._export_dir is not None
+        return os.path.join(self._export_dir, f"capture_{index:05d}")
+
+    def _export(self, snap: CaptureSnapshot) -> None:
+        """Write the annotations of *snap* to ``export_dir/capture_NNNNN/decoded.csv``."""
+        if any(snap.annotations.values()):
+            with open(os.path.join(self._export_path(snap.index), "decoded.csv"), "w",
+                      encoding="utf-8", newline="") as fh:
+                fh.write(TABLE_HEADER)
+                for aid, anns in snap.annotations.items():
+                    name = self._analyzer_names.get(aid) or aid
+                    fh.write("".join(
+                        _csv_row(a["start_sample"], a["end_sample"], name, a["ann_class"],
+                                 (a.get("texts") or [""])[0])
+                        for a in anns))
+
+    # ---- statistics ----
+
+    def _record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def stats(self) -> dict:
+        """Per-stage timing of the current (or last) run.
+
+        Returns:
+            Dict with ``captures``, ``processed``, ``errors``,
+            ``elapsed_s``, ``instrument_busy`` (fraction of wall time
+            spent in capture/decode/snapshot/save/export) and ``stages``:
+            stage name → ``{count, total_s, mean_s, max_s}``.
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    "count": n,
+                    "total_s": total,
+                    "mean_s": total / n if n else 0.0,
+                    "max_s": peak,
+                }
+                for name, (n, total, peak) in self._stages.items()
+            }
+            busy = sum(self._stages[s][1] for s in _INSTRUMENT_STAGES if s in self._stages)
+            return {
+                "captures": self._captured,
+                "processed": self._processed,
+                "errors": len(self._errors),
+                "elapsed_s": self._elapsed,
+                "instrument_busy": busy / self._elapsed if self._elapsed else 0.0,
+                "stages": stages,
+            }
@@ -0,0 +1,345 @@
+"""Pool of PXView headless instances for parallel work.
+
+A single PXView server owns one session at a time, so decoding or
+exporting many saved ``.pxc`` files serially leaves the machine idle.
+:class:`PXViewPool` launches several ``--headless`` instances on
+auto-allocated ports, each with its own config directory so they do
+not fight over settings and profiles, and hands them out through
+leases.
+
+Typical usage::
+
+    from pxview_automation import PXViewPool
+
+    def export(pxv, path):
+        pxv.load(path)
+        return pxv.export("vcd", directory=path + ".out")
+
+    with PXViewPool(size=4, exe_path="C:/PXView/PXView.exe") as pool:
+        results = pool.map(export, ["a.pxc", "b.pxc", "c.pxc"])
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from ._utils import find_free_port
+from .exceptions import McpConnectionError, ProcessError
+from .highlevel import PXView
+from .process import PXViewProcess
+
+
+class _Member:
+    """One pool slot: a process, its connected client and bookkeeping."""
+
+    def __init__(self, index: int, config_dir: str):
+        self.index = index
+        self.config_dir = config_dir
+        self.process: Optional[PXViewProcess] = None
+        self.pxview: Optional[PXView] = None
+        self.restarts = 0
+
+
+class PXViewPool:
+    """Launch and lease a fixed number of PXView headless instances.
+
+    Every instance gets free MCP and WS ports and a private config
+    directory below *config_root*.  Leases are exclusive: a leased
+    :class:`PXView` is used by one thread at a time.  When a lease ends
+    and the instance is found dead (or the job failed with
+    :class:`McpConnectionError` and the instance no longer answers
+    ``ping``), it is restarted before being handed out again.
+
+    Args:
+        size:            Number of instances (default: 2).
+        exe_path:        Path to the PXView executable.  None searches
+                         ``PATH`` and common install dirs.
+        config_root:     Parent directory for the per-instance config
+                         dirs.  None creates a temporary directory that
+                         is removed by :meth:`stop`.
+        log_level:       Log level passed to each instance.
+        startup_timeout: Seconds to wait for each instance to come up.
+        timeout:         Default HTTP timeout of the leased clients.
+        max_restarts:    Restarts allowed per instance before the pool
+                         gives up on it (default: 3).
+    """
+
+    # Attempts to launch one instance; a freshly probed port can be
+    # taken by another process before PXView binds it.
+    _LAUNCH_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        size: int = 2,
+        exe_path: Optional[str] = None,
+        *,
+        config_root: Optional[str] = None,
+        log_level: int = -1,
+        startup_timeout: float = 30.0,
+        timeout: float = 60.0,
+        max_restarts: int = 3,
+    ):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        self.size = size
+        self.exe_path = exe_path
+        self.log_level = log_level
+        self.startup_timeout = startup_timeout
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self._config_root = config_root
+        self._owns_root = False
+        self._members: List[_Member] = []
+        self._idle: "queue.Queue[Optional[_Member]]" = queue.Queue()
+        self._available = 0
+        self._lock = threading.Lock()
+
+    # ---- Context manager ----
+
+    def __enter__(self) -> "PXViewPool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    # ---- Lifecycle ----
+
+    def start(self) -> None:
+        """Launch all instances in parallel and wait until they answer.
+
+        Raises:
+            ProcessError: if any instance fails to start; instances that
+                          did start are stopped again.
+        """
+        if self._members:
+            return  # Already started
+
+        if self._config_root is None:
+            self._config_root = tempfile.mkdtemp(prefix="pxview-pool-")
+            self._owns_root = True
+        self._members = [
+            _Member(i, os.path.join(self._config_root, f"instance-{i}"))
+            for i in range(self.size)
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._launch, m) for m in self._members]
+        errors = [exc for exc in (f.exception() for f in futures) if exc is not None]
+        if errors:
+            self.stop()
+            raise errors[0]
+
+        self._available = len(self._members)
+        for member in self._members:
+            self._idle.put(member)
+
+    def stop(self) -> None:
+        """Stop every instance and remove the temporary config root."""
+        for member in self._members:
+            self._shutdown(member)
+        self._members = []
+        self._idle = queue.Queue()
+        self._available = 0
+        if self._owns_root and self._config_root:
+            shutil.rmtree(self._config_root, ignore_errors=True)
+            self._config_root = None
+            self._owns_root = False
+
+    @property
+    def processes(self) -> List[PXViewProcess]:
+        """The running :class:`PXViewProcess` objects, in slot order."""
+        return [m.process for m in self._members if m.process is not None]
+
+    @property
+    def restarts(self) -> int:
+        """Total number of instance restarts since :meth:`start`."""
+        return sum(m.restarts for m in self._members)
+
+    # ---- Leasing ----
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[PXView]:
+        """Borrow an idle instance for exclusive use.
+
+        Args:
+            timeout: Seconds to wait for an idle instance (None = forever).
+
+        Yields:
+            A connected :class:`PXView` bound to the leased instance.
+
+        Raises:
+            ProcessError: if the pool is not started, every instance has
+                          been dropped, or no instance became idle
+                          within *timeout*.
+        """
+        if not self._members:
+            raise ProcessError("PXViewPool is not started")
+        try:
+            member = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise ProcessError(
+                f"No idle PXView instance within {timeout}s"
+            ) from None
+        if member is None:
+            # Sentinel: the last instance was dropped; wake other waiters.
+            self._idle.put(None)
+            raise ProcessError("All PXView instances in the pool have failed")
+
+        lost_connection = False
+        try:
+            yield member.pxview  # type: ignore[misc]
+        except McpConnectionError:
+            lost_connection = True
+            raise
+        finally:
+            self._release(member, lost_connection)
+
+    def map(
+        self,
+        fn: Callable[[PXView, Any], Any],
+        jobs: Iterable[Any],
+        *,
+        retries: int = 1,
+        lease_timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """Run ``fn(pxview, job)`` for every job across the pool.
+
+        Jobs are dispatched to instances as they become idle.  A job
+        that fails with :class:`McpConnectionError` (typically because
+        its instance crashed) is retried on a restarted instance up to
+        *retries* times; any other exception propagates unchanged.
+
+        Args:
+            fn:            Callable receiving a leased :class:`PXView`
+                           and one job.
+            jobs:          Iterable of job arguments.
+            retries:       Retries per job after a connection failure.
+            lease_timeout: Seconds to wait for an idle instance per job.
+
+        Returns:
+            The results of *fn*, in the order of *jobs*.
+        """
+        def run(job: Any) -> Any:
+            attempt = 0
+            while True:
+                try:
+                    with self.lease(lease_timeout) as pxv:
+                        return fn(pxv, job)
+                except McpConnectionError:
+                    if attempt >= retries:
+                        raise
+                    attempt += 1
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, jobs))
+
+    def health_check(self) -> List[int]:
+        """Ping every idle instance and restart the ones that are down.
+
+        Leased instances are skipped; they are checked when released.
+
+        Returns:
+            Slot indexes of the instances that were restarted.
+        """
+        checked: List[_Member] = []
+        while True:
+            try:
+                member = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if member is None:
+                self._idle.put(None)
+                break
+            checked.append(member)
+
+        restarted = []
+        for member in checked:
+            if not self._is_healthy(member, ping=True):
+                restarted.append(member.index)
+            self._release(member, lost_connection=True)
+        return restarted
+
+    # ---- Internal helpers ----
+
+    def _launch(self, member: _Member) -> None:
+        """Start *member* on fresh ports and connect a client to it."""
+        last_error: Optional[ProcessError] = None
+        for _ in range(self._LAUNCH_ATTEMPTS):
+            proc = PXViewProcess(
+                exe_path=self.exe_path,
+                port=find_free_port(),
+                ws_port=find_free_port(),
+                log_level=self.log_level,
+                startup_timeout=self.startup_timeout,
+                config_dir=member.config_dir,
+            )
+            try:
+                proc.start()
+            except ProcessError as exc:
+                last_error = exc
+                continue
+            member.process = proc
+            break
+        else:
+            assert last_error is not None
+            raise last_error
+
+        pxv = PXView(port=proc.port, ws_port=proc.ws_port, timeout=self.timeout)
+        try:
+            pxv.connect()
+        except Exception:
+            proc.stop()
+            member.process = None
+            raise
+        member.pxview = pxv
+
+    def _shutdown(self, member: _Member) -> None:
+        if member.pxview is not None:
+            member.pxview.disconnect()
+            member.pxview = None
+        if member.process is not None:
+            member.process.stop()
+            member.process = None
+
+    def _is_healthy(self, member: _Member, ping: bool) -> bool:
+        if member.process is None or not member.process.is_running:
+            return False
+        if ping and member.pxview is not None:
+            return member.pxview.client.ping()
+        return member.pxview is not None
+
+    def _release(self, member: _Member, lost_connection: bool) -> None:
+        """Return *member* to the idle queue, restarting it if needed.
+
+        An instance that exhausted *max_restarts* or cannot be restarted
+        is dropped from circulation, shrinking the pool.
+        """
+        if not self._is_healthy(member, ping=lost_connection):
+            self._shutdown(member)
+            try:
+                if member.restarts >= self.max_restarts:
+                    raise ProcessError(
+                        f"PXView instance {member.index} exceeded "
+                        f"{self.max_restarts} restarts"
+                    )
+                member.restarts += 1
+                self._launch(member)
+            except Exception:
+                self._shutdown(member)
+                self._drop()
+                return
+        self._idle.put(member)
+
+    def _drop(self) -> None:
+        with self._lock:
+            self._available -= 1
+            if self._available == 0:
+                self._idle.put(None)
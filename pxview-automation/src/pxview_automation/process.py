@@ -19,17 +19,35 @@ the MCP (:10110) and WS (:10430) transports without any GUI.
 Custom ports can be set via the *port* and *ws_port* parameters, which
 are passed to PXView via ``--port`` and ``--ws-port`` command-line
 options.
+
+Readiness is signalled by PXView itself: the process is started with
+``--ready-file`` and :meth:`PXViewProcess.start` returns as soon as that
+file appears, instead of polling ``ping`` at a fixed interval.  Older
+builds reject the option and exit; they are relaunched without it and
+waited for with ``ping``.
+
+To reuse one warm instance across several pytest sessions, use
+:meth:`PXViewProcess.shared`, which records the running instance in a
+state file guarded by a lock file::
+
+    proc = PXViewProcess.shared("/tmp/pxview-tests.json", exe_path=exe)
+    # ... later sessions attach to the same process ...
+    proc.stop(force=True)   # when the instance should really go away
 """
 
 from __future__ import annotations
 
+import json
 import os
 import shutil
 import signal
 import subprocess
 import sys
+import tempfile
 import time
-from typing import Optional
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
 
 from .exceptions import ProcessError
 
@@ -46,11 +64,23 @@ class PXViewProcess:
         store_log:  If True, pass ``--storelog`` to save logs to file.
         startup_timeout: Seconds to wait for the MCP port to become
                          reachable (default: 30).
+        config_dir: Directory for this instance's settings and profiles
+                    (passed via ``--config-dir``).  None uses the
+                    per-user default, shared by all instances.
+        keep_alive: If True, :meth:`stop` leaves the process running (it
+                    is also detached from this process's console/job) so
+                    a later session can attach to it.
 
     Attributes:
         port:          MCP port.
         process:       The ``subprocess.Popen`` object, or None if
-                       not started.
+                       not started (or attached via :meth:`shared`).
+        server_pid:    PID of the PXView server, also set when attached.
+        startup_timings: Seconds spent in each startup phase: ``spawn``
+                       (process creation), ``server_init`` and
+                       ``server_start`` (as reported by PXView), ``ready``
+                       (spawn until ready) and ``total``.  An attached
+                       instance only records ``attach``.
     """
 
     # Common Windows install locations
@@ -68,6 +98,14 @@ class PXViewProcess:
         "/opt/PXView/PXView",
     ]
 
+    # Ready-file poll interval, and the slower ping fallback for PXView
+    # builds that predate --ready-file.
+    _READY_POLL_INTERVAL = 0.02
+    _PING_INTERVAL = 0.5
+
+    # Executables found to reject --ready-file (see start()).
+    _no_ready_file: set = set()
+
     def __init__(
         self,
         exe_path: Optional[str] = None,
@@ -76,14 +114,21 @@ class PXViewProcess:
         log_level: int = -1,
         store_log: bool = False,
         startup_timeout: float = 30.0,
+        config_dir: Optional[str] = None,
+        keep_alive: bool = False,
     ):
         self.port = port
         self.ws_port = ws_port
         self.log_level = log_level
         self.store_log = store_log
         self.startup_timeout = startup_timeout
+        self.config_dir = config_dir
+        self.keep_alive = keep_alive
         self._exe_path = exe_path or self._find_exe()
         self.process: Optional[subprocess.Popen] = None
+        self.server_pid: Optional[int] = None
+        self.startup_timings: Dict[str, float] = {}
+        self._attached = False
 
     # ---- Context manager ----
 
@@ -104,7 +149,7 @@ class PXViewProcess:
                           fails to start, or the MCP port never becomes
                           reachable.
         """
-        if self.process is not None:
+        if self.process is not None or self._attached:
             return  # Already started
 
         exe = self._exe_path
@@ -124,48 +169,63 @@ class PXViewProcess:
             cmd.extend(["--loglevel", str(self.log_level)])
         if self.store_log:
             cmd.append("--storelog")
-
-        try:
-            # On Windows, use CREATE_NO_WINDOW to avoid a console popup.
-            kwargs: dict = {}
-            if sys.platform == "win32":
-                kwargs["creationflags"] = (
-                    subprocess.CREATE_NO_WINDOW
-                    if hasattr(subprocess, "CREATE_NO_WINDOW")
-                    else 0x08000000
-                )
-
-            self.process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                **kwargs,
+        if self.config_dir:
+            cmd.extend(["--config-dir", self.config_dir])
+        ready_path: Optional[str] = None
+        if exe not in PXViewProcess._no_ready_file:
+            ready_path = os.path.join(
+                tempfile.gettempdir(), f"pxview-ready-{uuid.uuid4().hex}.txt"
             )
-        except OSError as exc:
-            raise ProcessError(
-                f"Failed to start PXView: {exc}"
-            ) from exc
 
-        # On Windows, assign the child process to a Job Object so that
-        # it is automatically killed when this (parent) process exits,
-        # even on abnormal termination (crash, SIGKILL, etc.).
-        # This mirrors the approach used by Saleae's logic2-automation.
-        if sys.platform == "win32":
-            self._assign_to_job_object()
+        self.startup_timings = {}
+        t0 = time.perf_counter()
+        deadline = time.time() + self.startup_timeout
+        self._spawn(cmd + ["--ready-file", ready_path] if ready_path else cmd)
+        self.startup_timings["spawn"] = time.perf_counter() - t0
 
-        # Wait for MCP port to become reachable
-        if not self._wait_for_port(self.startup_timeout):
+        # Wait for the ready file (or, failing that, the MCP port)
+        try:
+            ready = self._wait_ready(ready_path, deadline - time.time())
+            if (not ready and ready_path and self.process is not None
+                    and self.process.poll() == 0):
+                # Builds that predate --ready-file print usage for the
+                # unknown option and exit 0.  Relaunch without it and
+                # rely on ping; remember that for this executable.
+                PXViewProcess._no_ready_file.add(exe)
+                self._spawn(cmd)
+                ready = self._wait_ready(None, deadline - time.time())
+        finally:
+            if ready_path:
+                try:
+                    os.remove(ready_path)
+                except OSError:
+                    pass
+        if not ready:
             # Kill the process if it started but port never came up
-            self.stop()
+            self.stop(force=True)
             raise ProcessError(
                 f"PXView started but MCP port {self.port} did not become "
                 f"reachable within {self.startup_timeout}s. "
                 "Check PXView logs for errors."
             )
+        self.startup_timings["total"] = time.perf_counter() - t0
+
+    def stop(self, force: bool = False) -> None:
+        """Stop the PXView process.
 
-    def stop(self) -> None:
-        """Stop the PXView process."""
+        Args:
+            force: Also stop a *keep_alive* or attached instance.
+        """
+        if self.keep_alive and not force:
+            return
         if self.process is None:
+            if self._attached and self.server_pid:
+                try:
+                    os.kill(self.server_pid, signal.SIGTERM)
+                except OSError:
+                    pass
+                self._attached = False
+                self.server_pid = None
             return
 
         try:
@@ -188,14 +248,102 @@ class PXViewProcess:
                 pass
 
         self.process = None
+        self.server_pid = None
 
     @property
     def is_running(self) -> bool:
         """True if the process is still running."""
+        if self._attached:
+            return self._ping()
         return self.process is not None and self.process.poll() is None
 
+    @classmethod
+    def shared(
+        cls,
+        state_file: str,
+        exe_path: Optional[str] = None,
+        **kwargs,
+    ) -> "PXViewProcess":
+        """Attach to a warm instance recorded in *state_file*, or start one.
+
+        The check-and-start runs under an exclusive lock on
+        ``state_file + ".lock"``, so concurrent sessions never launch two
+        instances.  The returned process has ``keep_alive=True``: leaving
+        a ``with`` block does not stop it; call ``stop(force=True)`` to
+        shut it down.
+
+        Args:
+            state_file: JSON file recording the running instance.
+            exe_path:   Path to the PXView executable (used when starting).
+            **kwargs:   Other :class:`PXViewProcess` arguments.
+
+        Raises:
+            ProcessError: if a new instance has to be started and fails.
+        """
+        kwargs["keep_alive"] = True
+        with _file_lock(state_file + ".lock"):
+            t0 = time.perf_counter()
+            state = _read_state(state_file)
+            if state:
+                params = dict(kwargs, port=state["mcp_port"], ws_port=state["ws_port"])
+                proc = cls(exe_path, **params)
+                if proc._ping():
+                    proc._attached = True
+                    proc.server_pid = state.get("pid")
+                    proc.startup_timings = {"attach": time.perf_counter() - t0}
+                    return proc
+
+            proc = cls(exe_path, **kwargs)
+            proc.start()
+            tmp = state_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(
+                    {"mcp_port": proc.port, "ws_port": proc.ws_port, "pid": proc.server_pid},
+                    fh,
+                )
+            os.replace(tmp, state_file)
+            return proc
+
     # ---- Internal helpers ----
 
+    def _spawn(self, cmd: list) -> None:
+        """Start *cmd* as :attr:`process`."""
+        try:
+            # On Windows, use CREATE_NO_WINDOW to avoid a console popup.
+            kwargs: dict = {}
+            if sys.platform == "win32":
+                kwargs["creationflags"] = (
+                    subprocess.CREATE_NO_WINDOW
+                    if hasattr(subprocess, "CREATE_NO_WINDOW")
+                    else 0x08000000
+                )
+                if self.keep_alive:
+                    kwargs["creationflags"] |= subprocess.CREATE_NEW_PROCESS_GROUP
+            elif self.keep_alive:
+                # Own session: Ctrl-C in the launching terminal must not
+                # reach an instance meant to outlive it.
+                kwargs["start_new_session"] = True
+
+            self.process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                **kwargs,
+            )
+        except OSError as exc:
+            raise ProcessError(
+                f"Failed to start PXView: {exc}"
+            ) from exc
+        self.server_pid = self.process.pid
+
+        # On Windows, assign the child process to a Job Object so that
+        # it is automatically killed when this (parent) process exits,
+        # even on abnormal termination (crash, SIGKILL, etc.).
+        # This mirrors the approach used by Saleae's logic2-automation.
+        # A keep-alive instance must survive us, so it is left out.
+        if sys.platform == "win32" and not self.keep_alive:
+            self._assign_to_job_object()
+
     def _assign_to_job_object(self) -> None:
         """Assign the child process to a Windows Job Object.
 
@@ -271,38 +419,117 @@ class PXViewProcess:
 
         return None
 
-    def _wait_for_port(self, timeout: float) -> bool:
-        """Wait until the MCP port is reachable."""
-        import json
-        import urllib.request
+    def _wait_ready(self, ready_path: Optional[str], timeout: float) -> bool:
+        """Wait for PXView's ready file, falling back to MCP ``ping``.
 
-        url = f"http://127.0.0.1:{self.port}/mcp"
+        With *ready_path* None only ``ping`` is used.  Records ``ready``
+        (and the server-reported phases) in :attr:`startup_timings`.
+        """
+        start = time.perf_counter()
         deadline = time.time() + timeout
+        next_ping = time.time() + self._PING_INTERVAL
 
         while time.time() < deadline:
+            info = _read_ready_file(ready_path) if ready_path else None
+            if info is not None:
+                for key in ("init_ms", "start_ms"):
+                    if key in info:
+                        phase = "server_" + key[:-3]
+                        self.startup_timings[phase] = int(info[key]) / 1000.0
+                if "pid" in info:
+                    self.server_pid = int(info["pid"])
+                self.startup_timings["ready"] = time.perf_counter() - start
+                return True
+
             # Check if process died
             if self.process and self.process.poll() is not None:
                 return False
 
-            try:
-                raw = json.dumps(
-                    {"jsonrpc": "2.0", "id": 0, "method": "ping"}
-                ).encode("utf-8")
-                req = urllib.request.Request(
-                    url,
-                    data=raw,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Connection": "close",
-                    },
-                    method="POST",
-                )
-                with urllib.request.urlopen(req, timeout=3.0) as resp:
-                    if resp.read().strip():
-                        return True
-            except Exception:
-                pass
+            if time.time() >= next_ping:
+                if self._ping():
+                    self.startup_timings["ready"] = time.perf_counter() - start
+                    return True
+                next_ping = time.time() + self._PING_INTERVAL
 
-            time.sleep(0.5)
+            time.sleep(self._READY_POLL_INTERVAL)
 
         return False
+
+    def _ping(self) -> bool:
+        """Return True if the MCP port answers a ``ping``."""
+        import urllib.request
+
+        url = f"http://127.0.0.1:{self.port}/mcp"
+        try:
+            raw = json.dumps(
+                {"jsonrpc": "2.0", "id": 0, "method": "ping"}
+            ).encode("utf-8")
+            req = urllib.request.Request(
+                url,
+                data=raw,
+                headers={
+                    "Content-Type": "application/json",
+                    "Connection": "close",
+                },
+                method="POST",
+            )
+            with urllib.request.urlopen(req, timeout=3.0) as resp:
+                return bool(resp.read().strip())
+        except Exception:
+            return False
+
+
+def _read_ready_file(path: str) -> Optional[Dict[str, str]]:
+    """Parse the ``key=value`` lines PXView writes to ``--ready-file``."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            text = fh.read()
+    except OSError:
+        return None
+    info = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            info[key.strip()] = value.strip()
+    return info
+
+
+def _read_state(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or "mcp_port" not in state or "ws_port" not in state:
+        return None
+    return state
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive, cross-process lock on *path* (created if missing)."""
+    with open(path, "a+b") as fh:
+        if sys.platform == "win32":
+            import msvcrt
+
+            fh.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after ~10 s; keep waiting.
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
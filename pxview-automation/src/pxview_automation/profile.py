@@ -0,0 +1,274 @@
+"""Diff-based application of :class:`~pxview_automation.DeviceProfile`.
+
+Setting up a capture takes many tool calls (work mode, sample config,
+per-channel enable / name, trigger, probes, glitch filter, signal
+invert, generic config), and loops used to re-send all of them every
+iteration.  :meth:`PXView.apply_profile` instead reads the settings the
+profile names, compares them with the profile and writes only what
+differs::
+
+    from pxview_automation import DeviceProfile, PXView
+
+    profile = DeviceProfile(sample_rate=10_000_000, sample_limit=1_000_000,
+                            channels={0: True, 1: True, 2: False})
+    with PXView(auto_connect=True) as pxv:
+        for _ in range(100):
+            result = pxv.apply_profile(profile)   # no calls once settled
+            pxv.capture(...)
+
+Reads for independent settings are issued concurrently, and changed
+fields of one tool (``set_sample_config``, ``configure_trigger``, the
+channel enables + names, the glitch filter / signal invert channel
+sets) are merged into a single call.  :class:`ProfileState` remembers
+what was read while the WebSocket event stream reports configuration
+changes, so a profile that is already applied costs no round trips.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .types import DeviceProfile, ServiceEvent
+
+if TYPE_CHECKING:
+    from .client import McpClient
+
+# A state section: ("sample",), ("probe", 3), ("config", key, type), ...
+Section = Tuple[Any, ...]
+
+# Service event → kinds of section it makes stale (None = all).
+INVALIDATING_EVENTS: Dict[ServiceEvent, Optional[Tuple[str, ...]]] = {
+    ServiceEvent.DEVICE_MODE_CHANGED: None,
+    ServiceEvent.DEVICE_CONFIG_CHANGED: None,
+    ServiceEvent.DEVICE_DETACHED: None,
+    ServiceEvent.LOAD_COMPLETE: None,
+    ServiceEvent.SAMPLE_CONFIG_CHANGED: ("sample",),
+    ServiceEvent.CHANNEL_CONFIG_CHANGED: ("channels",),
+    ServiceEvent.TRIGGER_CONFIG_CHANGED: ("trigger",),
+    ServiceEvent.GLITCH_FILTER_COMPLETED: ("glitch",),
+    ServiceEvent.GLITCH_FILTER_CLEARED: ("glitch",),
+    ServiceEvent.SIGNAL_INVERT_COMPLETED: ("invert",),
+    ServiceEvent.SIGNAL_INVERT_CLEARED: ("invert",),
+}
+
+_SAMPLE_FIELDS = ("sample_rate", "sample_limit", "time_base", "collect_mode", "repeat_interval")
+_PROBE_FIELDS = ("vdiv", "coupling", "vfactor", "map_default")
+
+
+class ProfileState:
+    """Thread-safe record of device settings read from the server.
+
+    :meth:`invalidate` starts a new generation; a read that was issued
+    before it is not stored (:meth:`store` compares generations).
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[Section, Any] = {}
+        self._written: Dict[Section, Any] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, section: Section) -> Tuple[bool, Any]:
+        """``(known, value)`` for *section*."""
+        with self._lock:
+            if section in self._values:
+                return True, self._values[section]
+            return False, None
+
+    def store(self, section: Section, value: Any, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._values[section] = value
+
+    def wrote(self, section: Section, value: Any) -> None:
+        """Record the value last written to *section*."""
+        with self._lock:
+            self._written[section] = value
+
+    def written(self, section: Section) -> Any:
+        """Value last written to *section*, or None; see :func:`read_section`."""
+        with self._lock:
+            return self._written.get(section)
+
+    def invalidate(self, kinds: Optional[Iterable[str]] = None) -> None:
+        """Forget sections of *kinds* (``'sample'``, ``'probe'``, ...; None = all)."""
+        with self._lock:
+            self._generation += 1
+            if kinds is None:
+                self._values.clear()
+                self._written.clear()
+                return
+            names = set(kinds)
+            for section in [s for s in self._values if s[0] in names]:
+                del self._values[section]
+
+
+def sections(profile: DeviceProfile) -> List[Section]:
+    """State sections *profile* needs to compare against, work mode excluded."""
+    out: List[Section] = []
+    if any(getattr(profile, f) is not None for f in _SAMPLE_FIELDS):
+        out.append(("sample",))
+    if profile.channels or profile.channel_names:
+        out.append(("channels",))
+    if profile.trigger:
+        out.append(("trigger",))
+    out.extend(("probe", ch) for ch in sorted(profile.probes))
+    if profile.glitch_filter is not None:
+        out.append(("glitch",))
+    if profile.signal_invert is not None:
+        out.append(("invert",))
+    out.extend(("config", key, vtype) for key, (vtype, _) in sorted(profile.config.items()))
+    return out
+
+
+def read_section(client: "McpClient", section: Section) -> Any:
+    """Current server value of *section*, normalized for :func:`diff`.
+
+    None means the server cannot report it (signal invert on PXView builds
+    whose getter only says whether invert is active).
+    """
+    kind = section[0]
+    if kind == "work_mode":
+        return client.get_work_mode()
+    if kind == "sample":
+        return client.get_sample_config()
+    if kind == "channels":
+        return {ch["index"]: ch for ch in client.get_channels()}
+    if kind == "trigger":
+        return client.configure_trigger()
+    if kind == "probe":
+        return client.configure_probe(section[1])
+    if kind == "glitch":
+        cfg = client.configure_glitch_filter()
+        modes = list(cfg.get("modes") or [])
+        modes += [0] * (len(cfg.get("channels", [])) - len(modes))
+        return {ch: (t, m) for ch, t, m in zip(cfg.get("channels", []),
+                                              cfg.get("thresholds", []), modes)}
+    if kind == "invert":
+        cfg = client.configure_signal_invert()
+        channels = cfg.get("channels", [])
+        if cfg.get("is_active") and not channels:
+            return None
+        return {ch: True for ch, on in zip(channels, cfg.get("invert_states", [])) if on}
+    if kind == "config":
+        result = client.get_config(section[1], section[2])
+        return result.get("value") if isinstance(result, dict) else result
+    raise ValueError(f"Unknown profile section {section!r}")
+
+
+def read_sections(client: "McpClient", wanted: List[Section],
+                  max_workers: int = 8) -> Dict[Section, Any]:
+    """Read *wanted* sections, concurrently when there is more than one."""
+    if len(wanted) <= 1:
+        return {s: read_section(client, s) for s in wanted}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(wanted))) as pool:
+        values = list(pool.map(lambda s: read_section(client, s), wanted))
+    return dict(zip(wanted, values))
+
+
+# A pending write: (section it changes, changes, call).
+Write = Tuple[Section, Dict[str, Tuple[Any, Any]], Callable[[], Any]]
+
+
+def diff(client: "McpClient", profile: DeviceProfile,
+         state: Dict[Section, Any]) -> List[Write]:
+    """Tool calls that bring the *state* read from the server to *profile*."""
+    writes: List[Write] = []
+
+    if ("sample",) in state:
+        current = state[("sample",)]
+        changed = {f: (current.get(f), getattr(profile, f)) for f in _SAMPLE_FIELDS
+                   if getattr(profile, f) is not None
+                   and not _same(current.get(f), getattr(profile, f))}
+        if changed:
+            args = {f: new for f, (_, new) in changed.items()}
+            writes.append((("sample",), changed, partial(client.set_sample_config, **args)))
+
+    if ("channels",) in state:
+        current = state[("channels",)]
+        changed = {}
+        enabled: Dict[int, bool] = {}
+        names: Dict[int, str] = {}
+        for ch in sorted(set(profile.channels) | set(profile.channel_names)):
+            info = current.get(ch, {})
+            if ch in profile.channels and info.get("enabled") != profile.channels[ch]:
+                changed[f"channel[{ch}].enabled"] = (info.get("enabled"), profile.channels[ch])
+                enabled[ch] = profile.channels[ch]
+            if ch in profile.channel_names and info.get("name") != profile.channel_names[ch]:
+                changed[f"channel[{ch}].name"] = (info.get("name"), profile.channel_names[ch])
+                names[ch] = profile.channel_names[ch]
+        if changed:
+            writes.append((("channels",), changed,
+                           partial(client.configure_channels, enabled, names)))
+
+    if ("trigger",) in state:
+        current = state[("trigger",)]
+        changed = {f"trigger.{k}": (current.get(k), v) for k, v in profile.trigger.items()
+                   if not _same(current.get(k), v)}
+        if changed:
+            args = {k: v for k, v in profile.trigger.items() if f"trigger.{k}" in changed}
+            writes.append((("trigger",), changed, partial(client.configure_trigger, **args)))
+
+    for ch, probe in sorted(profile.probes.items()):
+        current = state.get(("probe", ch))
+        if current is None:
+            continue
+        wanted = {"vdiv": probe.vdiv, "vfactor": probe.vfactor, "map_default": probe.map_default,
+                  "coupling": probe.coupling.value if probe.coupling is not None else None}
+        changed = {f"probe[{ch}].{k}": (current.get(k), wanted[k]) for k in _PROBE_FIELDS
+                   if wanted[k] is not None and not _same(current.get(k), wanted[k])}
+        if changed:
+            args = {k: wanted[k] for k in _PROBE_FIELDS if f"probe[{ch}].{k}" in changed}
+            writes.append((("probe", ch), changed, partial(
+                client.configure_probe, ch, vdiv=args.get("vdiv"), coupling=args.get("coupling"),
+                vfactor=args.get("vfactor"), map_default=args.get("map_default"))))
+
+    if ("glitch",) in state and profile.glitch_filter is not None:
+        wanted_glitch = {ch: v if isinstance(v, tuple) else (v, 0)
+                         for ch, v in profile.glitch_filter.items()}
+        if wanted_glitch != state[("glitch",)]:
+            chans = sorted(wanted_glitch)
+            writes.append((("glitch",), {"glitch_filter": (state[("glitch",)], wanted_glitch)},
+                           partial(client.configure_glitch_filter, chans,
+                                   [wanted_glitch[c][0] for c in chans],
+                                   [wanted_glitch[c][1] for c in chans])))
+
+    if ("invert",) in state and profile.signal_invert is not None:
+        # Compared as the set of inverted channels, which is what PXView
+        # reports; channels not listed are not inverted.
+        wanted_invert = {ch: True for ch, v in sorted(profile.signal_invert.items()) if v}
+        if wanted_invert != state[("invert",)]:
+            chans = list(wanted_invert)
+            writes.append((("invert",), {"signal_invert": (state[("invert",)], wanted_invert)},
+                           partial(client.configure_signal_invert,
+                                   chans, [True] * len(chans))))
+
+    for key, (vtype, value) in sorted(profile.config.items()):
+        section = ("config", key, vtype)
+        if section in state and not _same(state[section], value):
+            writes.append((section, {f"config[{key}]": (state[section], value)},
+                           partial(client.set_config, key, vtype, value)))
+    return writes
+
+
+def written_value(section: Section, changes: Dict[str, Tuple[Any, Any]]) -> Any:
+    """Value of *section* after a write of *changes*, for sections the server may not report."""
+    if section == ("invert",):
+        return changes["signal_invert"][1]
+    return None
+
+
+def _same(current: Any, wanted: Any) -> bool:
+    numbers = (int, float)
+    if (isinstance(current, numbers) and isinstance(wanted, numbers)
+            and not isinstance(current, bool) and not isinstance(wanted, bool)):
+        return math.isclose(current, wanted, rel_tol=1e-9, abs_tol=1e-12)
+    return bool(current == wanted)
@@ -0,0 +1,214 @@
+"""Block cache for logic sample reads.
+
+Viewers and render-style loops read overlapping ``get_samples`` windows
+(``pos += window // 2``), re-transferring data the client already holds.
+:class:`SampleCache` splits every read into fixed-size blocks aligned to
+``block_size`` sample boundaries, fetches only the blocks it is missing
+(one request per contiguous run) and keeps decoded blocks in a
+byte-bounded LRU::
+
+    from pxview_automation import PXView, SampleCache
+
+    pxv = PXView(sample_cache=SampleCache(max_bytes=64 << 20))
+    pxv.connect()
+    for pos in range(0, total, window // 2):
+        data = pxv.get_logic_samples(0, pos, window)   # half from memory
+
+Blocks are keyed by ``(session, generation, channel, type, block)``.
+:meth:`SampleCache.invalidate` starts a new generation, so a fetch that
+was in flight when the capture changed is discarded instead of stored.
+:class:`~pxview_automation.PXView` invalidates on its own capture / load /
+close calls and on ``CaptureStateChanged``, ``DataUpdated``,
+``LoadComplete`` and glitch-filter / signal-invert events.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from .exceptions import ConfigError
+
+Fetch = Callable[[int, int], bytes]
+
+
+class SampleCache:
+    """Thread-safe, byte-bounded LRU of aligned sample blocks.
+
+    Args:
+        max_bytes:  Upper bound on cached sample bytes (one byte per
+                    logic sample).
+        block_size: Samples per block; reads are widened to block
+                    boundaries.
+
+    Attributes:
+        hits:      Blocks served from memory.
+        misses:    Blocks fetched from the server.
+        evictions: Blocks dropped to stay within *max_bytes*.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20, block_size: int = 1 << 16):
+        if block_size <= 0 or max_bytes < 0:
+            raise ConfigError("block_size must be positive and max_bytes non-negative")
+        self.max_bytes = max_bytes
+        self.block_size = block_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._blocks: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        # (session, generation, channel, type) → index of the last block,
+        # learned when a fetch comes back short (end of capture).
+        self._tails: Dict[Tuple, int] = {}
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (f"SampleCache(blocks={len(self._blocks)}, bytes={self._bytes}, "
+                f"max_bytes={self.max_bytes}, block_size={self.block_size})")
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> dict:
+        """Counters and occupancy as a plain dict."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "blocks": len(self._blocks),
+                "bytes": self._bytes,
+                "generation": self._generation,
+            }
+
+    def invalidate(self) -> None:
+        """Drop every block and start a new capture generation."""
+        with self._lock:
+            self._generation += 1
+            self._blocks.clear()
+            self._tails.clear()
+            self._bytes = 0
+
+    # ---- Reads ----
+
+    def read(self, key: Tuple[Hashable, ...], start: int, end: int, fetch: Fetch) -> bytes:
+        """Return samples ``[start, end)`` for *key*, fetching missing blocks.
+
+        Args:
+            key:   ``(session, channel, type)``; the current generation is
+                   added internally.
+            start: First sample (inclusive).
+            end:   Last sample (exclusive).
+            fetch: ``fetch(start, end) -> bytes`` reading from the server.
+
+        The result is shorter than requested if the capture ends first.
+        """
+        if end <= start:
+            return b""
+        bs = self.block_size
+        first, last = start // bs, (end - 1) // bs
+        with self._lock:
+            gen = self._generation
+            full_key = key[:1] + (gen,) + key[1:]
+            tail = self._tails.get(full_key)
+            if tail is not None:
+                last = min(last, tail)
+            blocks: List[Optional[bytes]] = [self._get(full_key, i) for i in range(first, last + 1)]
+
+        i = 0
+        while i < len(blocks):
+            if blocks[i] is not None:
+                i += 1
+                continue
+            j = i
+            while j + 1 < len(blocks) and blocks[j + 1] is None:
+                j += 1
+            data = fetch((first + i) * bs, (first + j + 1) * bs)
+            fetched = self._split(data, j - i + 1)
+            blocks[i:j + 1] = fetched
+            self._store(full_key, gen, first + i, fetched)
+            if not fetched:
+                del blocks[i:]
+                with self._lock:
+                    if self._generation == gen and first + i > 0:
+                        self._tails[full_key] = first + i - 1
+                break
+            if len(fetched) < j - i + 1 or len(fetched[-1]) < bs:
+                del blocks[i + len(fetched):]  # capture ended inside this run
+                break
+            i = j + 1
+
+        joined = b"".join(b for b in blocks if b is not None)
+        offset = start - first * bs
+        return joined[offset:offset + (end - start)]
+
+    def store(self, key: Tuple[Hashable, ...], start: int, data: bytes, *,
+              to_end: bool = False) -> None:
+        """Add samples read outside the cache, e.g. a whole-channel read.
+
+        Only whole blocks are kept, plus the final partial block when
+        *to_end* says *data* runs to the end of the capture.
+        """
+        bs = self.block_size
+        first = -(-start // bs)
+        skip = first * bs - start
+        if skip >= len(data) and not to_end:
+            return
+        blocks = self._split(data[skip:], None)
+        if blocks and len(blocks[-1]) < bs and not to_end:
+            blocks.pop()
+        with self._lock:
+            gen = self._generation
+            full_key = key[:1] + (gen,) + key[1:]
+        self._store(full_key, gen, first, blocks, count_misses=False)
+        if to_end and blocks and len(blocks[-1]) == bs:
+            # Data ended exactly on a block boundary.
+            with self._lock:
+                if self._generation == gen:
+                    self._tails[full_key] = first + len(blocks) - 1
+
+    # ---- Internals ----
+
+    def _get(self, full_key: Tuple, index: int) -> Optional[bytes]:
+        block = self._blocks.get(full_key + (index,))
+        if block is not None:
+            self._blocks.move_to_end(full_key + (index,))
+            self.hits += 1
+        return block
+
+    def _split(self, data: bytes, count: Optional[int]) -> List[bytes]:
+        bs = self.block_size
+        n = -(-len(data) // bs)
+        if count is not None:
+            n = min(n, count)
+        return [bytes(data[k * bs:(k + 1) * bs]) for k in range(n)]
+
+    def _store(self, full_key: Tuple, gen: int, first: int, blocks: List[bytes],
+               count_misses: bool = True) -> None:
+        with self._lock:
+            if count_misses:
+                self.misses += len(blocks)
+            if gen != self._generation:
+                return  # capture changed while fetching
+            for k, block in enumerate(blocks):
+                bkey = full_key + (first + k,)
+                old = self._blocks.pop(bkey, None)
+                if old is not None:
+                    self._bytes -= len(old)
+                if len(block) > self.max_bytes:
+                    continue
+                self._blocks[bkey] = block
+                self._bytes += len(block)
+                if len(block) < self.block_size:
+                    self._tails[full_key] = first + k
+            while self._bytes > self.max_bytes:
+                _, dropped = self._blocks.popitem(last=False)
+                self._bytes -= len(dropped)
+                self.evictions += 1
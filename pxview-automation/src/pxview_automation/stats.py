@@ -0,0 +1,308 @@
+"""Per-tool latency and payload instrumentation for :class:`McpClient`.
+
+Every JSON-RPC request the client sends is recorded under its tool name
+(or method name for non-tool calls such as ``initialize``), with a
+latency histogram per phase:
+
+``connect``
+    TCP connect to the MCP port.
+``send``
+    Writing the request line, headers and body.
+``ttfb``
+    From the end of the send until the response status line arrives,
+    i.e. server compute time plus one network round trip.
+``read``
+    Reading the response body.
+``parse``
+    Decoding the JSON (or SSE) body.
+``total``
+    Wall time of the whole call, including retries and back-off.
+
+Counters track calls, errors, retries, re-handshakes and request /
+response bytes.  Typical usage::
+
+    client = McpClient()
+    client.on_response(lambda rec: print(rec.tool, rec.timings))
+    ...
+    print(client.stats().to_prometheus())
+
+Phase timings come from an instrumented ``http.client`` connection that
+the client installs in urllib's default opener; the ``read``, ``parse``
+and ``total`` phases are measured by the client itself.
+"""
+
+from __future__ import annotations
+
+import bisect
+import copy
+import http.client
+import json
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PHASES = ("connect", "send", "ttfb", "read", "parse", "total")
+
+# Histogram bucket upper bounds in seconds (Prometheus ``le`` labels).
+BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+@dataclass
+class CallRecord:
+    """One JSON-RPC call, passed to ``on_request`` / ``on_response`` hooks.
+
+    ``on_request`` hooks see the record before it is sent (``timings``
+    empty); ``on_response`` hooks see the same object once the call has
+    finished, successfully or not.
+
+    Attributes:
+        tool:           Tool name for ``tools/call``, else the method.
+        method:         JSON-RPC method.
+        request_id:     JSON-RPC id.
+        request_bytes:  Size of the encoded request body.
+        response_bytes: Size of the response body (last attempt), after
+                        any ``Content-Encoding`` was undone.
+        timings:        Seconds per phase (see :data:`PHASES`).
+        retries:        Attempts beyond the first.
+        reconnected:    True if a re-handshake was triggered.
+        error:          Exception that ended the call, if any.
+        response_wire_bytes: Size of the response body as received, i.e.
+                        compressed when the server applied gzip / deflate.
+    """
+
+    tool: str
+    method: str
+    request_id: Any = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    retries: int = 0
+    reconnected: bool = False
+    error: Optional[BaseException] = None
+    response_wire_bytes: int = 0
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (seconds)."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: upper bound of the bucket containing *q*."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return BUCKETS[i] if i < len(BUCKETS) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.counts)),
+        }
+
+
+class ToolStats:
+    """Counters and phase histograms for one tool."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.reconnects = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.response_wire_bytes = 0
+        self.phases: Dict[str, Histogram] = {p: Histogram() for p in PHASES}
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "reconnects": self.reconnects,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "response_wire_bytes": self.response_wire_bytes,
+            "phases": {p: h.to_dict() for p, h in self.phases.items() if h.count},
+        }
+
+
+class ClientStats:
+    """Thread-safe collection of :class:`ToolStats`, keyed by tool name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.tools: Dict[str, ToolStats] = {}
+        self.hook_errors = 0
+
+    def record(self, rec: CallRecord) -> None:
+        with self._lock:
+            st = self.tools.get(rec.tool)
+            if st is None:
+                st = self.tools[rec.tool] = ToolStats()
+            st.calls += 1
+            st.errors += rec.error is not None
+            st.retries += rec.retries
+            st.reconnects += rec.reconnected
+            st.request_bytes += rec.request_bytes
+            st.response_bytes += rec.response_bytes
+            st.response_wire_bytes += rec.response_wire_bytes
+            for phase, value in rec.timings.items():
+                st.phases[phase].observe(value)
+
+    def add_error(self, tool: str) -> None:
+        """Count an error reported by the server for an answered call."""
+        with self._lock:
+            st = self.tools.get(tool)
+            if st is None:
+                st = self.tools[tool] = ToolStats()
+            st.errors += 1
+
+    def add_hook_error(self) -> None:
+        with self._lock:
+            self.hook_errors += 1
+
+    def snapshot(self) -> "ClientStats":
+        with self._lock:
+            snap = ClientStats()
+            snap.tools = copy.deepcopy(self.tools)
+            snap.hook_errors = self.hook_errors
+        return snap
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tools = {}
+            self.hook_errors = 0
+
+    # ---- Export ----
+
+    def to_dict(self) -> dict:
+        return {
+            "tools": {name: st.to_dict() for name, st in sorted(self.tools.items())},
+            "hook_errors": self.hook_errors,
+        }
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "pxview_mcp") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        counters = (
+            ("calls_total", "calls", "MCP calls by tool."),
+            ("errors_total", "errors", "Failed MCP calls by tool."),
+            ("retries_total", "retries", "Request retries by tool."),
+            ("reconnects_total", "reconnects", "Re-handshakes triggered by tool."),
+            ("request_bytes_total", "request_bytes", "Request body bytes by tool."),
+            ("response_bytes_total", "response_bytes", "Response body bytes by tool."),
+            ("response_wire_bytes_total", "response_wire_bytes",
+             "Response body bytes received before decompression, by tool."),
+        )
+        tools = sorted(self.tools.items())
+        for metric, attr, help_text in counters:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, st in tools:
+                lines.append(f'{prefix}_{metric}{{tool="{name}"}} {getattr(st, attr)}')
+
+        metric = f"{prefix}_phase_seconds"
+        lines.append(f"# HELP {metric} MCP call latency by tool and phase.")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, st in tools:
+            for phase, h in st.phases.items():
+                if not h.count:
+                    continue
+                labels = f'tool="{name}",phase="{phase}"'
+                cumulative = 0
+                for bound, n in zip(BUCKETS + (float("inf"),), h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{labels}}} {h.sum!r}")
+                lines.append(f"{metric}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+Hook = Callable[[CallRecord], None]
+
+
+# ------------------------------------------------------------------
+# Transport phase timing
+#
+# urllib gives no visibility below urlopen(), so the client installs
+# an HTTP handler whose connections note connect / send / ttfb times
+# into a thread-local dict that _post() arms before each attempt.
+# ------------------------------------------------------------------
+
+_phase_local = threading.local()
+
+
+def begin_phases() -> Dict[str, float]:
+    """Arm phase timing for the next request on this thread."""
+    timings: Dict[str, float] = {}
+    _phase_local.timings = timings
+    return timings
+
+
+def end_phases() -> None:
+    _phase_local.timings = None
+
+
+def _note(phase: str, value: float) -> None:
+    timings = getattr(_phase_local, "timings", None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + value
+
+
+class _TimedHTTPConnection(http.client.HTTPConnection):
+    _connect_time = 0.0
+    _sent_at: Optional[float] = None
+
+    def connect(self) -> None:
+        t0 = time.perf_counter()
+        super().connect()
+        self._connect_time = time.perf_counter() - t0
+        _note("connect", self._connect_time)
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        t0 = time.perf_counter()
+        self._connect_time = 0.0
+        super().request(*args, **kwargs)
+        # request() connects lazily; keep that out of "send".
+        self._sent_at = time.perf_counter()
+        _note("send", self._sent_at - t0 - self._connect_time)
+
+    def getresponse(self) -> http.client.HTTPResponse:
+        resp = super().getresponse()
+        if self._sent_at is not None:
+            _note("ttfb", time.perf_counter() - self._sent_at)
+        return resp
+
+
+class TimedHTTPHandler(urllib.request.HTTPHandler):
+    """``HTTPHandler`` whose connections report phase timings."""
+
+    def http_open(self, req: urllib.request.Request) -> http.client.HTTPResponse:
+        return self.do_open(_TimedHTTPConnection, req)
+
@@ -0,0 +1,433 @@
+"""Online reads of a running Stream-mode capture.
+
+In Stream mode PXView keeps acquiring until ``stop_capture`` and the
+logic snapshot grows while the capture runs; ``get_samples`` returns
+whatever has arrived so far.  :func:`stream_samples` follows that live
+edge with chunked reads and hands each chunk to a sink, so long
+captures can be processed (or written to disk) while they run::
+
+    from pxview_automation import PXView, SampleRing
+
+    ring = SampleRing(10_000_000)
+    with PXView(auto_connect=True) as pxv:
+        stats = pxv.stream_capture(ring, [0, 1, 2, 3], 10_000_000, duration_s=3600)
+
+Sinks:
+
+``str`` / path-like / binary file object
+    Samples are appended in the sigrok ``binary`` logic layout: one unit
+    of ``ceil(len(channels) / 8)`` bytes per sample, little-endian, bit
+    *k* holding ``channels[k]``.
+:class:`SampleRing`
+    Keeps the most recent samples of every channel in memory.
+callable
+    Called as ``fn(start_sample, {channel: bytes})`` with one byte per
+    sample.
+
+Chunks travel from the reader to the sink through a bounded queue.  A
+slow sink stalls the reader rather than buffering without limit; the
+stall time, queue depth and lag behind the server are reported in
+:class:`~pxview_automation.types.StreamStats` together with the
+server's disk cache metrics from ``get_session_status``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .exceptions import ConfigError, McpConnectionError, McpError
+from .exports import _Writer
+from .types import ServiceEvent, StreamStats
+
+if TYPE_CHECKING:
+    from .client import McpClient
+    from .events import EventStream
+
+__all__ = [
+    "SampleRing",
+    "stream_samples",
+]
+
+_END = object()
+
+
+# ======================================================================
+# Sinks
+# ======================================================================
+
+class SampleRing:
+    """Fixed-size ring buffer of the most recent logic samples.
+
+    Args:
+        capacity: Samples kept per channel.
+
+    Example::
+
+        ring = SampleRing(1_000_000)
+        pxv.stream_capture(ring, [0, 1], 10_000_000, duration_s=60)
+        tail = ring.latest(1000)[0]     # last 1000 samples of channel 0
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ConfigError("'capacity' must be at least 1")
+        self.capacity = capacity
+        self._buffers: Dict[int, bytearray] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, start: int, data: Dict[int, bytes]) -> None:
+        self.append(data)
+
+    @property
+    def total(self) -> int:
+        """Samples appended per channel since creation."""
+        return self._total
+
+    @property
+    def channels(self) -> List[int]:
+        return list(self._buffers)
+
+    def append(self, data: Dict[int, bytes]) -> None:
+        """Append the same number of samples to every channel."""
+        with self._lock:
+            count = len(next(iter(data.values()), b""))
+            pos = self._total % self.capacity
+            for ch, chunk in data.items():
+                buf = self._buffers.get(ch)
+                if buf is None:
+                    buf = self._buffers[ch] = bytearray(self.capacity)
+                if count >= self.capacity:
+                    # Only the tail survives; keep it where it would have landed
+                    tail = chunk[count - self.capacity:]
+                    split = (pos + count) % self.capacity
+                    buf[split:] = tail[:self.capacity - split]
+                    buf[:split] = tail[self.capacity - split:]
+                    continue
+                first = min(count, self.capacity - pos)
+                buf[pos:pos + first] = chunk[:first]
+                buf[:count - first] = chunk[first:]
+            self._total += count
+
+    def read(self, start: int, count: int) -> Dict[int, bytes]:
+        """Samples ``[start, start + count)`` of every channel.
+
+        Raises:
+            ConfigError: if the range was overwritten or not yet appended.
+        """
+        with self._lock:
+            oldest = max(0, self._total - self.capacity)
+            if start < oldest or start + count > self._total or count < 0:
+                raise ConfigError(
+                    f"Samples {start}..{start + count} are not in the ring "
+                    f"(holds {oldest}..{self._total})")
+            pos = start % self.capacity
+            first = min(count, self.capacity - pos)
+            return {
+                ch: bytes(buf[pos:pos + first]) + bytes(buf[:count - first])
+                for ch, buf in self._buffers.items()
+            }
+
+    def latest(self, count: Optional[int] = None) -> Dict[int, bytes]:
+        """The last *count* samples (default: all held) of every channel."""
+        with self._lock:
+            held = min(self._total, self.capacity)
+        count = held if count is None else min(count, held)
+        return self.read(self._total - count, count)
+
+
+def _interleave(parts: List[bytes]) -> bytes:
+    """Pack one-byte-per-sample channels into sigrok logic units."""
+    n = len(parts[0])
+    width = (len(parts) + 7) // 8
+    lanes = []
+    for lane in range(width):
+        # Samples are 0/1 bytes, so a shift below 8 stays inside each byte
+        acc = 0
+        for bit, data in enumerate(parts[lane * 8:(lane + 1) * 8]):
+            acc |= int.from_bytes(data, "little") << bit
+        lanes.append(acc.to_bytes(n, "little"))
+    if width == 1:
+        return lanes[0]
+    out = bytearray(n * width)
+    for lane, data in enumerate(lanes):
+        out[lane::width] = data
+    return bytes(out)
+
+
+def _sink_writer(
+    sink: Any, channels: List[int],
+) -> Tuple[Callable[[int, Dict[int, bytes]], Any], Callable[[], None]]:
+    """Return ``(write, close)`` for any supported sink."""
+    if callable(sink) and not isinstance(sink, (str, os.PathLike)):
+        return sink, lambda: None
+    out = _Writer(sink, binary=True)
+    return (lambda start, data: out.write(_interleave([data[ch] for ch in channels]))), out.close
+
+
+# ======================================================================
+# Reader
+# ======================================================================
+
+def stream_samples(
+    client: "McpClient",
+    sink: Any,
+    channels: List[int],
+    *,
+    events: Optional["EventStream"] = None,
+    start_sample: int = 0,
+    duration_s: Optional[float] = None,
+    max_samples: Optional[int] = None,
+    stop_event: Optional[threading.Event] = None,
+    chunk_samples: int = 1 << 18,
+    max_workers: int = 4,
+    max_pending: int = 16,
+    poll_interval_s: float = 0.05,
+    status_interval_s: float = 1.0,
+    on_stats: Optional[Callable[[StreamStats], None]] = None,
+) -> StreamStats:
+    """Follow the running capture and deliver new samples to *sink*.
+
+    The capture must already be running.  When *duration_s*,
+    *max_samples* or *stop_event* ends streaming (or the server reports
+    a full disk cache) ``stop_capture`` is sent and the remaining samples
+    are drained before returning.  A capture stopped by the server is
+    drained the same way.
+
+    Args:
+        client:            Connected :class:`McpClient`.
+        sink:              Path, binary file object, :class:`SampleRing`
+                           or callable (see the module docstring).
+        channels:          Logic channels to read.
+        events:            Stream subscribed to ``capture_state``,
+                           ``data_updated`` and ``error``; ``DataUpdated``
+                           wakes the reader early and updates
+                           ``server_samples``.  Without it the capture
+                           state is polled.
+        start_sample:      First sample to read.
+        duration_s:        Stop the capture after this many seconds.
+        max_samples:       Stop after this many samples per channel.
+        stop_event:        Stop the capture once this event is set.
+        chunk_samples:     Samples per ``get_samples`` request.
+        max_workers:       Concurrent requests for channels after the
+                           first.
+        max_pending:       Chunks that may wait for the sink.
+        poll_interval_s:   Wait at the live edge before reading again.
+        status_interval_s: Interval for ``get_session_status`` (disk
+                           cache metrics) and *on_stats*.
+        on_stats:          Called with a copy of the stats every
+                           *status_interval_s*.
+
+    Returns:
+        Final :class:`StreamStats`.
+
+    Raises:
+        ConfigError: on an empty channel list or bad sizes.
+    """
+    if not channels:
+        raise ConfigError("'channels' must be a non-empty list")
+    if chunk_samples < 1 or max_pending < 1:
+        raise ConfigError("'chunk_samples' and 'max_pending' must be at least 1")
+    if max_samples is not None:
+        chunk_samples = min(chunk_samples, max_samples) or 1
+
+    write, close = _sink_writer(sink, channels)
+    stats = StreamStats()
+    lock = threading.Lock()
+    pending: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+    failure: List[BaseException] = []
+
+    def drain_to_sink() -> None:
+        while True:
+            item = pending.get()
+            if item is _END:
+                return
+            if failure:
+                continue
+            start, data = item
+            try:
+                write(start, data)
+            except Exception as exc:  # noqa: BLE001 - re-raised by the reader
+                failure.append(exc)
+                continue
+            with lock:
+                stats.samples += len(data[channels[0]])
+                stats.queue_depth = pending.qsize()
+
+    writer = threading.Thread(target=drain_to_sink, name="pxview-stream-sink", daemon=True)
+    writer.start()
+
+    t0 = time.monotonic()
+    deadline = t0 + duration_s if duration_s is not None else None
+    next_status = t0
+    cursor = start_sample
+    stopping = False   # stop_capture sent
+    finished = False   # capture no longer running: drain, then return
+
+    def request_stop(reason: str) -> None:
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        with lock:
+            stats.stop_reason = stats.stop_reason or reason
+        client.stop_capture()
+
+    def handle(event: Any) -> None:
+        nonlocal finished
+        if event.event is ServiceEvent.DATA_UPDATED:
+            try:
+                count = int(event.params.get("sample_count", 0))
+            except (TypeError, ValueError):
+                return
+            with lock:
+                stats.server_samples = max(stats.server_samples, count)
+        elif event.event is ServiceEvent.ERROR_OCCURRED or (
+            event.event is ServiceEvent.CAPTURE_STATE_CHANGED
+            and event.params.get("state") == "stopped"
+        ):
+            finished = True
+
+    try:
+        while True:
+            if failure:
+                request_stop("error")
+                break
+            now = time.monotonic()
+            if now >= next_status:
+                next_status = now + status_interval_s
+                if events is not None:
+                    # A reader that is behind never waits for events; take
+                    # the queued ones so server_samples is current.
+                    event = events.get(timeout=0)
+                    while event is not None:
+                        handle(event)
+                        event = events.get(timeout=0)
+                if _poll_status(client, stats, lock, events is None or stopping):
+                    finished = True
+                if on_stats is not None:
+                    with lock:
+                        stats.elapsed_seconds = now - t0
+                        snapshot = dataclasses.replace(stats)
+                    on_stats(snapshot)
+            if stats.disk_full:
+                request_stop("disk_full")
+            elif stop_event is not None and stop_event.is_set():
+                request_stop("stop")
+            elif deadline is not None and now >= deadline:
+                request_stop("duration")
+
+            want = chunk_samples
+            if max_samples is not None:
+                want = min(want, start_sample + max_samples - cursor)
+            n = _read_chunk(client, channels, cursor, want, max_workers, pending, stats, lock)
+            cursor += n
+            if max_samples is not None and cursor - start_sample >= max_samples:
+                request_stop("max_samples")
+                break
+            if n == want:
+                continue  # probably more already available
+            if finished:
+                break     # the capture had stopped before this read: all read
+
+            if events is not None and events.is_open:
+                event = events.get(timeout=poll_interval_s)
+                while event is not None:
+                    handle(event)
+                    event = events.get(timeout=0)
+            else:
+                time.sleep(poll_interval_s)
+                if stopping:
+                    finished = _capture_stopped(client)
+    except BaseException:
+        if not stopping:
+            try:
+                client.stop_capture()
+            except (McpError, McpConnectionError):
+                pass
+        raise
+    finally:
+        pending.put(_END)
+        writer.join()
+        close()
+        with lock:
+            stats.elapsed_seconds = time.monotonic() - t0
+            stats.queue_depth = 0
+            stats.stop_reason = stats.stop_reason or "capture"
+
+    if failure:
+        raise failure[0]
+    return stats
+
+
+def _read_chunk(
+    client: "McpClient",
+    channels: List[int],
+    cursor: int,
+    want: int,
+    max_workers: int,
+    pending: "queue.Queue[Any]",
+    stats: StreamStats,
+    lock: threading.Lock,
+) -> int:
+    """Read up to *want* new samples of every channel and queue them.
+
+    The first channel decides how many samples are available; the others
+    are then read for exactly that range.
+    """
+    if want <= 0:
+        return 0
+    try:
+        first = client.get_samples(channels[0], "logic", cursor, cursor + want)
+    except McpError:
+        if stats.read_samples == 0:
+            return 0  # no data has arrived yet
+        raise
+    n = len(first)
+    with lock:
+        stats.reads += 1
+        stats.caught_up = n < want
+    if n == 0:
+        return 0
+    data = {channels[0]: bytes(first)}
+    if len(channels) > 1:
+        rest = client.get_samples_many(
+            channels[1:], "logic", cursor, cursor + n, max_workers=max_workers)
+        data.update(rest.data)
+        with lock:
+            stats.reads += rest.requests
+    n = min(len(d) for d in data.values())
+    if any(len(d) != n for d in data.values()):
+        data = {ch: d[:n] for ch, d in data.items()}
+
+    t0 = time.monotonic()
+    pending.put((cursor, data))   # blocks while the sink is behind
+    waited = time.monotonic() - t0
+    with lock:
+        stats.read_samples += n
+        stats.backpressure_seconds += waited
+        stats.queue_depth = pending.qsize()
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+    return n
+
+
+def _poll_status(client: "McpClient", stats: StreamStats, lock: threading.Lock,
+                 check_capture: bool) -> bool:
+    """Refresh the disk cache metrics; return True if the capture has stopped."""
+    status = client.get_session_status()
+    cache = status.get("disk_cache", {}) if isinstance(status, dict) else {}
+    with lock:
+        stats.disk_write_speed_mbps = float(cache.get("write_speed_mbps", 0.0))
+        stats.disk_write_queue_depth = int(cache.get("write_queue_depth", 0))
+        stats.disk_full = stats.disk_full or bool(cache.get("is_disk_full", False))
+    return _capture_stopped(client) if check_capture else False
+
+
+def _capture_stopped(client: "McpClient") -> bool:
+    status = client.get_capture_status()
+    return isinstance(status, dict) and status.get("state") not in ("capturing", "running")
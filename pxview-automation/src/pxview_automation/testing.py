@@ -0,0 +1,2348 @@
+"""In-process fake PXView server for tests and offline development.
+
+:class:`FakePXViewServer` speaks the same MCP (HTTP + SSE) and WebSocket
+protocols as ``PXView --headless`` and implements its tool set against a
+simulated demo device, so :class:`~pxview_automation.McpClient`,
+:class:`~pxview_automation.PXView` and ``pxview-cli`` can be exercised
+without a PXView binary or USB hardware::
+
+    from pxview_automation import PXView
+    from pxview_automation.testing import FakePXViewServer
+
+    with FakePXViewServer(pattern="i2c") as server:
+        pxv = PXView(port=server.port, ws_port=server.ws_port)
+        pxv.connect()
+        results = pxv.capture_and_decode(
+            "demo", "i2c", {"scl": 0, "sda": 1}, sample_count=100_000)
+
+Capture data comes from a deterministic generator modelled on the demo
+device's patterns:
+
+``incremental``
+    Channel *n* is bit *n* of a sample counter (toggles every ``2**n``
+    samples).
+``random``
+    Seeded pseudo-random level on every sample.
+``i2c``
+    Channel 0 = SCL, channel 1 = SDA carrying back-to-back 100 kHz
+    write transactions to address 0x50; other channels idle high.  An
+    ``i2c`` decoder mapped onto this pattern returns the matching
+    start / address / data / ACK / stop annotations.
+
+Any other decoder (or pattern) yields evenly spaced synthetic data
+annotations, *annotations* per capture.
+
+Latency and failures can be injected per tool to exercise client
+timeouts, retries and error handling; see :meth:`FakePXViewServer.set_latency`
+and :meth:`FakePXViewServer.inject_failure`.
+
+The fake models one device: all sessions share its configuration and
+capture buffer.  Raw exports follow the layout of PXView's output
+modules (bit-packed ``binary``, MSB-first ``hex``) with simplified
+headers, analog channels are exported as ``csv`` or ``binary`` only, and
+``save_capture`` writes a JSON description of the capture rather than a
+real ``.pxc`` archive.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import gzip
+import json
+import math
+import os
+import random
+import re
+import secrets
+import socket
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+
+from ._ws import OPCODE_CLOSE, OPCODE_TEXT, WebSocket
+from .exceptions import ConfigError
+from .exports import RAW_SUFFIXES, TABLE_HEADER, _csv_row, _format_radix, _iso8601
+from .types import ServiceEvent
+
+__all__ = ["FakePXViewServer", "PATTERNS", "FAILURE_KINDS"]
+
+PROTOCOL_VERSION = "2025-03-26"
+
+PATTERNS = ("incremental", "random", "i2c")
+
+# tool:  isError tool result (McpError)
+# rpc:   JSON-RPC error object (McpError with code)
+# http:  HTTP 503 with an empty body (retried by the client)
+# drop:  connection closed without a response (retried, re-handshake)
+#
+# For the ``'blob'`` target (GET /mcp/blob/<id>): tool/rpc answer 404 as if
+# the blob had expired, http answers 503 and drop sends only half the body.
+FAILURE_KINDS = ("tool", "rpc", "http", "drop")
+
+BLOB_PATH = "/mcp/blob/"
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+DEMO_DEVICE_ID = "demo"
+
+# CaptureState string contract → state_code (see pv/api/types.h).
+_STATE_CODES = {"idle": 0, "capturing": 2, "completed": 4, "error": 6}
+
+_WORK_MODES = {0: "Logic", 1: "DSO", 2: "Analog"}
+_MODE_CHANNELS = {0: (16, 0), 1: (2, 2), 2: (2, 1)}  # mode → (count, ChannelType)
+
+
+# Decoder catalogue: id → (name, long_name, channels, optional channels, classes)
+_DECODERS: Dict[str, Tuple[str, str, List[Tuple[str, str, str]], List[Tuple[str, str, str]],
+                           List[str]]] = {
+    "i2c": (
+        "I²C", "Inter-Integrated Circuit",
+        [("scl", "SCL", "Serial clock line"), ("sda", "SDA", "Serial data line")],
+        [],
+        ["start", "repeat-start", "stop", "ack", "nack", "bit",
+         "address-read", "address-write", "data-read", "data-write", "warning"],
+    ),
+    "spi": (
+        "SPI", "Serial Peripheral Interface",
+        [("clk", "CLK", "Clock")],
+        [("miso", "MISO", "Master in, slave out"), ("mosi", "MOSI", "Master out, slave in"),
+         ("cs", "CS#", "Chip-select")],
+        ["miso-data", "mosi-data", "miso-bit", "mosi-bit", "warning"],
+    ),
+    "uart": (
+        "UART", "Universal Asynchronous Receiver/Transmitter",
+        [("rxtx", "RX/TX", "UART transceive line")],
+        [],
+        ["data", "start", "stop", "parity-ok", "parity-err", "warning"],
+    ),
+}
+
+# (description, read_only) for every tool, in registration order.
+_TOOLS: Dict[str, Tuple[str, bool]] = {
+    "switch_work_mode": ("Switch the device work mode (0=Logic, 1=DSO, 2=Analog).", False),
+    "get_work_mode": ("Get the current device work mode.", True),
+    "get_supported_work_modes": ("Get the work modes supported by the current device.", True),
+    "get_devices": ("List connected devices and their IDs.", True),
+    "start_capture": ("Start a capture in the current work mode.", False),
+    "stop_capture": ("Stop the current capture.", False),
+    "wait_capture": ("Wait for the current capture to complete.", True),
+    "get_capture_status": ("Get the current capture status.", True),
+    "load_capture": ("Load a previously saved capture from a file.", False),
+    "save_capture": ("Save the current capture to a file.", False),
+    "close_capture": ("Close the current capture and release its data.", False),
+    "add_analyzer": ("Add a protocol decoder (analyzer).", False),
+    "remove_analyzer": ("Remove a previously added protocol decoder.", False),
+    "list_analyzers": ("List all available protocol decoders.", True),
+    "get_analyzer_options": ("Get the configuration options for a protocol decoder.", True),
+    "get_analyzer_results": ("Read decoded protocol data from an analyzer.", True),
+    "export_raw_data": ("Export raw sample data to files.", False),
+    "open_export_stream": ("Stream one channel's raw export back over MCP.", False),
+    "read_export_stream": ("Read the next chunk of an export stream.", False),
+    "close_export_stream": ("Release an export stream.", False),
+    "export_data_table_csv": ("Export decoded analyzer data as a CSV table.", False),
+    "get_channels": ("Get channel list for the current or specified work mode.", True),
+    "refresh_device_list": ("Rescan device drivers and return the device list.", True),
+    "set_sample_config": ("Set sample configuration parameters.", False),
+    "configure_channel": ("Enable/disable a channel and/or set its name.", False),
+    "configure_channels": ("Enable/disable and rename several channels atomically.", False),
+    "configure_trigger": ("Get or set trigger configuration.", False),
+    "configure_probe": ("Get or set probe configuration.", False),
+    "configure_glitch_filter": ("Get, set, or clear the glitch filter.", False),
+    "configure_signal_invert": ("Get, set, or clear signal invert.", False),
+    "get_config": ("Read a generic SR_CONF_* config value by key.", True),
+    "set_config": ("Write a generic SR_CONF_* config value by key.", False),
+    "set_export_config": ("Set the sample range for save/export operations.", False),
+    "connect_device": ("Connect to a specific device by ID.", False),
+    "disconnect_device": ("Disconnect from a device.", False),
+    "get_session_status": ("Get session status and disk cache information.", True),
+    "get_samples": ("Read raw samples from a channel.", True),
+    "find_next_edge": ("Find the next signal edge from a sample position.", True),
+    "find_pattern": ("Find the next occurrence of a signal pattern.", True),
+    "get_active_decoders": ("List the currently active protocol decoders.", True),
+    "clear_all_decoders": ("Remove all active protocol decoders.", False),
+    "reconfigure_decoder": ("Reconfigure an existing decoder in place.", False),
+    "list_sessions": ("List all sessions.", True),
+    "create_session": ("Create a new session.", False),
+    "destroy_session": ("Destroy a session by ID.", False),
+    "set_active_session": ("Switch the active session.", False),
+    "get_measurement_results": ("Get measurement and analysis results.", True),
+    "configure_error_state": ("Get or clear the session error state.", False),
+    "configure_cursors": ("Manage waveform cursors.", False),
+}
+
+# WebSocket topic of each service event (pv::api::service_event_topic).
+_EVENT_TOPICS: Dict[ServiceEvent, str] = {
+    ServiceEvent.CAPTURE_STATE_CHANGED: "capture_state",
+    ServiceEvent.CAPTURE_PROGRESS: "capture_progress",
+    ServiceEvent.DATA_UPDATED: "data_updated",
+    ServiceEvent.TRIGGER_RECEIVED: "trigger",
+    ServiceEvent.FRAME_BEGAN: "frame",
+    ServiceEvent.FRAME_ENDED: "frame",
+    ServiceEvent.DEVICE_LIST_UPDATED: "device_list",
+    ServiceEvent.NEW_USB_DEVICE: "device_list",
+    ServiceEvent.DEVICE_MODE_CHANGED: "device",
+    ServiceEvent.DEVICE_CONFIG_CHANGED: "device",
+    ServiceEvent.DEVICE_DETACHED: "device",
+    ServiceEvent.DECODE_DONE: "decode",
+    ServiceEvent.DECODER_ADDED: "decoder",
+    ServiceEvent.DECODER_REMOVED: "decoder",
+    ServiceEvent.DECODE_PROGRESS: "decode_progress",
+    ServiceEvent.SAMPLE_CONFIG_CHANGED: "sample_config",
+    ServiceEvent.CHANNEL_CONFIG_CHANGED: "channel_config",
+    ServiceEvent.TRIGGER_CONFIG_CHANGED: "trigger_config",
+    ServiceEvent.SAVE_COMPLETE: "file_op",
+    ServiceEvent.LOAD_COMPLETE: "file_op",
+    ServiceEvent.EXPORT_COMPLETE: "file_op",
+    ServiceEvent.SIGNALS_CHANGED: "signals",
+    ServiceEvent.ERROR_OCCURRED: "error",
+}
+
+# Tools that read an immutable capture and must not serialise on the state lock.
+_LOCK_FREE_TOOLS = frozenset({"get_samples", "get_analyzer_results", "wait_capture"})
+
+# byte → 8 samples (LSB first), for expanding random bits.
+_BIT_TABLE = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+
+class _ToolError(Exception):
+    """Raised by a tool handler; reported as an ``isError`` result."""
+
+
+class _Failure:
+    __slots__ = ("target", "kind", "message", "remaining", "rate", "code")
+
+    def __init__(self, target: str, kind: str, message: str,
+                 remaining: Optional[int], rate: Optional[float], code: int):
+        self.target = target
+        self.kind = kind
+        self.message = message
+        self.remaining = remaining
+        self.rate = rate
+        self.code = code
+
+
+# ======================================================================
+# Synthetic capture data
+# ======================================================================
+
+def _i2c_waveform(count: int, half: int) -> Tuple[bytes, bytes, List[tuple]]:
+    """SCL / SDA bytes and decoder annotations for repeated I²C writes."""
+    scl = bytearray()
+    sda = bytearray()
+    anns: List[tuple] = []
+
+    def emit(c: int, d: int, n: int) -> None:
+        scl.extend(b"\x01" * n if c else b"\x00" * n)
+        sda.extend(b"\x01" * n if d else b"\x00" * n)
+
+    def byte(value: int, cls: int, texts: List[str]) -> None:
+        start = len(scl)
+        for bit in range(7, -1, -1):
+            level = (value >> bit) & 1
+            emit(0, level, half)
+            emit(1, level, half)
+        anns.append((start, len(scl) - 1, cls, texts))
+        start = len(scl)
+        emit(0, 0, half)
+        emit(1, 0, half)
+        anns.append((start, len(scl) - 1, 3, ["ACK", "A"]))
+
+    n = 0
+    while len(scl) < count:
+        emit(1, 1, 4 * half)
+        start = len(scl)
+        emit(1, 0, half)
+        anns.append((start, len(scl) - 1, 0, ["Start", "S"]))
+        byte(0x50 << 1, 7, ["Address write: 50", "AW: 50", "50"])
+        for value in ((2 * n) & 0xFF, (2 * n + 1) & 0xFF):
+            byte(value, 9, [f"Data write: {value:02X}", f"DW: {value:02X}", f"{value:02X}"])
+        emit(0, 0, half)
+        start = len(scl)
+        emit(1, 0, half)
+        emit(1, 1, 0)
+        anns.append((start, len(scl) - 1, 2, ["Stop", "P"]))
+        n += 1
+    anns = [a for a in anns if a[1] < count]
+    return bytes(scl[:count]), bytes(sda[:count]), anns
+
+
+class _Capture:
+    """One completed (or running) capture; sample data is generated lazily."""
+
+    def __init__(self, capture_id: int, pattern: str, sample_rate: int, sample_count: int,
+                 channels: List[int], mode: int, seed: int):
+        self.capture_id = capture_id
+        self.pattern = pattern
+        self.sample_rate = sample_rate
+        self.sample_count = sample_count
+        self.channels = channels
+        self.mode = mode
+        self.seed = seed
+        self._data: Dict[int, bytes] = {}
+        self._i2c: Optional[Tuple[bytes, bytes, List[tuple]]] = None
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> dict:
+        return {
+            "pattern": self.pattern, "sample_rate": self.sample_rate,
+            "sample_count": self.sample_count, "channels": self.channels,
+            "mode": self.mode, "seed": self.seed,
+        }
+
+    def _i2c_data(self) -> Tuple[bytes, bytes, List[tuple]]:
+        if self._i2c is None:
+            half = max(1, self.sample_rate // 200_000)
+            self._i2c = _i2c_waveform(self.sample_count, half)
+        return self._i2c
+
+    def logic(self, channel: int) -> bytes:
+        with self._lock:
+            data = self._data.get(channel)
+            if data is not None:
+                return data
+            count = self.sample_count
+            if self.pattern == "random":
+                rng = random.Random((self.seed << 8) | channel)
+                raw = rng.getrandbits(count + 8).to_bytes((count + 15) // 8, "little")
+                data = b"".join(map(_BIT_TABLE.__getitem__, raw))[:count]
+            elif self.pattern == "i2c":
+                scl, sda, _ = self._i2c_data()
+                data = scl if channel == 0 else sda if channel == 1 else b"\x01" * count
+            else:
+                half = 1 << min(channel, 24)
+                period = b"\x00" * half + b"\x01" * half
+                data = (period * (count // len(period) + 1))[:count]
+            self._data[channel] = data
+            return data
+
+    def truncate(self, sample_count: int) -> None:
+        """Shorten the capture, e.g. when a stream capture is stopped."""
+        with self._lock:
+            self.sample_count = sample_count
+            self._data = {ch: d[:sample_count] for ch, d in self._data.items()}
+            if self._i2c is not None:
+                scl, sda, anns = self._i2c
+                self._i2c = (scl[:sample_count], sda[:sample_count],
+                             [a for a in anns if a[1] <= sample_count])
+
+    def i2c_annotations(self) -> List[tuple]:
+        with self._lock:
+            return self._i2c_data()[2]
+
+    def analog(self, channel: int, start: int, end: int) -> List[float]:
+        phase = channel * math.pi / 2
+        return [round(math.sin(i / 50.0 + phase), 4) for i in range(start, end)]
+
+
+class _TableAnnotations:
+    """Annotations held as a sorted list of ``(start, end, class, texts)``.
+
+    Like PXView there is one decoder row per class, and reads return the
+    rows one after the other in class order.  Classes in
+    *numeric_classes* carry a decoder value, like PXView's
+    ``Annotation::is_numberic()``.
+    """
+
+    def __init__(self, rows: List[tuple], numeric_classes: Collection[int] = ()):
+        self.rows: List[tuple] = []
+        self._by_class: Dict[int, List[int]] = {}
+        self._class_starts: Dict[int, List[int]] = {}
+        self.numeric_classes = frozenset(numeric_classes)
+        self.append(rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _ann(self, row: tuple) -> dict:
+        s, e, cls, texts = row
+        ann = {"start_sample": s, "end_sample": e, "ann_class": cls, "texts": texts}
+        if cls in self.numeric_classes:
+            ann["numeric"] = True
+        return ann
+
+    def page(self, start: int, end: int, max_count: int,
+             ann_classes: Optional[Collection[int]]) -> List[dict]:
+        out: List[dict] = []
+        for cls in sorted(self._by_class):
+            if ann_classes and cls not in ann_classes:
+                continue
+            rows = self._by_class[cls]
+            i = bisect.bisect_left(self._class_starts[cls], start)
+            while i < len(rows) and len(out) < max_count:
+                row = self.rows[rows[i]]
+                if row[0] >= end:
+                    break
+                out.append(self._ann(row))
+                i += 1
+        return out
+
+    def since(self, cursor: Tuple[int, ...], start: int, end: int, max_count: int,
+              ann_classes: Optional[Collection[int]]) -> Tuple[List[dict], Tuple[int, ...], bool]:
+        """Annotations after *cursor*, the cursor to resume from, and whether more remain.
+
+        The cursor holds the number of annotations consumed from each row.
+        """
+        counts = list(cursor)
+        out: List[dict] = []
+        more = False
+        for cls in sorted(self._by_class):
+            rows = self._by_class[cls]
+            counts.extend([0] * (cls + 1 - len(counts)))
+            n = counts[cls]
+            if n >= len(rows):
+                continue
+            if len(out) >= max_count:
+                more = True
+                break
+            if ann_classes and cls not in ann_classes:
+                counts[cls] = len(rows)
+                continue
+            while n < len(rows) and len(out) < max_count:
+                row = self.rows[rows[n]]
+                n += 1
+                if start <= row[0] < end:
+                    out.append(self._ann(row))
+            counts[cls] = n
+            more = more or n < len(rows)
+        while counts and not counts[-1]:
+            counts.pop()
+        return out, tuple(counts), more
+
+    def append(self, rows: List[tuple]) -> None:
+        # Rebind rather than extend: rows may be the capture's cached list.
+        first = len(self.rows)
+        self.rows = self.rows + list(rows)
+        by_class = {cls: list(idx) for cls, idx in self._by_class.items()}
+        starts = {cls: list(s) for cls, s in self._class_starts.items()}
+        for i, row in enumerate(rows, first):
+            by_class.setdefault(row[2], []).append(i)
+            starts.setdefault(row[2], []).append(row[0])
+        self._by_class, self._class_starts = by_class, starts
+
+
+class _SyntheticAnnotations:
+    """*count* evenly spaced class 0 annotations, computed on demand."""
+
+    def __init__(self, count: int, sample_count: int, label: str, numeric: bool = False):
+        self.step = max(1, sample_count // max(1, count))
+        self.count = min(count, sample_count // self.step)
+        self.label = label
+        self.numeric_classes = frozenset({0} if numeric else ())
+
+    def __len__(self) -> int:
+        return self.count
+
+    def page(self, start: int, end: int, max_count: int,
+             ann_classes: Optional[Collection[int]]) -> List[dict]:
+        if ann_classes and 0 not in ann_classes:
+            return []
+        step = self.step
+        first = -(-start // step)
+        last = min(self.count, -(-end // step), first + max(0, max_count))
+        out = []
+        for i in range(first, last):
+            v = i & 0xFF
+            ann = {
+                "start_sample": i * step,
+                "end_sample": i * step + step - 1,
+                "ann_class": 0,
+                "texts": [f"{self.label}: {v:02X}", f"{v:02X}"],
+            }
+            if self.numeric_classes:
+                ann["numeric"] = True
+            out.append(ann)
+        return out
+
+    def since(self, cursor: Tuple[int, ...], start: int, end: int, max_count: int,
+              ann_classes: Optional[Collection[int]]) -> Tuple[List[dict], Tuple[int, ...], bool]:
+        done = (self.count,) if self.count else ()
+        if ann_classes and 0 not in ann_classes:
+            return [], done, False
+        first = max(cursor[0] if cursor else 0, -(-start // self.step))
+        out = self.page(first * self.step, end, max_count, None)
+        if len(out) < max_count:
+            return out, done, False
+        nxt = first + len(out)
+        return out, (nxt,), nxt < self.count
+
+
+_ANN_FIELDS = ("start_sample", "end_sample", "ann_class", "texts", "numeric")
+
+# Annotation classes PXView flags numeric (built from a decoder value).
+_NUMERIC_CLASSES: Dict[str, Tuple[int, ...]] = {"i2c": (6, 7, 8, 9), "spi": (0, 1), "uart": (0,)}
+
+
+def _columnar(anns: List[dict], fields: List[str]) -> dict:
+    """Encode *anns* the way PXView's ``format="columnar"`` does."""
+    columns: Dict[str, list] = {}
+    encoding: Dict[str, str] = {}
+    for f in ("start_sample", "end_sample"):
+        if f in fields:
+            prev, col = 0, []
+            for ann in anns:
+                col.append(ann[f] - prev)
+                prev = ann[f]
+            columns[f], encoding[f] = col, "delta"
+    if "ann_class" in fields:
+        columns["ann_class"] = [ann["ann_class"] for ann in anns]
+    if "numeric" in fields:
+        columns["numeric"] = [bool(ann.get("numeric")) for ann in anns]
+    result: Dict[str, Any] = {"format": "columnar", "count": len(anns),
+                              "columns": columns, "encoding": encoding}
+    if "texts" in fields:
+        ids: Dict[str, int] = {}
+        columns["texts"] = [[ids.setdefault(t, len(ids)) for t in ann["texts"]] for ann in anns]
+        encoding["texts"] = "text_table"
+        result["text_table"] = list(ids)
+    return result
+
+
+# ======================================================================
+# FakePXViewServer
+# ======================================================================
+
+class FakePXViewServer:
+    """Simulated PXView headless server on local ports.
+
+    Args:
+        host:          Interface to bind (default: ``'127.0.0.1'``).
+        port:          MCP (HTTP) port; 0 picks a free port.
+        ws_port:       WebSocket transport port; 0 picks a free port.
+        pattern:       Default demo pattern (see :data:`PATTERNS`);
+                       ``start_capture(pattern=...)`` overrides it.
+        sample_rate:   Initial sample rate in Hz.
+        sample_limit:  Initial sample count limit.
+        capture_time:  Seconds a (non-stream) capture stays running.
+        annotations:   Synthetic annotations per decoder and capture.
+        latency:       Seconds added to every ``tools/call``.
+        seed:          Seed for the ``random`` pattern and ``rate``-based
+                       failure injection.
+
+    Attributes:
+        calls:      ``(tool, arguments)`` for every ``tools/call`` received.
+        disk_cache: ``disk_cache`` dict reported by ``get_session_status``
+                    (set ``is_disk_full`` etc. to simulate the disk cache).
+        blob_ttl:   Seconds a ``get_samples`` blob stays fetchable.
+        compress_min_bytes: JSON-RPC replies of at least this many bytes
+                    are gzip / deflate encoded when the request's
+                    ``Accept-Encoding`` allows it, like PXView's
+                    ``--compress-min-bytes``; 0 disables.
+        link_bandwidth: Bytes per second the server writes response
+                    bodies at, to simulate a slow link (VPN, remote
+                    bench); None = unthrottled loopback.
+        device_ready_delay: Seconds after ``connect_device`` binds the
+                    demo device before ``get_devices`` reports it
+                    ``is_active``, like hardware still loading firmware.
+        decode_time: Seconds decoders keep running after a capture stops;
+                    until then ``get_active_decoders`` reports them
+                    running and they have no annotations.  Like PXView,
+                    starting a capture clears decoded results and sends
+                    ``DecodeDone`` with ``detail='clear_decode_data'``;
+                    no event marks the end of decoding (tests can send
+                    one with :meth:`emit_event`).
+        stream_update_interval: Seconds between the ``DataUpdated``
+                    events (``detail='sample_count_updated'``) a running
+                    stream capture sends with its acquired ``sample_count``.
+
+    Example::
+
+        with FakePXViewServer(latency=0.01) as server:
+            server.inject_failure("get_samples", kind="drop", times=1)
+            client = McpClient(server.url)
+            client.connect()
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ws_port: int = 0,
+        *,
+        pattern: str = "incremental",
+        sample_rate: int = 1_000_000,
+        sample_limit: int = 1_000_000,
+        capture_time: float = 0.0,
+        annotations: int = 1000,
+        latency: float = 0.0,
+        seed: int = 0,
+    ):
+        if pattern not in PATTERNS:
+            raise ConfigError(f"Unknown pattern {pattern!r}; use one of {', '.join(PATTERNS)}")
+        self.host = host
+        self.pattern = pattern
+        self.capture_time = capture_time
+        self.annotations = annotations
+        self.latency = latency
+        self.seed = seed
+        self.calls: List[Tuple[str, dict]] = []
+        self.blob_ttl = 30.0
+        self.compress_min_bytes = 1024
+        self.link_bandwidth: Optional[float] = None
+        self.device_ready_delay = 0.0
+        self.decode_time = 0.0
+        self.stream_update_interval = 0.05
+        self._initial_rate = sample_rate
+        self._initial_limit = sample_limit
+        self._requested_ports = (port, ws_port)
+        self._tool_latency: Dict[str, float] = {}
+        self._failures: List[_Failure] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        self._ws_clients: Dict[WebSocket, set] = {}
+        self._ws_lock = threading.Lock()
+        self._event_version = 0
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._ws_listener: Optional[socket.socket] = None
+        self._timer: Optional[threading.Timer] = None
+        self._decode_timer: Optional[threading.Timer] = None
+        self.reset()
+
+    def __enter__(self) -> "FakePXViewServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        where = f"port={self.port}, ws_port={self.ws_port}" if self._http else "stopped"
+        return f"FakePXViewServer({where}, pattern={self.pattern!r})"
+
+    # ---- Lifecycle ----
+
+    def start(self) -> None:
+        """Bind both transports and start serving on background threads."""
+        if self._http is not None:
+            return
+        port, ws_port = self._requested_ports
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._http = _HttpServer((self.host, port), handler)
+        threading.Thread(target=self._http.serve_forever, name="fake-pxview-mcp",
+                         daemon=True).start()
+        listener = socket.socket()
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((self.host, ws_port))
+        listener.listen(16)
+        self._ws_listener = listener
+        threading.Thread(target=self._ws_accept_loop, args=(listener,), name="fake-pxview-ws",
+                         daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop serving and close all WebSocket clients."""
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        if self._ws_listener is not None:
+            self._ws_listener.close()
+            self._ws_listener = None
+        with self._ws_lock:
+            clients, self._ws_clients = list(self._ws_clients), {}
+        for ws in clients:
+            ws.close()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._decode_timer is not None:
+                self._decode_timer.cancel()
+                self._decode_timer = None
+
+    def reset(self) -> None:
+        """Restore the device, session and capture state to power-on defaults.
+
+        Injected failures, latency settings and :attr:`calls` are kept.
+        """
+        with self._lock:
+            self._work_mode = 0
+            self._channels = self._make_channels(0)
+            self._sample_rate = self._initial_rate
+            self._sample_limit = self._initial_limit
+            self._collect_mode = 0
+            self._repeat_interval = 1.0
+            self._sessions: Dict[int, str] = {1: DEMO_DEVICE_ID}
+            self._active_session: Optional[int] = 1
+            self._device_ready_at = 0.0
+            self._next_session = 2
+            self._state = "idle"
+            self._capture: Optional[_Capture] = None
+            self._pending: Optional[_Capture] = None
+            self._pending_stream = False
+            self._started_at = 0.0
+            self._capture_id = 0
+            self._capture_error: Optional[str] = None
+            self._error_state = {"has_error": False, "error_code": 0,
+                                 "error_pattern": "", "error_message": ""}
+            self.disk_cache: Dict[str, Any] = {"enabled": False, "write_speed_mbps": 0.0,
+                                               "write_queue_depth": 0, "is_disk_full": False}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._decoders: Dict[str, dict] = {}
+            self._decoder_seq = 0
+            self._decoding: set = set()
+            if self._decode_timer is not None:
+                self._decode_timer.cancel()
+                self._decode_timer = None
+            self._results: Dict[str, Any] = {}
+            self._ann_journals: Dict[str, Tuple[Any, List[Tuple[int, Tuple[int, ...]]]]] = {}
+            self._ann_version = 0
+            self._cursors: List[int] = []
+            self._blobs: Dict[str, Tuple[bytes, float]] = {}
+            self._export_streams: Dict[str, dict] = {}
+            self._export_stream_seq = 0
+            self._save_range = (0, 0)
+            self._config: Dict[int, Any] = {}
+            self._logic_trigger = {"stage_count": 1, "config_json": ""}
+            self._dso_trigger = {"source": 0, "slope": 0, "horiz_pos": 50.0,
+                                 "holdoff": 0.0, "margin": 0.0, "channel": 0}
+            self._probes: Dict[int, dict] = {}
+            self._glitch: Dict[str, list] = {"channels": [], "thresholds": [], "modes": []}
+            self._invert: Dict[str, list] = {"channels": [], "invert_states": []}
+            self._cond.notify_all()
+
+    # ---- Addresses ----
+
+    @property
+    def port(self) -> int:
+        """Bound MCP (HTTP) port."""
+        if self._http is None:
+            raise ConfigError("FakePXViewServer is not running")
+        return self._http.server_port
+
+    @property
+    def ws_port(self) -> int:
+        """Bound WebSocket transport port."""
+        if self._ws_listener is None:
+            raise ConfigError("FakePXViewServer is not running")
+        return int(self._ws_listener.getsockname()[1])
+
+    @property
+    def url(self) -> str:
+        """MCP endpoint URL, for ``McpClient(url)``."""
+        return f"http://{self.host}:{self.port}/mcp"
+
+    @property
+    def ws_url(self) -> str:
+        """WebSocket transport URL, for ``McpClient(ws_url=...)``."""
+        return f"ws://{self.host}:{self.ws_port}"
+
+    # ---- Fault injection ----
+
+    def set_latency(self, seconds: float, tool: Optional[str] = None) -> None:
+        """Delay every ``tools/call`` (or only calls to *tool*) by *seconds*."""
+        with self._lock:
+            if tool is None:
+                self.latency = seconds
+            else:
+                self._tool_latency[tool] = seconds
+
+    def inject_failure(
+        self,
+        tool: str = "*",
+        kind: str = "tool",
+        *,
+        message: Optional[str] = None,
+        times: Optional[int] = 1,
+        rate: Optional[float] = None,
+        code: int = -32603,
+    ) -> None:
+        """Make calls to *tool* fail.
+
+        Args:
+            tool:    Tool name, a JSON-RPC method (``'initialize'``,
+                     ``'tools/list'``, ...), ``'blob'`` for blob downloads
+                     or ``'*'`` for every tool.
+            kind:    How the call fails (see :data:`FAILURE_KINDS`).
+            message: Error text for ``'tool'`` / ``'rpc'`` failures.
+            times:   Number of calls to fail; None for every call.
+            rate:    If given, each matching call fails with this
+                     probability (still limited by *times*).
+            code:    JSON-RPC error code for ``'rpc'`` failures.
+        """
+        if kind not in FAILURE_KINDS:
+            raise ConfigError(f"Unknown failure kind {kind!r}; "
+                              f"use one of {', '.join(FAILURE_KINDS)}")
+        with self._lock:
+            self._failures.append(_Failure(
+                tool, kind, message or f"Injected failure in {tool}", times, rate, code))
+
+    def inject_capture_error(self, message: str = "Injected capture error") -> None:
+        """End the next capture in the ``error`` state with *message*."""
+        with self._lock:
+            self._capture_error = message
+
+    def clear_failures(self) -> None:
+        """Remove all injected failures and per-tool latency."""
+        with self._lock:
+            self._failures = []
+            self._tool_latency = {}
+            self._capture_error = None
+
+    def emit_event(self, event: ServiceEvent, params: Optional[dict] = None) -> None:
+        """Push *event* to WebSocket subscribers as PXView's generic ``on_event``.
+
+        Simulates state changes made outside the MCP API (GUI, USB
+        hot-plug), e.g. ``ServiceEvent.DEVICE_CONFIG_CHANGED``.
+        """
+        self._emit(_EVENT_TOPICS.get(event, "misc"), "on_event",
+                   {"event": event.value, "params": params or {}})
+
+    def call_count(self, tool: Optional[str] = None) -> int:
+        """Number of ``tools/call`` requests received (for *tool*, or all)."""
+        with self._lock:
+            if tool is None:
+                return len(self.calls)
+            return sum(1 for name, _ in self.calls if name == tool)
+
+    def _take_failure(self, target: str, is_tool: bool) -> Optional[_Failure]:
+        with self._lock:
+            for f in self._failures:
+                if f.target != target and not (is_tool and f.target == "*"):
+                    continue
+                if f.remaining == 0:
+                    continue
+                if f.rate is not None and self._rng.random() >= f.rate:
+                    continue
+                if f.remaining is not None:
+                    f.remaining -= 1
+                return f
+        return None
+
+    # ---- In-process helpers ----
+
+    def capture(self, sample_count: Optional[int] = None, *, pattern: Optional[str] = None,
+                channels: Optional[List[int]] = None) -> None:
+        """Run a capture to completion without going through the MCP API."""
+        args: Dict[str, Any] = {"captureMode": "manual"}
+        if sample_count is not None:
+            args["sampleCount"] = sample_count
+        if pattern is not None:
+            args["pattern"] = pattern
+        if channels is not None:
+            args["digitalChannels"] = channels
+        with self._lock:
+            self._tool_start_capture(args)
+            self._finish_capture(self._capture_id)
+
+    # ==================================================================
+    # Dispatch
+    # ==================================================================
+
+    def handle(self, req: dict) -> Optional[dict]:
+        """Handle one JSON-RPC request; returns the response payload.
+
+        Returns None for notifications, which get no response.
+        """
+        method = req.get("method", "")
+        if "id" not in req and method.startswith("notifications/"):
+            return None
+        result: Dict[str, Any]
+        if method == "initialize":
+            result = {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {
+                "tools": {"listChanged": False},
+                "experimental": {"structuredContent": {"structuredOnly": True},
+                                 "blobTransfer": {"path": BLOB_PATH,
+                                                  "ttlMs": int(self.blob_ttl * 1000)}},
+            },
+                "serverInfo": {"name": "pxview", "version": "fake"},
+                "instructions": "",
+            }
+        elif method == "tools/list":
+            result = {"tools": [_tool_json(name) for name in _TOOLS]}
+        elif method == "ping" or method.startswith("notifications/"):
+            result = {}
+        elif method == "tools/call":
+            params = req.get("params") or {}
+            structured_only = bool((params.get("_meta") or {}).get("pxview/structuredOnly"))
+            result = self.call_tool(params.get("name", ""), params.get("arguments") or {},
+                                    structured_only=structured_only)
+        else:
+            return {"error": {"code": -32601, "message": f"Method not found: {method}"}}
+        return {"result": result}
+
+    def call_tool(self, name: str, args: dict, *, structured_only: bool = False) -> dict:
+        """Run tool *name* and return the MCP ``tools/call`` result.
+
+        JSON results carry ``structuredContent`` (non-objects wrapped as
+        ``{"value": ...}``) next to the text; *structured_only* leaves the
+        text empty, as PXView does for ``_meta`` ``pxview/structuredOnly``.
+        """
+        with self._lock:
+            self.calls.append((name, args))
+            delay = self._tool_latency.get(name, self.latency)
+        if delay:
+            time.sleep(delay)
+        handler: Optional[Callable[[dict], Any]] = getattr(self, f"_tool_{name}", None)
+        if name not in _TOOLS or handler is None:
+            return _error_result(f"Unknown tool: {name}")
+        try:
+            if name in _LOCK_FREE_TOOLS:
+                value = handler(args)
+            else:
+                with self._lock:
+                    value = handler(args)
+        except _ToolError as exc:
+            return _error_result(str(exc))
+        except (KeyError, TypeError, ValueError) as exc:
+            return _error_result(f"Invalid parameters: {exc}")
+        return _tool_result(value, structured_only)
+
+    # ---- Events ----
+
+    def _emit(self, topic: str, method: str, params: dict) -> None:
+        with self._ws_lock:
+            self._event_version += 1
+            msg = json.dumps({
+                "type": "notification", "topic": topic, "method": method, "params": params,
+                "version": self._event_version, "timestamp": int(time.time() * 1000),
+            })
+            targets = [ws for ws, topics in self._ws_clients.items()
+                       if not topics or topic in topics]
+        for ws in targets:
+            try:
+                ws.send_text(msg)
+            except Exception:
+                pass
+
+    def _emit_error(self, message: str) -> None:
+        self._emit("error", "on_event", {"event": ServiceEvent.ERROR_OCCURRED.value,
+                                         "params": {"message": message}})
+
+    # ---- Helpers ----
+
+    def _require_session(self) -> None:
+        if self._active_session is None:
+            raise _ToolError("No active session")
+
+    def _require_capture(self) -> _Capture:
+        self._require_session()
+        if self._capture is None:
+            raise _ToolError("No capture data available")
+        return self._capture
+
+    @staticmethod
+    def _make_channels(mode: int) -> List[dict]:
+        count, ctype = _MODE_CHANNELS[mode]
+        return [{"index": i, "name": str(i), "type": ctype, "enabled": True,
+                 "enabled_default": True} for i in range(count)]
+
+    def _decode(self, instance_id: str) -> None:
+        """(Re)compute annotations for one decoder against the current capture."""
+        inst = self._decoders[instance_id]
+        cap = self._capture
+        if cap is None:
+            self._results.pop(instance_id, None)
+            return
+        dec = inst["decoder_id"]
+        cmap = inst["channel_map"]
+        if dec == "i2c" and cap.pattern == "i2c" and cmap.get("scl") == 0 and cmap.get("sda") == 1:
+            self._results[instance_id] = _TableAnnotations(cap.i2c_annotations(),
+                                                           _NUMERIC_CLASSES[dec])
+        else:
+            self._results[instance_id] = _SyntheticAnnotations(
+                self.annotations, cap.sample_count, _DECODERS[dec][0],
+                0 in _NUMERIC_CLASSES.get(dec, ()))
+
+    def _finish_capture(self, capture_id: int) -> None:
+        with self._lock:
+            cap = self._pending
+            if cap is None or cap.capture_id != capture_id:
+                return
+            if self._pending_stream:
+                elapsed = time.monotonic() - self._started_at
+                cap.truncate(max(1, min(cap.sample_count, int(elapsed * cap.sample_rate))))
+            self._pending = None
+            self._timer = None
+            error, self._capture_error = self._capture_error, None
+            if error is not None:
+                self._state = "error"
+                self._error_state = {"has_error": True, "error_code": 1,
+                                     "error_pattern": "", "error_message": error}
+                self._emit_error(error)
+            else:
+                self._state = "completed"
+                self._capture = cap
+            self._emit("capture_state", "on_capture_state_changed", {"state": "stopped"})
+            if error is None:
+                self._emit("data_updated", "on_data_updated",
+                           {"sample_count": str(cap.sample_count)})
+                if self.decode_time > 0:
+                    self._decoding = set(self._decoders)
+                    self._decode_timer = threading.Timer(
+                        self.decode_time, self._finish_decode, args=(capture_id,))
+                    self._decode_timer.daemon = True
+                    self._decode_timer.start()
+                else:
+                    for instance_id in self._decoders:
+                        self._decode(instance_id)
+            self._cond.notify_all()
+
+    def _finish_decode(self, capture_id: int) -> None:
+        with self._lock:
+            if self._capture is None or self._capture.capture_id != capture_id:
+                return
+            for instance_id in self._decoding & set(self._decoders):
+                self._decode(instance_id)
+            self._decoding = set()
+            self._decode_timer = None
+
+    def _logic(self, cap: _Capture, channel: int) -> bytes:
+        if channel not in cap.channels:
+            raise _ToolError(f"Channel {channel} was not captured")
+        data = cap.logic(channel)
+        inv = self._invert
+        if channel in inv["channels"]:
+            pos = inv["channels"].index(channel)
+            if pos < len(inv["invert_states"]) and inv["invert_states"][pos]:
+                data = data.translate(bytes([1, 0]) + bytes(254))
+        return data
+
+    # ==================================================================
+    # Tools — Tier 0: mode management
+    # ==================================================================
+
+    def _tool_switch_work_mode(self, a: dict) -> Any:
+        self._require_session()
+        mode = int(a["mode"])
+        if mode < 0 or mode > 3:
+            raise _ToolError("Invalid mode value. Use 0=Logic, 1=DSO, 2=Analog, 3=MSO.")
+        if mode not in _WORK_MODES:
+            raise _ToolError(f"Work mode {mode} is not supported by this device")
+        if mode != self._work_mode:
+            self._work_mode = mode
+            self._channels = self._make_channels(mode)
+            self._capture = None
+            self._state = "idle"
+            self.emit_event(ServiceEvent.DEVICE_MODE_CHANGED, {"mode": mode})
+        return {"success": True, "mode": mode}
+
+    def _tool_get_work_mode(self, a: dict) -> Any:
+        self._require_session()
+        return {"mode": self._work_mode}
+
+    def _tool_get_supported_work_modes(self, a: dict) -> Any:
+        self._require_session()
+        return {"modes": sorted(_WORK_MODES)}
+
+    # ==================================================================
+    # Tools — Tier 1: core workflow
+    # ==================================================================
+
+    def _device_json(self) -> dict:
+        active = (self._active_session is not None
+                  and self._sessions.get(self._active_session) == DEMO_DEVICE_ID
+                  and time.monotonic() >= self._device_ready_at)
+        return {
+            "id": DEMO_DEVICE_ID, "driver_name": "demo", "display_name": "Demo Device",
+            "path": "", "is_hardware": False, "is_demo": True, "is_file": False,
+            "is_virtual": True, "is_hardware_logic": False, "is_hardware_dso": False,
+            "is_dsl_device": False, "is_compat_device": False, "usb_speed": 0,
+            "is_active": active,
+        }
+
+    def _tool_get_devices(self, a: dict) -> Any:
+        return [self._device_json()]
+
+    def _tool_refresh_device_list(self, a: dict) -> Any:
+        self._require_session()
+        self._emit("device_list", "on_device_list_updated", {})
+        return [self._device_json()]
+
+    def _tool_start_capture(self, a: dict) -> Any:
+        if a.get("deviceId"):
+            self._tool_connect_device({"deviceId": a["deviceId"]})
+        self._require_session()
+        if self._state == "capturing":
+            raise _ToolError("A capture is already running")
+        pattern = a.get("pattern") or self.pattern
+        if pattern not in PATTERNS:
+            raise _ToolError(f"Unknown pattern: {pattern}")
+        rate = int(a.get("digitalSampleRate") or a.get("analogSampleRate") or self._sample_rate)
+        if rate <= 0:
+            raise _ToolError("Invalid sample rate")
+        self._sample_rate = rate
+        if a.get("digitalChannels"):
+            wanted = {int(c) for c in a["digitalChannels"]}
+            for ch in self._channels:
+                ch["enabled"] = ch["index"] in wanted
+        channels = [ch["index"] for ch in self._channels if ch["enabled"]]
+        if not channels:
+            raise _ToolError("No channels enabled")
+        mode = a.get("captureMode", "manual")
+        stream = mode == "stream" or str(a.get("channelMode", "")).lower() == "stream"
+        if a.get("sampleCount") and not stream:
+            count = int(a["sampleCount"])
+        elif mode == "timed" and a.get("durationSeconds") and not stream:
+            count = int(float(a["durationSeconds"]) * rate)
+        else:
+            count = self._sample_limit
+        if count <= 0:
+            raise _ToolError("Sample count must be positive")
+
+        self._export_streams.clear()  # PXView shuts streamed exports down
+        self._capture_id += 1
+        self._pending = _Capture(self._capture_id, pattern, rate, count, channels,
+                                 self._work_mode, self.seed)
+        self._pending_stream = stream
+        self._capture = None
+        self._state = "capturing"
+        self._started_at = time.monotonic()
+        # PXView resets every decoder when a capture starts (ClearDecodeData).
+        self._results = {}
+        self._decoding = set()
+        if self._decode_timer is not None:
+            self._decode_timer.cancel()
+            self._decode_timer = None
+        self._emit("capture_state", "on_capture_state_changed", {"state": "running"})
+        self._emit("decode", "on_decode_done", {"detail": "clear_decode_data"})
+        if not stream:
+            self._timer = threading.Timer(self.capture_time, self._finish_capture,
+                                          args=(self._capture_id,))
+            self._timer.daemon = True
+            self._timer.start()
+        else:
+            self._arm_stream_update(self._capture_id)
+        return {"started": True, "capture_id": self._capture_id}
+
+    def _arm_stream_update(self, capture_id: int) -> None:
+        self._timer = threading.Timer(self.stream_update_interval, self._stream_update,
+                                      args=(capture_id,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _stream_update(self, capture_id: int) -> None:
+        """Report the samples acquired so far, like PXView's SampleCountUpdated."""
+        with self._lock:
+            cap = self._pending
+            if cap is None or cap.capture_id != capture_id or not self._pending_stream:
+                return
+            elapsed = time.monotonic() - self._started_at
+            live = min(cap.sample_count, int(elapsed * cap.sample_rate))
+            self._emit("data_updated", "on_data_updated",
+                       {"detail": "sample_count_updated", "sample_count": str(live)})
+            self._arm_stream_update(capture_id)
+
+    def _tool_stop_capture(self, a: dict) -> Any:
+        self._require_session()
+        if self._pending is not None:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._pending_stream = True  # keep only what was captured so far
+            self._finish_capture(self._pending.capture_id)
+        return "stopped"
+
+    def wait_capture(self, timeout_s: float,
+                     on_progress: Optional[Callable[[float], None]] = None,
+                     interval: float = 0.5) -> None:
+        """Block until the running capture finishes.
+
+        Raises:
+            _ToolError: on timeout or if the capture ended in error.
+        """
+        t0 = time.monotonic()
+        deadline = t0 + timeout_s
+        with self._cond:
+            while self._state == "capturing":
+                if on_progress is not None:
+                    on_progress(time.monotonic() - t0)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise _ToolError(f"Capture did not complete within {timeout_s:g}s")
+                self._cond.wait(min(interval, remaining))
+            if self._state == "error":
+                raise _ToolError(self._error_state["error_message"])
+
+    def _tool_wait_capture(self, a: dict) -> Any:
+        with self._lock:
+            self._require_session()
+        if "timeoutMs" in a:
+            timeout_s = float(a["timeoutMs"]) / 1000.0
+        else:
+            timeout_s = float(a.get("timeoutSeconds", 300.0))
+        self.wait_capture(timeout_s)
+        return {"completed": True}
+
+    def _tool_get_capture_status(self, a: dict) -> Any:
+        self._require_session()
+        progress = 100 if self._state == "completed" else 0
+        if self._state == "capturing" and not self._pending_stream and self.capture_time > 0:
+            elapsed = time.monotonic() - self._started_at
+            progress = min(99, int(100 * elapsed / self.capture_time))
+        status = {
+            "state": self._state,
+            "state_code": _STATE_CODES[self._state],
+            "is_instant": False,
+            "is_saving": False,
+            "have_view_data": self._capture is not None,
+            "have_hardware_data": self._capture is not None,
+            "have_decoded_result": bool(self._results),
+            "is_glitch_filter_active": bool(self._glitch["channels"]),
+            "is_signal_invert_active": bool(self._invert["channels"]),
+            "progress": progress,
+            "triggered": self._capture is not None,
+        }
+        if not a.get("includeProgress", True):
+            status.pop("progress")
+        return status
+
+    def _tool_load_capture(self, a: dict) -> Any:
+        self._require_session()
+        path = a["filePath"]
+        try:
+            with open(path, encoding="utf-8") as fh:
+                saved = json.load(fh)
+            info = saved["fake_pxview_capture"]
+        except (OSError, ValueError, KeyError, TypeError):
+            raise _ToolError(f"Failed to load file: {path}") from None
+        self._export_streams.clear()
+        self._capture_id += 1
+        self._capture = _Capture(self._capture_id, info["pattern"], info["sample_rate"],
+                                 info["sample_count"], info["channels"], info["mode"],
+                                 info["seed"])
+        self._state = "completed"
+        for instance_id in self._decoders:
+            self._decode(instance_id)
+        self._emit("file_op", "on_load_complete", {"path": path})
+        return "loaded"
+
+    def _tool_save_capture(self, a: dict) -> Any:
+        cap = self._require_capture()
+        path = a["filePath"]
+        info = cap.to_dict()
+        start, end = int(a.get("startSample", 0)), int(a.get("endSample", 0))
+        if end > start:
+            info["sample_count"] = min(cap.sample_count, end) - start
+        try:
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump({"fake_pxview_capture": info}, fh)
+        except OSError as exc:
+            raise _ToolError(f"Failed to save file: {exc}") from None
+        self._emit("file_op", "on_save_complete", {"path": path})
+        return "saved"
+
+    def _tool_close_capture(self, a: dict) -> Any:
+        self._require_session()
+        self._export_streams.clear()
+        self._capture = None
+        self._results = {}
+        self._state = "idle"
+        return "closed"
+
+    def _tool_add_analyzer(self, a: dict) -> Any:
+        self._require_session()
+        if self._work_mode not in (0, 3):
+            raise _ToolError("Protocol decoders are only available in Logic/MSO mode.")
+        decoder_id = a["decoderId"]
+        if decoder_id not in _DECODERS:
+            raise _ToolError(f"Decoder not found: {decoder_id}")
+        stack_on = a.get("stackOnAnalyzerId", "")
+        if stack_on and stack_on not in self._decoders:
+            raise _ToolError(f"Analyzer not found: {stack_on}")
+        cmap = {k: int(v) for k, v in (a.get("channelMap") or {}).items()}
+        required = [c[0] for c in _DECODERS[decoder_id][2]]
+        missing = [c for c in required if c not in cmap]
+        if missing and not stack_on:
+            raise _ToolError(f"Required channel(s) not mapped: {', '.join(missing)}")
+        self._decoder_seq += 1
+        instance_id = f"{self._active_session}:{self._decoder_seq}"
+        self._decoders[instance_id] = {
+            "instance_id": instance_id,
+            "decoder_id": decoder_id,
+            "display_name": a.get("label") or _DECODERS[decoder_id][0],
+            "row_index": len(self._decoders),
+            "channel_map": cmap,
+            "options": dict(a.get("options") or {}),
+        }
+        if self._capture is not None:
+            self._decode(instance_id)
+        return {"analyzerId": instance_id, "success": True}
+
+    def _get_decoder(self, instance_id: str) -> dict:
+        inst = self._decoders.get(instance_id)
+        if inst is None:
+            raise _ToolError(f"Analyzer not found: {instance_id}")
+        return inst
+
+    def _tool_remove_analyzer(self, a: dict) -> Any:
+        self._require_session()
+        self._get_decoder(a["analyzerId"])
+        del self._decoders[a["analyzerId"]]
+        self._results.pop(a["analyzerId"], None)
+        self._ann_journals.pop(a["analyzerId"], None)
+        return "removed"
+
+    def _tool_list_analyzers(self, a: dict) -> Any:
+        self._require_session()
+        flt = a.get("filter")
+        return [_decoder_desc(d) for d in _DECODERS if not flt or flt in d]
+
+    def _tool_get_analyzer_options(self, a: dict) -> Any:
+        self._require_session()
+        decoder_id = a["decoderId"]
+        if decoder_id not in _DECODERS:
+            raise _ToolError(f"Decoder not found: {decoder_id}")
+        desc = _decoder_desc(decoder_id)
+        channels = desc["channel_info"]
+        return {"id": decoder_id, "channels": [c for c in channels if not c["is_optional"]],
+                "optional_channels": [c for c in channels if c["is_optional"]],
+                "options": []}
+
+    def _tool_get_analyzer_results(self, a: dict) -> Any:
+        instance_id = a["analyzerId"]
+        with self._lock:
+            self._require_session()
+            inst = self._get_decoder(instance_id)
+            source = self._results.get(instance_id)
+        classes = {int(c) for c in a.get("annClasses") or []}
+        if a.get("annClass") is not None:
+            classes.add(int(a["annClass"]))
+        fmt = a.get("format", "rows")
+        if fmt not in ("rows", "columnar"):
+            raise _ToolError(f"Invalid format '{fmt}'. Use 'rows' or 'columnar'.")
+        fields = list(a["fields"]) if a.get("fields") is not None else list(_ANN_FIELDS)
+        for name in fields:
+            if name not in _ANN_FIELDS:
+                raise _ToolError(f"Unknown field '{name}'. Use start_sample, "
+                                 "end_sample, ann_class, texts or numeric.")
+        start, end = int(a.get("startSample", 0)), int(a.get("endSample", 2 ** 64 - 1))
+        max_count = int(a.get("maxCount", 1000))
+        anns: List[dict] = []
+        delta: Optional[dict] = None
+        if a.get("sinceVersion") is not None:
+            anns, delta = self._annotation_delta(instance_id, source, int(a["sinceVersion"]),
+                                                 start, end, max_count, classes)
+        elif source is not None:
+            anns = source.page(start, end, max_count, classes)
+        selected = [f for f in _ANN_FIELDS if f in fields]
+        result: Dict[str, Any]
+        if fmt == "columnar":
+            result = _columnar(anns, selected)
+        else:
+            if len(selected) < len(_ANN_FIELDS):
+                anns = [{f: ann[f] for f in selected if f in ann} for ann in anns]
+            result = {"annotations": anns}
+        if delta is not None:
+            result.update(delta)
+        if a.get("includeMetadata"):
+            names = _DECODERS[inst["decoder_id"]][4]
+            result["metadata"] = {"classNames": [
+                {"class_id": i, "class_name": c} for i, c in enumerate(names)]}
+        return result
+
+    def _annotation_delta(self, instance_id: str, source: Any, since: int, start: int,
+                          end: int, max_count: int,
+                          classes: Collection[int]) -> Tuple[List[dict], dict]:
+        """``sinceVersion`` read: each version names the per-row counts delivered so far."""
+        with self._lock:
+            owner, checkpoints = self._ann_journals.get(instance_id, (None, []))
+            if owner is not source:  # decoded again: old versions are meaningless
+                checkpoints = []
+                self._ann_journals[instance_id] = (source, checkpoints)
+            cursor: Tuple[int, ...] = ()
+            reset = False
+            if since:
+                cursors = [c for v, c in checkpoints if v == since]
+                if cursors:
+                    cursor = cursors[0]
+                else:
+                    reset = True
+        anns, nxt, more = (source.since(cursor, start, end, max_count, classes)
+                           if source is not None else ([], (), False))
+        with self._lock:
+            if since and not reset and nxt == cursor:
+                version = since
+            else:
+                found = [v for v, o in checkpoints if o == nxt]
+                if found:
+                    version = found[0]
+                else:
+                    self._ann_version += 1
+                    version = self._ann_version
+                    checkpoints.append((version, nxt))
+                    del checkpoints[:-64]
+        return anns, {"version": version, "reset": reset, "more": more}
+
+    def append_annotations(self, analyzer_id: str, rows: List[tuple]) -> None:
+        """Append decoded annotations, as a running stream decode does.
+
+        Emits ``DataUpdated`` and ``DecodeProgress`` like PXView when new
+        data has been decoded.
+
+        Args:
+            analyzer_id: Decoder instance ID.
+            rows:        ``(start_sample, end_sample, ann_class, texts)``
+                         tuples, in start order.
+        """
+        with self._lock:
+            if analyzer_id not in self._decoders:
+                raise ConfigError(f"Unknown analyzer: {analyzer_id}")
+            source = self._results.get(analyzer_id)
+            if not isinstance(source, _TableAnnotations):
+                existing = ([] if source is None
+                            else source.page(0, 2 ** 64 - 1, len(source), None))
+                table = _TableAnnotations(
+                    [(x["start_sample"], x["end_sample"], x["ann_class"], x["texts"])
+                     for x in existing],
+                    _NUMERIC_CLASSES.get(self._decoders[analyzer_id]["decoder_id"], ()))
+                journal = self._ann_journals.get(analyzer_id)
+                if journal is not None and journal[0] is source:  # same rows, same cursors
+                    self._ann_journals[analyzer_id] = (table, journal[1])
+                self._results[analyzer_id] = source = table
+            source.append(rows)
+            sample_count = self._capture.sample_count if self._capture is not None else 0
+            self._emit("data_updated", "on_data_updated", {"sample_count": str(sample_count)})
+            self._emit("decode", "on_decode_progress", {"decoder_id": analyzer_id, "progress": 100})
+
+    def _raw_export(self, cap: _Capture, fmt: str, ch: int, analog: bool) -> Tuple[str, bytes]:
+        """File name and contents of one channel's ``export_raw_data`` output."""
+        if fmt not in RAW_SUFFIXES:
+            raise _ToolError(f"Unsupported export format: {fmt} "
+                             "(supported: csv, binary, vcd, hex, bits)")
+        start, end = self._save_range
+        if end <= start:
+            start, end = 0, cap.sample_count
+        end = min(end, cap.sample_count)
+        name = self._channels[ch]["name"] if ch < len(self._channels) else str(ch)
+        if not analog:
+            return (f"channel_{ch}.{RAW_SUFFIXES[fmt]}",
+                    _render_export(fmt, self._logic(cap, ch)[start:end], name, cap.sample_rate))
+        if cap.mode == 0:
+            raise _ToolError(f"No analog channel {ch} in Logic mode")
+        values = cap.analog(ch, start, end)
+        if fmt == "binary":
+            return f"channel_{ch}.bin", struct.pack(f"<{len(values)}f", *values)
+        if fmt != "csv":
+            raise _ToolError("FakePXViewServer exports analog channels as csv or binary only")
+        return (f"analog_{ch}.csv",
+                (f"{name}\n" + "".join(f"{v:g}\n" for v in values)).encode())
+
+    def _tool_export_raw_data(self, a: dict) -> Any:
+        cap = self._require_capture()
+        fmt = a.get("format", "csv")
+        directory = a["directory"]
+        targets = ([(int(ch), False) for ch in a.get("digitalChannels") or []]
+                   + [(int(ch), True) for ch in a.get("analogChannels") or []])
+        exports = [self._raw_export(cap, fmt, ch, analog) for ch, analog in targets]
+        os.makedirs(directory, exist_ok=True)
+        for file_name, data in exports:
+            with open(os.path.join(directory, file_name), "wb") as fh:
+                fh.write(data)
+        self._emit("file_op", "on_export_complete", {"path": directory, "format": fmt})
+        return "exported"
+
+    def _tool_open_export_stream(self, a: dict) -> Any:
+        cap = self._require_capture()
+        file_name, data = self._raw_export(cap, a.get("format", "csv"), int(a["channel"]),
+                                           bool(a.get("analog", False)))
+        with self._lock:
+            if len(self._export_streams) >= 8:
+                raise _ToolError("Too many open export streams (close_export_stream unused ones)")
+            self._export_stream_seq += 1
+            stream_id = f"xs-{self._export_stream_seq}"
+            self._export_streams[stream_id] = {"data": data, "offset": 0, "last_offset": 0,
+                                               "last": b"", "last_eof": False}
+        return {"streamId": stream_id, "fileName": file_name}
+
+    def _tool_read_export_stream(self, a: dict) -> Any:
+        stream_id, offset = a["streamId"], int(a["offset"])
+        max_bytes = min(max(int(a.get("maxBytes", 4 << 20)), 1), 64 << 20)
+        with self._lock:
+            st = self._export_streams.get(stream_id)
+            if st is None:
+                raise _ToolError(f"Unknown export stream: {stream_id}")
+            if offset == st["offset"]:
+                chunk = st["data"][offset:offset + max_bytes]
+                st.update(last_offset=offset, last=chunk,
+                          last_eof=offset + len(chunk) >= len(st["data"]),
+                          offset=offset + len(chunk))
+            elif offset != st["last_offset"]:
+                raise _ToolError(f"Export stream {stream_id} is at offset "
+                                 f"{st['offset']}, not {offset}")
+            chunk, eof = st["last"], st["last_eof"]
+        blob_min = int(a.get("blobMinBytes", 0))
+        out: Dict[str, Any] = {"offset": offset, "size": len(chunk), "eof": eof}
+        if blob_min and chunk and len(chunk) >= blob_min:
+            out.update(encoding="blob", blob=self._blob_handle(chunk))
+        else:
+            out.update(encoding="base64", data=base64.b64encode(chunk).decode("ascii"))
+        return out
+
+    def _tool_close_export_stream(self, a: dict) -> Any:
+        with self._lock:
+            if self._export_streams.pop(a["streamId"], None) is None:
+                raise _ToolError(f"Unknown export stream: {a['streamId']}")
+        return {"closed": True}
+
+    def _tool_export_data_table_csv(self, a: dict) -> Any:
+        self._require_capture()
+        base = a["filePath"]
+        if "analyzers" in a:
+            if not isinstance(a["analyzers"], list) or not a["analyzers"]:
+                raise _ToolError("'analyzers' must be a non-empty array.")
+            exported = []
+            for entry in a["analyzers"]:
+                instance_id = entry["analyzerId"]
+                root, ext = os.path.splitext(base)
+                path = f"{root}_{instance_id.replace(':', '_')}{ext or '.csv'}"
+                self._write_table(path, instance_id, int(entry.get("radixType", 0)),
+                                  bool(a.get("iso8601Timestamp")))
+                exported.append({"analyzerId": instance_id, "filePath": path})
+            return {"exported": exported}
+        if "analyzerId" not in a:
+            raise _ToolError("Provide either 'analyzers' array or 'analyzerId'.")
+        self._write_table(base, a["analyzerId"], int(a.get("radixType", 0)),
+                          bool(a.get("iso8601Timestamp")))
+        return "exported"
+
+    def _write_table(self, path: str, instance_id: str, radix: int, iso8601: bool) -> None:
+        inst = self._get_decoder(instance_id)
+        source = self._results.get(instance_id)
+        rate = self._capture.sample_rate if self._capture else self._sample_rate
+        rows = source.page(0, 2 ** 64 - 1, len(source), None) if source is not None else []
+        stamp = (lambda n: _iso8601(n, rate)) if iso8601 else (lambda n: n)
+        with open(path, "w", encoding="utf-8", newline="") as fh:
+            fh.write(TABLE_HEADER)
+            for ann in rows:
+                fh.write(_csv_row(stamp(ann["start_sample"]), stamp(ann["end_sample"]),
+                                  inst["display_name"], ann["ann_class"],
+                                  _format_radix(ann, radix)))
+
+    def _tool_get_channels(self, a: dict) -> Any:
+        self._require_session()
+        if a.get("mode") is not None and int(a["mode"]) != self._work_mode:
+            mode = int(a["mode"])
+            counts = []
+            if mode in _MODE_CHANNELS:
+                count, ctype = _MODE_CHANNELS[mode]
+                counts.append({"type": ("logic", "analog", "dso")[ctype], "count": count})
+            return {"requested_mode": mode, "current_mode": self._work_mode,
+                    "note": f"Call switch_work_mode({mode}) for full channel details.",
+                    "channel_counts": counts}
+        return [dict(ch) for ch in self._channels]
+
+    # ==================================================================
+    # Tools — Tier 2: configuration
+    # ==================================================================
+
+    def _sample_config(self) -> dict:
+        return {
+            "sample_rate": self._sample_rate, "sample_limit": self._sample_limit,
+            "time_base": 0, "collect_mode": self._collect_mode, "stream_mode": False,
+            "rle_enabled": False, "repeat_interval": self._repeat_interval,
+            "repeat_hold_percent": 0,
+        }
+
+    def _tool_set_sample_config(self, a: dict) -> Any:
+        self._require_session()
+        if "sampleRate" in a:
+            if int(a["sampleRate"]) <= 0:
+                raise _ToolError("Invalid sample rate")
+            self._sample_rate = int(a["sampleRate"])
+        if "sampleLimit" in a:
+            self._sample_limit = int(a["sampleLimit"])
+        if "collectMode" in a:
+            self._collect_mode = int(a["collectMode"])
+        if "repeatInterval" in a:
+            self._repeat_interval = float(a["repeatInterval"])
+        self._emit("sample_config", "on_sample_config_changed", {})
+        return {"success": True}
+
+    def _tool_configure_channel(self, a: dict) -> Any:
+        self._require_session()
+        idx = int(a["channelIndex"])
+        if not 0 <= idx < len(self._channels):
+            raise _ToolError(f"Channel {idx} not found")
+        if "enabled" in a:
+            self._channels[idx]["enabled"] = bool(a["enabled"])
+        if "name" in a:
+            self._channels[idx]["name"] = str(a["name"])
+        self._emit("channel_config", "on_channel_config_changed", {"channel": str(idx)})
+        return {"success": True}
+
+    def _tool_configure_channels(self, a: dict) -> Any:
+        self._require_session()
+        entries = a.get("channels")
+        if not isinstance(entries, list) or not entries:
+            raise _ToolError("'channels' must be a non-empty array.")
+        # Validate everything first: a bad entry leaves all channels as they were.
+        seen = set()
+        for entry in entries:
+            if not isinstance(entry, dict) or "channelIndex" not in entry:
+                raise _ToolError("Each 'channels' entry needs a channelIndex.")
+            idx = int(entry["channelIndex"])
+            if not 0 <= idx < len(self._channels):
+                raise _ToolError(f"Channel {idx} not found")
+            if idx in seen:
+                raise _ToolError(f"Channel {idx} listed more than once")
+            seen.add(idx)
+        for entry in entries:
+            ch = self._channels[int(entry["channelIndex"])]
+            if "enabled" in entry:
+                ch["enabled"] = bool(entry["enabled"])
+            if "name" in entry:
+                ch["name"] = str(entry["name"])
+        self._emit("channel_config", "on_channel_config_changed",
+                   {"field": "channels", "count": str(len(entries))})
+        return {"success": True, "count": len(entries)}
+
+    def _tool_configure_trigger(self, a: dict) -> Any:
+        self._require_session()
+        if self._work_mode in (0, 3):
+            if "stageCount" not in a and "configJson" not in a:
+                return dict(self._logic_trigger)
+            if "stageCount" in a:
+                self._logic_trigger["stage_count"] = int(a["stageCount"])
+            if "configJson" in a:
+                self._logic_trigger["config_json"] = str(a["configJson"])
+        else:
+            keys = {"source": "source", "slope": "slope", "horizPos": "horiz_pos",
+                    "holdoff": "holdoff", "margin": "margin", "channel": "channel"}
+            if not any(k in a for k in keys):
+                return dict(self._dso_trigger)
+            for k, field_name in keys.items():
+                if k in a:
+                    self._dso_trigger[field_name] = a[k]
+        self._emit("trigger_config", "on_trigger_config_changed", {})
+        return {"success": True}
+
+    def _tool_configure_probe(self, a: dict) -> Any:
+        self._require_session()
+        if self._work_mode == 0:
+            raise _ToolError("Probe configuration is not available in Logic mode "
+                             "(current mode: 0). Call switch_work_mode(1) for DSO or "
+                             "switch_work_mode(2) for Analog.")
+        idx = int(a["channelIndex"])
+        probe = self._probes.setdefault(
+            idx, {"vdiv": 1000.0, "coupling": 0, "vfactor": 1.0, "map_default": True})
+        keys = {"vdiv": "vdiv", "coupling": "coupling", "vfactor": "vfactor",
+                "mapDefault": "map_default"}
+        if not any(k in a for k in keys):
+            return dict(probe)
+        for k, field_name in keys.items():
+            if k in a:
+                probe[field_name] = a[k]
+        return {"success": True}
+
+    def _tool_configure_glitch_filter(self, a: dict) -> Any:
+        self._require_session()
+        if self._work_mode in (1, 2):
+            raise _ToolError(f"Glitch filter is not available in DSO/Analog mode "
+                             f"(current mode: {self._work_mode}). "
+                             "Call switch_work_mode(0) for Logic mode.")
+        if "channels" not in a:
+            return dict(self._glitch, is_active=bool(self._glitch["channels"]))
+        if not a["channels"]:
+            self._glitch = {"channels": [], "thresholds": [], "modes": []}
+            return {"cleared": True}
+        self._glitch = {"channels": list(a["channels"]),
+                        "thresholds": list(a.get("thresholds") or []),
+                        "modes": list(a.get("modes") or [])}
+        return {"success": True}
+
+    def _tool_configure_signal_invert(self, a: dict) -> Any:
+        self._require_session()
+        if "channels" not in a:
+            return dict(self._invert, is_active=bool(self._invert["channels"]))
+        if not a["channels"]:
+            self._invert = {"channels": [], "invert_states": []}
+            return {"cleared": True}
+        states = a.get("invertStates")
+        if states is None:
+            states = [True] * len(a["channels"])
+        logic = [c["index"] for c in self._channels if c["type"] == 0]
+        for ch in a["channels"]:
+            if ch not in logic:
+                raise _ToolError(f"Not a logic channel: {ch}")
+        # Like PXView: one state per logic channel, read back as the
+        # inverted channels in channel order.
+        inverted = sorted({ch for ch, on in zip(a["channels"], states) if on}, key=logic.index)
+        self._invert = {"channels": inverted, "invert_states": [True] * len(inverted)}
+        return {"success": True}
+
+    _CONFIG_TYPES: Dict[str, Callable[[Any], Any]] = {
+        "bool": bool, "int": int, "int64": int, "uint64": int, "double": float, "string": str,
+    }
+
+    def _tool_get_config(self, a: dict) -> Any:
+        self._require_session()
+        key, vtype = int(a["key"]), a["type"]
+        if vtype not in self._CONFIG_TYPES:
+            raise _ToolError(f"Unsupported 'type': {vtype}. "
+                             "Use: bool, int, int64, string, double, uint64.")
+        if key not in self._config:
+            raise _ToolError(f"Config key {key} is not supported by this device")
+        return {"value": self._CONFIG_TYPES[vtype](self._config[key])}
+
+    def _tool_set_config(self, a: dict) -> Any:
+        self._require_session()
+        key, vtype = int(a["key"]), a["type"]
+        if vtype not in self._CONFIG_TYPES:
+            raise _ToolError(f"Unsupported 'type': {vtype}. "
+                             "Use: bool, int, int64, string, double, uint64.")
+        if "value" not in a:
+            raise _ToolError("Missing 'value' parameter")
+        self._config[key] = self._CONFIG_TYPES[vtype](a["value"])
+        self.emit_event(ServiceEvent.DEVICE_CONFIG_CHANGED)
+        return {"success": True}
+
+    def _tool_set_export_config(self, a: dict) -> Any:
+        self._require_session()
+        self._save_range = (int(a["startSample"]), int(a["endSample"]))
+        return {"success": True}
+
+    def _tool_connect_device(self, a: dict) -> Any:
+        device_id = a["deviceId"]
+        if device_id != DEMO_DEVICE_ID:
+            raise _ToolError(f"Failed to connect device: device not found: {device_id}")
+        active = self._active_session
+        if active is None or self._sessions.get(active) != device_id:
+            self._device_ready_at = time.monotonic() + self.device_ready_delay
+        sid = next((k for k, dev in self._sessions.items() if dev == device_id), None)
+        if sid is None:
+            sid = self._next_session
+            self._next_session += 1
+            self._sessions[sid] = device_id
+        self._active_session = sid
+        return {"success": True, "session_id": sid}
+
+    def _tool_disconnect_device(self, a: dict) -> Any:
+        device_id = a.get("deviceId")
+        if device_id is None:
+            if self._active_session is None:
+                raise _ToolError("No active device to disconnect")
+            device_id = self._sessions[self._active_session]
+        gone = [sid for sid, dev in self._sessions.items() if dev == device_id]
+        if not gone:
+            raise _ToolError(f"Device not connected: {device_id}")
+        for sid in gone:
+            del self._sessions[sid]
+        if self._active_session in gone:
+            self._active_session = None
+        return {"success": True}
+
+    def _tool_get_session_status(self, a: dict) -> Any:
+        self._require_session()
+        result: Dict[str, Any] = {
+            "collect_mode": self._collect_mode,
+            "is_single_mode": self._collect_mode == 0,
+            "is_repeat_mode": self._collect_mode == 1,
+            "is_loop_mode": self._collect_mode == 2,
+            "repeat_interval": self._repeat_interval,
+            "repeat_hold_percent": 0,
+            "disk_cache": dict(self.disk_cache),
+        }
+        if "config" in str(a.get("include", "")):
+            result["sampleConfig"] = self._sample_config()
+        return result
+
+    # ==================================================================
+    # Tools — Tier 3: advanced features
+    # ==================================================================
+
+    def _readable_capture(self) -> Tuple[_Capture, int]:
+        """Capture ``get_samples`` reads and how many samples it holds.
+
+        A running stream capture is readable up to the samples acquired
+        so far, like PXView's growing logic snapshot.
+        """
+        pending = self._pending
+        if pending is not None and self._pending_stream:
+            self._require_session()
+            elapsed = time.monotonic() - self._started_at
+            live = min(pending.sample_count, int(elapsed * pending.sample_rate))
+            if live <= 0:
+                raise _ToolError("No logic data available")
+            return pending, live
+        cap = self._require_capture()
+        return cap, cap.sample_count
+
+    def _tool_get_samples(self, a: dict) -> Any:
+        ch = int(a["channelIndex"])
+        ctype = a["channelType"]
+        with self._lock:
+            cap, available = self._readable_capture()
+            expected = {0: "logic", 1: "dso", 2: "analog"}[cap.mode]
+            if ctype not in ("logic", "analog", "dso"):
+                raise _ToolError("Invalid channelType. Use 'logic', 'analog', or 'dso'.")
+            if ctype != expected:
+                raise _ToolError(f"channelType '{ctype}' does not match the current work mode "
+                                 f"(expected '{expected}')")
+            if ctype == "logic":
+                data = self._logic(cap, ch)
+        start = int(a.get("startSample", 0))
+        end = min(int(a.get("endSample", available)), available)
+        if start > end:
+            raise _ToolError(f"Invalid sample range {start}..{end}")
+        blob_min = int(a.get("blobMinBytes", 0))
+        if ctype == "logic":
+            chunk = data[start:end]
+            if blob_min and len(chunk) >= blob_min:
+                return self._blob_result(len(chunk), chunk, "u8")
+            return {"sample_count": len(chunk), "data": base64.b64encode(chunk).decode("ascii"),
+                    "encoding": "base64"}
+        values = cap.analog(ch, start, end)
+        if blob_min and 4 * len(values) >= blob_min:
+            raw = struct.pack(f"<{len(values)}f", *values)
+            return self._blob_result(len(values), raw, "float32le")
+        return {"sample_count": len(values), "data": values, "encoding": "float32"}
+
+    def _blob_handle(self, data: bytes) -> dict:
+        blob_id = secrets.token_hex(16)
+        with self._lock:
+            now = time.monotonic()
+            self._blobs = {k: v for k, v in self._blobs.items() if v[1] > now}
+            self._blobs[blob_id] = (data, now + self.blob_ttl)
+        return {"id": blob_id, "path": BLOB_PATH + blob_id, "size": len(data),
+                "content_type": "application/octet-stream",
+                "expires_in_ms": int(self.blob_ttl * 1000)}
+
+    def _blob_result(self, sample_count: int, data: bytes, fmt: str) -> dict:
+        return {"sample_count": sample_count, "encoding": "blob", "format": fmt,
+                "blob": self._blob_handle(data)}
+
+    def blob(self, blob_id: str) -> Optional[bytes]:
+        """Bytes of a live ``get_samples`` blob, or None once it expired."""
+        with self._lock:
+            entry = self._blobs.get(blob_id)
+            if entry is None or entry[1] <= time.monotonic():
+                self._blobs.pop(blob_id, None)
+                return None
+            return entry[0]
+
+    def _find_level(self, from_sample: int, channel: int, state: str) -> int:
+        data = self._logic(self._require_capture(), channel)
+        if state == "x":
+            return from_sample
+        pos = data.find(b"\x01" if state == "1" else b"\x00", from_sample)
+        if pos < 0:
+            raise _ToolError("Pattern not found")
+        return pos
+
+    def _tool_find_next_edge(self, a: dict) -> Any:
+        data = self._logic(self._require_capture(), int(a["channelIndex"]))
+        needle = b"\x00\x01" if a.get("risingEdge", True) else b"\x01\x00"
+        pos = data.find(needle, int(a["fromSample"]))
+        if pos < 0:
+            raise _ToolError("No edge found")
+        return {"sample": pos + 1}
+
+    def _tool_find_pattern(self, a: dict) -> Any:
+        from_sample = int(a["fromSample"])
+        if "channels" in a:
+            channels = a["channels"]
+            if not isinstance(channels, list) or not channels:
+                raise _ToolError("'channels' must be a non-empty array.")
+            search_from = from_sample
+            for _ in range(10000):
+                all_match = True
+                max_pos = search_from
+                for ch in channels:
+                    pos = self._find_level(search_from, int(ch["channelIndex"]), ch["state"])
+                    if pos > max_pos:
+                        max_pos = pos
+                    elif pos < max_pos:
+                        all_match = False
+                if all_match:
+                    return {"sample": max_pos}
+                search_from = max_pos + 1
+            raise _ToolError("Pattern not found within 10000 iterations.")
+        if "channelIndex" not in a or "pattern" not in a:
+            raise _ToolError("Provide either 'channels' array or 'channelIndex'+'pattern'.")
+        return {"sample": self._find_level(from_sample, int(a["channelIndex"]), a["pattern"])}
+
+    def _tool_get_active_decoders(self, a: dict) -> Any:
+        self._require_session()
+        return [{
+            "instance_id": d["instance_id"], "decoder_id": d["decoder_id"],
+            "display_name": d["display_name"], "row_index": d["row_index"],
+            "is_running": d["instance_id"] in self._decoding,
+            "progress": 1.0 if d["instance_id"] in self._results else 0.0,
+        } for d in self._decoders.values()]
+
+    def _tool_clear_all_decoders(self, a: dict) -> Any:
+        self._require_session()
+        self._decoders = {}
+        self._results = {}
+        self._ann_journals = {}
+        return "cleared"
+
+    def _tool_reconfigure_decoder(self, a: dict) -> Any:
+        self._require_session()
+        inst = self._get_decoder(a["analyzerId"])
+        if "options" in a:
+            inst["options"].update(a["options"] or {})
+        if "channelMap" in a:
+            inst["channel_map"].update({k: int(v) for k, v in (a["channelMap"] or {}).items()})
+        if self._capture is not None:
+            self._decode(inst["instance_id"])
+        return {"success": True}
+
+    def _tool_list_sessions(self, a: dict) -> Any:
+        sessions = []
+        for sid, dev in sorted(self._sessions.items()):
+            s: Dict[str, Any] = {"session_id": sid, "is_active": sid == self._active_session}
+            if a.get("includeDeviceInfo", True):
+                s.update(device_id=dev, device_name="Demo Device" if dev == DEMO_DEVICE_ID else dev,
+                         driver_name="demo" if dev == DEMO_DEVICE_ID else "virtual-session",
+                         is_file=dev != DEMO_DEVICE_ID,
+                         file_path="" if dev == DEMO_DEVICE_ID else dev)
+            sessions.append(s)
+        active = self._active_session if self._active_session is not None else -1
+        return {"sessions": sessions, "active_session_id": active, "count": len(sessions)}
+
+    def _tool_create_session(self, a: dict) -> Any:
+        device_id = a.get("deviceId", "")
+        file_path = a.get("filePath", "")
+        if device_id and device_id != DEMO_DEVICE_ID:
+            raise _ToolError(f"Device not found: {device_id}")
+        sid = self._next_session
+        self._next_session += 1
+        self._sessions[sid] = device_id or file_path or DEMO_DEVICE_ID
+        self._active_session = sid
+        if file_path:
+            self._tool_load_capture({"filePath": file_path})
+        return {"session_id": sid, "success": True}
+
+    def _tool_destroy_session(self, a: dict) -> Any:
+        sid = int(a["sessionId"])
+        if sid not in self._sessions:
+            raise _ToolError(f"Session {sid} not found")
+        del self._sessions[sid]
+        if self._active_session == sid:
+            self._active_session = min(self._sessions) if self._sessions else None
+        return {"success": True}
+
+    def _tool_set_active_session(self, a: dict) -> Any:
+        sid = int(a["sessionId"])
+        if sid not in self._sessions:
+            raise _ToolError(f"Session {sid} not found")
+        self._active_session = sid
+        return {"success": True}
+
+    def _tool_get_measurement_results(self, a: dict) -> Any:
+        self._require_session()
+        if self._work_mode == 0:
+            raise _ToolError("Measurement results are only available in DSO/Analog/MSO mode.")
+        types = a.get("types") or ["math", "spectrum", "lissajous"]
+        result: Dict[str, Any] = {}
+        if "math" in types:
+            result["math"] = {"is_enabled": False, "ch1_index": 0, "ch2_index": 1,
+                              "math_type": 0, "sample_num": 0, "samples": []}
+        if "spectrum" in types:
+            result["spectrum"] = {"is_enabled": False, "channel_index": 0, "sample_num": 0,
+                                  "windows_index": 0, "dc_ignored": True,
+                                  "sample_interval": 1, "spectrum": []}
+        if "lissajous" in types:
+            result["lissajous"] = {"is_enabled": False, "x_index": 0, "y_index": 1,
+                                   "percent": 100.0}
+        return result
+
+    def _tool_configure_error_state(self, a: dict) -> Any:
+        self._require_session()
+        if a.get("action", "get") == "clear":
+            self._error_state = {"has_error": False, "error_code": 0,
+                                 "error_pattern": "", "error_message": ""}
+            if self._state == "error":
+                self._state = "idle"
+            return {"cleared": True}
+        return dict(self._error_state)
+
+    def _tool_configure_cursors(self, a: dict) -> Any:
+        self._require_session()
+        action = a.get("action", "get")
+        if action == "get":
+            return [{"index": i, "sample_pos": pos} for i, pos in enumerate(self._cursors)]
+        if action == "add":
+            if "samplePos" not in a:
+                raise _ToolError("'samplePos' is required for action='add'.")
+            self._cursors.append(int(a["samplePos"]))
+            return {"success": True}
+        if action == "remove":
+            if "index" not in a:
+                raise _ToolError("'index' is required for action='remove'.")
+            idx = int(a["index"])
+            if not 0 <= idx < len(self._cursors):
+                raise _ToolError(f"Cursor {idx} not found")
+            del self._cursors[idx]
+            return {"success": True}
+        if action == "clear":
+            self._cursors = []
+            return {"cleared": True}
+        raise _ToolError(f"Invalid action: {action}. Use 'get', 'add', 'remove', or 'clear'.")
+
+    # ==================================================================
+    # WebSocket transport
+    # ==================================================================
+
+    def _ws_accept_loop(self, listener: socket.socket) -> None:
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._ws_serve, args=(conn,), daemon=True).start()
+
+    def _ws_serve(self, conn: socket.socket) -> None:
+        try:
+            ws = WebSocket.accept(conn)
+        except Exception:
+            conn.close()
+            return
+        with self._ws_lock:
+            self._ws_clients[ws] = set()
+        try:
+            while True:
+                try:
+                    opcode, payload = ws.recv()
+                except Exception:
+                    break
+                if opcode == OPCODE_CLOSE:
+                    break
+                if opcode != OPCODE_TEXT:
+                    continue
+                try:
+                    req = json.loads(payload)
+                except ValueError:
+                    continue
+                ws.send_text(json.dumps(dict(self._ws_request(ws, req), jsonrpc="2.0",
+                                             id=req.get("id"))))
+        finally:
+            with self._ws_lock:
+                self._ws_clients.pop(ws, None)
+            ws.close()
+
+    def _ws_request(self, ws: WebSocket, req: dict) -> dict:
+        method = req.get("method", "")
+        topics = (req.get("params") or {}).get("topics")
+        with self._ws_lock:
+            subscribed = self._ws_clients.setdefault(ws, set())
+            if method == "subscribe":
+                subscribed.update(topics or [])
+            elif method == "unsubscribe":
+                if topics is None:
+                    subscribed.clear()
+                else:
+                    subscribed.difference_update(topics)
+            else:
+                return {"error": {"code": -32601, "message": f"Method not found: {method}"}}
+            return {"result": {"subscribed": sorted(subscribed)}}
+
+
+# ======================================================================
+# Module helpers
+# ======================================================================
+
+def _negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Content-Encoding PXView would pick for *accept_encoding*, or None."""
+    quality: Dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        m = re.match(r"\s*q\s*=\s*([0-9.]+)", params)
+        if m:
+            try:
+                q = float(m.group(1))
+            except ValueError:
+                q = 0.0
+        quality["gzip" if coding == "x-gzip" else coding] = q
+    wildcard = quality.get("*", 0.0)
+    gzip_q = quality.get("gzip", wildcard)
+    deflate_q = quality.get("deflate", wildcard)
+    if gzip_q > 0 and gzip_q >= deflate_q:
+        return "gzip"
+    return "deflate" if deflate_q > 0 else None
+
+
+def _error_result(message: str) -> dict:
+    return {"isError": True, "content": [{"type": "text", "text": message}]}
+
+
+def _tool_result(value: Any, structured_only: bool = False) -> dict:
+    if isinstance(value, str):
+        return {"content": [{"type": "text", "text": value}]}
+    text = "" if structured_only else json.dumps(value, indent=2)  # PXView: dump(2)
+    result: Dict[str, Any] = {"content": [{"type": "text", "text": text}]}
+    if isinstance(value, dict):
+        result["structuredContent"] = value
+    else:
+        result["structuredContent"] = {"value": value}
+        result["_meta"] = {"pxview/unwrap": "value"}
+    return result
+
+
+def _tool_json(name: str) -> dict:
+    description, read_only = _TOOLS[name]
+    return {
+        "name": name,
+        "description": description,
+        "inputSchema": {"type": "object", "properties": {}},
+        "annotations": {"readOnlyHint": read_only, "destructiveHint": not read_only},
+    }
+
+
+def _decoder_desc(decoder_id: str) -> dict:
+    name, long_name, required, optional, _ = _DECODERS[decoder_id]
+    info = [{"id": cid, "name": cname, "desc": desc, "order": i, "is_optional": i >= len(required)}
+            for i, (cid, cname, desc) in enumerate(required + optional)]
+    return {
+        "id": decoder_id, "name": name, "long_name": long_name,
+        "channels": [c[0] for c in required], "optional_channels": [c[0] for c in optional],
+        "channel_info": info,
+    }
+
+
+_BIT_CHARS = bytes([0x30] + [0x31] * 255)  # sample byte → b"0" / b"1"
+
+
+def _rate_string(rate: int) -> str:
+    """``sr_samplerate_string``: ``1 MHz``, ``250 kHz``, ``2.5 GHz``."""
+    for unit, suffix in ((1_000_000_000, "GHz"), (1_000_000, "MHz"), (1_000, "kHz")):
+        if rate >= unit:
+            return f"{rate / unit:g} {suffix}"
+    return f"{rate} Hz"
+
+
+def _pack(data: bytes, msb_first: bool) -> bytes:
+    """Pack one byte per sample into bytes of 8 samples (zero-padded)."""
+    n = len(data)
+    if not n:
+        return b""
+    nbytes = (n + 7) // 8
+    bits = data.translate(_BIT_CHARS)
+    if msb_first:
+        return int(bits + b"0" * (nbytes * 8 - n), 2).to_bytes(nbytes, "big")
+    return int(bits[::-1], 2).to_bytes(nbytes, "little")
+
+
+def _render_export(fmt: str, data: bytes, name: str, rate: int) -> bytes:
+    """One logic channel in the layout of PXView's *fmt* export."""
+    if fmt == "binary":
+        return _pack(data, msb_first=False)  # first sample in the LSB
+    if fmt == "csv":
+        body = bytearray(b"\n" * (2 * len(data)))
+        body[0::2] = data.translate(_BIT_CHARS)
+        return (f"; CSV generated by FakePXViewServer\n; Channels (1/1): {name}\n"
+                f"; Samplerate: {_rate_string(rate)}\n{name}\n").encode() + bytes(body)
+    if fmt == "vcd":
+        if rate > 1_000_000:
+            period, unit = 1_000_000_000, "ns"
+        elif rate > 1_000:
+            period, unit = 1_000_000, "us"
+        else:
+            period, unit = 1_000, "ms"
+        out = ["$version FakePXViewServer $end\n"
+               f"$comment\n  Acquisition with 1/1 channels at {_rate_string(rate)}\n$end\n"
+               f"$timescale 1 {unit} $end\n$scope module libsigrok $end\n"
+               f"$var wire 1 ! {name} $end\n$upscope $end\n$enddefinitions $end\n"]
+        pos, last = 0, -1
+        while pos < len(data):
+            if last >= 0:
+                pos = data.find(b"\x00" if last else b"\x01", pos)
+                if pos < 0:
+                    break
+            last = 1 if data[pos] else 0
+            out.append(f"#{pos * period // rate} {last}!\n")
+            pos += 1
+        out.append(f"#{len(data) * period // rate}\n")
+        return "".join(out).encode()
+    # bits / hex: "name:" lines of 64 samples; hex is MSB-first
+    out = [f"FakePXViewServer\nAcquisition with 1/1 channels at {_rate_string(rate)}\n"]
+    for off in range(0, len(data), 64):
+        chunk = data[off:off + 64]
+        if fmt == "bits":
+            bits = chunk.translate(_BIT_CHARS).decode()
+            line = " ".join(bits[i:i + 8] for i in range(0, len(bits), 8))
+        else:
+            line = _pack(chunk, msb_first=True).hex(" ")
+        out.append(f"{name}:{line}\n")
+    return "".join(out).encode()
+
+
+# ======================================================================
+# MCP HTTP transport
+# ======================================================================
+
+class _HttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakePXViewServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.startswith(BLOB_PATH):
+            self._send_blob(self.path[len(BLOB_PATH):])
+            return
+        self._send(405, json.dumps({"jsonrpc": "2.0", "id": None, "error": {
+            "code": -32600, "message": "Method not allowed, use POST"}}).encode())
+
+    def _send_blob(self, blob_id: str) -> None:
+        failure = self.fake._take_failure("blob", False)
+        if failure is not None and failure.kind == "http":
+            self._send(503, b"")
+            return
+        data = self.fake.blob(blob_id)
+        if data is None or (failure is not None and failure.kind in ("tool", "rpc")):
+            self._send(404, b"Blob not found or expired", "text/plain")
+            return
+        status, first, last = 200, 0, len(data) - 1
+        header = self.headers.get("Range")
+        if header:
+            m = _RANGE_RE.match(header.strip())
+            if m and (m.group(1) or m.group(2)):
+                if m.group(1):
+                    first = int(m.group(1))
+                    last = min(int(m.group(2)), last) if m.group(2) else last
+                else:
+                    first = max(0, len(data) - int(m.group(2)))
+            if not m or not (m.group(1) or m.group(2)) or first >= len(data) or last < first:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.send_header("Content-Length", "0")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                return
+            status = 206
+        body = data[first:last + 1]
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {first}-{last}/{len(data)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        if failure is not None and failure.kind == "drop":
+            self._write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        self._write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            req = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._reply({}, {"error": {"code": -32700, "message": "Parse error"}})
+            return
+        method = req.get("method", "")
+        is_tool = method == "tools/call"
+        target = (req.get("params") or {}).get("name", "") if is_tool else method
+        failure = self.fake._take_failure(target, is_tool)
+        if failure is not None:
+            self._fail(req, failure)
+            return
+        if is_tool and target == "wait_capture":
+            self._sse_wait_capture(req)
+            return
+        payload = self.fake.handle(req)
+        if payload is None:
+            self._send(204, b"")
+            return
+        self._reply(req, payload)
+
+    def _fail(self, req: dict, failure: _Failure) -> None:
+        if failure.kind == "drop":
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+        elif failure.kind == "http":
+            self._send(503, b"")
+        elif failure.kind == "rpc":
+            self._reply(req, {"error": {"code": failure.code, "message": failure.message}})
+        else:
+            self._reply(req, {"result": _error_result(failure.message)})
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json",
+              content_encoding: Optional[str] = None) -> None:
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", content_type)
+        if content_encoding:
+            self.send_header("Content-Encoding", content_encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self._write(body)
+        self.close_connection = True
+
+    def _write(self, body: bytes) -> None:
+        """Write *body*, paced to ``link_bandwidth`` when one is set."""
+        bandwidth = self.fake.link_bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        chunk = max(1, int(bandwidth / 100))  # ~10 ms per write
+        t0 = time.perf_counter()
+        for offset in range(0, len(body), chunk):
+            self.wfile.write(body[offset:offset + chunk])
+            delay = t0 + (offset + chunk) / bandwidth - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _reply(self, req: dict, payload: dict) -> None:
+        payload = dict(payload, jsonrpc="2.0", id=req.get("id"))
+        body = json.dumps(payload).encode("utf-8")
+        encoding = None
+        threshold = self.fake.compress_min_bytes
+        if threshold and len(body) >= threshold:
+            encoding = _negotiate_encoding(self.headers.get("Accept-Encoding", ""))
+            if encoding == "gzip":
+                body = gzip.compress(body, compresslevel=6)
+            elif encoding == "deflate":
+                body = zlib.compress(body, 6)
+        self._send(200, body, content_encoding=encoding)
+
+    def _sse_event(self, event: str, data: dict) -> None:
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _sse_wait_capture(self, req: dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def progress(elapsed: float) -> None:
+            self._sse_event("progress", {"status": "capturing",
+                                         "elapsed_seconds": round(elapsed, 3)})
+
+        args = (req.get("params") or {}).get("arguments") or {}
+        fake = self.fake
+        with fake._lock:
+            fake.calls.append(("wait_capture", args))
+            delay = fake._tool_latency.get("wait_capture", fake.latency)
+        progress(0.0)
+        if delay:
+            time.sleep(delay)
+        timeout_s = float(args["timeoutMs"]) / 1000.0 if "timeoutMs" in args \
+            else float(args.get("timeoutSeconds", 300.0))
+        try:
+            with fake._lock:
+                fake._require_session()
+            fake.wait_capture(timeout_s, on_progress=progress)
+            meta = (req.get("params") or {}).get("_meta") or {}
+            result = _tool_result({"completed": True}, bool(meta.get("pxview/structuredOnly")))
+        except _ToolError as exc:
+            result = _error_result(str(exc))
+        self._sse_event("result", {"jsonrpc": "2.0", "id": req.get("id"), "result": result})
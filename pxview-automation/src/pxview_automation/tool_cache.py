@@ -0,0 +1,202 @@
+"""Result cache for read-only MCP tools.
+
+Helpers and scripts ask for the same slowly-changing state over and
+over: ``get_demo_device`` and ``get_hardware_device`` each re-list the
+devices, capture loops re-read the channel list every iteration.
+:class:`ToolCache` keeps the results of selected read-only tools for a
+per-tool TTL and coalesces identical concurrent calls into one request::
+
+    from pxview_automation import McpClient, ToolCache
+
+    client = McpClient(tool_cache=ToolCache())
+    client.connect()
+    client.get_devices()          # request
+    client.get_devices()          # served from memory for 2 s
+
+Entries are keyed by tool name and arguments.  :meth:`ToolCache.invalidate`
+starts a new generation, so a call that was in flight when the state
+changed is returned to its caller but not stored.  :class:`McpClient`
+invalidates on every tool that is not annotated ``readOnlyHint`` (and on
+``refresh_device_list`` / ``wait_capture``), on reconnects, and on
+``DeviceListUpdated``, ``DeviceConfigChanged`` and related service events
+when the WebSocket transport is reachable.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from .exceptions import ConfigError
+from .types import ServiceEvent
+
+# Seconds each tool's result is reused by default.  The decoder catalogue
+# only changes with a PXView restart; session status tracks a running
+# capture, so it is kept just long enough to absorb bursts.
+DEFAULT_TTLS: Dict[str, float] = {
+    "get_devices": 2.0,
+    "get_channels": 2.0,
+    "get_work_mode": 2.0,
+    "get_supported_work_modes": 10.0,
+    "get_session_status": 0.5,
+    "get_active_decoders": 2.0,
+    "list_sessions": 2.0,
+    "list_analyzers": 60.0,
+    "get_analyzer_options": 60.0,
+}
+
+# Service event → tools whose cached results it makes stale (None = all).
+INVALIDATING_EVENTS: Dict[ServiceEvent, Optional[Tuple[str, ...]]] = {
+    ServiceEvent.DEVICE_LIST_UPDATED: ("get_devices",),
+    ServiceEvent.NEW_USB_DEVICE: ("get_devices",),
+    ServiceEvent.DEVICE_DETACHED: None,
+    ServiceEvent.DEVICE_CONFIG_CHANGED: None,
+    ServiceEvent.DEVICE_MODE_CHANGED: None,
+    ServiceEvent.CHANNEL_CONFIG_CHANGED: ("get_channels",),
+    ServiceEvent.SAMPLE_CONFIG_CHANGED: ("get_session_status",),
+    ServiceEvent.DECODER_ADDED: ("get_active_decoders",),
+    ServiceEvent.DECODER_REMOVED: ("get_active_decoders",),
+}
+
+
+class _Flight:
+    """One in-progress call that identical callers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ToolCache:
+    """Thread-safe TTL cache with single-flight calls, keyed by tool + arguments.
+
+    Args:
+        ttls:      Seconds to keep each tool's result; tools not listed
+                   are never cached.  Defaults to :data:`DEFAULT_TTLS`.
+        max_entries: Upper bound on cached results (oldest dropped first).
+
+    Attributes:
+        hits:          Calls answered from memory.
+        misses:        Calls sent to the server.
+        coalesced:     Calls that waited for an identical in-flight call
+                       instead of sending their own.
+        invalidations: Times the cache was (partly) cleared.
+
+    Cached values are deep-copied on the way in and out, so callers may
+    modify what they get back.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024):
+        ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        if any(t <= 0 for t in ttls.values()) or max_entries <= 0:
+            raise ConfigError("TTLs and max_entries must be positive")
+        self.ttls = ttls
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        # key → (expiry, value); insertion order = age.
+        self._entries: Dict[Tuple[str, Hashable], Tuple[float, Any]] = {}
+        # (key, generation) → call in progress.  Keying by generation
+        # keeps callers arriving after an invalidation off older calls.
+        self._inflight: Dict[Tuple[Tuple[str, Hashable], int], _Flight] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"ToolCache(tools={len(self.ttls)}, entries={len(self._entries)})"
+
+    def caches(self, tool: str) -> bool:
+        """True if results of *tool* are cached."""
+        return tool in self.ttls
+
+    def stats(self) -> dict:
+        """Counters and occupancy as a plain dict."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "generation": self._generation,
+            }
+
+    def invalidate(self, tools: Optional[Iterable[str]] = None) -> None:
+        """Drop cached results of *tools* (all when None).
+
+        In-flight calls still answer their callers but are not stored.
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if tools is None:
+                self._entries.clear()
+                return
+            names = set(tools)
+            for key in [k for k in self._entries if k[0] in names]:
+                del self._entries[key]
+
+    def call(self, tool: str, arguments: Optional[dict], fetch: Callable[[], Any]) -> Any:
+        """Return *tool*'s cached result for *arguments*, or ``fetch()`` it.
+
+        Concurrent calls with the same tool and arguments share a single
+        ``fetch()``; its exception, if any, is raised in every caller and
+        nothing is cached.
+        """
+        ttl = self.ttls.get(tool)
+        if ttl is None:
+            return fetch()
+        key = (tool, _args_key(arguments))
+        leader = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self.hits += 1
+                    return copy.deepcopy(entry[1])
+                del self._entries[key]
+            gen = self._generation
+            flight = self._inflight.get((key, gen))
+            if flight is not None:
+                self.coalesced += 1
+            else:
+                flight = self._inflight[(key, gen)] = _Flight()
+                self.misses += 1
+                leader = True
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            value = fetch()
+            # Snapshot shared by waiting callers and the cache entry;
+            # both hand out copies, so the leader may keep *value*.
+            flight.result = copy.deepcopy(value)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[(key, gen)]
+                if flight.error is None and gen == self._generation:
+                    self._entries[key] = (time.monotonic() + ttl, flight.result)
+                    while len(self._entries) > self.max_entries:
+                        del self._entries[next(iter(self._entries))]
+            flight.done.set()
+        return value
+
+
+def _args_key(arguments: Optional[dict]) -> Hashable:
+    if not arguments:
+        return ""
+    return json.dumps(arguments, sort_keys=True, default=str)
@@ -29,9 +29,10 @@ low-level :class:`~pxview_automation.client.McpClient` via
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 
 # ======================================================================
@@ -118,6 +119,66 @@ class CouplingType(Enum):
     GND = 2
 
 
+class ServiceEvent(Enum):
+    """Service event pushed over the WebSocket transport.
+
+    Values mirror ``pv::api::ServiceEvent`` in PXView.  The
+    :attr:`event_name` form (``'CaptureStateChanged'``) is accepted
+    wherever an event is expected.
+    """
+
+    CAPTURE_STATE_CHANGED = 100
+    DATA_UPDATED = 101
+    TRIGGER_RECEIVED = 102
+    FRAME_BEGAN = 103
+    FRAME_ENDED = 104
+    CAPTURE_PROGRESS = 105
+    DEVICE_LIST_UPDATED = 200
+    DEVICE_MODE_CHANGED = 201
+    DEVICE_CONFIG_CHANGED = 202
+    DEVICE_DETACHED = 203
+    NEW_USB_DEVICE = 204
+    GLITCH_FILTER_STARTED = 300
+    GLITCH_FILTER_PROGRESS = 301
+    GLITCH_FILTER_COMPLETED = 302
+    GLITCH_FILTER_CLEARED = 303
+    SIGNAL_INVERT_STARTED = 304
+    SIGNAL_INVERT_COMPLETED = 305
+    SIGNAL_INVERT_CLEARED = 306
+    DECODE_DONE = 400
+    DECODER_ADDED = 401
+    DECODER_REMOVED = 402
+    DECODE_PROGRESS = 403
+    SAMPLE_CONFIG_CHANGED = 450
+    CHANNEL_CONFIG_CHANGED = 451
+    TRIGGER_CONFIG_CHANGED = 452
+    SAVE_COMPLETE = 500
+    LOAD_COMPLETE = 501
+    EXPORT_COMPLETE = 502
+    SIGNALS_CHANGED = 600
+    VIEW_SHOW_REGION = 700
+    VIEW_ZOOM_FIT = 701
+    VIEW_ZOOM_IN = 702
+    VIEW_ZOOM_OUT = 703
+    VIEW_CURSOR_ADDED = 704
+    VIEW_CURSOR_REMOVED = 705
+    VIEW_CURSORS_CLEARED = 706
+    ERROR_OCCURRED = 900
+
+    @property
+    def event_name(self) -> str:
+        """C++ enumerator name, e.g. ``'CaptureStateChanged'``."""
+        return "".join(part.capitalize() for part in self.name.split("_"))
+
+    @classmethod
+    def from_name(cls, name: str) -> "ServiceEvent":
+        """Look up an event by C++ name (``'DecodeDone'``) or member name."""
+        for member in cls:
+            if name in (member.event_name, member.name):
+                return member
+        raise ValueError(f"Unknown service event: {name!r}")
+
+
 # ======================================================================
 # Glitch filter
 # ======================================================================
@@ -518,6 +579,439 @@ class SampleConfig:
         )
 
 
+@dataclass
+class DeviceProfile:
+    """Declarative device settings applied by :meth:`PXView.apply_profile`.
+
+    Every field left at None (or empty, for the per-channel maps) is not
+    touched, so a profile only needs to name the settings it cares about.
+
+    Args:
+        work_mode:      0=Logic, 1=DSO, 2=Analog, 3=MSO; switched first.
+        sample_rate:    Sample rate in Hz.
+        sample_limit:   Sample count limit.
+        time_base:      DSO time base.
+        collect_mode:   Collect mode code as used by ``set_sample_config``.
+        repeat_interval: Repeat-mode interval in seconds.
+        channels:       Channel index → enabled.
+        channel_names:  Channel index → display name.
+        trigger:        :meth:`McpClient.configure_trigger` keyword
+                        arguments (``stage_count``, ``config_json`` or
+                        ``source``, ``slope``, ``horiz_pos``, ...).
+        probes:         Channel index → :class:`ProbeConfig`.
+        glitch_filter:  Channel index → minimum pulse width in samples,
+                        or ``(threshold, mode)``; ``{}`` clears the
+                        filter, None leaves it.
+        signal_invert:  Channel index → inverted; ``{}`` clears, None
+                        leaves it.
+        config:         SR_CONF_* key → ``(type, value)`` for
+                        :meth:`McpClient.set_config`.
+    """
+
+    work_mode: Optional[int] = None
+    sample_rate: Optional[int] = None
+    sample_limit: Optional[int] = None
+    time_base: Optional[int] = None
+    collect_mode: Optional[int] = None
+    repeat_interval: Optional[float] = None
+    channels: Dict[int, bool] = field(default_factory=dict)
+    channel_names: Dict[int, str] = field(default_factory=dict)
+    trigger: Dict[str, Any] = field(default_factory=dict)
+    probes: Dict[int, ProbeConfig] = field(default_factory=dict)
+    glitch_filter: Optional[Dict[int, Any]] = None
+    signal_invert: Optional[Dict[int, bool]] = None
+    config: Dict[int, Tuple[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        """JSON-friendly dict of the fields that are set."""
+        d: dict = {}
+        for name in ("work_mode", "sample_rate", "sample_limit", "time_base",
+                     "collect_mode", "repeat_interval"):
+            if getattr(self, name) is not None:
+                d[name] = getattr(self, name)
+        for name in ("channels", "channel_names", "glitch_filter", "signal_invert"):
+            value = getattr(self, name)
+            # {} is meaningful (clear) for the optional maps.
+            if value or (value is not None and name in ("glitch_filter", "signal_invert")):
+                d[name] = {str(k): list(v) if isinstance(v, tuple) else v
+                           for k, v in value.items()}
+        if self.trigger:
+            d["trigger"] = dict(self.trigger)
+        if self.probes:
+            d["probes"] = {
+                str(ch): {k: v for k, v in (("vdiv", p.vdiv),
+                                            ("coupling", p.coupling.value if p.coupling else None),
+                                            ("vfactor", p.vfactor),
+                                            ("map_default", p.map_default)) if v is not None}
+                for ch, p in self.probes.items()
+            }
+        if self.config:
+            d["config"] = {str(k): list(v) for k, v in self.config.items()}
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "DeviceProfile":
+        def by_channel(name: str) -> Optional[dict]:
+            value = d.get(name)
+            return None if value is None else {int(k): v for k, v in value.items()}
+
+        glitch = by_channel("glitch_filter")
+        return cls(
+            work_mode=d.get("work_mode"),
+            sample_rate=d.get("sample_rate"),
+            sample_limit=d.get("sample_limit"),
+            time_base=d.get("time_base"),
+            collect_mode=d.get("collect_mode"),
+            repeat_interval=d.get("repeat_interval"),
+            channels=by_channel("channels") or {},
+            channel_names=by_channel("channel_names") or {},
+            trigger=dict(d.get("trigger") or {}),
+            probes={int(k): ProbeConfig.from_dict(v) for k, v in (d.get("probes") or {}).items()},
+            glitch_filter=None if glitch is None else {
+                k: tuple(v) if isinstance(v, list) else v for k, v in glitch.items()},
+            signal_invert=by_channel("signal_invert"),
+            config={int(k): (v[0], v[1]) for k, v in (d.get("config") or {}).items()},
+        )
+
+
+# ======================================================================
+# Sample data
+# ======================================================================
+
+
+@dataclass
+class SampleBatch:
+    """Samples of several channels read in one operation.
+
+    Returned by :meth:`McpClient.get_samples_many`.
+
+    Attributes:
+        channel_type:    ``'logic'``, ``'analog'`` or ``'dso'``.
+        start_sample:    First sample of every channel.
+        data:            Channel index → samples (``bytes`` for logic,
+                         list of floats otherwise), in request order.
+        elapsed_seconds: Wall time of the whole read.
+        requests:        Number of ``get_samples`` requests issued.
+    """
+
+    channel_type: str = "logic"
+    start_sample: int = 0
+    data: Dict[int, Any] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    requests: int = 0
+
+    @property
+    def sample_count(self) -> int:
+        """Total samples across all channels."""
+        return sum(len(v) for v in self.data.values())
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.sample_count / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def throughput_mbps(self) -> float:
+        """Decoded MB/s (1 byte per logic sample, 4 per analog/DSO sample)."""
+        width = 1 if self.channel_type == "logic" else 4
+        return self.samples_per_second * width / 1e6
+
+
+# ======================================================================
+# Decoded annotations
+# ======================================================================
+
+
+class AnnotationRow:
+    """Lazy view of one row of an :class:`AnnotationTable`.
+
+    Fields that were not requested (see ``fields=`` of
+    :meth:`McpClient.get_analyzer_results`) read as ``None``.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "AnnotationTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def start_sample(self) -> Optional[int]:
+        col = self._table.start_sample
+        return col[self._index] if col is not None else None
+
+    @property
+    def end_sample(self) -> Optional[int]:
+        col = self._table.end_sample
+        return col[self._index] if col is not None else None
+
+    @property
+    def ann_class(self) -> Optional[int]:
+        col = self._table.ann_class
+        return col[self._index] if col is not None else None
+
+    @property
+    def texts(self) -> Optional[List[str]]:
+        ids = self._table.text_ids
+        if ids is None:
+            return None
+        table = self._table.text_table
+        return [table[i] for i in ids[self._index]]
+
+    @property
+    def numeric(self) -> Optional[bool]:
+        col = self._table.numeric
+        return bool(col[self._index]) if col is not None else None
+
+    def to_dict(self) -> dict:
+        """The row as a ``format="rows"`` annotation dict."""
+        row = {name: getattr(self, name) for name in self._table.fields}
+        if not row.get("numeric", True):
+            del row["numeric"]  # rows only carry the flag when it is set
+        return row
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, AnnotationRow):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"AnnotationRow({self.to_dict()!r})"
+
+
+class AnnotationTable:
+    """Decoded annotations held column by column.
+
+    Returned by :meth:`McpClient.get_analyzer_results` with
+    ``format="columnar"``.  Sample positions are stored in ``array('q')``
+    columns and texts as indices into a shared :attr:`text_table`;
+    indexing or iterating yields :class:`AnnotationRow` views instead of
+    building a dict per annotation.
+
+    Attributes:
+        start_sample: Start sample of each row (``None`` if not requested).
+        end_sample:   End sample of each row (``None`` if not requested).
+        ann_class:    Annotation class of each row (``None`` if not requested).
+        text_ids:     Per row, indices into :attr:`text_table`.
+        text_table:   Distinct annotation texts.
+        numeric:      Per row, 1 if the texts hold a decoder value (the
+                      annotations ``radixType`` reformats).
+        metadata:     ``metadata`` of the result (``includeMetadata``).
+    """
+
+    _FIELDS = ("start_sample", "end_sample", "ann_class", "texts", "numeric")
+
+    def __init__(self, fields: Sequence[str] = _FIELDS):
+        self.fields = [f for f in self._FIELDS if f in fields]
+        self.start_sample: Optional[array] = array("q") if "start_sample" in fields else None
+        self.end_sample: Optional[array] = array("q") if "end_sample" in fields else None
+        self.ann_class: Optional[array] = array("i") if "ann_class" in fields else None
+        self.text_ids: Optional[List[List[int]]] = [] if "texts" in fields else None
+        self.numeric: Optional[array] = array("b") if "numeric" in fields else None
+        self.text_table: List[str] = []
+        self.metadata: Dict[str, Any] = {}
+        self._count = 0
+        self._text_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_columnar(cls, result: dict) -> "AnnotationTable":
+        """Build a table from a ``format="columnar"`` tool result."""
+        table = cls(list(result.get("columns", {})))
+        table.extend(result)
+        return table
+
+    def extend(self, page: Union[dict, "AnnotationTable"]) -> None:
+        """Append the rows of another page (a columnar result or a table).
+
+        Raises:
+            ValueError: if the page does not carry the same fields.
+        """
+        if isinstance(page, AnnotationTable):
+            columns: Dict[str, Any] = {
+                "start_sample": page.start_sample, "end_sample": page.end_sample,
+                "ann_class": page.ann_class, "texts": page.text_ids, "numeric": page.numeric}
+            encoding: Dict[str, str] = {}
+            names, count, text_table = page.fields, len(page), page.text_table
+        else:
+            columns = page.get("columns", {})
+            encoding = page.get("encoding", {})
+            names = [f for f in self._FIELDS if f in columns]
+            count, text_table = int(page.get("count", 0)), page.get("text_table", [])
+            if isinstance(page.get("metadata"), dict):
+                self.metadata = page["metadata"]
+        if names != self.fields:
+            raise ValueError(f"page has fields {names}, table has {self.fields}")
+        for name in ("start_sample", "end_sample"):
+            col = getattr(self, name)
+            if col is None:
+                continue
+            if encoding.get(name) == "delta":
+                value = 0
+                for delta in columns[name]:
+                    value += delta
+                    col.append(value)
+            else:
+                col.extend(columns[name])
+        if self.ann_class is not None:
+            self.ann_class.extend(columns["ann_class"])
+        if self.numeric is not None:
+            self.numeric.extend(map(bool, columns["numeric"]))
+        if self.text_ids is not None:
+            remap = [self._intern(t) for t in text_table]
+            self.text_ids.extend([remap[i] for i in ids] for ids in columns["texts"])
+        self._count += count
+
+    def _intern(self, text: str) -> int:
+        i = self._text_index.get(text)
+        if i is None:
+            i = self._text_index[text] = len(self.text_table)
+            self.text_table.append(text)
+        return i
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> AnnotationRow:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("annotation index out of range")
+        return AnnotationRow(self, index)
+
+    def __iter__(self) -> Iterator[AnnotationRow]:
+        for i in range(self._count):
+            yield AnnotationRow(self, i)
+
+    def to_dicts(self) -> List[dict]:
+        """All rows as ``format="rows"`` annotation dicts."""
+        return [row.to_dict() for row in self]
+
+    def __repr__(self) -> str:
+        return (f"AnnotationTable({self._count} rows, fields={self.fields}, "
+                f"{len(self.text_table)} distinct texts)")
+
+
+@dataclass
+class AnnotationDelta:
+    """Annotations yielded by :meth:`McpClient.follow_analyzer`.
+
+    Attributes:
+        annotations: Annotation dicts appended since the previous delta.
+        version:     Annotation version after this delta; pass it as
+                     ``since_version`` to resume following later.
+        reset:       The decode started over (e.g. the next capture in
+                     repeat mode) or the previous version had expired:
+                     *annotations* start from the beginning and anything
+                     received before is stale.
+    """
+
+    annotations: List[dict] = field(default_factory=list)
+    version: int = 0
+    reset: bool = False
+
+
+@dataclass
+class ProfileResult:
+    """Outcome of :meth:`PXView.apply_profile`.
+
+    Attributes:
+        changes: Setting name (``'sample_rate'``, ``'channel[3].enabled'``,
+                 ``'trigger.stage_count'``, ...) → ``(old, new)`` for
+                 every setting that was written.
+        reads:   Tool calls spent reading the current state.
+        writes:  Tool calls spent applying changes.
+        timings: ``'read'`` / ``'write'`` / ``'total'`` → seconds.
+    """
+
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    reads: int = 0
+    writes: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        """True if any setting was written."""
+        return bool(self.changes)
+
+
+@dataclass
+class CaptureSnapshot:
+    """Client-side copy of one capture taken by :class:`CaptureLoop`.
+
+    Attributes:
+        index:       Iteration number, starting at 0.
+        status:      Capture status dict after the capture stopped.
+        sample_rate: Sample rate in Hz.
+        samples:     Channel index → logic samples (one byte per sample).
+        annotations: Analyzer instance ID → annotation dicts.
+        saved_path:  Server-side ``.pxc`` path, if the capture was saved.
+        timings:     Stage name → seconds spent on this capture.
+    """
+
+    index: int = 0
+    status: Dict[str, Any] = field(default_factory=dict)
+    sample_rate: int = 0
+    samples: Dict[int, bytes] = field(default_factory=dict)
+    annotations: Dict[str, List[dict]] = field(default_factory=dict)
+    saved_path: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def sample_count(self) -> int:
+        """Samples per channel (0 when samples were not read)."""
+        return max((len(v) for v in self.samples.values()), default=0)
+
+
+@dataclass
+class StreamStats:
+    """Progress of a stream capture read by :meth:`PXView.stream_capture`.
+
+    Attributes:
+        samples:                Samples per channel delivered to the sink.
+        read_samples:           Samples per channel read from the server.
+        server_samples:         Sample count last reported by a
+                                ``DataUpdated`` event (0 if none).
+        reads:                  ``get_samples`` requests issued.
+        elapsed_seconds:        Wall time since streaming started.
+        queue_depth:            Chunks read but not yet written to the sink.
+        max_queue_depth:        Highest *queue_depth* seen.
+        backpressure_seconds:   Time the reader waited for the sink.
+        caught_up:              The last read returned less than a full
+                                chunk (the reader is at the live edge).
+        disk_write_speed_mbps:  Server disk cache write speed.
+        disk_write_queue_depth: Server disk cache write queue depth.
+        disk_full:              Server disk cache reported a full disk.
+        stop_reason:            Why streaming ended: ``'stop'``,
+                                ``'duration'``, ``'max_samples'``,
+                                ``'capture'`` (stopped by the server),
+                                ``'disk_full'`` or ``'error'``.
+    """
+
+    samples: int = 0
+    read_samples: int = 0
+    server_samples: int = 0
+    reads: int = 0
+    elapsed_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    backpressure_seconds: float = 0.0
+    caught_up: bool = False
+    disk_write_speed_mbps: float = 0.0
+    disk_write_queue_depth: int = 0
+    disk_full: bool = False
+    stop_reason: str = ""
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def lag_samples(self) -> int:
+        """Samples acquired by the server but not yet in the sink (best known)."""
+        return max(self.server_samples, self.read_samples) - self.samples
+
+
 # ======================================================================
 # Capture status
 # ======================================================================
@@ -0,0 +1,546 @@
+"""Live viewport streaming over PXView's WebSocket transport.
+
+PXView's WebSocket transport (``--ws-port``, default 10430) lets a
+client subscribe to a *viewport* — a sample range rendered at a given
+pixel width — and pushes data for it at ~30 fps.  Waveform data is
+sent as compact binary frames (see ``pv/api/binary_codec.h``):
+
+=========  ===================  ==========================================
+Type       Name                 Payload
+=========  ===================  ==========================================
+``0x01``   Logic edges          ``start_sample`` + per channel: edge count,
+                                then (varint position, uint8 level) pairs
+``0x02``   Analog envelope      ``start_sample`` + per channel: scale,
+                                length, interleaved float32 min/max pairs
+``0x06``   Viewport reset       ``start_sample``, ``end_sample``, width
+=========  ===================  ==========================================
+
+:class:`ViewportStream` subscribes, decodes those frames and hands them
+out through an iterator or registered callbacks.  Between data frames
+the server sends ``viewport_tick`` notifications, which are delivered
+as :class:`ViewportTick` objects.
+
+Typical usage::
+
+    from pxview_automation import ViewportFrame, ViewportStream
+
+    with ViewportStream(channels=[0, 1], end_sample=1_000_000, width=1920) as vs:
+        for item in vs:
+            if isinstance(item, ViewportFrame):
+                for ch, edges in item.edges.items():
+                    plot(ch, edges.positions, edges.levels)
+
+Decoded frames reuse their buffers: the :class:`ViewportFrame` yielded
+for a given frame type is the same object every time and is only valid
+until the next frame arrives.  Copy what you need to keep.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import struct
+import sys
+import threading
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from ._ws import OPCODE_BINARY, OPCODE_CLOSE, OPCODE_TEXT, WebSocket
+from .exceptions import McpError
+
+FRAME_LOGIC_EDGES = 0x01
+FRAME_ANALOG_ENVELOPE = 0x02
+FRAME_VIEWPORT_RESET = 0x06
+
+_HEADER = struct.Struct("<BHxI")
+_U64 = struct.Struct("<Q")
+_U16 = struct.Struct("<H")
+_ENVELOPE_HEAD = struct.Struct("<II")
+_RESET = struct.Struct("<QQi")
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+# ======================================================================
+# Decoded frame containers
+# ======================================================================
+
+class ChannelEdges:
+    """Logic edges of one channel in a ``LogicEdges`` frame.
+
+    Attributes:
+        channel:   Channel index.
+        positions: Absolute sample position of each edge (``array('Q')``).
+        levels:    Signal level after each edge, 0 or 1 (``bytearray``).
+    """
+
+    __slots__ = ("channel", "positions", "levels")
+
+    def __init__(self, channel: int):
+        self.channel = channel
+        self.positions = array("Q")
+        self.levels = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __repr__(self) -> str:
+        return f"ChannelEdges(channel={self.channel}, edges={len(self.positions)})"
+
+
+class ChannelEnvelope:
+    """Min/max envelope of one channel in an ``AnalogEnvelope`` frame.
+
+    Attributes:
+        channel: Channel index.
+        scale:   Samples covered by each min/max pair.
+        values:  Interleaved ``min, max, min, max, ...`` (``array('f')``).
+    """
+
+    __slots__ = ("channel", "scale", "values")
+
+    def __init__(self, channel: int):
+        self.channel = channel
+        self.scale = 0
+        self.values = array("f")
+
+    def __len__(self) -> int:
+        return len(self.values) // 2
+
+    @property
+    def mins(self) -> array:
+        """Minimum of each pair (a copy)."""
+        return self.values[0::2]
+
+    @property
+    def maxs(self) -> array:
+        """Maximum of each pair (a copy)."""
+        return self.values[1::2]
+
+    def __repr__(self) -> str:
+        return (
+            f"ChannelEnvelope(channel={self.channel}, scale={self.scale}, "
+            f"pairs={len(self)})"
+        )
+
+
+@dataclass
+class ViewportFrame:
+    """A decoded binary viewport frame.
+
+    Only the fields relevant to :attr:`frame_type` are meaningful:
+    ``edges`` for logic frames, ``envelopes`` for analog frames and
+    ``end_sample`` / ``width`` for viewport resets.
+    """
+
+    frame_type: int
+    signal_mask: int = 0
+    timestamp_ms: int = 0
+    start_sample: int = 0
+    end_sample: int = 0
+    width: int = 0
+    edges: Dict[int, ChannelEdges] = field(default_factory=dict)
+    envelopes: Dict[int, ChannelEnvelope] = field(default_factory=dict)
+
+    @property
+    def channels(self) -> List[int]:
+        """Channel indices present in this frame (from the signal mask)."""
+        return [ch for ch in range(16) if self.signal_mask & (1 << ch)]
+
+
+@dataclass
+class ViewportTick:
+    """A ``viewport_tick`` notification: new data may be available."""
+
+    start_sample: int
+    end_sample: int
+    width: int
+    last_sent_sample: int
+    version: int = 0
+    timestamp_ms: int = 0
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ViewportTick":
+        params = d.get("params", {})
+        return cls(
+            start_sample=params.get("start_sample", 0),
+            end_sample=params.get("end_sample", 0),
+            width=params.get("width", 0),
+            last_sent_sample=params.get("last_sent_sample", 0),
+            version=d.get("version", 0),
+            timestamp_ms=d.get("timestamp", 0),
+        )
+
+
+# ======================================================================
+# Frame decoder
+# ======================================================================
+
+def _resize(arr: array, n: int) -> None:
+    """Resize *arr* to *n* items, keeping existing storage when possible."""
+    current = len(arr)
+    if current > n:
+        del arr[n:]
+    elif current < n:
+        arr.frombytes(bytes((n - current) * arr.itemsize))
+
+
+class FrameDecoder:
+    """Decode PXView binary viewport frames into reusable buffers.
+
+    One :class:`ViewportFrame` is kept per frame type and per-channel
+    buffers are kept across frames, so steady-state decoding does not
+    allocate new containers.
+    """
+
+    def __init__(self) -> None:
+        self._frames: Dict[int, ViewportFrame] = {}
+        self._edges: Dict[int, ChannelEdges] = {}
+        self._envelopes: Dict[int, ChannelEnvelope] = {}
+
+    def _frame(self, frame_type: int) -> ViewportFrame:
+        frame = self._frames.get(frame_type)
+        if frame is None:
+            frame = self._frames[frame_type] = ViewportFrame(frame_type)
+        return frame
+
+    def decode(self, data: bytes) -> ViewportFrame:
+        """Decode one binary frame.
+
+        Raises:
+            McpError: if the frame is truncated or of an unsupported type.
+        """
+        if len(data) < _HEADER.size:
+            raise McpError(f"Viewport frame too short ({len(data)} bytes)")
+        frame_type, mask, ts = _HEADER.unpack_from(data, 0)
+        try:
+            if frame_type == FRAME_LOGIC_EDGES:
+                frame = self._decode_logic(data, mask)
+            elif frame_type == FRAME_ANALOG_ENVELOPE:
+                frame = self._decode_envelope(data, mask)
+            elif frame_type == FRAME_VIEWPORT_RESET:
+                frame = self._frame(frame_type)
+                frame.start_sample, frame.end_sample, frame.width = _RESET.unpack_from(
+                    data, _HEADER.size
+                )
+            else:
+                raise McpError(f"Unsupported viewport frame type 0x{frame_type:02x}")
+        except (IndexError, struct.error) as exc:
+            raise McpError(
+                f"Truncated viewport frame (type 0x{frame_type:02x}, {len(data)} bytes)"
+            ) from exc
+        frame.signal_mask = mask
+        frame.timestamp_ms = ts
+        return frame
+
+    def _decode_logic(self, data: bytes, mask: int) -> ViewportFrame:
+        frame = self._frame(FRAME_LOGIC_EDGES)
+        frame.edges.clear()
+        off = _HEADER.size
+        (base,) = _U64.unpack_from(data, off)
+        off += 8
+        frame.start_sample = base
+        for ch in range(16):
+            if not mask & (1 << ch):
+                continue
+            (count,) = _U16.unpack_from(data, off)
+            off += 2
+            buf = self._edges.get(ch)
+            if buf is None:
+                buf = self._edges[ch] = ChannelEdges(ch)
+            positions = buf.positions
+            levels = buf.levels
+            _resize(positions, count)
+            del levels[count:]
+            if len(levels) < count:
+                levels.extend(bytes(count - len(levels)))
+            for i in range(count):
+                value = 0
+                shift = 0
+                while True:
+                    b = data[off]
+                    off += 1
+                    value |= (b & 0x7F) << shift
+                    if b < 0x80:
+                        break
+                    shift += 7
+                positions[i] = base + value
+                levels[i] = data[off]
+                off += 1
+            frame.edges[ch] = buf
+        return frame
+
+    def _decode_envelope(self, data: bytes, mask: int) -> ViewportFrame:
+        frame = self._frame(FRAME_ANALOG_ENVELOPE)
+        frame.envelopes.clear()
+        off = _HEADER.size
+        (frame.start_sample,) = _U64.unpack_from(data, off)
+        off += 8
+        view = memoryview(data)
+        for ch in range(16):
+            if not mask & (1 << ch):
+                continue
+            scale, length = _ENVELOPE_HEAD.unpack_from(data, off)
+            off += 8
+            nbytes = length * 8
+            if off + nbytes > len(data):
+                raise IndexError("envelope payload")
+            buf = self._envelopes.get(ch)
+            if buf is None:
+                buf = self._envelopes[ch] = ChannelEnvelope(ch)
+            buf.scale = scale
+            _resize(buf.values, length * 2)
+            if nbytes:
+                memoryview(buf.values).cast("B")[:] = view[off:off + nbytes]
+                if _BIG_ENDIAN:
+                    buf.values.byteswap()
+            off += nbytes
+            frame.envelopes[ch] = buf
+        return frame
+
+
+# ======================================================================
+# Stream client
+# ======================================================================
+
+ViewportItem = Union[ViewportFrame, ViewportTick]
+
+
+class ViewportStream:
+    """Subscribe to a PXView viewport and receive live waveform frames.
+
+    Args:
+        url:          WebSocket URL of PXView's WS transport.
+        channels:     Channel indices to include in the subscription.
+        start_sample: First sample of the viewport.
+        end_sample:   Last sample of the viewport.
+        width:        Target pixel width (controls envelope decimation).
+        timeout:      Connect / handshake timeout in seconds.
+
+    Iterate the stream to receive :class:`ViewportFrame` and
+    :class:`ViewportTick` objects, or register callbacks with
+    :meth:`on_frame` / :meth:`on_tick` and call :meth:`start` to
+    dispatch from a background thread.
+    """
+
+    def __init__(
+        self,
+        url: str = "ws://127.0.0.1:10430",
+        *,
+        channels: Optional[List[int]] = None,
+        start_sample: int = 0,
+        end_sample: int = 0,
+        width: int = 1000,
+        timeout: float = 10.0,
+    ):
+        self.url = url
+        self.channels = list(channels or [])
+        self.start_sample = start_sample
+        self.end_sample = end_sample
+        self.width = width
+        self.timeout = timeout
+        self.frames_received = 0
+        self.bytes_received = 0
+        self._ws: Optional[WebSocket] = None
+        self._decoder = FrameDecoder()
+        self._request_id = 0
+        self._frame_handlers: List[Callable[[ViewportFrame], None]] = []
+        self._tick_handlers: List[Callable[[ViewportTick], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def __enter__(self) -> "ViewportStream":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        status = "open" if self._ws is not None else "closed"
+        return f"ViewportStream(url={self.url!r}, channels={self.channels}, {status})"
+
+    # ---- Subscription management ----
+
+    def _send(self, method: str, params: Optional[dict] = None) -> int:
+        if self._ws is None:
+            raise McpError("ViewportStream is not open")
+        self._request_id += 1
+        body: dict = {"jsonrpc": "2.0", "id": self._request_id, "method": method}
+        if params is not None:
+            body["params"] = params
+        self._ws.send_text(json.dumps(body))
+        return self._request_id
+
+    def _await_response(self, request_id: int) -> dict:
+        assert self._ws is not None
+        self._ws.settimeout(self.timeout)
+        try:
+            while True:
+                opcode, payload = self._ws.recv()
+                if opcode == OPCODE_CLOSE:
+                    raise McpError("WebSocket closed while subscribing to viewport")
+                if opcode != OPCODE_TEXT:
+                    continue
+                msg = json.loads(payload)
+                if msg.get("id") == request_id and "type" not in msg:
+                    _raise_on_error(msg)
+                    return msg
+        except socket.timeout as exc:
+            raise McpError("Timed out waiting for viewport subscription") from exc
+        finally:
+            self._ws.settimeout(None)
+
+    def open(self) -> None:
+        """Connect and subscribe to the viewport.
+
+        Service-event notifications are filtered out on this
+        connection (only ``viewport_tick`` is subscribed); use
+        :meth:`McpClient.events` for those.
+        """
+        if self._ws is not None:
+            return
+        self._ws = WebSocket.connect(self.url, timeout=self.timeout)
+        try:
+            self._await_response(self._send("subscribe", {"topics": ["viewport_tick"]}))
+            self._await_response(self._send("subscribe_viewport", {
+                "start_sample": self.start_sample,
+                "end_sample": self.end_sample,
+                "width": self.width,
+                "channels": self.channels,
+            }))
+        except Exception:
+            self._ws.close()
+            self._ws = None
+            raise
+
+    def update(
+        self,
+        start_sample: Optional[int] = None,
+        end_sample: Optional[int] = None,
+        width: Optional[int] = None,
+    ) -> None:
+        """Pan/zoom the viewport.  Omitted values are left unchanged.
+
+        The acknowledgement is consumed by the reader; an error reply
+        is raised from the iterator (or background thread).
+        """
+        params: dict = {}
+        if start_sample is not None:
+            self.start_sample = start_sample
+            params["start_sample"] = start_sample
+        if end_sample is not None:
+            self.end_sample = end_sample
+            params["end_sample"] = end_sample
+        if width is not None:
+            self.width = width
+            params["width"] = width
+        self._send("update_viewport", params)
+
+    def close(self) -> None:
+        """Unsubscribe, close the connection and stop the reader thread."""
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            try:
+                ws.send_text(json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": self._request_id + 1,
+                    "method": "unsubscribe_viewport",
+                }))
+            except Exception:
+                pass
+            ws.close()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.timeout)
+
+    @property
+    def is_open(self) -> bool:
+        return self._ws is not None
+
+    # ---- Iterator API ----
+
+    def __iter__(self) -> Iterator[ViewportItem]:
+        """Yield frames and ticks until the stream is closed.
+
+        Raises:
+            McpError: if the server replies with an error (e.g. to
+                :meth:`update`) or sends a malformed frame.
+        """
+        while True:
+            ws = self._ws
+            if ws is None:
+                return
+            try:
+                opcode, payload = ws.recv()
+            except McpError:
+                if self._ws is None:
+                    return
+                raise
+            if opcode == OPCODE_CLOSE:
+                self._ws = None
+                return
+            if opcode == OPCODE_BINARY:
+                self.frames_received += 1
+                self.bytes_received += len(payload)
+                yield self._decoder.decode(payload)
+                continue
+            msg = json.loads(payload)
+            if msg.get("topic") == "viewport_tick":
+                yield ViewportTick.from_dict(msg)
+            elif "type" not in msg:
+                _raise_on_error(msg)
+
+    # ---- Callback API ----
+
+    def on_frame(self, handler: Callable[[ViewportFrame], None]) -> None:
+        """Register a callback for decoded binary frames."""
+        self._frame_handlers.append(handler)
+
+    def on_tick(self, handler: Callable[[ViewportTick], None]) -> None:
+        """Register a callback for ``viewport_tick`` notifications."""
+        self._tick_handlers.append(handler)
+
+    def dispatch(self, item: ViewportItem) -> None:
+        """Deliver one item to the registered callbacks."""
+        if isinstance(item, ViewportTick):
+            for on_tick in self._tick_handlers:
+                on_tick(item)
+        else:
+            for on_frame in self._frame_handlers:
+                on_frame(item)
+
+    def run(self) -> None:
+        """Read the stream in the calling thread, dispatching to callbacks."""
+        for item in self:
+            self.dispatch(item)
+
+    def start(self) -> None:
+        """Open (if needed) and dispatch to callbacks from a daemon thread."""
+        self.open()
+        if self._thread is not None:
+            return
+
+        def _reader() -> None:
+            try:
+                self.run()
+            except BaseException as exc:  # surfaced by join()
+                if self._ws is not None:
+                    self._error = exc
+
+        self._thread = threading.Thread(target=_reader, name="pxview-viewport", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the background reader to finish and re-raise its error."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+
+def _raise_on_error(msg: dict) -> None:
+    if "error" in msg:
+        err = msg["error"]
+        raise McpError(err.get("message", "Unknown error"), err.get("code", -1), err)
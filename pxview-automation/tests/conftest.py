@@ -1,17 +1,67 @@
 """Pytest configuration for pxview-automation tests.
 
 Registers the ``integration`` marker for tests that require a running
-PXView headless server.
+PXView headless server, and the shared ``server`` / ``client`` / ``pxv``
+fixtures backed by :class:`FakePXViewServer`.  Configure them per module
+or per test with markers::
+
+    pytestmark = [
+        pytest.mark.fake_server(pattern="i2c", capture=200_000),
+        pytest.mark.mcp_client(retry_delay=0.01),
+    ]
 """
 
 import pytest
 
+from pxview_automation import McpClient, PXView
+from pxview_automation.testing import FakePXViewServer
+
 
 def pytest_configure(config):
     config.addinivalue_line(
         "markers",
         "integration: tests that require a running PXView --headless server",
     )
+    config.addinivalue_line(
+        "markers",
+        "fake_server(capture=None, **kwargs): FakePXViewServer arguments for the "
+        "server fixture; capture=N (True = sample limit) records a capture first",
+    )
+    config.addinivalue_line(
+        "markers",
+        "mcp_client(**kwargs): McpClient arguments for the client fixture",
+    )
+
+
+def _marker_kwargs(request, name):
+    marker = request.node.get_closest_marker(name)
+    return dict(marker.kwargs) if marker is not None else {}
+
+
+@pytest.fixture
+def server(request):
+    """A running FakePXViewServer, configured by ``@pytest.mark.fake_server``."""
+    kwargs = _marker_kwargs(request, "fake_server")
+    capture = kwargs.pop("capture", None)
+    with FakePXViewServer(**kwargs) as srv:
+        if capture is not None:
+            srv.capture(None if capture is True else capture)
+        yield srv
+
+
+@pytest.fixture
+def client(request, server):
+    """Connected McpClient (with WS events), configured by ``@pytest.mark.mcp_client``."""
+    kwargs = {"ws_url": server.ws_url, **_marker_kwargs(request, "mcp_client")}
+    with McpClient(server.url, auto_connect=True, **kwargs) as c:
+        yield c
+
+
+@pytest.fixture
+def pxv(server):
+    """Connected PXView on the fake server."""
+    with PXView(port=server.port, ws_port=server.ws_port, auto_connect=True) as p:
+        yield p
 
 
 def pytest_collection_modifyitems(config, items):
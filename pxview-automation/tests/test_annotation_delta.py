@@ -0,0 +1,119 @@
+"""Tests for get_analyzer_results(sinceVersion) and McpClient.follow_analyzer."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pxview_automation import AnnotationDelta, ConfigError
+
+pytestmark = pytest.mark.fake_server(pattern="i2c", capture=200_000)
+
+
+@pytest.fixture
+def i2c(client):
+    return client.add_analyzer("i2c", {"channelMap": {"scl": 0, "sda": 1}})["analyzerId"]
+
+
+def _new_rows(first, count, ann_class=0):
+    return [(first + 10 * i, first + 10 * i + 5, ann_class, [f"n{first + i}"])
+            for i in range(count)]
+
+
+class TestSinceVersion:
+    def test_only_new_annotations(self, server, client, i2c):
+        everything = client.get_analyzer_results(i2c, max_count=10 ** 6)["annotations"]
+        first = client.get_analyzer_results(i2c, max_count=10 ** 6, since_version=0)
+        assert first["annotations"] == everything
+        assert first["version"] > 0 and not first["reset"] and not first["more"]
+
+        again = client.get_analyzer_results(i2c, since_version=first["version"])
+        assert again["annotations"] == [] and again["version"] == first["version"]
+
+        server.append_annotations(i2c, _new_rows(300_000, 3))
+        delta = client.get_analyzer_results(i2c, since_version=first["version"])
+        assert [a["texts"] for a in delta["annotations"]] == [["n300000"], ["n300001"], ["n300002"]]
+        assert delta["version"] > first["version"]
+
+    def test_max_count_sets_more(self, client, i2c):
+        total = len(client.get_analyzer_results(i2c, max_count=10 ** 6)["annotations"])
+        version, seen = 0, 0
+        while True:
+            page = client.get_analyzer_results(i2c, max_count=7, since_version=version)
+            seen += len(page["annotations"])
+            version = page["version"]
+            if not page["more"]:
+                break
+        assert seen == total
+
+    def test_unknown_version_resets(self, client, i2c):
+        total = len(client.get_analyzer_results(i2c, max_count=10 ** 6)["annotations"])
+        page = client.get_analyzer_results(i2c, max_count=10 ** 6, since_version=12345)
+        assert page["reset"] and len(page["annotations"]) == total
+
+    def test_new_capture_resets(self, server, client, i2c):
+        version = client.get_analyzer_results(i2c, max_count=10 ** 6, since_version=0)["version"]
+        server.capture(200_000)
+        page = client.get_analyzer_results(i2c, max_count=10 ** 6, since_version=version)
+        assert page["reset"] and page["annotations"]
+        assert page["version"] > version
+
+    def test_ann_classes_and_columnar(self, server, client, i2c):
+        version = client.get_analyzer_results(i2c, max_count=10 ** 6, since_version=0)["version"]
+        server.append_annotations(i2c, _new_rows(300_000, 2, ann_class=5) + _new_rows(400_000, 2))
+        page = client.get_analyzer_results(i2c, ann_classes=[5], since_version=version)
+        assert [a["ann_class"] for a in page["annotations"]] == [5, 5]
+        table = client.get_analyzer_results(i2c, since_version=version, format="columnar")
+        assert len(table) == 4 and table.metadata["version"] == page["version"]
+
+    def test_append_to_unknown_analyzer(self, server):
+        with pytest.raises(ConfigError):
+            server.append_annotations("9:9", [])
+
+
+class TestFollowAnalyzer:
+    def _feed(self, server, aid, batches, delay=0.05):
+        def run():
+            for i in range(batches):
+                time.sleep(delay)
+                server.append_annotations(aid, _new_rows(300_000 + 1000 * i, 5))
+        t = threading.Thread(target=run)
+        t.start()
+        return t
+
+    @pytest.mark.parametrize("use_events", [True, False])
+    def test_yields_new_annotations(self, server, client, i2c, use_events):
+        existing = len(client.get_analyzer_results(i2c, max_count=10 ** 6)["annotations"])
+        feeder = self._feed(server, i2c, 3)
+        deltas = []
+        for delta in client.follow_analyzer(i2c, use_events=use_events, poll_interval_s=0.02,
+                                            idle_timeout_s=0.5):
+            assert isinstance(delta, AnnotationDelta)
+            deltas.append(delta)
+        feeder.join()
+        assert sum(len(d.annotations) for d in deltas) == existing + 15
+        assert not any(d.reset for d in deltas)
+        assert [d.version for d in deltas] == sorted(d.version for d in deltas)
+
+    def test_events_wake_before_poll_interval(self, server, client, i2c):
+        follow = client.follow_analyzer(i2c, page_size=10 ** 6, poll_interval_s=5.0)
+        first = next(follow)
+        t0 = time.monotonic()
+        self._feed(server, i2c, 1, delay=0.1).join()
+        delta = next(follow)
+        follow.close()
+        assert time.monotonic() - t0 < 2.0
+        assert len(delta.annotations) == 5 and delta.version > first.version
+
+    def test_resume_and_stop_event(self, server, client, i2c):
+        stop = threading.Event()
+        version = 0
+        for delta in client.follow_analyzer(i2c, stop_event=stop, use_events=False):
+            version = delta.version
+            stop.set()
+        server.append_annotations(i2c, _new_rows(300_000, 2))
+        resumed = list(client.follow_analyzer(i2c, since_version=version, use_events=False,
+                                              idle_timeout_s=0))
+        assert [len(d.annotations) for d in resumed] == [2]
@@ -0,0 +1,116 @@
+"""Tests for columnar get_analyzer_results and AnnotationTable."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pxview_automation import AnnotationTable, ConfigError, McpError
+
+pytestmark = pytest.mark.fake_server(pattern="i2c", capture=200_000)
+
+
+@pytest.fixture
+def i2c(client):
+    return client.add_analyzer("i2c", {"channelMap": {"scl": 0, "sda": 1}})["analyzerId"]
+
+
+def _rows(client, aid, **kwargs):
+    return client.get_analyzer_results(aid, max_count=10 ** 6, **kwargs)["annotations"]
+
+
+class TestColumnar:
+    def test_matches_rows(self, client, i2c):
+        rows = _rows(client, i2c)
+        table = client.get_analyzer_results(i2c, max_count=10 ** 6, format="columnar")
+        assert isinstance(table, AnnotationTable)
+        assert len(table) == len(rows) > 0
+        assert table.to_dicts() == rows
+        assert table[3] == rows[3] and table[-1] == rows[-1]
+        assert table[1].texts == rows[1]["texts"]
+        assert len(table.text_table) < sum(len(r["texts"]) for r in rows)
+        with pytest.raises(IndexError):
+            table[len(rows)]
+
+    def test_decoder_results_are_rows(self, client, i2c, pxv):
+        assert pxv.get_decoder_results(i2c, max_count=20) == _rows(client, i2c)[:20]
+
+    def test_wire_encoding(self, client, i2c):
+        raw = client._call_tool("get_analyzer_results", {
+            "analyzerId": i2c, "maxCount": 5, "format": "columnar"})
+        rows = _rows(client, i2c)[:5]
+        assert raw["count"] == 5
+        assert raw["encoding"] == {"start_sample": "delta", "end_sample": "delta",
+                                   "texts": "text_table"}
+        starts = raw["columns"]["start_sample"]
+        assert starts[0] == rows[0]["start_sample"]
+        assert starts[1] == rows[1]["start_sample"] - rows[0]["start_sample"]
+        assert [[raw["text_table"][i] for i in ids] for ids in raw["columns"]["texts"]] \
+            == [r["texts"] for r in rows]
+
+    def test_smaller_than_rows(self, client, i2c):
+        rows = client._call_tool("get_analyzer_results", {"analyzerId": i2c, "maxCount": 10 ** 6})
+        cols = client._call_tool("get_analyzer_results", {
+            "analyzerId": i2c, "maxCount": 10 ** 6, "format": "columnar"})
+        assert len(json.dumps(cols)) * 2 < len(json.dumps(rows))
+
+    def test_fields_projection(self, client, i2c):
+        rows = _rows(client, i2c, fields=["start_sample", "ann_class"])
+        assert set(rows[0]) == {"start_sample", "ann_class"}
+        table = client.get_analyzer_results(i2c, fields=["texts"], format="columnar")
+        assert table.fields == ["texts"] and table.start_sample is None
+        assert table[0].start_sample is None and table[0].texts
+        assert table[0].to_dict() == {"texts": table[0].texts}
+
+    def test_ann_classes(self, client, i2c):
+        everything = _rows(client, i2c)
+        rows = _rows(client, i2c, ann_classes=[7, 9])
+        assert rows and {r["ann_class"] for r in rows} == {7, 9}
+        assert len(rows) == sum(r["ann_class"] in (7, 9) for r in everything)
+        combined = _rows(client, i2c, ann_class=3, ann_classes=[7])
+        assert {r["ann_class"] for r in combined} == {3, 7}
+
+    def test_metadata(self, client, i2c):
+        table = client.get_analyzer_results(i2c, max_count=0, include_metadata=True,
+                                            format="columnar")
+        assert len(table) == 0
+        assert table.metadata["classNames"][0]["class_id"] == 0
+
+    def test_invalid_arguments(self, server, client, i2c):
+        with pytest.raises(ConfigError):
+            client.get_analyzer_results(i2c, format="csv")
+        with pytest.raises(McpError, match="Invalid format"):
+            client._call_tool("get_analyzer_results", {"analyzerId": i2c, "format": "csv"})
+        with pytest.raises(McpError, match="Unknown field 'data'"):
+            client.get_analyzer_results(i2c, fields=["data"])
+
+
+class TestAnnotationTable:
+    def test_extend_merges_text_tables(self, client, i2c):
+        rows = _rows(client, i2c)
+        table = client.get_analyzer_results(i2c, max_count=10, format="columnar")
+        cursor = rows[9]["start_sample"] + 1
+        rest = client.get_analyzer_results(i2c, start_sample=cursor, max_count=10 ** 6,
+                                           format="columnar")
+        table.extend(rest)
+        expected = rows[:10] + [r for r in rows if r["start_sample"] >= cursor]
+        assert table.to_dicts() == expected
+        assert len(table.text_table) == len(set(table.text_table))
+
+    def test_extend_rejects_other_fields(self):
+        table = AnnotationTable(["start_sample"])
+        with pytest.raises(ValueError):
+            table.extend(AnnotationTable(["texts"]))
+
+    def test_from_plain_columns(self):
+        table = AnnotationTable.from_columnar({
+            "count": 2,
+            "columns": {"start_sample": [5, 3], "end_sample": [9, 4],
+                        "texts": [[0], [1, 0]]},
+            "encoding": {"start_sample": "delta"},
+            "text_table": ["a", "b"]})
+        assert list(table.start_sample) == [5, 8]
+        assert list(table.end_sample) == [9, 4]
+        assert [r.texts for r in table] == [["a"], ["b", "a"]]
+        assert table[1].ann_class is None
@@ -320,6 +320,21 @@ class TestMcpClient:
         result = client._parse_tool_result(resp)
         assert result == "plain text"
 
+    def test_parse_tool_result_structured_content(self):
+        client = McpClient()
+        resp = {"result": {"content": [{"text": ""}],
+                           "structuredContent": {"key": "value"}}}
+        assert client._parse_tool_result(resp) == {"key": "value"}
+        wrapped = {"result": {"content": [{"text": ""}], "structuredContent": {"value": [1, 2]},
+                              "_meta": {"pxview/unwrap": "value"}}}
+        assert client._parse_tool_result(wrapped) == [1, 2]
+
+    def test_parse_tool_result_structured_disabled(self):
+        client = McpClient(structured_content=False)
+        resp = {"result": {"content": [{"text": '{"key": 1}'}],
+                           "structuredContent": {"key": 2}}}
+        assert client._parse_tool_result(resp) == {"key": 1}
+
 
 # ======================================================================
 # PXView (high-level, mocked)
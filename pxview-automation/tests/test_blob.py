@@ -0,0 +1,117 @@
+"""Tests for out-of-band blob transfer of large get_samples results."""
+
+from __future__ import annotations
+
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pxview_automation import ConfigError, McpClient
+
+pytestmark = [
+    pytest.mark.fake_server(pattern="random", seed=3, sample_limit=300_000, capture=True),
+    pytest.mark.mcp_client(retry_delay=0.01, blob_threshold=100_000),
+]
+
+
+def _inline(server, channel, **kwargs):
+    with McpClient(server.url, blob_threshold=None, auto_connect=True) as c:
+        return c.get_samples(channel, "logic", **kwargs)
+
+
+def _blob_calls(client):
+    return client.stats().tools.get("get_samples/blob")
+
+
+class TestBlobTransfer:
+    def test_large_read_uses_blob(self, server, client):
+        data = client.get_samples(2, "logic")
+        assert server.calls[-1][1]["blobMinBytes"] == 100_000
+        assert len(data) == 300_000
+        assert data == _inline(server, 2)
+        st = _blob_calls(client)
+        assert st.calls == 1 and st.response_bytes == 300_000
+
+    def test_small_read_stays_inline(self, client):
+        data = client.get_samples(2, "logic", 0, 1000)
+        assert len(data) == 1000
+        assert _blob_calls(client) is None
+
+    def test_disabled(self, server):
+        with McpClient(server.url, blob_threshold=None, auto_connect=True) as c:
+            assert len(c.get_samples(0, "logic")) == 300_000
+        assert "blobMinBytes" not in server.calls[-1][1]
+        with pytest.raises(ConfigError):
+            McpClient(server.url, blob_threshold=0)
+
+    def test_short_read_resumes_with_range(self, server, client):
+        server.inject_failure("blob", kind="drop")
+        assert client.get_samples(1, "logic") == _inline(server, 1)
+        st = _blob_calls(client)
+        assert st.calls == 1 and st.retries == 1 and st.response_bytes == 300_000
+
+    def test_server_error_is_retried(self, server, client):
+        server.inject_failure("blob", kind="http")
+        assert len(client.get_samples(1, "logic")) == 300_000
+
+    def test_expired_blob_falls_back_inline(self, server, client):
+        server.inject_failure("blob", kind="tool")
+        assert client.get_samples(3, "logic") == _inline(server, 3)
+        assert [args.get("blobMinBytes") for name, args in server.calls
+                if name == "get_samples"][:2] == [100_000, None]
+
+    def test_analog_blob(self, server, client):
+        server.capture()
+        client.switch_work_mode(2)
+        server.capture(50_000)
+        values = client.get_samples(0, "analog")
+        with McpClient(server.url, blob_threshold=None, auto_connect=True) as c:
+            expected = c.get_samples(0, "analog")
+        assert len(values) == 50_000
+        assert values == pytest.approx(expected, rel=1e-6)
+        assert _blob_calls(client).calls == 1
+
+    def test_get_samples_many(self, server, client):
+        batch = client.get_samples_many([0, 1, 2], chunk_samples=150_000)
+        assert batch.data[1] == _inline(server, 1)
+        # channel 0 read whole to learn the length, then 2 chunks × 2 channels
+        assert _blob_calls(client).calls == 5
+
+
+class TestBlobEndpoint:
+    def _handle(self, server, client):
+        return client._call_tool("get_samples", {
+            "channelIndex": 0, "channelType": "logic", "blobMinBytes": 1})["blob"]
+
+    def _get(self, server, path, headers=None):
+        req = urllib.request.Request(f"http://127.0.0.1:{server.port}{path}",
+                                     headers=headers or {})
+        return urllib.request.urlopen(req, timeout=5)
+
+    def test_range_and_content_length(self, server, client):
+        blob = self._handle(server, client)
+        full = server.blob(blob["id"])
+        with self._get(server, blob["path"]) as resp:
+            assert resp.status == 200
+            assert int(resp.headers["Content-Length"]) == blob["size"] == len(full)
+            assert resp.headers["Accept-Ranges"] == "bytes"
+        with self._get(server, blob["path"], {"Range": "bytes=10-19"}) as resp:
+            assert resp.status == 206
+            assert resp.headers["Content-Range"] == f"bytes 10-19/{len(full)}"
+            assert resp.read() == full[10:20]
+        with self._get(server, blob["path"], {"Range": "bytes=-5"}) as resp:
+            assert resp.read() == full[-5:]
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            self._get(server, blob["path"], {"Range": f"bytes={len(full)}-"})
+        assert exc.value.code == 416
+
+    def test_expiry(self, server, client):
+        server.blob_ttl = 0.05
+        blob = self._handle(server, client)
+        assert blob["expires_in_ms"] == 50
+        time.sleep(0.1)
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            self._get(server, blob["path"])
+        assert exc.value.code == 404
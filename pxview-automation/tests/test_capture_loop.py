@@ -0,0 +1,103 @@
+"""Tests for the pipelined CaptureLoop (FakePXViewServer, no PXView required)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pxview_automation import CaptureLoop, ConfigError
+
+pytestmark = pytest.mark.fake_server(pattern="i2c", capture_time=0.05)
+
+
+def _loop(pxv, **kwargs):
+    kwargs.setdefault("channels", [0, 1])
+    kwargs.setdefault("sample_count", 5000)
+    return CaptureLoop(pxv, "demo", **kwargs)
+
+
+class TestCaptureLoop:
+    def test_snapshots_and_exports(self, pxv, tmp_path):
+        analyzer = pxv.add_decoder("i2c", {"scl": 0, "sda": 1})
+        seen = []
+        lock = threading.Lock()
+
+        def handler(snap):
+            with lock:
+                seen.append(snap)
+
+        stats = _loop(pxv, export_dir=str(tmp_path), export_format="bits",
+                      handlers=[handler]).run(count=3)
+        assert stats["captures"] == stats["processed"] == 3
+        assert stats["errors"] == 0
+        assert sorted(s.index for s in seen) == [0, 1, 2]
+        snap = seen[0]
+        assert snap.sample_count == 5000 and set(snap.samples) == {0, 1}
+        assert snap.annotations[analyzer][0]["texts"][0] == "Start"
+        assert {"capture", "decode", "snapshot", "process"} <= set(snap.timings)
+        out = tmp_path / "capture_00002"
+        assert (out / "channel_0.bits").is_file() and (out / "channel_1.bits").is_file()
+        table = (out / "decoded.csv").read_text(encoding="utf-8").splitlines()
+        assert table[0] == "start_sample,end_sample,analyzer_name,annotation_class,text"
+        assert len(table) == len(snap.annotations[analyzer]) + 1
+
+    def test_waits_for_decoding_without_completion_event(self, server, pxv):
+        # Like PXView: DecodeDone(clear_decode_data) when each capture
+        # starts, decoders still running after it stops, no completion event.
+        analyzer = pxv.add_decoder("i2c", {"scl": 0, "sda": 1})
+        server.decode_time = 0.3
+        seen = []
+        stats = _loop(pxv, read_samples=False, handlers=[seen.append]).run(count=2)
+        assert stats["processed"] == 2
+        assert stats["stages"]["decode"]["mean_s"] >= 0.2
+        for snap in seen:
+            anns = snap.annotations[analyzer]
+            assert anns and anns[0]["texts"][0] == "Start"
+        assert len(seen[0].annotations[analyzer]) == len(seen[1].annotations[analyzer])
+
+    def test_next_capture_overlaps_processing(self, pxv):
+        stats = _loop(pxv, workers=2, handlers=[lambda snap: time.sleep(0.2)]).run(count=4)
+        # Serially this would take at least 4 × (0.05 + 0.2) s
+        assert stats["processed"] == 4
+        assert stats["elapsed_s"] < 0.9
+        assert stats["stages"]["process"]["count"] == 4
+        assert stats["stages"]["process"]["mean_s"] >= 0.2
+
+    def test_backpressure_is_bounded(self, pxv):
+        stats = _loop(pxv, workers=1, max_pending=1, read_samples=False,
+                      handlers=[lambda snap: time.sleep(0.3)]).run(count=4)
+        assert stats["processed"] == 4
+        assert stats["stages"]["backpressure"]["total_s"] > 0.3
+
+    def test_handler_error_stops_loop(self, pxv):
+        def handler(snap):
+            if snap.index == 1:
+                raise ValueError("boom")
+
+        loop = _loop(pxv, handlers=[handler], max_pending=1)
+        with pytest.raises(ValueError, match="boom"):
+            loop.run(count=20)
+        assert loop.stats()["captures"] < 20
+        assert loop.stats()["errors"] == 1
+
+    def test_duration_and_save(self, pxv, tmp_path):
+        stats = _loop(pxv, read_samples=False, save_dir=str(tmp_path)).run(duration_s=0.3)
+        assert stats["captures"] >= 1
+        assert len(list(tmp_path.glob("capture_*.pxc"))) == stats["captures"]
+        assert 0 < stats["instrument_busy"] <= 1
+
+    def test_stop(self, pxv):
+        loop = _loop(pxv, read_samples=False)
+        loop.add_handler(lambda snap: loop.stop())
+        stats = loop.run()
+        assert 1 <= stats["captures"] <= 4
+
+    def test_bad_arguments(self, pxv):
+        with pytest.raises(ConfigError):
+            _loop(pxv, export_format="wav")
+        with pytest.raises(ConfigError):
+            _loop(pxv, workers=0)
+        with pytest.raises(ConfigError):
+            _loop(pxv).run(count=0)
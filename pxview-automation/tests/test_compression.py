@@ -0,0 +1,115 @@
+"""Tests for gzip / deflate compression of MCP HTTP responses."""
+
+from __future__ import annotations
+
+import json
+import time
+import urllib.request
+import zlib
+
+import pytest
+
+from pxview_automation import McpClient, McpConnectionError
+from pxview_automation.stats import CallRecord
+from pxview_automation.testing import _negotiate_encoding
+
+pytestmark = pytest.mark.fake_server(pattern="i2c", capture=200_000)
+
+
+def _client(server, **kwargs):
+    client = McpClient(server.url, **kwargs)
+    client.connect()
+    return client
+
+
+def _annotations(client):
+    aid = client.add_analyzer("i2c", {"channelMap": {"scl": 0, "sda": 1}})["analyzerId"]
+    return client.get_analyzer_results(aid, max_count=10 ** 6)["annotations"]
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate", "gzip"),
+        ("deflate, gzip", "gzip"),
+        ("deflate", "deflate"),
+        ("gzip;q=0, deflate", "deflate"),
+        ("gzip;q=0.0", None),
+        ("*", "gzip"),
+        ("identity", None),
+        ("", None),
+    ])
+    def test_accept_encoding(self, header, expected):
+        assert _negotiate_encoding(header) == expected
+
+
+class TestClient:
+    def test_large_results_are_compressed(self, server):
+        client = _client(server)
+        plain = _client(server, compression=False)
+        assert _annotations(client) == _annotations(plain)
+        st = client.stats().tools["get_analyzer_results"]
+        assert st.response_wire_bytes * 4 < st.response_bytes
+        ref = plain.stats().tools["get_analyzer_results"]
+        assert ref.response_wire_bytes == ref.response_bytes == st.response_bytes
+
+    def test_small_replies_stay_plain(self, server):
+        client = _client(server)
+        client.get_capture_status()
+        st = client.stats().tools["get_capture_status"]
+        assert st.response_wire_bytes == st.response_bytes < server.compress_min_bytes
+
+    def test_threshold_zero_disables(self, server):
+        server.compress_min_bytes = 0
+        client = _client(server)
+        _annotations(client)
+        st = client.stats().tools["get_analyzer_results"]
+        assert st.response_wire_bytes == st.response_bytes
+
+    def test_record_and_prometheus(self, server):
+        client = _client(server)
+        seen = []
+        client.on_response(seen.append)
+        client.get_devices()
+        _annotations(client)
+        rec = seen[-1]
+        assert rec.response_wire_bytes < rec.response_bytes
+        text = client.stats().to_prometheus()
+        assert 'pxview_mcp_response_wire_bytes_total{tool="get_analyzer_results"}' in text
+
+    def test_corrupt_body(self):
+        rec = CallRecord("x", "tools/call")
+        with pytest.raises(McpConnectionError, match="Corrupt gzip"):
+            McpClient._decode_body(b"not gzip", {"Content-Encoding": "gzip"}, rec)
+        assert McpClient._decode_body(zlib.compress(b"{}"), {"Content-Encoding": "deflate"},
+                                      rec) == b"{}"
+        assert rec.response_wire_bytes > rec.response_bytes == 2
+
+
+class TestServer:
+    def _post(self, server, encoding):
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "tools/list"}).encode()
+        req = urllib.request.Request(server.url, data=body, method="POST", headers={
+            "Content-Type": "application/json", "Accept-Encoding": encoding})
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.headers, resp.read()
+
+    def test_deflate_is_zlib_wrapped(self, server):
+        headers, data = self._post(server, "deflate")
+        assert headers["Content-Encoding"] == "deflate"
+        assert headers["Vary"] == "Accept-Encoding"
+        assert json.loads(zlib.decompress(data))["result"]["tools"]
+
+    def test_identity(self, server):
+        headers, data = self._post(server, "identity")
+        assert headers["Content-Encoding"] is None
+        assert json.loads(data)["result"]["tools"]
+
+    def test_link_bandwidth_throttles(self, server):
+        client = _client(server, compression=False)
+        client.get_devices()
+        server.link_bandwidth = 200_000
+        t0 = time.perf_counter()
+        payload = client.get_samples(0, "logic", 0, 50_000)
+        slow = time.perf_counter() - t0
+        wire = client.stats().tools["get_samples"].response_wire_bytes
+        assert len(payload) == 50_000 and slow >= wire / 200_000 * 0.8
@@ -0,0 +1,183 @@
+"""Stress tests for sharing one McpClient between threads."""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from pxview_automation import McpClient, McpError
+from pxview_automation.testing import FakePXViewServer
+
+THREADS = 32
+CALLS_PER_THREAD = 25
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Echo tool: returns the request id and arguments it was called with."""
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.methods.append(req["method"])
+            server.ids.append(req.get("id"))
+        method = req["method"]
+        if method == "initialize":
+            result = {"protocolVersion": "2025-03-26", "capabilities": {}}
+        elif method == "tools/list":
+            result = {"tools": [{"name": "echo"}]}
+        elif method == "tools/call":
+            payload = {"id": req["id"], "args": req["params"].get("arguments")}
+            result = {"content": [{"type": "text", "text": json.dumps(payload)}]}
+        else:
+            result = {}
+        body = json.dumps({"jsonrpc": "2.0", "id": req.get("id"), "result": result}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = THREADS * 2  # listen backlog for the burst
+
+
+@pytest.fixture
+def server():
+    srv = _Server(("127.0.0.1", 0), _Handler)
+    srv.lock = threading.Lock()
+    srv.methods = []
+    srv.ids = []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+class TestSharedClient:
+    def test_32_threads(self, server):
+        client = McpClient(f"http://127.0.0.1:{server.server_port}/mcp", timeout=10)
+        client.connect()
+        start = threading.Barrier(THREADS)
+
+        def worker(n):
+            start.wait()
+            out = []
+            for i in range(CALLS_PER_THREAD):
+                reply = client._call_tool("echo", {"thread": n, "i": i})
+                out.append((reply["args"], reply["id"]))
+            return out
+
+        with ThreadPoolExecutor(THREADS) as pool:
+            results = list(pool.map(worker, range(THREADS)))
+
+        # Every caller got the reply to its own request.
+        for n, replies in enumerate(results):
+            assert [args for args, _ in replies] == [
+                {"thread": n, "i": i} for i in range(CALLS_PER_THREAD)
+            ]
+        ids = [rid for replies in results for _, rid in replies]
+        assert len(set(ids)) == THREADS * CALLS_PER_THREAD
+        assert len(set(server.ids)) == len(server.ids)
+        assert client.connected
+        assert server.methods.count("initialize") == 1
+
+    def test_reconnect_is_single_flight(self):
+        client = McpClient()
+        client._connected = True
+        stale = client._generation
+        calls = []
+
+        def fake_handshake():
+            calls.append(threading.get_ident())
+            client._connected = True
+
+        start = threading.Barrier(THREADS)
+
+        def worker(_):
+            start.wait()
+            client._reconnect(stale)
+
+        with patch.object(client, "_handshake", side_effect=fake_handshake):
+            with ThreadPoolExecutor(THREADS) as pool:
+                list(pool.map(worker, range(THREADS)))
+
+        assert len(calls) == 1
+        assert client._generation == stale + 1
+        assert client.connected
+
+    def test_failed_reconnect_is_not_retried_by_waiters(self):
+        client = McpClient()
+        client._connected = True
+        stale = client._generation
+        calls = []
+
+        def failing_handshake():
+            calls.append(1)
+            raise ConnectionError("still down")
+
+        with patch.object(client, "_handshake", side_effect=failing_handshake):
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(lambda _: client._reconnect(stale), range(8)))
+
+        assert calls == [1]
+        assert not client.connected
+
+
+class TestGetSamplesMany:
+    @pytest.fixture
+    def fake(self):
+        with FakePXViewServer() as srv:
+            srv.capture(20_000)
+            client = McpClient(srv.url, ws_url=srv.ws_url)
+            client.connect()
+            yield srv, client
+
+    def test_matches_serial_reads_in_channel_order(self, fake):
+        srv, client = fake
+        channels = [5, 0, 3, 1]
+        batch = client.get_samples_many(channels, start_sample=100, end_sample=9000)
+        assert list(batch.data) == channels
+        for ch in channels:
+            assert batch.data[ch] == client.get_samples(ch, "logic", 100, 9000)
+        assert batch.requests == 4
+        assert batch.sample_count == 4 * 8900
+        assert batch.throughput_mbps > 0
+
+    def test_to_end_and_chunked(self, fake):
+        srv, client = fake
+        batch = client.get_samples_many([0, 1, 2], chunk_samples=3000)
+        assert [len(v) for v in batch.data.values()] == [20_000] * 3
+        # First channel learns the length, the others go in 7 chunks each.
+        assert batch.requests == 1 + 2 * 7
+        assert batch.data[2] == client.get_samples(2, "logic")
+
+    def test_requests_overlap(self, fake):
+        srv, client = fake
+        srv.set_latency(0.2, tool="get_samples")
+        batch = client.get_samples_many(list(range(8)), end_sample=1000, max_workers=8)
+        assert batch.elapsed_seconds < 0.2 * 4
+
+    def test_inflight_bytes_bound(self, fake):
+        srv, client = fake
+        srv.set_latency(0.1, tool="get_samples")
+        # Each request is ~4 KB of estimated buffers, so one runs at a time.
+        batch = client.get_samples_many([0, 1, 2, 3], end_sample=1000, max_workers=4,
+                                        max_inflight_bytes=5000)
+        assert batch.elapsed_seconds >= 0.4
+
+    def test_errors_propagate(self, fake):
+        srv, client = fake
+        with pytest.raises(McpError, match="not captured"):
+            client.get_samples_many([0, 40], end_sample=100)
@@ -0,0 +1,74 @@
+"""Tests for the bulk configure_channels tool and its client wrappers."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from pxview_automation import ConfigError, McpError, PXView
+
+
+def _state(client):
+    return [(c["enabled"], c["name"]) for c in client.get_channels()]
+
+
+class TestConfigureChannels:
+    def test_applies_enables_and_names(self, server, client):
+        result = client.configure_channels(enabled={i: i < 4 for i in range(16)},
+                                           names={0: "SCL", 1: "SDA"})
+        assert result["count"] == 16
+        state = _state(client)
+        assert [e for e, _ in state] == [True] * 4 + [False] * 12
+        assert [n for _, n in state[:2]] == ["SCL", "SDA"]
+        assert server.call_count("configure_channels") == 1
+        assert server.call_count("configure_channel") == 0
+
+    def test_omitted_fields_unchanged(self, client):
+        before = _state(client)
+        client.configure_channels(names={3: "CS"})
+        after = _state(client)
+        assert after[3] == (before[3][0], "CS")
+        assert after[:3] == before[:3] and after[4:] == before[4:]
+
+    def test_invalid_index_changes_nothing(self, client):
+        before = _state(client)
+        with pytest.raises(McpError, match="Channel 99 not found"):
+            client.configure_channels(enabled={0: False, 99: True}, names={1: "X"})
+        assert _state(client) == before
+
+    def test_duplicate_index_rejected(self, client):
+        before = _state(client)
+        with pytest.raises(McpError, match="more than once"):
+            client._call_tool("configure_channels", {"channels": [
+                {"channelIndex": 2, "enabled": False}, {"channelIndex": 2, "name": "A"}]})
+        assert _state(client) == before
+
+    def test_empty_arguments(self, client):
+        with pytest.raises(ConfigError):
+            client.configure_channels()
+        with pytest.raises(McpError, match="non-empty array"):
+            client._call_tool("configure_channels", {"channels": []})
+
+    def test_single_config_changed_event(self, client):
+        with client.events(["channel_config"]) as events:
+            client.configure_channels(enabled={i: False for i in range(8)})
+            first = events.get(timeout=2.0)
+            time.sleep(0.2)
+            assert first is not None and first.params["count"] == "8"
+            assert events.drain() == []
+
+    def test_falls_back_to_configure_channel(self, server, client):
+        # A PXView build that predates the tool.
+        client._tools = [t for t in client._tools if t["name"] != "configure_channels"]
+        client.configure_channels(enabled={0: False, 1: False}, names={1: "SDA"})
+        assert server.call_count("configure_channels") == 0
+        assert server.call_count("configure_channel") == 2
+        state = _state(client)
+        assert [e for e, _ in state[:2]] == [False, False] and state[1][1] == "SDA"
+
+    def test_pxview_wrapper(self, server):
+        host, port = server.url.split("//")[1].split("/")[0].split(":")
+        with PXView(host, int(port), auto_connect=True) as pxv:
+            pxv.configure_channels(enabled={0: False}, names={0: "CLK"})
+            assert _state(pxv.client)[0] == (False, "CLK")
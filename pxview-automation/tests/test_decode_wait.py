@@ -0,0 +1,98 @@
+"""Tests for waiting on decoder completion (McpClient.wait_decoded)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pxview_automation import McpError, PXView, ServiceEvent
+
+I2C = {"scl": 0, "sda": 1}
+
+
+pytestmark = pytest.mark.fake_server(pattern="i2c", capture_time=0.05)
+
+
+@pytest.fixture
+def server(server):
+    # Like PXView without per-decoder DecodeDone: a clear event when the
+    # capture starts and nothing when decoding finishes.
+    server.decode_time = 0.4
+    return server
+
+
+def _pxview(server):
+    return PXView(port=server.port, ws_port=server.ws_port, auto_connect=True)
+
+
+class TestWaitDecoded:
+    def test_polls_until_decoder_idle(self, server, client):
+        aid = client.add_analyzer("i2c", {"channelMap": I2C})["analyzerId"]
+        with client.events(["decode"]) as events:
+            client.start_capture(sample_count=5000)
+            client.wait_capture()
+            t0 = time.monotonic()
+            client.wait_decoded([aid], timeout=5.0, events=events)
+        assert time.monotonic() - t0 >= 0.2
+        assert client.get_analyzer_results(aid)["annotations"]
+
+    def test_clear_event_is_not_completion(self, server, client):
+        aid = client.add_analyzer("i2c", {"channelMap": I2C})["analyzerId"]
+        with client.events(["decode"]) as events:
+            client.start_capture(sample_count=5000)
+            client.wait_capture()
+            cleared = events.wait_for(ServiceEvent.DECODE_DONE, timeout=2.0)
+            assert cleared.params == {"detail": "clear_decode_data"}
+            client.wait_decoded([aid], timeout=5.0, events=events)
+        assert client.get_active_decoders()[0]["progress"] == 1.0
+
+    def test_completion_event_ends_wait(self, server, client):
+        server.decode_time = 30.0
+        aid = client.add_analyzer("i2c", {"channelMap": I2C})["analyzerId"]
+        with client.events(["decode"]) as events:
+            client.start_capture(sample_count=5000)
+            client.wait_capture()
+            threading.Timer(0.1, server.emit_event,
+                            args=(ServiceEvent.DECODE_DONE, {"instance_id": aid})).start()
+            t0 = time.monotonic()
+            client.wait_decoded([aid], timeout=5.0, events=events)
+        assert time.monotonic() - t0 < 2.0
+
+    def test_completion_before_clear_is_discarded(self, server, client):
+        aid = client.add_analyzer("i2c", {"channelMap": I2C})["analyzerId"]
+        with client.events(["decode"]) as events:
+            server.emit_event(ServiceEvent.DECODE_DONE, {"instance_id": aid})
+            time.sleep(0.1)
+            client.start_capture(sample_count=5000)
+            client.wait_capture()
+            client.wait_decoded([aid], timeout=5.0, events=events)
+        assert client.get_analyzer_results(aid)["annotations"]
+
+    def test_without_event_stream(self, server, client):
+        aid = client.add_analyzer("i2c", {"channelMap": I2C})["analyzerId"]
+        client.start_capture(sample_count=5000)
+        client.wait_capture()
+        client.wait_decoded([aid], timeout=5.0)
+        assert client.get_analyzer_results(aid)["annotations"]
+
+    def test_timeout(self, server, client):
+        server.decode_time = 30.0
+        aid = client.add_analyzer("i2c", {"channelMap": I2C})["analyzerId"]
+        client.start_capture(sample_count=5000)
+        client.wait_capture()
+        with pytest.raises(McpError, match="did not finish"):
+            client.wait_decoded([aid], timeout=0.2)
+
+    def test_unknown_analyzer(self, client):
+        with pytest.raises(McpError, match="not active"):
+            client.wait_decoded(["9:9"], timeout=1.0)
+
+
+class TestCaptureAndDecode:
+    def test_waits_for_decoding(self, server):
+        with _pxview(server) as pxv:
+            results = pxv.capture_and_decode("demo", "i2c", I2C, sample_count=5000)
+        anns = results["annotations"] if isinstance(results, dict) else results
+        assert anns and anns[0]["texts"][0] == "Start"
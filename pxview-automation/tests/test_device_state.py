@@ -0,0 +1,106 @@
+"""Tests for active-device tracking and the connect_device readiness wait."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from pxview_automation import McpError, ServiceEvent
+from pxview_automation.testing import DEMO_DEVICE_ID
+
+I2C = {"channelMap": {"scl": 0, "sda": 1}}
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestConnectDevice:
+    def test_returns_without_fixed_sleep(self, server, client):
+        t0 = time.monotonic()
+        result = client.connect_device(DEMO_DEVICE_ID)
+        assert time.monotonic() - t0 < 0.5
+        assert result["success"]
+        assert client.active_device == DEMO_DEVICE_ID
+
+    def test_waits_until_device_is_active(self, server, client):
+        client.disconnect_device()
+        server.device_ready_delay = 0.3
+        t0 = time.monotonic()
+        client.connect_device(DEMO_DEVICE_ID)
+        assert 0.3 <= time.monotonic() - t0 < 1.0
+        assert server.call_count("get_devices") > 1
+        assert client.get_devices()[0]["is_active"]
+
+    def test_ready_timeout(self, server, client):
+        client.disconnect_device()
+        server.device_ready_delay = 5.0
+        with pytest.raises(McpError, match="not active"):
+            client.connect_device(DEMO_DEVICE_ID, ready_timeout=0.1)
+        assert client.active_device is None
+
+    def test_connect_failure_propagates(self, client):
+        with pytest.raises(McpError):
+            client.connect_device("no-such-device")
+        assert client.active_device is None
+
+
+class TestEnsureDevice:
+    def test_skips_active_device(self, server, client):
+        assert client.ensure_device(DEMO_DEVICE_ID) is False
+        assert server.call_count("connect_device") == 0
+        assert client.active_device == DEMO_DEVICE_ID
+
+    def test_connects_inactive_device(self, server, client):
+        client.disconnect_device()
+        assert client.active_device is None
+        assert client.ensure_device(DEMO_DEVICE_ID) is True
+        assert server.call_count("connect_device") == 1
+
+    def test_add_analyzer_connects_once(self, server, client):
+        client.disconnect_device()
+        t0 = time.monotonic()
+        for _ in range(16):
+            client.add_analyzer("i2c", I2C, device_id=DEMO_DEVICE_ID)
+        assert time.monotonic() - t0 < 2.0
+        assert server.call_count("connect_device") == 1
+        assert len(client.get_active_decoders()) == 16
+
+    def test_add_analyzer_unknown_device_raises(self, server, client):
+        with pytest.raises(McpError):
+            client.add_analyzer("i2c", I2C, device_id="no-such-device")
+        assert server.call_count("add_analyzer") == 0
+
+    def test_without_events_checks_each_time(self, server, client):
+        before = server.call_count("get_devices")
+        for _ in range(3):
+            client.ensure_device(DEMO_DEVICE_ID)
+        assert server.call_count("get_devices") - before == 3
+
+    def test_events_make_tracking_trusted(self, server, client):
+        client.on("*", lambda e: None)
+        client.ensure_device(DEMO_DEVICE_ID)
+        before = server.call_count("get_devices")
+        for _ in range(3):
+            assert client.ensure_device(DEMO_DEVICE_ID) is False
+        assert server.call_count("get_devices") == before
+
+    def test_device_event_forgets_device(self, server, client):
+        client.on("*", lambda e: None)
+        client.ensure_device(DEMO_DEVICE_ID)
+        server.emit_event(ServiceEvent.DEVICE_DETACHED)
+        assert _wait_for(lambda: client.active_device is None)
+
+    def test_switching_tools_forget_device(self, server, client):
+        client.ensure_device(DEMO_DEVICE_ID)
+        client.set_active_session(1)
+        assert client.active_device is None
+        client.ensure_device(DEMO_DEVICE_ID)
+        client.disconnect()
+        assert client.active_device is None
@@ -0,0 +1,190 @@
+"""Tests for service event subscriptions (no PXView required)."""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from pxview_automation import ConfigError, McpClient, McpConnectionError, McpError, PXView
+from pxview_automation._ws import OPCODE_TEXT, WebSocket
+from pxview_automation.events import Event, EventStream
+from pxview_automation.types import ServiceEvent
+
+
+def _notification(method, params, topic="misc", version=1):
+    return {
+        "type": "notification", "topic": topic, "method": method,
+        "params": params, "version": version, "timestamp": 1000 + version,
+    }
+
+
+class _EventServer:
+    """Loopback WS server: ack one subscribe, push *notifications*, then idle."""
+
+    def __init__(self, notifications):
+        self.notifications = notifications
+        self.subscribe_params = None
+        self.done = threading.Event()
+        self._listener = socket.socket()
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(1)
+        self.url = f"ws://127.0.0.1:{self._listener.getsockname()[1]}"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        conn, _ = self._listener.accept()
+        ws = WebSocket.accept(conn)
+        opcode, payload = ws.recv()
+        assert opcode == OPCODE_TEXT
+        req = json.loads(payload)
+        self.subscribe_params = req["params"]
+        ws.send_text(json.dumps({"jsonrpc": "2.0", "id": req["id"],
+                                 "result": {"subscribed": req["params"]["topics"]}}))
+        for n in self.notifications:
+            ws.send_text(json.dumps(n))
+        self.done.wait(5)
+        ws.close()
+        self._listener.close()
+
+
+class TestEvent:
+    def test_named_method(self):
+        ev = Event.from_dict(_notification(
+            "on_capture_state_changed", {"state": "stopped"}, topic="capture_state"))
+        assert ev.event is ServiceEvent.CAPTURE_STATE_CHANGED
+        assert ev.name == "CaptureStateChanged"
+        assert ev.params == {"state": "stopped"}
+
+    def test_generic_on_event(self):
+        ev = Event.from_dict(_notification(
+            "on_event", {"event": 301, "params": {"progress": "40"}}, topic="glitch_filter"))
+        assert ev.event is ServiceEvent.GLITCH_FILTER_PROGRESS
+        assert ev.params == {"progress": "40"}
+
+    def test_unknown_code(self):
+        ev = Event.from_dict(_notification("on_event", {"event": 12345}))
+        assert ev.event is None
+        assert ev.name == "on_event"
+
+    def test_service_event_names(self):
+        assert ServiceEvent.from_name("DecodeDone") is ServiceEvent.DECODE_DONE
+        assert ServiceEvent.from_name("NEW_USB_DEVICE") is ServiceEvent.NEW_USB_DEVICE
+        with pytest.raises(ValueError):
+            ServiceEvent.from_name("Nope")
+
+
+class TestEventStream:
+    def test_subscribe_handlers_and_queue(self):
+        server = _EventServer([
+            _notification("on_data_updated", {"samples": "10"}, "data_updated", 1),
+            _notification("on_capture_state_changed", {"state": "running"}, "capture_state", 2),
+            _notification("on_capture_state_changed", {"state": "stopped"}, "capture_state", 3),
+        ])
+        seen = []
+        events = EventStream(server.url, ["capture_state", "data_updated"])
+        events.on("DataUpdated", lambda e: seen.append(e.params["samples"]))
+        with events:
+            ev = events.wait_for(
+                ServiceEvent.CAPTURE_STATE_CHANGED,
+                lambda e: e.params.get("state") == "stopped",
+                timeout=5,
+            )
+            server.done.set()
+        assert server.subscribe_params == {"topics": ["capture_state", "data_updated"]}
+        assert ev.version == 3
+        assert seen == ["10"]
+
+    def test_wait_for_timeout(self):
+        server = _EventServer([])
+        with EventStream(server.url, ["decode"]) as events:
+            assert events.wait_for("DecodeDone", timeout=0.05) is None
+            server.done.set()
+
+    def test_drop_oldest(self):
+        events = EventStream(max_queue=2)
+        for v in (1, 2, 3):
+            events._deliver(Event(ServiceEvent.DATA_UPDATED, "data_updated", "", version=v))
+        assert [e.version for e in events.drain()] == [2, 3]
+        assert events.dropped == 1
+
+    def test_drop_newest(self):
+        events = EventStream(max_queue=2, drop_policy="drop_newest")
+        for v in (1, 2, 3):
+            events._deliver(Event(ServiceEvent.DATA_UPDATED, "data_updated", "", version=v))
+        assert [e.version for e in events.drain()] == [1, 2]
+        assert events.dropped == 1
+
+    def test_handler_errors_are_counted(self):
+        events = EventStream()
+        events.on("*", lambda e: 1 / 0)
+        events._deliver(Event(ServiceEvent.DATA_UPDATED, "data_updated", ""))
+        assert events.handler_errors == 1
+        assert isinstance(events.last_error, ZeroDivisionError)
+
+    def test_invalid_drop_policy(self):
+        with pytest.raises(ConfigError):
+            EventStream(drop_policy="lossy")
+
+    def test_unknown_event_name(self):
+        with pytest.raises(ConfigError):
+            EventStream().on("NotAnEvent", print)
+
+
+class TestClientEvents:
+    def test_default_ws_url(self):
+        assert McpClient("http://10.0.0.5:10110/mcp").ws_url == "ws://10.0.0.5:10430"
+        assert PXView(port=10111, ws_port=10431).client.ws_url == "ws://127.0.0.1:10431"
+
+    def test_unreachable_ws(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        client = McpClient(ws_url=f"ws://127.0.0.1:{port}")
+        with pytest.raises(McpConnectionError):
+            client.events(["capture_state"])
+
+
+class TestPXViewCaptureEvents:
+    def _pxv(self):
+        pxv = PXView()
+        pxv._client = MagicMock()
+        pxv._client.get_capture_status.return_value = {"state": "stopped"}
+        return pxv
+
+    def test_capture_waits_on_events(self):
+        pxv = self._pxv()
+        stream = MagicMock()
+        stream.wait_for.return_value = Event(
+            ServiceEvent.CAPTURE_STATE_CHANGED, "capture_state", "", {"state": "stopped"})
+        pxv._client.events.return_value = stream
+
+        status = pxv.capture("demo", channels=[0], duration_s=0.1)
+
+        assert status == {"state": "stopped"}
+        pxv._client.events.assert_called_once_with(["capture_state", "error"])
+        pxv._client.wait_capture.assert_not_called()
+        stream.close.assert_called_once()
+
+    def test_capture_falls_back_without_ws(self):
+        pxv = self._pxv()
+        pxv._client.events.side_effect = McpConnectionError("refused")
+
+        pxv.capture("demo", channels=[0], duration_s=0.1)
+
+        pxv._client.wait_capture.assert_called_once()
+
+    def test_capture_timeout(self):
+        pxv = self._pxv()
+        stream = MagicMock()
+        stream.wait_for.return_value = None
+        stream.is_open = True
+        pxv._client.events.return_value = stream
+
+        with pytest.raises(McpError, match="did not complete"):
+            pxv.capture("demo", channels=[0], wait_timeout_s=0.01)
+        stream.close.assert_called_once()
@@ -0,0 +1,306 @@
+"""Tests for client-side streamed exports (FakePXViewServer, no PXView required)."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from pxview_automation import ConfigError, McpClient, McpError
+from pxview_automation.exports import (
+    VcdFile,
+    _format_radix,
+    _iso8601,
+    _prefetch,
+    iter_annotations,
+    iter_binary,
+    iter_csv,
+    iter_export,
+    iter_hex,
+    verify_export,
+)
+from pxview_automation.testing import FakePXViewServer
+
+pytestmark = pytest.mark.fake_server(pattern="i2c", capture=200_000)
+
+
+@pytest.fixture
+def i2c(client):
+    return client.add_analyzer("i2c", {"channelMap": {"scl": 0, "sda": 1}})["analyzerId"]
+
+
+class TestDataTable:
+    def test_csv_matches_server_export(self, client, i2c, tmp_path):
+        server_path = tmp_path / "server.csv"
+        client.export_data_table_csv(str(server_path), i2c)
+        out = io.StringIO()
+        rows = client.export_data_table_stream(out, i2c, page_size=37)
+        expected = server_path.read_text(encoding="utf-8")
+        assert out.getvalue() == expected
+        assert rows == expected.count("\n") - 1
+
+    def test_pages_do_not_drop_or_repeat(self, client, i2c):
+        everything = client.get_analyzer_results(i2c, max_count=10 ** 6, since_version=0)
+        paged = [a for page, _ in iter_annotations(client, i2c, page_size=5) for a in page]
+        assert paged == everything["annotations"]
+        assert [a["ann_class"] for a in paged] == sorted(a["ann_class"] for a in paged)
+
+    def test_forgotten_version_resumes(self, server, client, i2c):
+        pages = iter_annotations(client, i2c, page_size=7)
+        first, names = next(pages)
+        assert names[0] == "start"
+        server._ann_journals.clear()  # the server evicted our version
+        rest = [a for page, _ in pages for a in page]
+        everything = client.get_analyzer_results(i2c, max_count=10 ** 6, since_version=0)
+        assert first + rest == everything["annotations"]
+
+    def test_numeric_flag(self, client, i2c):
+        anns = client.get_analyzer_results(i2c, end_sample=2000)["annotations"]
+        assert {a["ann_class"] for a in anns if a.get("numeric")} == {7, 9}
+        assert not any("numeric" in a for a in anns if a["ann_class"] in (0, 2, 3))
+        table = client.get_analyzer_results(i2c, end_sample=2000, format="columnar")
+        assert [row.numeric for row in table] == [bool(a.get("numeric")) for a in anns]
+        assert table.to_dicts() == anns
+
+    def test_ndjson_to_path(self, client, i2c, tmp_path):
+        path = tmp_path / "i2c.ndjson"
+        rows = client.export_data_table_stream(str(path), i2c, format="ndjson")
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == rows > 0
+        first = json.loads(lines[0])
+        assert first["analyzer_id"] == i2c
+        assert first["class_name"] and first["text"]
+
+    def test_columnar_multi_analyzer(self, server, client, i2c):
+        server.annotations = 50
+        uart = client.add_analyzer("uart", {"channelMap": {"rxtx": 2}})["analyzerId"]
+        out = io.BytesIO()
+        rows = client.export_data_table_stream(
+            out, analyzers=[{"analyzerId": i2c}, {"analyzerId": uart, "radixType": 3}],
+            format="columnar", page_size=100)
+        pages = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert {p["analyzer_id"] for p in pages} == {i2c, uart}
+        assert sum(len(p["text"]) for p in pages) == rows
+        assert all(len(p["start_sample"]) == len(p["text"]) for p in pages)
+
+    def test_iso8601_matches_server_export(self, client, i2c, tmp_path):
+        server_path = tmp_path / "server.csv"
+        client.export_data_table_csv(str(server_path), i2c, iso8601_timestamp=True)
+        out = io.StringIO()
+        client.export_data_table_stream(out, i2c, iso8601_timestamp=True)
+        assert out.getvalue() == server_path.read_text(encoding="utf-8")
+        assert out.getvalue().splitlines()[1].startswith("1970-01-01T00:00:00.")
+
+    def test_bad_arguments(self, client, i2c):
+        with pytest.raises(ConfigError):
+            client.export_data_table_stream(io.StringIO(), i2c, format="xml")
+        with pytest.raises(ConfigError):
+            client.export_data_table_stream(io.StringIO())
+
+
+class TestFormatting:
+    @pytest.mark.parametrize("text, numeric, radix, expected", [
+        ("0x1F", True, 1, "0b11111"),
+        ("0x1F", True, 2, "31"),
+        ("31", True, 3, "0x1f"),
+        ("017", True, 2, "15"),
+        ("Data write: 1F", True, 3, "Data write: 1F"),
+        ("0x1F", True, 4, "0x1F"),
+        ("31", False, 3, "31"),
+    ])
+    def test_radix(self, text, numeric, radix, expected):
+        ann = {"texts": [text], "numeric": True} if numeric else {"texts": [text]}
+        assert _format_radix(ann, radix) == expected
+
+    def test_iso8601(self):
+        assert _iso8601(1_500_000, 1_000_000) == "1970-01-01T00:00:01.500Z"
+
+
+@pytest.mark.fake_server(pattern="random", seed=3, sample_rate=2_000_000, capture=10_007)
+class TestRawStream:
+    @pytest.mark.parametrize("fmt", ["csv", "binary", "vcd", "hex", "bits"])
+    def test_matches_server_export(self, server, client, tmp_path, fmt):
+        client.export_raw_data(fmt, str(tmp_path / "server"), digital_channels=[2, 5])
+        written = client.export_raw_data_stream(
+            fmt, str(tmp_path / "local"), [2, 5], chunk_bytes=1000, prefetch=2)
+        names = [f"channel_{ch}.{'bin' if fmt == 'binary' else fmt}" for ch in (2, 5)]
+        assert list(written) == names
+        for name in names:
+            expected = (tmp_path / "server" / name).read_bytes()
+            assert (tmp_path / "local" / name).read_bytes() == expected
+            assert written[name] == len(expected)
+        assert not server._export_streams
+
+    def test_follows_export_range(self, client):
+        samples = bytes(client.get_samples(4, "logic", 100, 400))
+        client.set_export_config(100, 400)
+        out = io.BytesIO()
+        client.export_raw_data_stream("vcd", out, [4], chunk_bytes=64)
+        body = out.getvalue().decode().split("$enddefinitions $end\n")[1].splitlines()
+        changes = [i for i in range(300) if i == 0 or samples[i] != samples[i - 1]]
+        assert body[:-1] == [f"#{i * 500} {samples[i]}!" for i in changes]  # 2 MHz → 500 ns
+        assert body[-1] == "#150000"
+
+    def test_analog(self, server, client, tmp_path):
+        client.switch_work_mode(2)
+        server.capture(3_000)
+        client.export_raw_data("csv", str(tmp_path / "server"), analog_channels=[1])
+        written = client.export_raw_data_stream("csv", str(tmp_path / "local"),
+                                                       analog_channels=[1])
+        assert list(written) == ["analog_1.csv"]
+        assert ((tmp_path / "local" / "analog_1.csv").read_bytes()
+                == (tmp_path / "server" / "analog_1.csv").read_bytes())
+        with pytest.raises(McpError, match="csv or binary"):
+            client.export_raw_data_stream("vcd", io.BytesIO(), analog_channels=[1])
+        assert not server._export_streams
+
+    def test_read_retry_returns_same_chunk(self, client):
+        stream_id = client.open_export_stream("csv", 0)["streamId"]
+        first = client.read_export_stream(stream_id, 0, max_bytes=100)
+        assert client.read_export_stream(stream_id, 0, max_bytes=100) == first
+        with pytest.raises(McpError, match="is at offset 100"):
+            client.read_export_stream(stream_id, 50)
+        second = client.read_export_stream(stream_id, 100, max_bytes=100)
+        assert second["offset"] == 100 and len(second["data"]) == 100
+        client.close_export_stream(stream_id)
+        with pytest.raises(McpError, match="Unknown export stream"):
+            client.read_export_stream(stream_id, 200)
+
+    def test_capture_closes_open_streams(self, client):
+        stream_id = client.open_export_stream("csv", 0)["streamId"]
+        client.read_export_stream(stream_id, 0, max_bytes=100)
+        client.start_capture()
+        with pytest.raises(McpError, match="Unknown export stream"):
+            client.read_export_stream(stream_id, 100)
+
+    def test_blob_chunks_and_expiry(self, server, tmp_path):
+        with McpClient(server.url, retry_delay=0.01, blob_threshold=1000,
+                       auto_connect=True) as c:
+            c.export_raw_data("csv", str(tmp_path), digital_channels=[1])
+            server.inject_failure("blob", kind="tool")  # first handle expires
+            out = io.BytesIO()
+            c.export_raw_data_stream("csv", out, [1], chunk_bytes=4096)
+            assert out.getvalue() == (tmp_path / "channel_1.csv").read_bytes()
+            assert c.stats().tools["read_export_stream/blob"].calls >= 2
+        reads = [args for name, args in server.calls if name == "read_export_stream"]
+        assert reads[0]["offset"] == reads[1]["offset"] == 0
+        assert "blobMinBytes" not in reads[1]
+
+    def test_gzip(self, client, tmp_path):
+        client.export_raw_data("csv", str(tmp_path / "server"), digital_channels=[3])
+        written = client.export_raw_data_stream(
+            "csv", str(tmp_path / "local"), [3], compression="gzip")
+        with gzip.open(tmp_path / "local" / "channel_3.csv.gz", "rb") as fh:
+            assert fh.read() == (tmp_path / "server" / "channel_3.csv").read_bytes()
+        assert written["channel_3.csv"] == (tmp_path / "server" / "channel_3.csv").stat().st_size
+
+    def test_errors(self, server, client, tmp_path):
+        with pytest.raises(ConfigError, match="Unsupported export format"):
+            client.export_raw_data_stream("wav", str(tmp_path), [0])
+        with pytest.raises(ConfigError, match="exactly one channel"):
+            client.export_raw_data_stream("csv", io.BytesIO(), [0, 1])
+        with pytest.raises(ConfigError, match="binary sink"):
+            client.export_raw_data_stream("csv", io.StringIO(), [0])
+        with pytest.raises(ConfigError, match="compression"):
+            client.export_raw_data_stream("csv", io.BytesIO(), [0], compression="lz4")
+        assert not server._export_streams  # closed even when writing fails
+
+    def test_server_without_stream_tool(self, client, tmp_path):
+        client._tools = [t for t in client._tools
+                                if t["name"] != "open_export_stream"]
+        with pytest.raises(McpError, match="export_raw_data"):
+            client.export_raw_data_stream("csv", str(tmp_path), [0])
+
+    def test_prefetch_is_bounded(self):
+        produced = []
+        lock = threading.Lock()
+
+        def chunks():
+            for i in range(100):
+                with lock:
+                    produced.append(i)
+                yield bytes(1000)
+
+        it = _prefetch(chunks(), depth=2)
+        next(it)
+        time.sleep(0.3)  # slow consumer: the reader must stall
+        with lock:
+            assert len(produced) <= 4
+        assert sum(len(c) for c in it) == 99_000
+
+
+class TestParsers:
+    @pytest.fixture
+    def capture(self, tmp_path):
+        with FakePXViewServer(pattern="random", seed=11, sample_rate=1_000_000) as srv:
+            srv.capture(5_003)
+            c = McpClient(srv.url, ws_url=srv.ws_url)
+            c.connect()
+            yield c, tmp_path
+
+    @pytest.mark.parametrize("fmt", ["csv", "binary", "vcd", "hex", "bits"])
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_round_trip(self, capture, fmt, compression):
+        client, tmp_path = capture
+        client.export_raw_data_stream(fmt, str(tmp_path), [6], compression=compression)
+        suffix = {"binary": "bin"}.get(fmt, fmt) + (".gz" if compression else "")
+        path = tmp_path / f"channel_6.{suffix}"
+        chunks = list(iter_export(path, sample_rate=1_000_000, sample_count=5_003,
+                                  chunk_samples=1000))
+        assert all(c.typecode == "B" for c in chunks)
+        assert [len(c) for c in chunks] == [1000] * 5 + [3]
+        assert b"".join(c.tobytes() for c in chunks) == bytes(client.get_samples(6, "logic"))
+        assert verify_export(client, path, 6, sample_rate=1_000_000, end_sample=5_003) == {
+            "samples": 5_003, "first_mismatch": None, "length_match": True}
+
+    def test_server_export_verifies(self, capture):
+        client, tmp_path = capture
+        client.export_raw_data("csv", str(tmp_path), digital_channels=[2])
+        result = verify_export(client, tmp_path / "channel_2.csv", 2)
+        assert result["first_mismatch"] is None and result["length_match"]
+
+    def test_mismatch_is_located(self, capture):
+        client, tmp_path = capture
+        client.export_raw_data_stream("binary", str(tmp_path), [1])
+        path = tmp_path / "channel_1.bin"
+        data = bytearray(path.read_bytes())
+        data[4321 // 8] ^= 1 << (4321 % 8)
+        path.write_bytes(bytes(data))
+        result = verify_export(client, path, 1, chunk_samples=1024)
+        assert result["first_mismatch"] == 4321
+
+    def test_binary_padding(self, tmp_path):
+        path = tmp_path / "x.bin"
+        path.write_bytes(bytes([0b00000101, 0b11111111]))
+        assert list(next(iter_binary(path))) == [1, 0, 1, 0, 0, 0, 0, 0] + [1] * 8
+        assert list(next(iter_binary(path, sample_count=10))) == [1, 0, 1, 0, 0, 0, 0, 0, 1, 1]
+
+    def test_hex_msb_first_and_trigger_lines(self, tmp_path):
+        path = tmp_path / "x.hex"
+        path.write_text("libsigrok 0.6.0\nAcquisition with 1/1 channels at 1 MHz\n"
+                        "D0:a0 01\nT:   ^ 3\n")
+        assert list(next(iter_hex(path, sample_count=12))) == [1, 0, 1, 0] + [0] * 8
+
+    def test_csv_columns(self, tmp_path):
+        path = tmp_path / "x.csv"
+        path.write_text("Time(s),D0,A0\n0.0,1,0.5\n0.1,0,-1.25\n")
+        assert list(next(iter_csv(path, "D0"))) == [1, 0]
+        assert list(next(iter_csv(path, typecode="d"))) == [0.5, -1.25]
+        with pytest.raises(ConfigError):
+            next(iter_csv(path, "D7"))
+
+    def test_vcd_changes(self, tmp_path):
+        path = tmp_path / "x.vcd"
+        path.write_text("$timescale 10 ns $end\n$scope module top $end\n"
+                        "$var wire 1 ! clk $end\n$var wire 4 # bus $end\n"
+                        "$upscope $end\n$enddefinitions $end\n"
+                        "#0 0! b1010 #\n#5\n1!\n#10 0!\n#20\n")
+        vcd = VcdFile(path)
+        assert vcd.signals == {"!": "clk", "#": "bus"}
+        assert vcd.timescale == pytest.approx(1e-8)
+        assert list(vcd.changes())[:3] == [(0, "!", "0"), (0, "#", "1010"), (5, "", "")]
+        assert list(next(vcd.samples(200_000_000, "clk"))) == [0] * 10 + [1] * 10 + [0] * 20
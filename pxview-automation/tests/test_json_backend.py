@@ -0,0 +1,77 @@
+"""Tests for the pluggable JSON backend (orjson / ujson / stdlib)."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pxview_automation import ConfigError, McpClient, _json, json_backend, set_json_backend
+from pxview_automation.testing import FakePXViewServer
+
+BACKENDS = _json.available_backends()
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = json_backend()
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend(previous)
+
+
+class TestCodec:
+    def test_stdlib_always_available(self):
+        assert BACKENDS[-1] == "json"
+        assert json_backend() == BACKENDS[0]
+
+    def test_round_trip(self, backend):
+        value = {"id": 1, "text": "Data write: 0x50 / ACK", "unicode": "µs",
+                 "nested": [1.5, None, True, {"k": []}]}
+        encoded = _json.dumps(value)
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == value
+        assert _json.loads(encoded) == value
+        assert _json.loads(encoded.decode()) == value
+
+    def test_falls_back_to_stdlib(self, backend):
+        assert json.loads(_json.dumps({"big": 1 << 70})) == {"big": 1 << 70}
+        with pytest.raises(TypeError):
+            _json.dumps({"obj": object()})
+
+    def test_invalid_input_is_value_error(self, backend):
+        with pytest.raises(ValueError):
+            _json.loads(b"{not json")
+
+    def test_set_backend_errors(self):
+        with pytest.raises(ConfigError, match="Unknown JSON backend"):
+            set_json_backend("simplejson")
+        previous = json_backend()
+        assert set_json_backend(None) == BACKENDS[0]
+        set_json_backend(previous)
+
+
+class TestClient:
+    def test_calls_and_sse(self, backend):
+        with FakePXViewServer(pattern="i2c", capture_time=0.2) as server:
+            with McpClient(server.url, auto_connect=True) as client:
+                client.start_capture()
+                assert client.wait_capture(timeout_seconds=10) == {"completed": True}
+                aid = client.add_analyzer("i2c", {"channelMap": {"scl": 0, "sda": 1}})
+                anns = client.get_analyzer_results(aid["analyzerId"])["annotations"]
+                assert anns and anns[0]["texts"]
+                client.structured_content = False
+                assert client.get_analyzer_results(aid["analyzerId"])["annotations"] == anns
+
+    def test_event_subscribe(self, backend):
+        with FakePXViewServer() as server:
+            client = McpClient(server.url, ws_url=server.ws_url)
+            with client.events(["capture_state"]) as stream:
+                server.capture(1000)
+                event = stream.get(timeout=2)
+                assert event is not None and event.params["state"] == "running"
+
+    def test_sse_skips_progress_events(self, backend):
+        text = ("event: progress\ndata: {broken\n\n"
+                'event: result\ndata: {"jsonrpc":"2.0","id":3,"result":{}}\n')
+        assert McpClient._parse_sse_response(text)["id"] == 3
@@ -0,0 +1,139 @@
+"""Tests for PXViewPool with mocked processes (no PXView required)."""
+
+from __future__ import annotations
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pxview_automation import McpConnectionError, ProcessError, PXViewPool
+from pxview_automation._utils import find_free_port
+
+
+class _FakeProcess:
+    instances: list = []
+
+    def __init__(self, exe_path=None, port=10110, ws_port=10430, log_level=-1,
+                 store_log=False, startup_timeout=30.0, config_dir=None):
+        self.port = port
+        self.ws_port = ws_port
+        self.config_dir = config_dir
+        self.running = False
+        _FakeProcess.instances.append(self)
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    @property
+    def is_running(self):
+        return self.running
+
+
+def _fake_pxview(port, ws_port, timeout):
+    pxv = MagicMock()
+    pxv.port = port
+    pxv.client.ping.return_value = True
+    return pxv
+
+
+@pytest.fixture
+def pool(tmp_path):
+    _FakeProcess.instances = []
+    with patch("pxview_automation.pool.PXViewProcess", _FakeProcess), \
+            patch("pxview_automation.pool.PXView", side_effect=_fake_pxview):
+        with PXViewPool(size=3, config_root=str(tmp_path)) as p:
+            yield p
+
+
+def _proc_for(pxv):
+    return next(p for p in _FakeProcess.instances if p.port == pxv.port)
+
+
+class TestPXViewPool:
+    def test_isolated_ports_and_config_dirs(self, pool):
+        procs = pool.processes
+        assert len(procs) == 3
+        assert len({p.port for p in procs} | {p.ws_port for p in procs}) == 6
+        assert len({p.config_dir for p in procs}) == 3
+        assert all(os.path.basename(p.config_dir).startswith("instance-") for p in procs)
+
+    def test_map_preserves_order(self, pool):
+        active = set()
+        lock = threading.Lock()
+
+        def job(pxv, n):
+            with lock:
+                assert pxv.port not in active  # leases are exclusive
+                active.add(pxv.port)
+            with lock:
+                active.discard(pxv.port)
+            return n * n
+
+        assert pool.map(job, range(20)) == [n * n for n in range(20)]
+
+    def test_crashed_instance_is_restarted_and_job_retried(self, pool):
+        crashed = []
+
+        def job(pxv, n):
+            if n == 1 and not crashed:
+                proc = _proc_for(pxv)
+                crashed.append(proc)
+                proc.running = False
+                raise McpConnectionError("connection reset")
+            return n
+
+        assert pool.map(job, [0, 1, 2]) == [0, 1, 2]
+        assert pool.restarts == 1
+        assert crashed[0] not in pool.processes
+        assert len(pool.processes) == 3
+
+    def test_retries_exhausted(self, pool):
+        def job(pxv, n):
+            _proc_for(pxv).running = False
+            raise McpConnectionError("down")
+
+        with pytest.raises(McpConnectionError):
+            pool.map(job, [0], retries=1)
+        assert pool.restarts == 2
+
+    def test_other_errors_propagate_without_restart(self, pool):
+        def job(pxv, n):
+            raise ValueError("bad job")
+
+        with pytest.raises(ValueError):
+            pool.map(job, [0])
+        assert pool.restarts == 0
+
+    def test_health_check_restarts_dead_instances(self, pool):
+        pool.processes[0].running = False
+        assert pool.health_check() == [0]
+        assert all(p.is_running for p in pool.processes)
+
+    def test_lease_timeout(self, pool):
+        with pool.lease(), pool.lease(), pool.lease():
+            with pytest.raises(ProcessError, match="No idle"):
+                with pool.lease(timeout=0.01):
+                    pass
+
+    def test_all_instances_dropped(self, pool):
+        pool.max_restarts = 0
+        for _ in range(3):
+            with pool.lease() as pxv:
+                _proc_for(pxv).running = False
+        with pytest.raises(ProcessError, match="have failed"):
+            with pool.lease():
+                pass
+
+    def test_not_started(self):
+        with pytest.raises(ProcessError, match="not started"):
+            with PXViewPool().lease():
+                pass
+
+
+def test_find_free_port():
+    assert 0 < find_free_port() < 65536
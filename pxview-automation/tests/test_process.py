@@ -0,0 +1,139 @@
+"""Tests for PXViewProcess startup against a fake PXView executable."""
+
+from __future__ import annotations
+
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+from pxview_automation import ProcessError, PXViewProcess
+from pxview_automation._utils import find_free_port
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="fake executable is a POSIX script"
+)
+
+# Minimal stand-in for ``PXView --headless``: answers every POST with an
+# empty JSON-RPC result and honours --ready-file unless FAKE_NO_READY is set.
+# FAKE_OLD_BUILD makes it exit 0 on --ready-file, like builds that predate it;
+# FAKE_ARGS_LOG names a file each launch appends its arguments to.
+_FAKE_PXVIEW = textwrap.dedent('''\
+    #!{python}
+    import argparse, json, os, sys
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    p = argparse.ArgumentParser()
+    p.add_argument("--headless", action="store_true")
+    p.add_argument("--port", type=int, default=10110)
+    p.add_argument("--ws-port", type=int, default=10430)
+    p.add_argument("--ready-file")
+    p.add_argument("--config-dir")
+    args = p.parse_args()
+    if os.environ.get("FAKE_ARGS_LOG"):
+        with open(os.environ["FAKE_ARGS_LOG"], "a") as f:
+            f.write(" ".join(sys.argv[1:]) + "\\n")
+    if args.ready_file and os.environ.get("FAKE_OLD_BUILD"):
+        raise SystemExit(0)
+    if os.environ.get("FAKE_EXIT"):
+        raise SystemExit(1)
+
+    class H(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps({{"jsonrpc": "2.0", "id": 0, "result": {{}}}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *a):
+            pass
+
+    server = HTTPServer(("127.0.0.1", args.port), H)
+    if args.ready_file and not os.environ.get("FAKE_NO_READY"):
+        with open(args.ready_file + ".tmp", "w") as f:
+            f.write("mcp_port=%d\\nws_port=%d\\npid=%d\\ninit_ms=12\\nstart_ms=3\\n"
+                    % (args.port, args.ws_port, os.getpid()))
+        os.replace(args.ready_file + ".tmp", args.ready_file)
+    server.serve_forever()
+''')
+
+
+@pytest.fixture
+def fake_exe(tmp_path):
+    path = tmp_path / "PXView"
+    path.write_text(_FAKE_PXVIEW.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+class TestStartup:
+    def test_ready_file_handshake(self, fake_exe):
+        with PXViewProcess(fake_exe, port=find_free_port()) as proc:
+            assert proc.is_running
+            assert proc.server_pid == proc.process.pid
+            timings = proc.startup_timings
+            assert timings["server_init"] == pytest.approx(0.012)
+            assert timings["server_start"] == pytest.approx(0.003)
+            assert 0 < timings["spawn"] <= timings["ready"] <= timings["total"]
+        assert not proc.is_running
+
+    def test_ping_fallback_without_ready_file(self, fake_exe, monkeypatch):
+        monkeypatch.setenv("FAKE_NO_READY", "1")
+        with PXViewProcess(fake_exe, port=find_free_port()) as proc:
+            assert proc.is_running
+            assert "server_init" not in proc.startup_timings
+
+    def test_old_build_relaunched_without_ready_file(self, fake_exe, tmp_path,
+                                                     monkeypatch):
+        log = tmp_path / "args.log"
+        monkeypatch.setenv("FAKE_OLD_BUILD", "1")
+        monkeypatch.setenv("FAKE_ARGS_LOG", str(log))
+        for _ in range(2):
+            with PXViewProcess(fake_exe, port=find_free_port()) as proc:
+                assert proc.is_running
+                assert "server_init" not in proc.startup_timings
+        launches = log.read_text().splitlines()
+        # Only the very first launch tries the option.
+        assert ["--ready-file" in args for args in launches] == [True, False, False]
+
+    def test_process_exit_fails_fast(self, fake_exe, monkeypatch):
+        monkeypatch.setenv("FAKE_EXIT", "1")
+        with pytest.raises(ProcessError, match="did not become reachable"):
+            PXViewProcess(fake_exe, port=find_free_port(), startup_timeout=10).start()
+
+
+class TestShared:
+    def test_second_session_attaches(self, fake_exe, tmp_path):
+        state = str(tmp_path / "pxview.json")
+        first = PXViewProcess.shared(state, fake_exe, port=find_free_port())
+        try:
+            first.stop()  # keep_alive: a plain stop leaves it running
+            assert first.is_running
+
+            second = PXViewProcess.shared(state, fake_exe, port=find_free_port())
+            assert second.process is None
+            assert second.port == first.port
+            assert second.server_pid == first.server_pid
+            assert "attach" in second.startup_timings
+            assert second.is_running
+        finally:
+            first.stop(force=True)
+        assert not first.is_running
+
+    def test_stale_state_starts_new_instance(self, fake_exe, tmp_path):
+        state = tmp_path / "pxview.json"
+        dead_port = find_free_port()
+        state.write_text(f'{{"mcp_port": {dead_port}, "ws_port": 1, "pid": 1}}')
+        port = find_free_port()
+        proc = PXViewProcess.shared(str(state), fake_exe, port=port)
+        try:
+            assert proc.process is not None
+            assert proc.port == port
+            assert str(port) in state.read_text()
+        finally:
+            proc.stop(force=True)
+        assert not os.path.exists(str(state) + ".tmp")
@@ -0,0 +1,189 @@
+"""Tests for DeviceProfile and PXView.apply_profile."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from pxview_automation import (
+    CouplingType,
+    DeviceProfile,
+    McpError,
+    ProbeConfig,
+    ProfileResult,
+    PXView,
+)
+
+PROFILE = DeviceProfile(
+    sample_rate=10_000_000,
+    sample_limit=200_000,
+    channels={0: True, 1: True, 2: False, 3: False},
+    channel_names={0: "SCL", 1: "SDA"},
+    trigger={"stage_count": 2},
+    glitch_filter={0: 4, 1: (8, 1)},
+    signal_invert={1: True},
+    config={30001: ("int", 7)},
+)
+
+WRITE_TOOLS = ("switch_work_mode", "set_sample_config", "configure_channel",
+               "configure_channels", "set_config")
+
+
+def _pxview(server, **kwargs):
+    host, port = server.url.split("//")[1].split("/")[0].split(":")
+    return PXView(host, int(port), ws_port=server.ws_port, **kwargs)
+
+
+@pytest.fixture
+def pxv(pxv):
+    pxv.client.set_config(30001, "int", 0)
+    return pxv
+
+
+def _writes(server):
+    """Config-changing calls received (the configure_* tools also read)."""
+    return sum(1 for tool, args in server.calls
+               if tool in WRITE_TOOLS or "channels" in args
+               or (tool == "configure_trigger" and args)
+               or (tool == "configure_probe" and len(args) > 1))
+
+
+def _settle():
+    time.sleep(0.2)  # let the echo events of the previous writes arrive
+
+
+class TestApplyProfile:
+    def test_applies_settings(self, server, pxv):
+        result = pxv.apply_profile(PROFILE)
+        assert isinstance(result, ProfileResult) and result.changed
+        client = pxv.client
+        cfg = client.get_sample_config()
+        assert (cfg["sample_rate"], cfg["sample_limit"]) == (10_000_000, 200_000)
+        channels = client.get_channels()
+        assert [c["enabled"] for c in channels[:4]] == [True, True, False, False]
+        assert [c["name"] for c in channels[:2]] == ["SCL", "SDA"]
+        assert client.configure_trigger()["stage_count"] == 2
+        glitch = client.configure_glitch_filter()
+        assert glitch["channels"] == [0, 1]
+        assert glitch["thresholds"] == [4, 8] and glitch["modes"] == [0, 1]
+        assert client.configure_signal_invert()["channels"] == [1]
+        assert client.get_config(30001, "int")["value"] == 7
+        assert set(result.timings) == {"read", "write", "total"}
+
+    def test_only_changes_are_written(self, server, pxv):
+        pxv.apply_profile(PROFILE)
+        _settle()
+        calls = server.call_count("set_sample_config")
+        result = pxv.apply_profile(DeviceProfile(sample_rate=10_000_000, sample_limit=500))
+        assert result.changes == {"sample_limit": (200_000, 500)}
+        assert result.writes == 1
+        assert server.call_count("set_sample_config") == calls + 1
+        assert server.calls[-1] == ("set_sample_config", {"sampleLimit": 500})
+
+    def test_one_call_for_all_channels(self, server, pxv):
+        result = pxv.apply_profile(DeviceProfile(channels={5: False, 6: False},
+                                                 channel_names={5: "CS"}))
+        assert server.call_count("configure_channels") == 1
+        assert server.call_count("configure_channel") == 0
+        assert set(result.changes) == {"channel[5].enabled", "channel[5].name",
+                                       "channel[6].enabled"}
+
+    def test_unchanged_profile_costs_no_calls(self, server, pxv):
+        pxv.apply_profile(PROFILE)
+        _settle()
+        second = pxv.apply_profile(PROFILE)
+        assert not second.changed and second.writes == 0
+        _settle()
+        before = len(server.calls)
+        third = pxv.apply_profile(PROFILE)
+        assert (third.reads, third.writes) == (0, 0)
+        assert len(server.calls) == before
+
+    def test_external_change_is_noticed(self, server, pxv):
+        pxv.apply_profile(PROFILE)
+        _settle()
+        pxv.apply_profile(PROFILE)
+        pxv.client.set_sample_config(sample_rate=1_000_000)  # e.g. from the GUI
+        _settle()
+        result = pxv.apply_profile(PROFILE)
+        assert result.changes == {"sample_rate": (1_000_000, 10_000_000)}
+
+    def test_without_events_reads_every_time(self, server):
+        with _pxview(server, auto_connect=True) as pxv:
+            pxv.client.set_config(30001, "int", 0)
+            pxv.client.ws_url = "ws://127.0.0.1:1"  # WS unreachable
+            pxv.apply_profile(PROFILE)
+            before = _writes(server)
+            result = pxv.apply_profile(PROFILE)
+            assert result.reads > 0 and result.writes == 0
+            assert _writes(server) == before
+
+    def test_work_mode_switch_rereads(self, server, pxv):
+        profile = DeviceProfile(work_mode=1, probes={0: ProbeConfig(vdiv=500.0,
+                                                                    coupling=CouplingType(1))})
+        result = pxv.apply_profile(profile)
+        assert result.changes["work_mode"] == (0, 1)
+        assert result.changes["probe[0].vdiv"] == (1000.0, 500.0)
+        assert pxv.client.configure_probe(0)["vdiv"] == 500.0
+        _settle()
+        assert not pxv.apply_profile(profile).changed
+
+    def test_clear_glitch_filter(self, server, pxv):
+        pxv.apply_profile(DeviceProfile(glitch_filter={2: 3}))
+        result = pxv.apply_profile(DeviceProfile(glitch_filter={}))
+        assert "glitch_filter" in result.changes
+        assert pxv.client.configure_glitch_filter()["channels"] == []
+
+    def test_signal_invert_compares_inverted_channels(self, server, pxv):
+        profile = DeviceProfile(signal_invert={2: True, 3: False})
+        assert pxv.apply_profile(profile).changes == {"signal_invert": ({}, {2: True})}
+        assert pxv.client.configure_signal_invert() == {
+            "channels": [2], "invert_states": [True], "is_active": True}
+        result = pxv.apply_profile(profile, refresh=True)
+        assert result.reads == 1 and result.writes == 0
+        pxv.apply_profile(DeviceProfile(signal_invert={}))
+        assert pxv.client.configure_signal_invert()["is_active"] is False
+
+    def test_signal_invert_without_channel_list(self, server, pxv, monkeypatch):
+        # Older PXView builds only report whether invert is active.
+        real = server._tool_configure_signal_invert
+
+        def active_only(a):
+            result = real(a)
+            if "channels" not in a:
+                return {"channels": [], "invert_states": [], "is_active": result["is_active"]}
+            return result
+
+        monkeypatch.setattr(server, "_tool_configure_signal_invert", active_only)
+        profile = DeviceProfile(signal_invert={1: True})
+        assert pxv.apply_profile(profile).writes == 1
+        result = pxv.apply_profile(profile)
+        assert (result.reads, result.writes) == (1, 0)
+        assert pxv.apply_profile(DeviceProfile(signal_invert={4: True})).writes == 1
+
+    def test_errors_propagate(self, server, pxv):
+        with pytest.raises(McpError):
+            pxv.apply_profile(DeviceProfile(probes={0: ProbeConfig(vdiv=1.0)}))  # Logic mode
+
+    def test_refresh_rereads(self, server, pxv):
+        pxv.apply_profile(PROFILE)
+        _settle()
+        pxv.apply_profile(PROFILE)
+        assert pxv.apply_profile(PROFILE, refresh=True).reads > 0
+
+
+class TestDeviceProfile:
+    def test_dict_round_trip(self):
+        profile = DeviceProfile(work_mode=1, repeat_interval=0.5,
+                                probes={0: ProbeConfig(vdiv=2.0, coupling=CouplingType(1))},
+                                **{k: getattr(PROFILE, k) for k in
+                                   ("channels", "channel_names", "trigger", "glitch_filter",
+                                    "signal_invert", "config")})
+        assert DeviceProfile.from_dict(json.loads(json.dumps(profile.to_dict()))) == profile
+
+    def test_empty_maps(self):
+        d = DeviceProfile(glitch_filter={}, signal_invert=None).to_dict()
+        assert d == {"glitch_filter": {}}
+        assert DeviceProfile.from_dict(d).glitch_filter == {}
@@ -0,0 +1,162 @@
+"""Tests for the logic sample block cache (no PXView required)."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from pxview_automation import ConfigError, McpError, PXView, SampleCache
+from pxview_automation.testing import FakePXViewServer
+
+
+class _Source:
+    """fetch() over a fixed buffer, recording requested ranges."""
+
+    def __init__(self, size):
+        self.data = bytes(i & 0xFF for i in range(size))
+        self.requests = []
+
+    def __call__(self, start, end):
+        self.requests.append((start, end))
+        return self.data[start:end]
+
+
+KEY = (1, 0, "logic")
+
+
+class TestSampleCache:
+    def test_overlapping_reads_fetch_only_missing_blocks(self):
+        cache = SampleCache(block_size=100)
+        src = _Source(1000)
+        assert cache.read(KEY, 50, 250, src) == src.data[50:250]
+        assert src.requests == [(0, 300)]
+        assert cache.read(KEY, 150, 350, src) == src.data[150:350]
+        assert src.requests[1:] == [(300, 400)]
+        assert cache.hits == 2 and cache.misses == 4
+
+    def test_holes_fetched_as_runs(self):
+        cache = SampleCache(block_size=10)
+        src = _Source(100)
+        cache.read(KEY, 20, 30, src)
+        cache.read(KEY, 50, 60, src)
+        src.requests.clear()
+        assert cache.read(KEY, 0, 70, src) == src.data[:70]
+        assert src.requests == [(0, 20), (30, 50), (60, 70)]
+
+    def test_end_of_capture(self):
+        cache = SampleCache(block_size=100)
+        src = _Source(250)
+        assert cache.read(KEY, 200, 400, src) == src.data[200:]
+        src.requests.clear()
+        assert cache.read(KEY, 150, 900, src) == src.data[150:]
+        assert src.requests == [(100, 200)]
+
+    def test_lru_eviction(self):
+        cache = SampleCache(max_bytes=300, block_size=100)
+        src = _Source(1000)
+        cache.read(KEY, 0, 300, src)
+        cache.read(KEY, 0, 100, src)          # block 0 becomes most recent
+        cache.read(KEY, 300, 400, src)        # evicts block 1
+        assert cache.evictions == 1 and cache.current_bytes == 300
+        src.requests.clear()
+        cache.read(KEY, 0, 100, src)
+        assert src.requests == []
+        cache.read(KEY, 100, 200, src)
+        assert src.requests == [(100, 200)]
+
+    def test_invalidate_discards_in_flight_fetch(self):
+        cache = SampleCache(block_size=10)
+        src = _Source(100)
+
+        def racing_fetch(start, end):
+            cache.invalidate()
+            return src(start, end)
+
+        cache.read(KEY, 0, 10, racing_fetch)
+        assert cache.current_bytes == 0
+        cache.read(KEY, 0, 10, src)
+        assert cache.current_bytes == 10
+
+    def test_store_whole_channel(self):
+        cache = SampleCache(block_size=10)
+        src = _Source(35)
+        cache.store(KEY, 5, src.data[5:], to_end=True)
+        assert cache.stats()["blocks"] == 3
+        assert cache.read(KEY, 10, 100, src) == src.data[10:]
+        assert src.requests == []
+
+    def test_bad_config(self):
+        with pytest.raises(ConfigError):
+            SampleCache(block_size=0)
+
+
+class TestPXViewSampleCache:
+    @pytest.fixture
+    def setup(self):
+        with FakePXViewServer() as server:
+            server.capture(10_000)
+            pxv = PXView(port=server.port, ws_port=server.ws_port,
+                         sample_cache=SampleCache(block_size=1000))
+            pxv.connect()
+            yield server, pxv
+            pxv.disconnect()
+
+    def test_sliding_window(self, setup):
+        server, pxv = setup
+        direct = pxv.client.get_samples(3, "logic", 0, 10_000)
+        before = server.call_count("get_samples")
+        for pos in range(0, 8000, 500):
+            assert pxv.get_logic_samples(3, pos, 1000) == direct[pos:pos + 1000]
+        # 16 windows, but each block is fetched only once.
+        assert server.call_count("get_samples") - before == 9
+
+    def test_new_capture_invalidates(self, setup):
+        server, pxv = setup
+        pxv.get_logic_samples(0, 0, 100)
+        pxv.capture("demo", sample_count=5000)
+        assert pxv.sample_cache.current_bytes == 0
+        before = server.call_count("get_samples")
+        pxv.get_logic_samples(0, 0, 100)
+        assert server.call_count("get_samples") == before + 1
+
+    def test_capture_event_invalidates(self, setup):
+        server, pxv = setup
+        pxv.get_logic_samples(0, 0, 100)
+        generation = pxv.sample_cache.generation
+        server.capture(2000)  # another client captured
+        for _ in range(50):
+            if pxv.sample_cache.generation != generation:
+                break
+            time.sleep(0.05)
+        assert pxv.sample_cache.generation != generation
+        assert len(pxv.get_logic_samples(0, 0, 5000)) == 2000
+
+    def test_closed_event_stream_falls_back(self, setup):
+        server, pxv = setup
+        assert len(pxv.get_logic_samples(0, 0, 5000)) == 5000
+        pxv.client.event_stream.close()
+        server.capture(2000)  # no event reaches the closed stream
+        assert len(pxv.get_logic_samples(0, 0, 5000)) == 2000
+        assert pxv.client.event_stream.is_open  # subscribed again
+        generation = pxv.sample_cache.generation
+        server.capture(3000)
+        for _ in range(50):
+            if pxv.sample_cache.generation != generation:
+                break
+            time.sleep(0.05)
+        assert len(pxv.get_logic_samples(0, 0, 5000)) == 3000
+
+    def test_without_event_stream(self):
+        with FakePXViewServer() as server:
+            server.capture(5000)
+            pxv = PXView(port=server.port, ws_port=1, sample_cache=SampleCache(block_size=1000))
+            pxv.connect()
+            pxv.get_logic_samples(1, 0, 1000)
+            pxv.get_logic_samples(1, 0, 1000)
+            assert server.call_count("get_samples") == 1
+            server.capture_time = 5.0
+            pxv.client.start_capture()
+            with pytest.raises(McpError):
+                pxv.get_logic_samples(1, 0, 10)
+            assert pxv.sample_cache.current_bytes == 0
@@ -0,0 +1,125 @@
+"""Tests for McpClient instrumentation (no PXView required)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from pxview_automation import McpClient, McpError
+from pxview_automation.stats import BUCKETS, CallRecord, ClientStats, Histogram
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers tools/call after a short delay; tool "fail" returns isError."""
+
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if req["method"] == "tools/call":
+            time.sleep(0.02)
+            name = req["params"]["name"]
+            result = {"content": [{"type": "text", "text": json.dumps({"x": "y" * 1000})}]}
+            if name == "fail":
+                result = {"isError": True, "content": [{"type": "text", "text": "bad"}]}
+        else:
+            result = {}
+        body = json.dumps({"jsonrpc": "2.0", "id": req.get("id"), "result": result}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def client():
+    srv = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield McpClient(f"http://127.0.0.1:{srv.server_port}/mcp", max_retries=1)
+    srv.shutdown()
+    srv.server_close()
+
+
+class TestClientStats:
+    def test_phases_and_bytes(self, client):
+        client._call_tool("get_samples", {"channel": 0})
+        client._call_tool("get_samples", {"channel": 1})
+        st = client.stats().tools["get_samples"]
+        assert st.calls == 2
+        assert st.errors == 0
+        assert st.response_bytes > 2000
+        assert st.request_bytes > 0
+        for phase in ("connect", "send", "ttfb", "read", "parse", "total"):
+            assert st.phases[phase].count == 2, phase
+        # Server-side delay shows up as time to first byte.
+        assert st.phases["ttfb"].sum >= 0.04
+        assert st.phases["total"].sum >= st.phases["ttfb"].sum
+
+    def test_tool_errors_counted(self, client):
+        with pytest.raises(McpError):
+            client._call_tool("fail")
+        assert client.stats().tools["fail"].errors == 1
+
+    def test_connection_errors_counted(self):
+        client = McpClient("http://127.0.0.1:1/mcp", max_retries=2, retry_delay=0)
+        assert not client.ping()
+        st = client.stats().tools["ping"]
+        assert (st.calls, st.errors, st.retries) == (1, 1, 1)
+
+    def test_hooks(self, client):
+        seen = []
+        client.on_request(lambda rec: seen.append(("req", rec.tool, dict(rec.timings))))
+        hook = client.on_response(lambda rec: seen.append(("resp", rec.tool, rec.response_bytes)))
+        client.on_response(lambda rec: 1 / 0)
+        client._call_tool("get_samples")
+        assert seen[0] == ("req", "get_samples", {})
+        assert seen[1][:2] == ("resp", "get_samples") and seen[1][2] > 0
+        assert client.stats().hook_errors == 1
+
+        client.remove_hook(hook)
+        client._call_tool("get_samples")
+        assert len(seen) == 3
+
+    def test_reset(self, client):
+        client.ping()
+        client.reset_stats()
+        assert client.stats().tools == {}
+
+
+class TestExport:
+    def _stats(self):
+        stats = ClientStats()
+        stats.record(CallRecord("get_samples", "tools/call", 1, 50, 4000,
+                                {"ttfb": 0.003, "total": 0.004}))
+        return stats
+
+    def test_json(self):
+        data = json.loads(self._stats().to_json())
+        tool = data["tools"]["get_samples"]
+        assert tool["calls"] == 1 and tool["response_bytes"] == 4000
+        assert tool["phases"]["ttfb"]["buckets"]["0.005"] == 1
+        assert "connect" not in tool["phases"]
+
+    def test_prometheus(self):
+        text = self._stats().to_prometheus()
+        assert "# TYPE pxview_mcp_calls_total counter" in text
+        assert 'pxview_mcp_calls_total{tool="get_samples"} 1' in text
+        bucket = 'pxview_mcp_phase_seconds_bucket{tool="get_samples",phase="ttfb",'
+        assert bucket + 'le="0.0025"} 0' in text
+        assert bucket + 'le="+Inf"} 1' in text
+        assert 'pxview_mcp_phase_seconds_count{tool="get_samples",phase="total"} 1' in text
+
+    def test_histogram_quantile(self):
+        h = Histogram()
+        for v in (0.001, 0.001, 0.2, 100.0):
+            h.observe(v)
+        assert h.quantile(0.5) == 0.001
+        assert h.quantile(0.75) == 0.25
+        assert h.quantile(1.0) == float("inf")
+        assert len(h.counts) == len(BUCKETS) + 1
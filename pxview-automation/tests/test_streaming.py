@@ -0,0 +1,127 @@
+"""Tests for Stream-mode capture streaming (FakePXViewServer, no PXView required)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pxview_automation import ConfigError, SampleRing
+from pxview_automation.streaming import _interleave
+
+pytestmark = pytest.mark.fake_server(pattern="random", seed=5, sample_limit=2_000_000)
+
+
+class TestStreamCapture:
+    def test_callable_sink_sees_every_sample(self, pxv):
+        chunks = []
+        stats = pxv.stream_capture(lambda start, data: chunks.append((start, data)),
+                                   [0, 3], 200_000, max_samples=50_000, chunk_samples=4096)
+        assert stats.stop_reason == "max_samples"
+        assert stats.samples == stats.read_samples == 50_000
+        starts = [start for start, _ in chunks]
+        assert starts == sorted(starts) and starts[0] == 0
+        for ch in (0, 3):
+            streamed = b"".join(data[ch] for _, data in chunks)
+            assert streamed == bytes(pxv.get_logic_samples(ch, 0, 50_000))
+
+    def test_file_sink_drains_the_tail(self, pxv, tmp_path):
+        path = tmp_path / "stream.bin"
+        channels = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+        stats = pxv.stream_capture(str(path), channels, 100_000, duration_s=0.3)
+        assert stats.stop_reason == "duration"
+        assert pxv.get_status()["state"] == "completed"
+        raw = path.read_bytes()
+        assert len(raw) == 2 * stats.samples  # 9 channels → 2-byte units
+        for k, ch in enumerate(channels):
+            samples = bytes(pxv.get_logic_samples(ch))
+            assert len(samples) == stats.samples
+            lane, bit = divmod(k, 8)
+            assert bytes((b >> bit) & 1 for b in raw[lane::2]) == samples
+
+    def test_stop_event_and_on_stats(self, pxv):
+        stop = threading.Event()
+        seen = []
+
+        def on_stats(stats):
+            seen.append(stats)
+            stop.set()
+
+        stats = pxv.stream_capture(SampleRing(1000), [0], 100_000, stop_event=stop,
+                                   status_interval_s=0.05, on_stats=on_stats)
+        assert stats.stop_reason == "stop"
+        assert seen and seen[0] is not stats
+
+    def test_on_stats_reports_server_samples_and_lag(self, pxv):
+        seen = []
+
+        def slow(start, data):
+            time.sleep(0.005)
+
+        stats = pxv.stream_capture(slow, [0], 1_000_000, max_samples=150_000,
+                                   chunk_samples=1000, max_pending=2,
+                                   status_interval_s=0.1, on_stats=seen.append)
+        assert stats.samples == 150_000
+        mid = seen[-1]
+        assert mid.server_samples > mid.samples > 0
+        assert mid.lag_samples >= mid.server_samples - mid.samples > 0
+
+    def test_disk_full_stops(self, server, pxv):
+        server.disk_cache.update(enabled=True, write_speed_mbps=12.5, is_disk_full=True)
+        stats = pxv.stream_capture(SampleRing(1000), [0], 100_000, duration_s=10)
+        assert stats.stop_reason == "disk_full"
+        assert stats.disk_full and stats.disk_write_speed_mbps == 12.5
+
+    def test_stopped_by_server(self, pxv):
+        ring = SampleRing(10_000_000)
+        timer = threading.Timer(0.3, pxv.stop_capture)
+        timer.start()
+        try:
+            stats = pxv.stream_capture(ring, [1], 100_000)
+        finally:
+            timer.cancel()
+        assert stats.stop_reason == "capture"
+        assert ring.total == stats.samples == len(pxv.get_logic_samples(1))
+
+    def test_slow_sink_applies_backpressure(self, pxv):
+        def slow(start, data):
+            time.sleep(0.02)
+
+        stats = pxv.stream_capture(slow, [0], 1_000_000, max_samples=30_000,
+                                   chunk_samples=1000, max_pending=2)
+        assert stats.samples == 30_000
+        assert stats.backpressure_seconds > 0.2
+        assert stats.max_queue_depth <= 2
+
+    def test_sink_error_stops_capture(self, pxv):
+        def broken(start, data):
+            raise OSError("disk gone")
+
+        with pytest.raises(OSError, match="disk gone"):
+            pxv.stream_capture(broken, [0], 100_000, duration_s=5)
+        assert pxv.get_status()["state"] == "completed"
+
+
+class TestSampleRing:
+    def test_wraps_and_reads(self):
+        ring = SampleRing(10)
+        for i in range(3):
+            ring.append({0: bytes([i]) * 4, 5: bytes([i + 10]) * 4})
+        assert ring.total == 12 and ring.channels == [0, 5]
+        assert ring.latest()[0] == b"\x00\x00\x01\x01\x01\x01\x02\x02\x02\x02"
+        assert ring.read(8, 4)[5] == bytes([12]) * 4
+        with pytest.raises(ConfigError):
+            ring.read(1, 2)
+
+    def test_append_larger_than_capacity(self):
+        ring = SampleRing(4)
+        ring.append({0: b"\x01\x02\x03"})
+        ring.append({0: bytes(range(10, 20))})
+        assert ring.latest()[0] == bytes(range(16, 20))
+        assert ring.read(11, 2)[0] == bytes([18, 19])
+
+    def test_interleave(self):
+        parts = [bytes([1, 0, 1]), bytes([0, 1, 1])] + [bytes(3)] * 6 + [bytes([1, 1, 0])]
+        assert _interleave(parts) == bytes([0b01, 0b1, 0b10, 0b1, 0b11, 0b0])
+        assert _interleave(parts[:2]) == bytes([0b01, 0b10, 0b11])
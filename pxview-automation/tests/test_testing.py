@@ -0,0 +1,190 @@
+"""Tests for the FakePXViewServer test double (no PXView required)."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+from pxview_automation import ConfigError, McpClient, McpError, PXView
+from pxview_automation.testing import FakePXViewServer
+from pxview_automation.types import ServiceEvent
+
+pytestmark = pytest.mark.mcp_client(max_retries=2, retry_delay=0)
+
+
+class TestProtocol:
+    def test_handshake_lists_all_tools(self, client):
+        names = {t["name"] for t in client.tools}
+        assert {"start_capture", "wait_capture", "get_samples", "get_analyzer_results",
+                "export_raw_data", "configure_cursors"} <= names
+        assert len(names) == 49
+
+    def test_unknown_tool(self, client):
+        with pytest.raises(McpError, match="Unknown tool: nope"):
+            client._call_tool("nope")
+
+    def test_structured_content(self, server, client):
+        text_client = McpClient(server.url, structured_content=False, auto_connect=True)
+        devices = client.get_devices()
+        assert devices[0]["id"] == "demo" and devices == text_client.get_devices()
+        # The structured-only response leaves out the duplicate text copy
+        size = client.stats().tools["get_devices"].response_bytes
+        assert size < text_client.stats().tools["get_devices"].response_bytes
+        result = server.call_tool("get_devices", {}, structured_only=True)
+        assert result["content"][0]["text"] == ""
+        assert result["_meta"] == {"pxview/unwrap": "value"}
+
+    def test_unknown_pattern(self):
+        with pytest.raises(ConfigError):
+            FakePXViewServer(pattern="sawtooth")
+
+
+class TestCapture:
+    def test_capture_and_wait(self, server, client):
+        server.capture_time = 0.3
+        started = client.start_capture(capture_configuration={
+            "manualCaptureMode": {"sampleCount": 5000}})
+        assert started == {"started": True, "capture_id": 1}
+        assert client.get_capture_status()["state"] == "capturing"
+        assert client.wait_capture(timeout_seconds=5) == {"completed": True}
+        status = client.get_capture_status()
+        assert (status["state"], status["progress"]) == ("completed", 100)
+        assert len(client.get_samples(3, "logic")) == 5000
+
+    def test_wait_capture_timeout(self, server, client):
+        server.capture_time = 5.0
+        client.start_capture()
+        with pytest.raises(McpError, match="did not complete"):
+            client.wait_capture(timeout_seconds=0.2)
+        client.stop_capture()
+        assert client.get_capture_status()["state"] == "completed"
+
+    def test_incremental_pattern(self, server, client):
+        server.capture(64)
+        assert list(client.get_samples(0, "logic", 0, 8)) == [0, 1, 0, 1, 0, 1, 0, 1]
+        assert list(client.get_samples(2, "logic", 0, 8)) == [0, 0, 0, 0, 1, 1, 1, 1]
+
+    def test_random_pattern_is_seeded(self):
+        chunks = []
+        for _ in range(2):
+            with FakePXViewServer(pattern="random", seed=7) as srv:
+                srv.capture(1000)
+                c = McpClient(srv.url)
+                c.connect()
+                chunks.append(bytes(c.get_samples(5, "logic")))
+        assert chunks[0] == chunks[1]
+        assert 300 < sum(chunks[0]) < 700
+
+    def test_save_and_load(self, server, client, tmp_path):
+        server.capture(1000, pattern="random")
+        before = bytes(client.get_samples(1, "logic"))
+        path = str(tmp_path / "cap.pxc")
+        client.save_capture(path)
+        client.close_capture()
+        with pytest.raises(McpError, match="No capture data"):
+            client.get_samples(1, "logic")
+        client.load_capture(path)
+        assert bytes(client.get_samples(1, "logic")) == before
+
+    def test_export_raw_data(self, server, client, tmp_path):
+        server.capture(100)
+        client.export_raw_data("binary", str(tmp_path), digital_channels=[0, 1])
+        with open(tmp_path / "channel_1.bin", "rb") as fh:
+            packed = fh.read()
+        assert len(packed) == 13  # 100 samples, 8 per byte, first sample in the LSB
+        assert packed[0] == 0b11001100
+        with pytest.raises(McpError, match="Unsupported export format"):
+            client.export_raw_data("wav", str(tmp_path), digital_channels=[0])
+
+
+class TestDecoders:
+    def test_i2c_annotations(self):
+        with FakePXViewServer(pattern="i2c") as srv:
+            srv.capture(20000)
+            c = McpClient(srv.url)
+            c.connect()
+            aid = c.add_analyzer("i2c", {"channelMap": {"scl": 0, "sda": 1}})["analyzerId"]
+            anns = c.get_analyzer_results(aid, max_count=10 ** 6)
+        anns = anns["annotations"] if isinstance(anns, dict) else anns
+        # Like PXView, one decoder row per class, read row after row
+        assert [a["ann_class"] for a in anns] == sorted(a["ann_class"] for a in anns)
+        anns.sort(key=lambda a: a["start_sample"])
+        classes = [a["ann_class"] for a in anns[:9]]
+        assert classes == [0, 7, 3, 9, 3, 9, 3, 2, 0]
+        assert anns[1]["texts"][0] == "Address write: 50"
+        assert [a["texts"][-1] for a in anns[3:6:2]] == ["00", "01"]
+
+    def test_synthetic_paging(self, server, client):
+        server.annotations = 100
+        server.capture(10_000)
+        aid = client.add_analyzer("uart", {"channelMap": {"rxtx": 0}})["analyzerId"]
+        seen, start = 0, 0
+        while True:
+            page = client.get_analyzer_results(aid, start_sample=start, max_count=30)
+            page = page["annotations"] if isinstance(page, dict) else page
+            if not page:
+                break
+            seen += len(page)
+            start = page[-1]["end_sample"] + 1
+        assert seen == 100
+
+    def test_required_channels(self, client):
+        with pytest.raises(McpError, match="Required channel"):
+            client.add_analyzer("i2c", {"channelMap": {"scl": 0}})
+
+
+class TestFaults:
+    def test_tool_and_rpc_failures(self, server, client):
+        server.inject_failure("get_devices", message="boom")
+        with pytest.raises(McpError, match="boom"):
+            client.get_devices()
+        server.inject_failure("get_devices", kind="rpc", code=-32000)
+        with pytest.raises(McpError) as info:
+            client.get_devices()
+        assert info.value.code == -32000
+        assert client.get_devices()[0]["id"] == "demo"
+
+    @pytest.mark.parametrize("kind", ["http", "drop"])
+    def test_transport_failures_are_retried(self, server, client, kind):
+        server.inject_failure("get_work_mode", kind=kind)
+        assert client.get_work_mode() == 0
+        assert server.call_count("get_work_mode") == 1
+
+    def test_latency(self, server, client):
+        server.set_latency(0.2, tool="get_work_mode")
+        t0 = time.monotonic()
+        client.get_work_mode()
+        assert time.monotonic() - t0 >= 0.2
+        server.clear_failures()
+        t0 = time.monotonic()
+        client.get_work_mode()
+        assert time.monotonic() - t0 < 0.2
+
+    def test_capture_error_event(self, server, client):
+        server.inject_capture_error("USB transfer failed")
+        with client.events(["capture_state", "error"]) as events:
+            client.start_capture()
+            event = events.wait_for(ServiceEvent.ERROR_OCCURRED, timeout=5)
+        assert event.params["message"] == "USB transfer failed"
+        assert client.get_capture_status()["state"] == "error"
+
+
+class TestHighLevel:
+    def test_capture_and_decode(self):
+        with FakePXViewServer(pattern="i2c", capture_time=0.1) as srv:
+            with PXView(port=srv.port, ws_port=srv.ws_port, auto_connect=True) as pxv:
+                results = pxv.capture_and_decode(
+                    "demo", "i2c", {"scl": 0, "sda": 1}, sample_count=5000)
+        anns = results["annotations"] if isinstance(results, dict) else results
+        assert anns and anns[0]["texts"][0] == "Start"
+
+    def test_saved_file_is_json(self, server, client, tmp_path):
+        server.capture(10)
+        path = str(tmp_path / "cap.pxc")
+        client.save_capture(path)
+        assert os.path.getsize(path) > 0
+        with open(path, encoding="utf-8") as fh:
+            assert json.load(fh)["fake_pxview_capture"]["sample_count"] == 10
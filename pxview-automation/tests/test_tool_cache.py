@@ -0,0 +1,184 @@
+"""Tests for ToolCache and McpClient(tool_cache=...)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pxview_automation import ConfigError, McpClient, McpError, ServiceEvent, ToolCache
+
+pytestmark = pytest.mark.fake_server(capture=10_000)
+
+
+@pytest.fixture
+def cache():
+    return ToolCache()
+
+
+@pytest.fixture
+def client(server, cache):
+    with McpClient(server.url, ws_url=server.ws_url, tool_cache=cache,
+                   auto_connect=True) as c:
+        yield c
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+class TestHits:
+    def test_repeated_calls_hit(self, server, client, cache):
+        first = client.get_devices()
+        assert client.get_devices() == first
+        client.get_demo_device()
+        client.get_hardware_device()
+        assert server.call_count("get_devices") == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (3, 1)
+
+    def test_results_are_copies(self, client):
+        client.get_devices()[0]["id"] = "changed"
+        assert client.get_devices()[0]["id"] != "changed"
+
+    def test_ttl_expiry(self, server):
+        with McpClient(server.url, tool_cache=ToolCache({"get_devices": 0.05}),
+                       auto_connect=True) as client:
+            client.get_devices()
+            client.get_channels()
+            client.get_channels()
+            time.sleep(0.1)
+            client.get_devices()
+        assert server.call_count("get_devices") == 2
+        assert server.call_count("get_channels") == 2  # not in this cache's TTLs
+
+    def test_arguments_are_part_of_key(self, server, client):
+        client.get_analyzer_options("uart")
+        client.get_analyzer_options("i2c")
+        client.get_analyzer_options("uart")
+        assert server.call_count("get_analyzer_options") == 2
+
+    def test_errors_are_not_cached(self, server, client, cache):
+        server.inject_failure("get_devices", kind="tool", times=1)
+        with pytest.raises(McpError):
+            client.get_devices()
+        assert client.get_devices()
+        assert cache.stats()["misses"] == 2
+
+
+class TestInvalidation:
+    def test_mutating_tool(self, server, client, cache):
+        client.get_channels()
+        client.configure_channel(0, enabled=False)
+        assert client.get_channels()[0]["enabled"] is False
+        assert server.call_count("get_channels") == 2
+        assert cache.stats()["invalidations"] >= 2  # connect + configure_channel
+
+    def test_read_only_tools_keep_entries(self, server, client):
+        client.get_devices()
+        client.get_samples(0, "logic", 0, 100)
+        client.get_capture_status()
+        client.get_devices()
+        assert server.call_count("get_devices") == 1
+
+    def test_refresh_device_list(self, server, client):
+        client.get_devices()
+        client.refresh_device_list()
+        client.get_devices()
+        assert server.call_count("get_devices") == 2
+
+    def test_reconnect_clears(self, server, client):
+        client.get_devices()
+        client.connect()
+        client.get_devices()
+        assert server.call_count("get_devices") == 2
+
+    def test_device_config_event(self, server, client, cache):
+        client.get_devices()
+        client.get_channels()
+        before = cache.stats()["invalidations"]
+        server.emit_event(ServiceEvent.DEVICE_CONFIG_CHANGED)
+        _wait_for(lambda: cache.stats()["invalidations"] > before)
+        client.get_devices()
+        client.get_channels()
+        assert server.call_count("get_devices") == server.call_count("get_channels") == 2
+
+    def test_device_list_event_is_scoped(self, server, client, cache):
+        client.get_devices()
+        client.get_channels()
+        before = cache.stats()["invalidations"]
+        server.emit_event(ServiceEvent.DEVICE_LIST_UPDATED)
+        _wait_for(lambda: cache.stats()["invalidations"] > before)
+        client.get_devices()
+        client.get_channels()
+        assert server.call_count("get_devices") == 2
+        assert server.call_count("get_channels") == 1
+
+    def test_without_websocket(self, server):
+        cache = ToolCache()
+        with McpClient(server.url, ws_url="ws://127.0.0.1:1", tool_cache=cache,
+                       auto_connect=True) as client:
+            client.get_devices()
+            client.get_devices()
+        assert cache.stats()["hits"] == 1
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_coalesce(self, server, client, cache):
+        server.set_latency(0.2, "get_devices")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get_devices()))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert server.call_count("get_devices") == 1
+        assert len(results) == 8 and all(r == results[0] for r in results)
+        stats = cache.stats()
+        assert stats["misses"] + stats["coalesced"] + stats["hits"] == 8
+        assert stats["misses"] == 1
+
+    def test_error_reaches_every_waiter(self):
+        cache = ToolCache({"t": 10})
+        gate = threading.Event()
+        errors = []
+
+        def fetch():
+            gate.wait(1)
+            raise McpError("boom")
+
+        def call():
+            try:
+                cache.call("t", None, fetch)
+            except McpError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        _wait_for(lambda: cache.stats()["misses"] + cache.stats()["coalesced"] == 4)
+        gate.set()
+        for t in threads:
+            t.join()
+        assert len(errors) == 4 and cache.stats()["entries"] == 0
+
+    def test_invalidated_flight_is_not_stored(self):
+        cache = ToolCache({"t": 10})
+
+        def fetch():
+            cache.invalidate(["t"])
+            return 1
+
+        assert cache.call("t", None, fetch) == 1
+        assert cache.call("t", None, lambda: 2) == 2
+        assert cache.call("t", None, lambda: 3) == 2
+
+
+def test_invalid_ttls():
+    with pytest.raises(ConfigError):
+        ToolCache({"get_devices": 0})
@@ -317,6 +317,7 @@ class TestServerVersionCompatibility:
                 # Tier 2: Configuration (consolidated)
                 "set_sample_config": "set_sample_config",
                 "configure_channel": "configure_channel",
+                "configure_channels": "configure_channels",
                 "configure_trigger": "configure_trigger",
                 "configure_probe": "configure_probe",
                 "configure_glitch_filter": "configure_glitch_filter",
@@ -0,0 +1,207 @@
+"""Tests for the WebSocket helper and viewport frame streaming.
+
+Frames are built with a Python port of ``pv/api/binary_codec.cpp`` and
+served from a loopback WebSocket server, so no PXView is required.
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import struct
+import threading
+
+import pytest
+
+from pxview_automation import McpError, ViewportFrame, ViewportStream, ViewportTick
+from pxview_automation._ws import OPCODE_TEXT, WebSocket
+from pxview_automation.viewport import (
+    FRAME_ANALOG_ENVELOPE,
+    FRAME_LOGIC_EDGES,
+    FRAME_VIEWPORT_RESET,
+    FrameDecoder,
+)
+
+# ======================================================================
+# Encoders (mirror BinaryCodec)
+# ======================================================================
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _header(frame_type: int, mask: int, ts: int = 1234) -> bytes:
+    return struct.pack("<BHxI", frame_type, mask, ts)
+
+
+def encode_logic_edges(start: int, edges: dict) -> bytes:
+    mask = 0
+    for ch in edges:
+        mask |= 1 << ch
+    out = bytearray(_header(FRAME_LOGIC_EDGES, mask))
+    out += struct.pack("<Q", start)
+    for ch in sorted(edges):
+        out += struct.pack("<H", len(edges[ch]))
+        for pos, level in edges[ch]:
+            out += _varint(pos - start)
+            out.append(level)
+    return bytes(out)
+
+
+def encode_analog_envelope(start: int, scale: int, envelopes: dict) -> bytes:
+    mask = 0
+    for ch in envelopes:
+        mask |= 1 << ch
+    out = bytearray(_header(FRAME_ANALOG_ENVELOPE, mask))
+    out += struct.pack("<Q", start)
+    for ch in sorted(envelopes):
+        values = envelopes[ch]
+        out += struct.pack("<II", scale, len(values) // 2)
+        out += struct.pack(f"<{len(values)}f", *values)
+    return bytes(out)
+
+
+# ======================================================================
+# FrameDecoder
+# ======================================================================
+
+class TestFrameDecoder:
+    def test_logic_edges(self):
+        data = encode_logic_edges(1000, {
+            0: [(1000, 1), (1200, 0), (1000 + 300_000, 1)],
+            3: [(1005, 0)],
+        })
+        frame = FrameDecoder().decode(data)
+        assert frame.frame_type == FRAME_LOGIC_EDGES
+        assert frame.start_sample == 1000
+        assert frame.timestamp_ms == 1234
+        assert frame.channels == [0, 3]
+        assert list(frame.edges[0].positions) == [1000, 1200, 301_000]
+        assert list(frame.edges[0].levels) == [1, 0, 1]
+        assert list(frame.edges[3].positions) == [1005]
+
+    def test_analog_envelope(self):
+        data = encode_analog_envelope(50, 16, {1: [-1.0, 1.0, -0.5, 0.25]})
+        frame = FrameDecoder().decode(data)
+        env = frame.envelopes[1]
+        assert frame.start_sample == 50
+        assert env.scale == 16
+        assert len(env) == 2
+        assert list(env.mins) == [-1.0, -0.5]
+        assert list(env.maxs) == [1.0, 0.25]
+
+    def test_viewport_reset(self):
+        data = _header(FRAME_VIEWPORT_RESET, 0) + struct.pack("<QQi", 10, 20_000, 1920)
+        frame = FrameDecoder().decode(data)
+        assert (frame.start_sample, frame.end_sample, frame.width) == (10, 20_000, 1920)
+
+    def test_buffers_are_reused(self):
+        decoder = FrameDecoder()
+        first = decoder.decode(encode_logic_edges(0, {0: [(1, 1), (2, 0), (3, 1)]}))
+        positions = first.edges[0].positions
+        second = decoder.decode(encode_logic_edges(0, {0: [(7, 0)]}))
+        assert second is first
+        assert second.edges[0].positions is positions
+        assert list(positions) == [7]
+
+    def test_truncated_frame(self):
+        data = encode_logic_edges(0, {0: [(1, 1), (2, 0)]})
+        with pytest.raises(McpError, match="Truncated"):
+            FrameDecoder().decode(data[:-1])
+
+    def test_unknown_type(self):
+        with pytest.raises(McpError, match="Unsupported"):
+            FrameDecoder().decode(_header(0x05, 0))
+
+
+# ======================================================================
+# ViewportStream against a loopback WS server
+# ======================================================================
+
+class _ViewportServer:
+    """Accept one client, ack its requests, then push *frames* and close."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.requests = []
+        self._listener = socket.socket()
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(1)
+        self.url = f"ws://127.0.0.1:{self._listener.getsockname()[1]}"
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        conn, _ = self._listener.accept()
+        ws = WebSocket.accept(conn)
+        while len(self.requests) < 2:
+            opcode, payload = ws.recv()
+            assert opcode == OPCODE_TEXT
+            req = json.loads(payload)
+            self.requests.append(req)
+            ws.send_text(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": ["ok"]}))
+        for frame in self.frames:
+            if isinstance(frame, bytes):
+                ws.send_binary(frame)
+            else:
+                ws.send_text(json.dumps(frame))
+        ws.close()
+        self._listener.close()
+
+    def join(self):
+        self._thread.join(timeout=5)
+
+
+class TestViewportStream:
+    def test_iterates_frames_and_ticks(self):
+        tick = {
+            "type": "notification", "topic": "viewport_tick",
+            "method": "on_viewport_data_available",
+            "params": {"start_sample": 0, "end_sample": 100, "width": 10,
+                       "last_sent_sample": 0},
+            "version": 7, "timestamp": 99,
+        }
+        server = _ViewportServer([
+            encode_logic_edges(0, {1: [(5, 1)]}),
+            tick,
+        ])
+        with ViewportStream(server.url, channels=[1], end_sample=100, width=10) as vs:
+            items = list(vs)
+        server.join()
+
+        assert server.requests[0]["method"] == "subscribe"
+        assert server.requests[0]["params"] == {"topics": ["viewport_tick"]}
+        assert server.requests[1]["method"] == "subscribe_viewport"
+        assert server.requests[1]["params"]["channels"] == [1]
+        assert isinstance(items[0], ViewportFrame)
+        assert list(items[0].edges[1].positions) == [5]
+        assert items[1] == ViewportTick(0, 100, 10, 0, version=7, timestamp_ms=99)
+        assert vs.frames_received == 1
+
+    def test_callbacks(self):
+        server = _ViewportServer([
+            encode_analog_envelope(0, 4, {0: [0.0, 1.0]}),
+        ])
+        scales = []
+        vs = ViewportStream(server.url, channels=[0])
+        vs.on_frame(lambda f: scales.append(f.envelopes[0].scale))
+        vs.start()
+        vs.join(timeout=5)
+        vs.close()
+        server.join()
+        assert scales == [4]
+
+    def test_error_reply_is_raised(self):
+        server = _ViewportServer([
+            {"jsonrpc": "2.0", "id": 3,
+             "error": {"code": -1, "message": "No active viewport subscription"}},
+        ])
+        with ViewportStream(server.url) as vs:
+            with pytest.raises(McpError, match="No active viewport"):
+                list(vs)
+        server.join()
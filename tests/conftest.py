@@ -20,10 +20,15 @@ Configuration via environment variables:
     PXVIEW_STARTUP_TIMEOUT  Seconds to wait for server (default: 120)
     PXVIEW_EXE_PATH         Path to PXView.exe; if set, auto-start headless
     PXVIEW_NO_AUTO_START    If "1", never auto-start (assume server is running)
+    PXVIEW_KEEP_ALIVE       If "1", leave the auto-started server running after
+                            the session and attach to it in later sessions
+    PXVIEW_STATE_FILE       State file for PXVIEW_KEEP_ALIVE
+                            (default: <tmp>/pxview-pytest-<port>.json)
 """
 
 from __future__ import annotations
 
+import logging
 import os
 import shutil
 import sys
@@ -45,6 +50,8 @@ except ImportError:
         sys.path.insert(0, str(_pkg_src))
     from pxview_automation import McpClient, McpError, PXViewProcess
 
+logger = logging.getLogger(__name__)
+
 
 # ---- Configuration (overridable via environment variables) ----
 
@@ -54,6 +61,11 @@ WS_PORT = int(os.environ.get("PXVIEW_WS_PORT", "10430"))
 MCP_STARTUP_TIMEOUT = float(os.environ.get("PXVIEW_STARTUP_TIMEOUT", "120"))
 EXE_PATH = os.environ.get("PXVIEW_EXE_PATH", "")
 NO_AUTO_START = os.environ.get("PXVIEW_NO_AUTO_START", "") == "1"
+KEEP_ALIVE = os.environ.get("PXVIEW_KEEP_ALIVE", "") == "1"
+STATE_FILE = os.environ.get(
+    "PXVIEW_STATE_FILE",
+    os.path.join(tempfile.gettempdir(), f"pxview-pytest-{MCP_PORT}.json"),
+)
 
 
 # ---- Session-scoped fixtures ----
@@ -124,13 +136,23 @@ def _pxview_process() -> Iterator[Optional[PXViewProcess]]:
         exe = None
 
     try:
-        proc = PXViewProcess(
-            exe_path=exe,
-            port=MCP_PORT,
-            ws_port=WS_PORT,
-            startup_timeout=MCP_STARTUP_TIMEOUT,
-        )
-        proc.start()
+        if KEEP_ALIVE:
+            # Attach to (or start) a warm server shared across sessions.
+            proc = PXViewProcess.shared(
+                STATE_FILE,
+                exe_path=exe,
+                port=MCP_PORT,
+                ws_port=WS_PORT,
+                startup_timeout=MCP_STARTUP_TIMEOUT,
+            )
+        else:
+            proc = PXViewProcess(
+                exe_path=exe,
+                port=MCP_PORT,
+                ws_port=WS_PORT,
+                startup_timeout=MCP_STARTUP_TIMEOUT,
+            )
+            proc.start()
     except Exception as exc:
         pytest.fail(
             f"Failed to start PXView headless: {exc}\n"
@@ -138,9 +160,12 @@ def _pxview_process() -> Iterator[Optional[PXViewProcess]]:
             f"manually with: PXView.exe --headless -l 4"
         )
 
+    timings = ", ".join(f"{k}={v:.2f}s" for k, v in proc.startup_timings.items())
+    logger.info("PXView headless ready (%s)", timings)
+
     yield proc
 
-    # Cleanup: stop PXView
+    # Cleanup: stop PXView (a no-op for a PXVIEW_KEEP_ALIVE instance)
     if proc is not None:
         proc.stop()
 
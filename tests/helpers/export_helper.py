@@ -10,6 +10,7 @@ import struct
 from typing import List, Optional
 
 from pxview_automation import McpClient
+from pxview_automation.exports import iter_csv, iter_export
 
 
 def read_csv_file(filepath: str) -> List[dict]:
@@ -25,6 +26,22 @@ def read_binary_file(filepath: str) -> bytes:
         return f.read()
 
 
+def count_csv_samples(filepath: str) -> int:
+    """Count data rows of a logic CSV export without holding it in memory."""
+    return sum(len(chunk) for chunk in iter_csv(filepath))
+
+
+def read_logic_export(filepath: str, sample_count: Optional[int] = None,
+                      sample_rate: Optional[int] = None) -> bytes:
+    """Read any raw logic export back to one byte (0/1) per sample.
+
+    The format follows the file extension; *sample_rate* is needed for
+    VCD and *sample_count* trims the byte padding of binary/hex exports.
+    """
+    return b"".join(chunk.tobytes() for chunk in iter_export(
+        filepath, sample_rate=sample_rate, sample_count=sample_count))
+
+
 def find_exported_csv(directory: str, pattern: str = "channel") -> List[str]:
     """Find CSV files matching a pattern in a directory."""
     result = []
@@ -0,0 +1,116 @@
+/*
+ * test_blob_store.cpp — QTest unit tests for mcp::BlobStore
+ *
+ * Covers blob lifetime (expiry, capacity eviction) and the Range header
+ * parser used by the GET /mcp/blob/<id> endpoint.
+ */
+
+#include <QtTest>
+#include <chrono>
+#include <cstdint>
+#include <thread>
+#include <vector>
+#include "pv/mcp/mcp_blob_store.h"
+
+using mcp::BlobStore;
+
+class TestBlobStore : public QObject {
+    Q_OBJECT
+private slots:
+    void PutAndGet();
+    void UniqueIds();
+    void UnknownIdIsNull();
+    void ExpiredBlobIsNull();
+    void EvictsOldestOverCapacity();
+    void EraseReleasesBytes();
+    void RangeFull();
+    void RangeOpenEnded();
+    void RangeSuffix();
+    void RangeClampsLast();
+    void RangeRejectsInvalid();
+};
+
+void TestBlobStore::PutAndGet() {
+    BlobStore store;
+    auto h = store.put({1, 2, 3, 4}, "application/octet-stream");
+    QCOMPARE(h.size, 4u);
+    QCOMPARE(h.id.size(), 32u);
+    std::string type;
+    auto data = store.get(h.id, &type);
+    QVERIFY(data != nullptr);
+    QCOMPARE(*data, (std::vector<uint8_t>{1, 2, 3, 4}));
+    QCOMPARE(type, std::string("application/octet-stream"));
+    QCOMPARE(store.total_bytes(), 4u);
+}
+void TestBlobStore::UniqueIds() {
+    BlobStore store;
+    auto a = store.put({1});
+    auto b = store.put({1});
+    QVERIFY(a.id != b.id);
+    QCOMPARE(store.count(), 2u);
+}
+void TestBlobStore::UnknownIdIsNull() {
+    BlobStore store;
+    QVERIFY(store.get("0123456789abcdef") == nullptr);
+}
+void TestBlobStore::ExpiredBlobIsNull() {
+    BlobStore store(1024, std::chrono::milliseconds(1));
+    auto h = store.put({1, 2});
+    std::this_thread::sleep_for(std::chrono::milliseconds(5));
+    QVERIFY(store.get(h.id) == nullptr);
+    QCOMPARE(store.total_bytes(), 0u);
+}
+void TestBlobStore::EvictsOldestOverCapacity() {
+    BlobStore store(10);
+    auto a = store.put(std::vector<uint8_t>(4));
+    auto b = store.put(std::vector<uint8_t>(4));
+    auto c = store.put(std::vector<uint8_t>(4));
+    QVERIFY(store.get(a.id) == nullptr);
+    QVERIFY(store.get(b.id) != nullptr);
+    QVERIFY(store.get(c.id) != nullptr);
+    QCOMPARE(store.total_bytes(), 8u);
+}
+void TestBlobStore::EraseReleasesBytes() {
+    BlobStore store;
+    auto h = store.put(std::vector<uint8_t>(16));
+    auto held = store.get(h.id);
+    store.erase(h.id);
+    QCOMPARE(store.total_bytes(), 0u);
+    QVERIFY(store.get(h.id) == nullptr);
+    QCOMPARE(held->size(), 16u);  // readers keep their shared buffer
+}
+void TestBlobStore::RangeFull() {
+    size_t first = 0, last = 0;
+    QVERIFY(mcp::parse_byte_range("bytes=0-9", 10, first, last));
+    QCOMPARE(first, 0u);
+    QCOMPARE(last, 9u);
+}
+void TestBlobStore::RangeOpenEnded() {
+    size_t first = 0, last = 0;
+    QVERIFY(mcp::parse_byte_range("bytes=4-", 10, first, last));
+    QCOMPARE(first, 4u);
+    QCOMPARE(last, 9u);
+}
+void TestBlobStore::RangeSuffix() {
+    size_t first = 0, last = 0;
+    QVERIFY(mcp::parse_byte_range("bytes=-3", 10, first, last));
+    QCOMPARE(first, 7u);
+    QCOMPARE(last, 9u);
+}
+void TestBlobStore::RangeClampsLast() {
+    size_t first = 0, last = 0;
+    QVERIFY(mcp::parse_byte_range("bytes=2-100", 10, first, last));
+    QCOMPARE(first, 2u);
+    QCOMPARE(last, 9u);
+}
+void TestBlobStore::RangeRejectsInvalid() {
+    size_t first = 0, last = 0;
+    QVERIFY(!mcp::parse_byte_range("bytes=10-", 10, first, last));
+    QVERIFY(!mcp::parse_byte_range("bytes=5-2", 10, first, last));
+    QVERIFY(!mcp::parse_byte_range("bytes=0-1,4-5", 10, first, last));
+    QVERIFY(!mcp::parse_byte_range("items=0-1", 10, first, last));
+    QVERIFY(!mcp::parse_byte_range("bytes=x-1", 10, first, last));
+}
+
+QTEST_MAIN(TestBlobStore)
+#include "test_blob_store.moc"
@@ -0,0 +1,100 @@
+/*
+ * test_export_stream.cpp — QTest unit tests for pv::api::ExportPipe
+ *
+ * Covers the bounded writer/reader handoff behind streamed raw exports:
+ * QTextStream output arrives byte for byte, a full pipe blocks the writer,
+ * finish() ends the stream and abort() releases a blocked writer.
+ */
+
+#include <QtTest>
+#include <QTextStream>
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <string>
+#include <thread>
+#include <vector>
+#include "pv/api/export_stream.h"
+
+using pv::api::ExportPipe;
+using namespace std::chrono_literals;
+
+class TestExportStream : public QObject {
+    Q_OBJECT
+private slots:
+    void TextStreamBytesArrive();
+    void TakeRespectsMaxBytes();
+    void FullPipeBlocksWriter();
+    void FinishReportsError();
+    void AbortReleasesWriter();
+};
+
+void TestExportStream::TextStreamBytesArrive() {
+    ExportPipe pipe;
+    QVERIFY(pipe.open(QIODevice::WriteOnly));
+    {
+        QTextStream out(&pipe);
+        out << "a,b\n" << "1,0\n";
+    }
+    pipe.close();
+    pipe.finish();
+    auto data = pipe.take(1024, 0ms);
+    QCOMPARE(std::string(data.begin(), data.end()), std::string("a,b\n1,0\n"));
+    QVERIFY(pipe.drained());
+    QVERIFY(pipe.error().empty());
+}
+
+void TestExportStream::TakeRespectsMaxBytes() {
+    ExportPipe pipe;
+    QVERIFY(pipe.open(QIODevice::WriteOnly));
+    QCOMPARE(pipe.write("0123456789", 10), qint64(10));
+    pipe.finish();
+    QCOMPARE(pipe.take(4, 0ms).size(), size_t(4));
+    QVERIFY(!pipe.drained());
+    QCOMPARE(pipe.take(100, 0ms).size(), size_t(6));
+    QVERIFY(pipe.drained());
+}
+
+void TestExportStream::FullPipeBlocksWriter() {
+    ExportPipe pipe(8);
+    QVERIFY(pipe.open(QIODevice::WriteOnly));
+    std::atomic<bool> done{false};
+    std::thread writer([&] {
+        pipe.write(std::string(20, 'x').c_str(), 20);
+        done = true;
+        pipe.finish();
+    });
+    std::this_thread::sleep_for(50ms);
+    QVERIFY(!done);
+    size_t total = 0;
+    while (!pipe.drained())
+        total += pipe.take(5, 100ms).size();
+    writer.join();
+    QCOMPARE(total, size_t(20));
+}
+
+void TestExportStream::FinishReportsError() {
+    ExportPipe pipe;
+    pipe.finish("No data to save.");
+    QVERIFY(pipe.take(10, 10ms).empty());
+    QVERIFY(pipe.drained());
+    QCOMPARE(pipe.error(), std::string("No data to save."));
+}
+
+void TestExportStream::AbortReleasesWriter() {
+    ExportPipe pipe(4);
+    QVERIFY(pipe.open(QIODevice::WriteOnly));
+    std::atomic<bool> aborted{false};
+    pipe.set_abort_handler([&] { aborted = true; });
+    qint64 written = 0;
+    std::thread writer([&] { written = pipe.write("0123456789", 10); });
+    std::this_thread::sleep_for(50ms);
+    pipe.abort();
+    writer.join();
+    QCOMPARE(written, qint64(-1));
+    QVERIFY(aborted);
+    QCOMPARE(pipe.write("x", 1), qint64(-1));
+}
+
+QTEST_MAIN(TestExportStream)
+#include "test_export_stream.moc"
@@ -0,0 +1,110 @@
+/*
+ * test_http_compression.cpp — QTest unit tests for pv::api HTTP compression
+ *
+ * Covers Accept-Encoding negotiation and that compress_body output
+ * inflates back to the input for both gzip and zlib-wrapped deflate.
+ */
+
+#include <QtTest>
+#include <string>
+#include <zlib.h>
+#include "pv/api/http_compression.h"
+
+using pv::api::ContentEncoding;
+using pv::api::compress_body;
+using pv::api::content_encoding_name;
+using pv::api::negotiate_content_encoding;
+
+namespace {
+
+// Inflate with automatic gzip / zlib header detection (windowBits 15+32).
+std::string inflate_all(const std::string& in) {
+    z_stream zs{};
+    if (inflateInit2(&zs, 15 + 32) != Z_OK)
+        return {};
+    std::string out(in.size() * 64 + 64, '\0');
+    zs.next_in = reinterpret_cast<Bytef*>(const_cast<char*>(in.data()));
+    zs.avail_in = static_cast<uInt>(in.size());
+    zs.next_out = reinterpret_cast<Bytef*>(out.data());
+    zs.avail_out = static_cast<uInt>(out.size());
+    int rc = inflate(&zs, Z_FINISH);
+    out.resize(zs.total_out);
+    inflateEnd(&zs);
+    return rc == Z_STREAM_END ? out : std::string();
+}
+
+std::string sample_json() {
+    std::string s = "{\"annotations\":[";
+    for (int i = 0; i < 500; ++i)
+        s += "{\"start_sample\":" + std::to_string(i * 100) + ",\"texts\":[\"Data\"]},";
+    s += "{}]}";
+    return s;
+}
+
+} // namespace
+
+class TestHttpCompression : public QObject {
+    Q_OBJECT
+private slots:
+    void NegotiatePrefersGzip();
+    void NegotiateDeflateOnly();
+    void NegotiateRefusesQZero();
+    void NegotiateWildcard();
+    void NegotiateIdentity();
+    void EncodingNames();
+    void GzipRoundTrip();
+    void DeflateRoundTrip();
+    void IdentityLeavesOutput();
+};
+
+void TestHttpCompression::NegotiatePrefersGzip() {
+    QCOMPARE(negotiate_content_encoding("gzip, deflate"), ContentEncoding::Gzip);
+    QCOMPARE(negotiate_content_encoding("deflate, gzip"), ContentEncoding::Gzip);
+    QCOMPARE(negotiate_content_encoding("GZIP;q=0.5"), ContentEncoding::Gzip);
+}
+void TestHttpCompression::NegotiateDeflateOnly() {
+    QCOMPARE(negotiate_content_encoding("deflate"), ContentEncoding::Deflate);
+    QCOMPARE(negotiate_content_encoding("br, deflate;q=1.0"), ContentEncoding::Deflate);
+}
+void TestHttpCompression::NegotiateRefusesQZero() {
+    QCOMPARE(negotiate_content_encoding("gzip;q=0, deflate"), ContentEncoding::Deflate);
+    QCOMPARE(negotiate_content_encoding("gzip;q=0.0"), ContentEncoding::Identity);
+}
+void TestHttpCompression::NegotiateWildcard() {
+    QCOMPARE(negotiate_content_encoding("*"), ContentEncoding::Gzip);
+    QCOMPARE(negotiate_content_encoding("gzip;q=0, *"), ContentEncoding::Deflate);
+}
+void TestHttpCompression::NegotiateIdentity() {
+    QCOMPARE(negotiate_content_encoding(""), ContentEncoding::Identity);
+    QCOMPARE(negotiate_content_encoding("identity"), ContentEncoding::Identity);
+    QCOMPARE(negotiate_content_encoding("br"), ContentEncoding::Identity);
+}
+void TestHttpCompression::EncodingNames() {
+    QCOMPARE(std::string(content_encoding_name(ContentEncoding::Gzip)), std::string("gzip"));
+    QCOMPARE(std::string(content_encoding_name(ContentEncoding::Deflate)), std::string("deflate"));
+    QVERIFY(content_encoding_name(ContentEncoding::Identity) == nullptr);
+}
+void TestHttpCompression::GzipRoundTrip() {
+    const std::string in = sample_json();
+    std::string out;
+    QVERIFY(compress_body(in, ContentEncoding::Gzip, out));
+    QVERIFY(out.size() < in.size() / 4);
+    QCOMPARE(static_cast<unsigned char>(out[0]), 0x1fu);
+    QCOMPARE(static_cast<unsigned char>(out[1]), 0x8bu);
+    QCOMPARE(inflate_all(out), in);
+}
+void TestHttpCompression::DeflateRoundTrip() {
+    const std::string in = sample_json();
+    std::string out;
+    QVERIFY(compress_body(in, ContentEncoding::Deflate, out));
+    QCOMPARE(static_cast<unsigned char>(out[0]) & 0x0f, 8); // CM = deflate
+    QCOMPARE(inflate_all(out), in);
+}
+void TestHttpCompression::IdentityLeavesOutput() {
+    std::string out = "untouched";
+    QVERIFY(!compress_body("abc", ContentEncoding::Identity, out));
+    QCOMPARE(out, std::string("untouched"));
+}
+
+QTEST_MAIN(TestHttpCompression)
+#include "test_http_compression.moc"
@@ -0,0 +1,60 @@
+/*
+ * test_tool_result.cpp — QTest unit tests for mcp::ToolResult
+ *
+ * Covers the structuredContent of JSON results, the {"value": ...} wrapper
+ * for non-object results and the empty text copy of structuredOnly calls.
+ */
+
+#include <QtTest>
+#include <string>
+#include "pv/mcp/mcp_content.h"
+
+using mcp::json;
+
+class TestToolResult : public QObject {
+    Q_OBJECT
+private slots:
+    void JsonResultHasTextCopy();
+    void StructuredOnlyLeavesTextEmpty();
+    void NonObjectIsWrapped();
+    void MovedResultMatchesCopy();
+    void TextResultHasNoStructuredContent();
+};
+
+void TestToolResult::JsonResultHasTextCopy() {
+    json r = mcp::json_result({{"a", 1}}).to_json();
+    QVERIFY(r["structuredContent"] == json({{"a", 1}}));
+    QVERIFY(json::parse(r["content"][0]["text"].get<std::string>()) == json({{"a", 1}}));
+    QVERIFY(!r.contains("_meta"));
+    QVERIFY(r["isError"] == json(false));
+}
+
+void TestToolResult::StructuredOnlyLeavesTextEmpty() {
+    json r = mcp::json_result({{"a", 1}}).to_json(true);
+    QVERIFY(r["structuredContent"] == json({{"a", 1}}));
+    QCOMPARE(r["content"].size(), size_t(1));
+    QVERIFY(r["content"][0]["text"] == json(""));
+}
+
+void TestToolResult::NonObjectIsWrapped() {
+    json r = mcp::json_result(json::array({1, 2})).to_json();
+    QVERIFY(r["structuredContent"] == json({{"value", {1, 2}}}));
+    QVERIFY(r["_meta"][mcp::ToolResult::kStructuredUnwrapKey] == json("value"));
+    QVERIFY(json::parse(r["content"][0]["text"].get<std::string>()) == json::array({1, 2}));
+}
+
+void TestToolResult::MovedResultMatchesCopy() {
+    auto result = mcp::json_result({{"k", "v"}, {"n", 3}});
+    json copied = result.to_json();
+    QVERIFY(std::move(result).to_json() == copied);
+}
+
+void TestToolResult::TextResultHasNoStructuredContent() {
+    json r = mcp::text("done").to_json(true);
+    QVERIFY(r["content"][0]["text"] == json("done"));
+    QVERIFY(!r.contains("structuredContent"));
+    QVERIFY(!mcp::json_result("plain").to_json().contains("structuredContent"));
+}
+
+QTEST_MAIN(TestToolResult)
+#include "test_tool_result.moc"
@@ -126,11 +126,8 @@ def setup_demo_session(output_path: str, sample_count: int = 1_000_000,
         device_id = device["id"]
         print(f"Demo device: {device_id}")
 
-        # Connect device
-        try:
-            client.connect_device(device_id)
-        except Exception:
-            pass
+        # Connect device (skipped when it is already active)
+        client.ensure_device(device_id)
 
         # Clear any existing state (skipped with --no-cleanup to preserve
         # decoders/capture already present in the connected session).
@@ -66,6 +66,7 @@ class TestMcpProtocol:
             "save_capture", "close_capture", "list_analyzers",
             "get_analyzer_options", "add_analyzer", "remove_analyzer",
             "get_analyzer_results", "export_raw_data", "export_data_table_csv",
+            "open_export_stream", "read_export_stream", "close_export_stream",
             "refresh_device_list",
             # Tier 2: Configuration (consolidated)
             "set_sample_config", "configure_channel", "configure_trigger",
@@ -2,6 +2,8 @@
 test_17_18_filter_invert.py - Glitch filter and signal invert tests.
 """
 
+import time
+
 import pytest
 
 from pxview_automation import McpClient, McpError
@@ -89,3 +91,20 @@ class TestSignalInvert:
                                   sample_rate=1000000, duration_seconds=0.3)
         assert status["state"] in ("completed", "idle")
         mcp.configure_signal_invert(channels=[])
+
+    def test_signal_invert_config_round_trip(self, mcp: McpClient, device_id: str,
+                                             cleanup_after_test):
+        """The getter reports the inverted channels by index."""
+        mcp.connect_device(device_id)
+        do_timed_capture(mcp, device_id, channels=[0, 1, 2],
+                         sample_rate=1000000, duration_seconds=0.3)
+        mcp.configure_signal_invert(channels=[1, 2], invert_states=[True, False])
+        deadline = time.monotonic() + 10
+        config = mcp.configure_signal_invert()
+        while not config["is_active"] and time.monotonic() < deadline:
+            time.sleep(0.1)  # inversion runs on a worker thread
+            config = mcp.configure_signal_invert()
+        assert config["channels"] == [1]
+        assert config["invert_states"] == [True]
+        mcp.configure_signal_invert(channels=[1], invert_states=[False])
+        assert mcp.configure_signal_invert()["is_active"] is False
@@ -8,9 +8,11 @@ Tests:
 1. VCD export: file non-empty, contains VCD header ($timescale, $var, $end)
 2. Hex export: file non-empty, each line is valid hexadecimal
 3. Bits export: file non-empty, contains valid bit strings
+4. Streamed export: export_raw_data_stream matches export_raw_data
 """
 
 import os
+import re
 
 import pytest
 
@@ -161,3 +163,37 @@ class TestBitsExport:
             assert bit_line_count > 0, \
                 f"No valid bit string lines found in {bits_file}. " \
                 f"First 5 lines: {lines[:5]}"
+
+
+def _without_timestamps(data: bytes) -> bytes:
+    """Drop the header lines libsigrok stamps with the export time."""
+    data = re.sub(rb"\$date.*?\$end\n?", b"", data, flags=re.S)
+    return b"".join(line for line in data.splitlines(keepends=True)
+                    if not line.startswith(b";"))
+
+
+class TestStreamedExport:
+
+    @pytest.mark.parametrize("fmt", ["csv", "binary", "vcd", "hex", "bits"])
+    def test_stream_matches_server_export(self, mcp: McpClient, device_id: str,
+                                          tmp_capture_dir: str, fmt: str,
+                                          cleanup_after_test):
+        """open/read_export_stream returns the bytes export_raw_data writes."""
+        do_timed_capture(mcp, device_id, channels=[0, 1],
+                         sample_rate=1000000, duration_seconds=0.3)
+
+        server_dir = os.path.join(tmp_capture_dir, "server")
+        local_dir = os.path.join(tmp_capture_dir, "local")
+        mcp.export_raw_data(fmt, server_dir, digital_channels=[0, 1])
+        written = mcp.export_raw_data_stream(fmt, local_dir, [0, 1],
+                                             chunk_bytes=64 * 1024)
+
+        assert len(written) == 2
+        for name, size in written.items():
+            with open(os.path.join(server_dir, name), "rb") as f:
+                expected = f.read()
+            with open(os.path.join(local_dir, name), "rb") as f:
+                actual = f.read()
+            assert size == len(actual) > 0
+            assert _without_timestamps(actual) == _without_timestamps(expected), \
+                f"Streamed {name} differs from export_raw_data"